@@ -954,8 +954,9 @@ if __name__ == '__main__':
         
     target_email = sys.argv[1]
     
-    # Load configuration
-    config = load_config()
+    # Load configuration (optional second argument: config file path)
+    config = load_config(sys.argv[2] if len(sys.argv) > 2 else 'config.json')
+    MAILDEV_URL = config.get('maildev_url', MAILDEV_URL)
     new_user = config.get('new_user_details', {})
     
     # Priority for details from config.json
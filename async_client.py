@@ -0,0 +1,362 @@
+"""
+asyncio variant of the TenantService / RestApiDeployer CP operations.
+
+The blocking clients need a thread per concurrent wait, so polling and
+lifecycle operations across hundreds of tenants meant hundreds of threads.
+AsyncCPClient runs the same operations (capabilities status, capability
+provisioning, app deploy, scale / start / stop) as coroutines on one event
+loop over an httpx.AsyncClient; the requests are built by payloads.py, the
+same builders the blocking classes use, so the wire format cannot drift.
+
+Login stays blocking: from_auth() copies the cookies of an authenticated
+SAMLAuthenticator. A 401 or a redirect to the login page counts as an
+expired session, as in auth.ReauthAdapter: the client re-runs
+auth.reauthenticate() in a worker thread and replays the request once.
+Redirects are not followed, so a login redirect is never sent on to the
+IdP with the API request's method and body. When another worker has already
+logged in again (auth.generation changed), the new cookies are picked up
+before the request is sent.
+
+httpx is optional (pip install httpx); only this module needs it.
+
+Usage:
+    async def main(tenants):
+        clients = [AsyncCPClient.from_auth(auth) for auth in tenants]
+        snapshots = await gather_limited([c.capabilities_status() for c in clients], limit=100)
+        ...
+        await asyncio.gather(*(c.aclose() for c in clients))
+
+    asyncio.run(main(tenants))
+"""
+
+import asyncio
+import os
+import time
+
+try:
+    import httpx
+except ImportError:  # optional: only needed by the asyncio client
+    httpx = None
+
+import payloads
+from auth import session_expired
+from deploy_rest_api import RestApiDeployer
+from status_model import StatusSnapshot
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_TIMEOUT_SECONDS = 60
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:146.0) Gecko/20100101 Firefox/146.0'
+
+
+async def gather_limited(coros, limit=50):
+    """
+    Run coroutines concurrently with at most `limit` in flight.
+
+    Args:
+        coros (iterable): Coroutines
+        limit (int): Concurrency limit
+
+    Returns:
+        list: Results in input order (exceptions are returned, not raised)
+    """
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def run(coro):
+        async with semaphore:
+            return await coro
+
+    return await asyncio.gather(*(run(c) for c in coros), return_exceptions=True)
+
+
+class AsyncCPClient:
+    """Async CP client for one tenant host and one authenticated identity."""
+
+    def __init__(self, host, cookies=None, auth=None, max_connections=DEFAULT_MAX_CONNECTIONS,
+                 timeout=DEFAULT_TIMEOUT_SECONDS):
+        """
+        Args:
+            host (str): Tenant host URL
+            cookies (dict): Session cookies (tsc, ...) when no authenticator is given
+            auth (SAMLAuthenticator): Logged-in authenticator to take cookies from and re-authenticate with
+            max_connections (int): Connection pool size of this client
+            timeout (float): Request timeout in seconds
+        """
+        if httpx is None:
+            raise RuntimeError("async_client needs httpx (pip install httpx)")
+        self.host = host.rstrip('/')
+        self.auth = auth
+        self.client = httpx.AsyncClient(
+            verify=False,
+            timeout=timeout,
+            follow_redirects=False,
+            headers={'User-Agent': USER_AGENT, 'Accept': 'application/json, text/plain, */*'},
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        )
+        self.generation = None
+        if auth is not None:
+            self._load_cookies()
+        elif cookies:
+            self.client.cookies.update(cookies)
+            if cookies.get('tsc'):
+                self.client.headers['x-xsrf-token'] = cookies['tsc']
+
+    @classmethod
+    def from_auth(cls, auth, host=None, **kwargs):
+        """Client on the session of a logged-in SAMLAuthenticator (host defaults to its host)."""
+        return cls(host or auth.host_idm, auth=auth, **kwargs)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    def _load_cookies(self):
+        self.client.cookies.clear()
+        for cookie in self.auth.session.cookies:
+            self.client.cookies.set(cookie.name, cookie.value, domain=cookie.domain, path=cookie.path)
+        tsc = self.auth.tsc_cookie()
+        if tsc:
+            self.client.headers['x-xsrf-token'] = tsc
+        self.generation = self.auth.generation
+
+    async def send(self, req, **kwargs):
+        """
+        Send an ApiRequest; re-authenticates and replays once when the session expired
+        (401 or redirect to the login page).
+
+        Args:
+            req (payloads.ApiRequest): Request to send
+            **kwargs: Passed to httpx (files, headers, ...)
+
+        Returns:
+            httpx.Response
+        """
+        if self.auth is not None and self.auth.generation != self.generation:
+            self._load_cookies()
+        resp = await self.client.request(req.method, req.url, params=req.params, json=req.json, **kwargs)
+        if self.auth is None or not session_expired(resp):
+            return resp
+        logger.info("[*] Session expired for %s (HTTP %s), re-authenticating...", self.host, resp.status_code)
+        if not await asyncio.get_running_loop().run_in_executor(None, self.auth.reauthenticate, self.generation):
+            return resp
+        self._load_cookies()
+        return await self.client.request(req.method, req.url, params=req.params, json=req.json, **kwargs)
+
+    # ------------------------------------------------------------------
+    # Status and capabilities
+    # ------------------------------------------------------------------
+
+    async def capabilities_status(self, dataplane_id=None):
+        """
+        Capabilities status of one dataplane (or all dataplanes).
+
+        Returns:
+            StatusSnapshot: Empty snapshot when the call failed
+        """
+        resp = await self.send(payloads.capabilities_status(self.host, dataplane_id))
+        if resp.status_code != 200:
+            logger.warning("[!] Capabilities status failed for %s. Status: %s", self.host, resp.status_code)
+            return StatusSnapshot.from_response({})
+        return StatusSnapshot.from_response(resp.json())
+
+    async def wait_for_capability(self, dataplane_id, capability, timeout=600, poll_interval=15):
+        """
+        Poll until a capability of a dataplane is green.
+
+        Returns:
+            bool: True when green before the timeout
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            snapshot = await self.capabilities_status(dataplane_id)
+            cap = snapshot.find_capability(dataplane_id, capability)
+            if cap is not None and cap.is_green:
+                return True
+            if time.monotonic() + poll_interval > deadline:
+                logger.warning("[!] %s on %s not green after %ss", capability, dataplane_id, timeout)
+                return False
+            await asyncio.sleep(poll_interval)
+
+    async def provision_capability(self, dataplane_id, capability, storage_resource_id, ingress_resource_id,
+                                   cap_config=None):
+        """
+        Provision a BWCE or FLOGO capability (resource IDs already resolved).
+
+        Returns:
+            dict: {"success": bool, "capability_instance_id": str} or {"success": False, "error": str}
+        """
+        req = payloads.provision_capability(self.host, dataplane_id, capability, storage_resource_id,
+                                            ingress_resource_id, cap_config or {})
+        headers = {'Origin': self.host, 'Referer': f"{self.host}/cp/app/dataplanes"}
+        try:
+            resp = await self.send(req, headers=headers)
+            if resp.status_code not in (200, 201):
+                logger.warning("[!] %s provisioning failed. Status: %s", capability, resp.status_code)
+                return {"success": False, "error": f"HTTP {resp.status_code}", "response": resp.text}
+            capability_instance_id = resp.json().get('response', {}).get('capabilityInstanceId', '')
+            if not capability_instance_id:
+                return {"success": False, "error": "No capability instance ID returned"}
+            return {"success": True, "capability_instance_id": capability_instance_id, "dataplane_id": dataplane_id}
+        except Exception as e:
+            logger.warning("[!] Error during %s provisioning: %s", capability, e)
+            return {"success": False, "error": str(e)}
+
+    # ------------------------------------------------------------------
+    # Application deployment
+    # ------------------------------------------------------------------
+
+    async def store_file(self, capability, file_path):
+        """Upload an .ear / .flogo file; returns the file ID or None."""
+        content = await asyncio.get_running_loop().run_in_executor(None, _read_file, file_path)
+        files = {'file': (os.path.basename(file_path), content, 'application/octet-stream')}
+        resp = await self.send(payloads.file_store(capability, self.host), files=files)
+        if resp.status_code not in (200, 201):
+            logger.warning("[!] Upload failed. Status: %s", resp.status_code)
+            return None
+        return payloads.stored_file_id(resp.json())
+
+    async def _send_json(self, req):
+        resp = await self.send(req)
+        if resp.status_code not in (200, 201, 202):
+            return {"success": False, "error": f"HTTP {resp.status_code}"}
+        try:
+            return {"success": True, "result": resp.json()}
+        except ValueError:
+            return {"success": True, "result": {}}
+
+    async def wait_for_build(self, capability, dataplane_id, capability_id, build_id, max_wait=300, poll_interval=10):
+        """Poll a build until it completed (True) or failed / timed out (False)."""
+        req = payloads.build_status(capability, self.host, dataplane_id, capability_id, build_id)
+        deadline = time.monotonic() + max_wait
+        while time.monotonic() < deadline:
+            resp = await self.send(req)
+            if resp.status_code == 200:
+                result = resp.json()
+                status = result.get('status', '').lower()
+                if status in ('success', 'completed'):
+                    return True
+                if status in ('failed', 'error'):
+                    logger.warning("[!] Build failed: %s", result.get('message'))
+                    return False
+            await asyncio.sleep(poll_interval)
+        logger.warning("[!] Build timeout after %s seconds", max_wait)
+        return False
+
+    async def deploy_app(self, capability, dataplane_id, capability_id, namespace, app_config):
+        """
+        Upload, build and deploy a BWCE or Flogo app (same flow as RestApiDeployer).
+
+        BWCE uses the latest provisioned buildtype and deploys right after the build
+        request; Flogo waits for the build. Buildtype provisioning is left to the
+        blocking RestApiDeployer.ensure_buildtype().
+
+        Args:
+            capability (str): 'BWCE' or 'FLOGO'
+            dataplane_id (str): Dataplane ID
+            capability_id (str): Capability instance ID
+            namespace (str): Kubernetes namespace
+            app_config (dict): app_folder, app_file_name, app_name
+
+        Returns:
+            dict: {"success": bool, "app_name", "build_id", "app_id", ...} or {"success": False, "error": str}
+        """
+        app_name = app_config.get('app_name')
+        app_file_name = app_config.get('app_file_name')
+        if not app_file_name:
+            return {"success": False, "error": "No app_file_name provided"}
+        kind = 'bwce' if capability == 'BWCE' else 'flogo'
+        app_file_path = os.path.abspath(os.path.join(app_config.get('app_folder', 'apps_to_deploy'), kind, app_file_name))
+        if not os.path.exists(app_file_path):
+            return {"success": False, "error": f"File not found: {app_file_path}"}
+
+        try:
+            file_id = await self.store_file(capability, app_file_path)
+            if not file_id:
+                return {"success": False, "error": "File upload failed"}
+
+            if capability == 'BWCE':
+                resp = await self.send(payloads.bwce_buildtypes(self.host, dataplane_id, capability_id))
+                versions = payloads.provisioned_bwce_versions(resp.json()) if resp.status_code == 200 else []
+                if not versions:
+                    return {"success": False, "error": "No BWCE version provisioned"}
+                build = await self._send_json(payloads.bwce_build(
+                    self.host, dataplane_id, capability_id, file_id, app_name,
+                    versions[0]['version'], versions[0]['baseImageTag']))
+            else:
+                resp = await self.send(payloads.capability_info('FLOGO', self.host, dataplane_id, capability_id))
+                info = resp.json() if resp.status_code == 200 else {}
+                build = await self._send_json(payloads.flogo_build(
+                    self.host, dataplane_id, capability_id, file_id, app_name, info.get('version', '1.0.0')))
+            if not build['success']:
+                return build
+
+            result = build['result']
+            build_id = result.get('buildId') or result.get('id')
+            if capability != 'BWCE':
+                build_id = build_id or result.get('buildName')
+            if not build_id:
+                return {"success": False, "error": "Build ID not in response"}
+
+            if capability == 'BWCE':
+                app_name = RestApiDeployer.sanitize_app_name(app_name)
+                req = payloads.bwce_deploy(self.host, dataplane_id, capability_id, namespace, build_id, app_name)
+            else:
+                if not await self.wait_for_build('FLOGO', dataplane_id, capability_id, build_id):
+                    return {"success": False, "error": "Build failed or timed out"}
+                req = payloads.flogo_deploy(self.host, dataplane_id, capability_id, namespace, build_id, app_name)
+            deploy = await self._send_json(req)
+            if not deploy['success']:
+                return deploy
+
+            logger.info("[+] %s app %s deployed on %s", capability, app_name, self.host)
+            return {
+                "success": True,
+                "app_name": app_name,
+                "build_id": build_id,
+                "app_id": deploy['result'].get('appId') or deploy['result'].get('id'),
+                "dataplane_id": dataplane_id,
+                "capability_id": capability_id,
+                "namespace": namespace
+            }
+        except Exception as e:
+            logger.warning("[!] Deployment error on %s: %s", self.host, e)
+            return {"success": False, "error": str(e)}
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def scale_app(self, capability, dataplane_id, capability_id, app_id, namespace, replica_count):
+        """
+        Scale a BWCE / Flogo app (0 = stop, 1+ = start).
+
+        Returns:
+            dict: {"success": bool, "message": str} or {"success": False, "error": str}
+        """
+        req = payloads.scale_app(capability, self.host, dataplane_id, capability_id, app_id, namespace, replica_count)
+        try:
+            result = await self._send_json(req)
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+        if not result['success']:
+            logger.warning("[!] Scale of %s failed: %s", app_id, result['error'])
+            return result
+        return {"success": True, "message": result['result'].get('message', 'Scale request accepted')}
+
+    async def start_app(self, capability, dataplane_id, capability_id, app_id, namespace, replica_count=1):
+        return await self.scale_app(capability, dataplane_id, capability_id, app_id, namespace, replica_count)
+
+    async def stop_app(self, capability, dataplane_id, capability_id, app_id, namespace):
+        return await self.scale_app(capability, dataplane_id, capability_id, app_id, namespace, 0)
+
+
+def _read_file(path):
+    with open(path, 'rb') as f:
+        return f.read()
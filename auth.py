@@ -1,31 +1,151 @@
+import contextlib
 import requests
-import ssl
 import urllib3
 import urllib.parse
 import re
-from bs4 import BeautifulSoup
-from requests.adapters import HTTPAdapter
-from urllib3.poolmanager import PoolManager
+import threading
+from requests.adapters import BaseAdapter
+from logging_config import get_logger
+from form_extract import extract_form, find_relay_state
+import relay_resolver
+import connection_pool
+
+logger = get_logger(__name__)
 
 # Disable InsecureRequestWarning for custom/self-signed certificates
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-class TLSAdapter(HTTPAdapter):
-    """Adapter to force specific TLS versions if needed."""
-    def init_poolmanager(self, connections, maxsize, block=False):
-        self.poolmanager = PoolManager(
-            num_pools=connections, maxsize=maxsize,
-            block=block, ssl_version=ssl.PROTOCOL_TLSv1_2)
+# Callables applied to every new SAMLAuthenticator session (e.g. benchmark
+# request counters). Each is called as hook(session, authenticator).
+SESSION_HOOKS = []
+
+def register_session_hook(hook):
+    """Register a callable run on each new session; returns the hook."""
+    if hook not in SESSION_HOOKS:
+        SESSION_HOOKS.append(hook)
+    return hook
+
+def unregister_session_hook(hook):
+    if hook in SESSION_HOOKS:
+        SESSION_HOOKS.remove(hook)
+
+class DelegatingAdapter(BaseAdapter):
+    """
+    Transport adapter that wraps another adapter.
+    Subclasses override send() to observe or alter traffic and call
+    super().send() to pass the request on; wrappers can be stacked by
+    mounting one around the adapter currently mounted on a session.
+    """
+    def __init__(self, inner):
+        super().__init__()
+        self.inner = inner
+
+    def send(self, request, **kwargs):
+        return self.inner.send(request, **kwargs)
+
+    def close(self):
+        self.inner.close()
+
+    def __getattr__(self, name):
+        # Expose attributes of the wrapped adapter (e.g. poolmanager)
+        if name == 'inner':
+            raise AttributeError(name)
+        return getattr(self.inner, name)
+
+def wrap_session_adapters(session, factory, prefixes=('https://', 'http://')):
+    """Mount factory(current_adapter) in place of the adapter for each prefix."""
+    for prefix in prefixes:
+        session.mount(prefix, factory(session.get_adapter(prefix)))
+
+# Redirect targets that mean the CP sent us back to the login page
+LOGIN_REDIRECT_MARKERS = ('/admin/login', '/cp/login', '/idm/v1/login-saml', 'relayState=')
+# Login/logout endpoints are never re-authenticated or replayed
+LOGIN_PATH_PREFIXES = ('/admin/login', '/cp/login', '/idm/')
+
+def session_expired(response):
+    """True for a 401 or a redirect to the login page (requests and httpx responses)."""
+    if response.status_code == 401:
+        return True
+    if response.is_redirect:
+        location = response.headers.get('Location', '')
+        return any(marker in location for marker in LOGIN_REDIRECT_MARKERS)
+    return False
+
+class ReauthAdapter(DelegatingAdapter):
+    """
+    Re-authenticates an expired session and replays the request once.
+
+    A session counts as expired when a request gets a 401, is redirected to
+    the login page, or is about to be sent after the tsc cookie disappeared.
+    The login flow is re-run under the authenticator's login_lock, so
+    concurrent workers hitting the expiry together trigger one login and all
+    replay with the new cookies. Requests made by the login flow itself pass
+    through untouched.
+    """
+    def __init__(self, inner, auth):
+        super().__init__(inner)
+        self.auth = auth
+
+    def _refresh_request(self, request):
+        """Copy of request carrying the current session cookies and CSRF token."""
+        replay = request.copy()
+        replay.headers.pop('Cookie', None)
+        replay.prepare_cookies(self.auth.session.cookies)
+        tsc_value = self.auth.tsc_cookie()
+        if tsc_value and 'x-xsrf-token' in replay.headers:
+            replay.headers['x-xsrf-token'] = tsc_value
+        return replay
+
+    def _host_path(self, request):
+        # Path below the host's base path, so /t/<prefix>/admin/login matches /admin/login
+        path = request.path_url
+        base = urllib.parse.urlsplit(self.auth.host_idm).path.rstrip('/')
+        if base and (path == base or path.startswith(base + '/')):
+            path = path[len(base):] or '/'
+        return path
+
+    def send(self, request, **kwargs):
+        auth = self.auth
+        if not auth.authenticated or auth.in_login_flow() or self._host_path(request).startswith(LOGIN_PATH_PREFIXES):
+            return super().send(request, **kwargs)
+
+        generation = auth.generation
+        if auth.expects_tsc and not auth.tsc_cookie():
+            logger.info("[*] tsc cookie missing for %s, re-authenticating before %s", auth.username, request.path_url)
+            if auth.reauthenticate(generation):
+                request = self._refresh_request(request)
+            generation = auth.generation
+
+        response = super().send(request, **kwargs)
+        if not session_expired(response):
+            return response
+
+        logger.info("[*] Session expired for %s (HTTP %s on %s), re-authenticating",
+                    auth.username, response.status_code, request.path_url)
+        if not auth.reauthenticate(generation):
+            return response
+        response.close()
+        return super().send(self._refresh_request(request), **kwargs)
 
 class SAMLAuthenticator:
     def __init__(self, host_idm, username, password):
         self.host_idm = host_idm
         self.username = username
         self.password = password
+        # Re-authentication state shared by all workers using this session
+        self.login_lock = threading.RLock()
+        self.generation = 0
+        self.authenticated = False
+        self.expects_tsc = False
+        self.fallback_relay_state = None
+        self.reauth_count = 0
+        self._local = threading.local()
         self.session = requests.Session()
         self.session.verify = False
         self.session.trust_env = False 
-        self.session.mount('https://', TLSAdapter())
+        # Keep-alive connections are shared with every other session in the process
+        connection_pool.mount(self.session)
+        wrap_session_adapters(self.session, lambda inner: ReauthAdapter(inner, self))
 
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:146.0) Gecko/20100101 Firefox/146.0',
@@ -35,19 +155,12 @@ class SAMLAuthenticator:
             'Upgrade-Insecure-Requests': '1'
         })
 
+        for hook in list(SESSION_HOOKS):
+            hook(self.session, self)
+
     def extract_form_data(self, response):
         """Extracts form action and all input fields from a response."""
-        soup = BeautifulSoup(response.text, 'html.parser')
-        form = soup.find('form')
-        if not form:
-            return None, {}
-        
-        action = form.get('action')
-        if action:
-            action = urllib.parse.urljoin(response.url, action)
-            
-        inputs = {inp.get('name'): inp.get('value', '') for inp in form.find_all('input') if inp.get('name')}
-        return action, inputs
+        return extract_form(response.text, response.url)
 
     def get_dynamic_relay_state(self, path="/admin/login"):
         """Attempts to fetch a fresh RelayState from the login landing page."""
@@ -60,27 +173,74 @@ class SAMLAuthenticator:
             if 'relayState' in params:
                 return params['relayState'][0]
             
-            soup = BeautifulSoup(resp.text, 'html.parser')
-            for link in soup.find_all(['a', 'form', 'input'], recursive=True):
-                href = link.get('href') or link.get('action') or link.get('value')
-                if href and 'relayState=' in href:
-                    query = urllib.parse.urlparse(href).query or href
-                    state = urllib.parse.parse_qs(query).get('relayState', [None])[0]
-                    if state: return state
+            state = find_relay_state(resp.text)
+            if state:
+                return state
             
             if path == "/admin/login":
                 return self.get_dynamic_relay_state(path="/cp/login")
 
         except Exception as e:
-            print(f"[!] Warning: Could not fetch dynamic RelayState: {e}")
+            logger.warning("[!] Warning: Could not fetch dynamic RelayState: %s", e)
         return None
 
+    def tsc_cookie(self):
+        """Value of the tsc session cookie, or None."""
+        return next((c.value for c in self.session.cookies if c.name == 'tsc'), None)
+
+    def in_login_flow(self):
+        return getattr(self._local, 'in_login', False)
+
+    @contextlib.contextmanager
+    def login_scope(self):
+        """Holds login_lock and marks this thread's requests as login traffic (never re-authenticated)."""
+        with self.login_lock:
+            previous = self.in_login_flow()
+            self._local.in_login = True
+            try:
+                yield self
+            finally:
+                self._local.in_login = previous
+
     def run_login_flow(self, relay_state_raw=None):
+        """Runs the SAML login flow; returns True when the session is authenticated."""
+        with self.login_lock:
+            with self.login_scope():
+                ok = self._run_login_flow(relay_state_raw)
+            if ok:
+                self.authenticated = True
+                self.expects_tsc = self.tsc_cookie() is not None
+                self.generation += 1
+            return ok
+
+    def reauthenticate(self, seen_generation=None):
+        """
+        Logs in again after the session expired.
+
+        Args:
+            seen_generation (int): generation the caller's failed request was sent
+                with; when another worker has logged in since, nothing is done
+
+        Returns:
+            bool: True when the session is (again) authenticated
+        """
+        with self.login_lock:
+            if seen_generation is not None and self.generation != seen_generation:
+                return self.authenticated
+            self.reauth_count += 1
+            if relay_resolver.login(self, self.fallback_relay_state, self.username):
+                logger.info("[+] Re-authenticated %s", self.username)
+                return True
+            logger.warning("[!] Re-authentication failed for %s", self.username)
+            self.authenticated = False
+            return False
+
+    def _run_login_flow(self, relay_state_raw=None):
         if not relay_state_raw:
             relay_state_raw = self.get_dynamic_relay_state()
             
         if not relay_state_raw:
-            print("[!] No RelayState found. Skipping flow.")
+            logger.warning("[!] No RelayState found. Skipping flow.")
             return False
 
         # Step 1: Initiating SAML login flow
@@ -92,12 +252,12 @@ class SAMLAuthenticator:
             resp1 = self.session.get(login_url, params={'relayState': relay_state_raw}, headers=step1_headers, timeout=30)
             # print(f"[*] Step 1 Status: {resp1.status_code}")
         except Exception as e:
-            print(f"[!] Critical Error: Connection failed: {e}")
+            logger.warning("[!] Critical Error: Connection failed: %s", e)
             return False
 
         idp_sso_url, saml_req_data = self.extract_form_data(resp1)
         if not idp_sso_url: 
-            print("[!] Step 1 failed to extract IDP URL. Check if you are reachable.")
+            logger.warning("[!] Step 1 failed to extract IDP URL. Check if you are reachable.")
             return False
 
         # Step 2: Submit SAML Request to IDP
@@ -106,12 +266,15 @@ class SAMLAuthenticator:
         
         # Step 3: IDP Login Page
         login_url, login_payload = self.extract_form_data(resp2)
-        if not login_url:
+        if 'SAMLResponse' in login_payload:
+            # IdP session still valid (refresh / re-authentication): resp2 is the SAMLResponse auto-post form
+            resp3 = resp2
+        elif not login_url:
             if 'SAMLResponse' in resp2.text:
                 # print("[*] Already authenticated. Moving to Step 4.")
                 resp3 = resp2
             else:
-                print("[!] Step 3 failed: No login form found on IDP page.")
+                logger.warning("[!] Step 3 failed: No login form found on IDP page.")
                 return False
         else:
             # print(f"[*] Step 3: Entering credentials at {login_url}")
@@ -125,7 +288,7 @@ class SAMLAuthenticator:
         # Step 4: Extract SAMLResponse
         acs_url, saml_resp_data = self.extract_form_data(resp3)
         if not acs_url or 'SAMLResponse' not in saml_resp_data:
-            print("[!] Step 4: IDP did not return a SAMLResponse.")
+            logger.warning("[!] Step 4: IDP did not return a SAMLResponse.")
             return False
 
         # print(f"[*] Step 4: Posting SAMLResponse to {acs_url}")
@@ -137,10 +300,10 @@ class SAMLAuthenticator:
         # Check for error URLs
         if '/error/' in resp4.url or '/tsc/error/' in resp4.url:
             error_code = urllib.parse.parse_qs(urllib.parse.urlparse(resp4.url).query).get('code', ['Unknown'])[0]
-            print(f"[!] Authentication error detected: {error_code}")
-            print(f"[!] Error URL: {resp4.url}")
+            logger.warning("[!] Authentication error detected: %s", error_code)
+            logger.warning("[!] Error URL: %s", resp4.url)
             if resp4.text:
-                print(f"[!] Response preview: {resp4.text[:300]}")
+                logger.warning("[!] Response preview: %s", resp4.text[:300])
             return False
 
         token = urllib.parse.parse_qs(urllib.parse.urlparse(resp4.url).query).get('token', [None])[0]
@@ -150,21 +313,23 @@ class SAMLAuthenticator:
             token = final_form.get('token')
 
         if token:
-            print("[+] Token found. Establishing session cookie...")
+            logger.info("[+] Token found. Establishing session cookie...")
             cookie_url = f"{self.host_idm}/idm/v1/cookie"
             self.session.post(cookie_url, data={'token': token, 'location': f"{self.host_idm}/cp/app/home"})
             return True
         
         if self.session.cookies.get('tsc'):
-            print("[+] Token not in URL, but 'tsc' session cookie is present. Assuming success.")
+            logger.info("[+] Token not in URL, but 'tsc' session cookie is present. Assuming success.")
             return True
         
-        print("[!] Final Step: Token extraction failed.")
+        logger.warning("[!] Final Step: Token extraction failed.")
         return False
 
     def logout(self, path="/idm/logout-request"):
         """Logs out from the current IDM session."""
         logout_url = f"{self.host_idm}{path}"
+        # No re-authentication once the session is ended on purpose
+        self.authenticated = False
         # print(f"[*] Attempting logout from {logout_url}...")
 
         headers = {
@@ -189,10 +354,10 @@ class SAMLAuthenticator:
                 # print("[+] Admin logout successful.")
                 return True
             else:
-                print(f"[!] Logout returned status: {resp.status_code}")
+                logger.warning("[!] Logout returned status: %s", resp.status_code)
                 return False
         except Exception as e:
-            print(f"[!] Error during logout: {e}")
+            logger.warning("[!] Error during logout: %s", e)
             # Clear cookies even on error
             self.session.cookies.clear()
             return False
\ No newline at end of file
@@ -0,0 +1,287 @@
+"""
+End-to-end benchmark for the population workflow.
+
+Runs main.py's workflow N times against the configured CP (or a fresh
+in-process cp_simulator per run), breaks each run down per stage and
+reports p50/p95/max wall time and HTTP requests per stage. Results are
+written as JSON so different concurrency settings or versions can be
+compared.
+
+Usage:
+    python benchmark.py --simulator --runs 5 --max-workers 1 4 8
+    python benchmark.py --config config.json --runs 3 --output bench_real.json
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+from auth import register_session_hook, unregister_session_hook
+from utils import load_config
+from workflow import current_task, PASSED, FAILED
+import main as populate
+
+
+# Stages in workflow order; tasks are tagged with one of these in main.build_workflow
+STAGES = ["login", "subscription", "invite", "accept", "registration", "commands",
+          "status_wait", "capability", "deploy", "start"]
+
+
+def percentile(values, pct):
+    """Linear-interpolated percentile of a list of numbers (0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+class RequestCounter:
+    """Counts HTTP responses per workflow stage via a requests response hook."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts = {}
+
+    def reset(self):
+        with self.lock:
+            self.counts = {}
+
+    def _on_response(self, response, *args, **kwargs):
+        task = current_task()
+        stage = task.labels.get('stage', 'other') if task else 'other'
+        with self.lock:
+            self.counts[stage] = self.counts.get(stage, 0) + 1
+        return response
+
+    def session_hook(self, session, authenticator):
+        session.hooks['response'].append(self._on_response)
+
+
+def stage_breakdown(workflows, request_counts):
+    """
+    Per-stage timings for one run.
+
+    Wall time is the span from the first task start to the last task end
+    in the stage (summed across prefixes, which run one after another);
+    busy time is the sum of task durations.
+    """
+    stages = {}
+    for wf in workflows:
+        grouped = {}
+        for task in wf.tasks.values():
+            if task.status not in (PASSED, FAILED) or task.start_time is None:
+                continue
+            grouped.setdefault(task.labels.get('stage', 'other'), []).append(task)
+
+        for name, tasks in grouped.items():
+            entry = stages.setdefault(name, {"wall": 0.0, "busy": 0.0, "tasks": 0, "failed": 0, "requests": 0})
+            entry["wall"] += max(t.end_time for t in tasks) - min(t.start_time for t in tasks)
+            entry["busy"] += sum(t.duration for t in tasks)
+            entry["tasks"] += len(tasks)
+            entry["failed"] += sum(1 for t in tasks if t.status == FAILED)
+
+    for name, count in request_counts.items():
+        stages.setdefault(name, {"wall": 0.0, "busy": 0.0, "tasks": 0, "failed": 0, "requests": 0})["requests"] = count
+    return stages
+
+
+def prepare_config(source_path, run_index, unique_prefixes, sim=None):
+    """
+    Build the configuration for one run and write it to a temp file
+    (accept_invite.py runs as a subprocess and reads the file).
+
+    Returns:
+        tuple: (config dict, temp config path)
+    """
+    fd, path = tempfile.mkstemp(prefix="bench_config_", suffix=".json")
+    os.close(fd)
+    if sim is not None:
+        sim.write_config(source_path, path)
+        config = load_config(path)
+    else:
+        config = load_config(source_path)
+
+    if unique_prefixes:
+        # A fresh subscription and user per run keeps runs comparable (no "already exists" shortcuts)
+        entries = []
+        for entry in config.get('target_prefixes', []):
+            entry = dict(entry) if isinstance(entry, dict) else {"prefix": entry, "user_email": config.get('invite_user_email')}
+            entry['prefix'] = f"{entry['prefix']}r{run_index}"
+            if entry.get('user_email') and '@' in entry['user_email']:
+                local, domain = entry['user_email'].split('@', 1)
+                entry['user_email'] = f"{local}+r{run_index}@{domain}"
+            entries.append(entry)
+        config['target_prefixes'] = entries
+
+    with open(path, 'w') as f:
+        json.dump(config, f, indent=4)
+    return config, path
+
+
+def run_once(args, run_index, max_workers, counter, log_file):
+    """Execute one full workflow run and return its result record."""
+    sim = None
+    if args.simulator:
+        from cp_simulator import CPSimulator
+        sim = CPSimulator(port=0, latency_ms=args.sim_latency_ms, jitter_ms=args.sim_jitter_ms,
+                          dp_green_after=args.sim_dp_green_after,
+                          capability_green_after=args.sim_capability_green_after,
+                          build_seconds=args.sim_build_seconds, error_rate=args.sim_error_rate,
+                          seed=run_index)
+
+    redirect = contextlib.redirect_stdout(log_file) if log_file else contextlib.nullcontext()
+    counter.reset()
+    workflows = []
+    summaries = []
+    start = time.time()
+    try:
+        with redirect:
+            if sim is not None:
+                sim.start()
+            config, config_path = prepare_config(args.config, run_index, not args.no_unique_prefixes, sim)
+            try:
+                for prefix_entry in config.get('target_prefixes', []):
+                    summary, wf = populate.run_prefix(config, prefix_entry, max_workers, config_path)
+                    summaries.append(summary)
+                    workflows.append(wf)
+            finally:
+                os.remove(config_path)
+    except Exception as e:
+        print(f"[!] Run {run_index} raised an error: {e}")
+        import traceback
+        traceback.print_exc()
+    finally:
+        if sim is not None:
+            sim.stop()
+    wall = time.time() - start
+
+    failed_tasks = [name for wf in workflows for name, task in wf.tasks.items() if task.status == FAILED]
+    critical = workflows[0].critical_path() if workflows else ([], 0.0)
+    return {
+        "run": run_index,
+        "max_workers": max_workers,
+        "wall": wall,
+        "success": bool(workflows) and not failed_tasks,
+        "failed_tasks": failed_tasks,
+        "stages": stage_breakdown(workflows, dict(counter.counts)),
+        "critical_path": {"tasks": critical[0], "seconds": critical[1]},
+        "summaries": summaries
+    }
+
+
+def aggregate(runs):
+    """p50/p95/max per stage across runs."""
+    walls = [r["wall"] for r in runs]
+    stage_names = [s for s in STAGES if any(s in r["stages"] for r in runs)]
+    stage_names += sorted({s for r in runs for s in r["stages"]} - set(stage_names))
+
+    stages = {}
+    for name in stage_names:
+        wall = [r["stages"].get(name, {}).get("wall", 0.0) for r in runs]
+        busy = [r["stages"].get(name, {}).get("busy", 0.0) for r in runs]
+        requests = [r["stages"].get(name, {}).get("requests", 0) for r in runs]
+        stages[name] = {
+            "p50": percentile(wall, 50),
+            "p95": percentile(wall, 95),
+            "max": max(wall) if wall else 0.0,
+            "busy_p50": percentile(busy, 50),
+            "requests_p50": percentile(requests, 50),
+            "requests_max": max(requests) if requests else 0
+        }
+
+    return {
+        "runs": len(runs),
+        "successful_runs": sum(1 for r in runs if r["success"]),
+        "wall": {"p50": percentile(walls, 50), "p95": percentile(walls, 95), "max": max(walls) if walls else 0.0},
+        "stages": stages
+    }
+
+
+def print_report(label, summary):
+    print("\n" + "=" * 80)
+    print(f"       BENCHMARK: {label}  ({summary['successful_runs']}/{summary['runs']} runs successful)")
+    print("=" * 80)
+    print(f"{'Stage':<16} | {'p50':>8} | {'p95':>8} | {'max':>8} | {'busy p50':>9} | {'req p50':>8} | {'req max':>8}")
+    print("-" * 80)
+    for name, s in summary["stages"].items():
+        print(f"{name:<16} | {s['p50']:>7.2f}s | {s['p95']:>7.2f}s | {s['max']:>7.2f}s | "
+              f"{s['busy_p50']:>8.2f}s | {s['requests_p50']:>8.0f} | {s['requests_max']:>8}")
+    print("-" * 80)
+    wall = summary["wall"]
+    print(f"{'total wall':<16} | {wall['p50']:>7.2f}s | {wall['p95']:>7.2f}s | {wall['max']:>7.2f}s")
+    print("=" * 80 + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='End-to-end benchmark for the population workflow')
+    parser.add_argument('--config', default='config.json', help='Configuration file (default: config.json)')
+    parser.add_argument('--runs', type=int, default=3, help='Runs per concurrency setting (default: 3)')
+    parser.add_argument('--max-workers', type=int, nargs='+', default=None,
+                        help='One or more concurrency settings to compare (default: workflow_config.max_workers)')
+    parser.add_argument('--output', default='benchmark_results.json', help='JSON results file')
+    parser.add_argument('--log', default='benchmark_runs.log',
+                        help='File receiving workflow output (use "-" to print to the console)')
+    parser.add_argument('--no-unique-prefixes', action='store_true',
+                        help='Reuse the configured prefixes/emails instead of suffixing them per run')
+
+    sim_group = parser.add_argument_group('simulator')
+    sim_group.add_argument('--simulator', action='store_true',
+                           help='Run each iteration against a fresh in-process cp_simulator')
+    sim_group.add_argument('--sim-latency-ms', type=int, default=10)
+    sim_group.add_argument('--sim-jitter-ms', type=int, default=0)
+    sim_group.add_argument('--sim-dp-green-after', type=float, default=2)
+    sim_group.add_argument('--sim-capability-green-after', type=float, default=2)
+    sim_group.add_argument('--sim-build-seconds', type=float, default=1)
+    sim_group.add_argument('--sim-error-rate', type=float, default=0.0)
+
+    args = parser.parse_args()
+
+    worker_settings = args.max_workers or [load_config(args.config).get('workflow_config', {}).get('max_workers', 4)]
+
+    counter = RequestCounter()
+    register_session_hook(counter.session_hook)
+
+    log_file = None if args.log == '-' else open(args.log, 'w')
+    results = {
+        "generated_at": time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        "target": "simulator" if args.simulator else load_config(args.config).get('admin_host'),
+        "settings": {k: v for k, v in vars(args).items()},
+        "runs": [],
+        "summary": {}
+    }
+
+    try:
+        for max_workers in worker_settings:
+            runs = []
+            for run_index in range(1, args.runs + 1):
+                print(f"[*] max_workers={max_workers} run {run_index}/{args.runs}...")
+                record = run_once(args, run_index, max_workers, counter, log_file)
+                state = "ok" if record["success"] else f"FAILED ({', '.join(record['failed_tasks'][:3])})"
+                print(f"    wall {record['wall']:.2f}s - {state}")
+                runs.append(record)
+                results["runs"].append(record)
+
+            label = f"max_workers={max_workers}"
+            results["summary"][label] = aggregate(runs)
+            print_report(label, results["summary"][label])
+    finally:
+        unregister_session_hook(counter.session_hook)
+        if log_file:
+            log_file.close()
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"[+] Results written to {args.output}")
+    if log_file:
+        print(f"[*] Workflow output written to {args.log}")
+
+
+if __name__ == "__main__":
+    main()
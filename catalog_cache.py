@@ -0,0 +1,191 @@
+"""
+On-disk cache for slow-changing CP catalogs.
+
+The BWCE buildtype catalog (/cp/bwce/v1/buildTypes) and the BWCE/Flogo
+capability info lookups (runtime version, base image tag) change maybe once
+a week but were fetched for every provisioning and deploy. CatalogCache
+keeps their JSON bodies in a file shared between runs:
+
+- responses that carried an ETag or Last-Modified header are revalidated
+  with If-None-Match / If-Modified-Since once revalidate_seconds have
+  passed; a 304 keeps the stored body
+- responses without validators are served from disk for ttl_seconds
+
+Version resolution (e.g. the latest available BWCE buildtype) then runs on
+the local copy.
+
+Usage:
+    catalog_cache.configure(config)          # catalog_cache_config in config.json
+    data = catalog_cache.get_json(session, f"{host}/cp/bwce/v1/buildTypes", verify=False)
+"""
+
+import json
+import os
+import re
+import threading
+import time
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_PATH = ".catalog_cache.json"
+DEFAULT_TTL_SECONDS = 24 * 3600
+DEFAULT_REVALIDATE_SECONDS = 300
+# Entries not used for this long are dropped when the file is loaded
+PRUNE_SECONDS = 7 * 24 * 3600
+
+
+class CatalogError(Exception):
+    """A catalog request failed and no cached copy was available."""
+
+    def __init__(self, status_code, url):
+        super().__init__(f"HTTP {status_code} from {url}")
+        self.status_code = status_code
+        self.url = url
+
+
+def version_key(version):
+    """Sort key ordering versions numerically ("6.12.0-HF1" > "6.9.0")."""
+    return [(0, int(part), '') if part.isdigit() else (1, 0, part) for part in re.split(r'[.\-]', str(version))]
+
+
+def latest_version(versions):
+    """Highest version string, or None for an empty list."""
+    versions = [v for v in versions if v]
+    return max(versions, key=version_key) if versions else None
+
+
+class CatalogCache:
+    """Thread-safe JSON response cache persisted to one file."""
+
+    def __init__(self, path=None, ttl=DEFAULT_TTL_SECONDS, revalidate=DEFAULT_REVALIDATE_SECONDS):
+        self.path = path
+        self.ttl = ttl
+        self.revalidate = revalidate
+        self.lock = threading.Lock()
+        self.entries = {}
+        self.stats = {"hits": 0, "revalidated": 0, "fetched": 0}
+        if path:
+            self.load()
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path) as f:
+                entries = json.load(f).get('entries', {})
+            cutoff = time.time() - PRUNE_SECONDS
+            self.entries = {k: e for k, e in entries.items() if e.get('fetched_at', 0) >= cutoff}
+        except (OSError, ValueError) as e:
+            logger.warning("[!] Ignoring unreadable catalog cache %s: %s", self.path, e)
+            self.entries = {}
+
+    def _save(self):
+        # Called with self.lock held
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump({"entries": self.entries}, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning("[!] Could not write catalog cache %s: %s", self.path, e)
+
+    @staticmethod
+    def key(url, params=None):
+        if not params:
+            return url
+        return url + "?" + "&".join(f"{k}={params[k]}" for k in sorted(params))
+
+    def get_json(self, session, url, params=None, ttl=None, **request_kwargs):
+        """
+        Catalog JSON for url, from disk when fresh, otherwise via a (conditional) GET.
+
+        Args:
+            session: requests.Session
+            url (str): Catalog URL
+            params (dict): Query parameters (part of the cache key)
+            ttl (float): Override ttl_seconds for responses without validators
+            **request_kwargs: Passed to session.get (verify, timeout, ...)
+
+        Returns:
+            Parsed JSON body
+
+        Raises:
+            CatalogError: Non-200/304 response
+        """
+        key = self.key(url, params)
+        ttl = self.ttl if ttl is None else ttl
+        with self.lock:
+            entry = self.entries.get(key)
+        now = time.time()
+
+        headers = dict(request_kwargs.pop('headers', None) or {})
+        if entry:
+            age = now - entry['fetched_at']
+            validated = entry.get('etag') or entry.get('last_modified')
+            if age < (self.revalidate if validated else ttl):
+                self.stats["hits"] += 1
+                logger.debug("[DEBUG] Catalog cache hit (%.0fs old): %s", age, key)
+                return entry['body']
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        resp = session.get(url, params=params, headers=headers, **request_kwargs)
+
+        if resp.status_code == 304 and entry:
+            self.stats["revalidated"] += 1
+            logger.debug("[DEBUG] Catalog not modified: %s", key)
+            with self.lock:
+                entry['fetched_at'] = now
+                self._save()
+            return entry['body']
+        if resp.status_code != 200:
+            raise CatalogError(resp.status_code, url)
+
+        body = resp.json()
+        self.stats["fetched"] += 1
+        with self.lock:
+            self.entries[key] = {
+                "fetched_at": now,
+                "etag": resp.headers.get('ETag'),
+                "last_modified": resp.headers.get('Last-Modified'),
+                "body": body
+            }
+            self._save()
+        return body
+
+    def invalidate(self, url=None, params=None):
+        """Drop one entry (or all entries when url is None)."""
+        with self.lock:
+            if url is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(self.key(url, params), None)
+            self._save()
+
+
+# Process-wide cache; in-memory only until configure() gives it a file
+cache = CatalogCache()
+
+
+def get_json(session, url, params=None, ttl=None, **request_kwargs):
+    return cache.get_json(session, url, params, ttl, **request_kwargs)
+
+
+def configure(config):
+    """Apply catalog_cache_config (enabled, path, ttl_seconds, revalidate_seconds)."""
+    catalog_config = (config or {}).get('catalog_cache_config', {})
+    if not catalog_config.get('enabled', True):
+        cache.path = None
+        cache.ttl = cache.revalidate = 0
+        return cache
+    cache.path = catalog_config.get('path', DEFAULT_PATH)
+    cache.ttl = float(catalog_config.get('ttl_seconds', DEFAULT_TTL_SECONDS))
+    cache.revalidate = float(catalog_config.get('revalidate_seconds', DEFAULT_REVALIDATE_SECONDS))
+    cache.load()
+    return cache
@@ -0,0 +1,186 @@
+"""
+Process-wide HTTP connection pools shared by all sessions.
+
+Every SAMLAuthenticator used to mount its own TLSAdapter, so the admin
+host, the tenant host and the IdP were handshaken again for each identity
+and script, and idle keep-alive connections of one session were of no use
+to another. PoolRegistry owns one adapter per scheme whose PoolManager
+keeps a pool per host; SAMLAuthenticator mounts these shared adapters
+(cookies stay per session, only the sockets are shared). prewarm() opens
+connections to a host in a background thread, e.g. to the tenant host
+while its SAML login flow is still running, so the first parallel API
+calls find established connections.
+
+TLS session tickets: urllib3 does not pass an SSL session to new sockets,
+so a *new* connection always does a full handshake. Sharing kept-alive
+connections is what avoids the handshakes; pool_maxsize should therefore
+be at least the number of workers talking to one host.
+
+With connection_pool_config.http2 (and httpx[http2] installed) https://
+traffic goes through http2_transport.HTTP2Adapter instead, multiplexing
+concurrent requests over one connection per host.
+
+Usage:
+    connection_pool.configure(config)        # connection_pool_config in config.json
+    connection_pool.mount(session)
+    connection_pool.prewarm(tenant_host)
+"""
+
+import ssl
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.poolmanager import PoolManager
+
+from logging_config import get_logger
+import http2_transport
+
+logger = get_logger(__name__)
+
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 16
+DEFAULT_PREWARM_CONNECTIONS = 4
+
+
+class SharedAdapter(HTTPAdapter):
+    """HTTPAdapter shared by many sessions; Session.close() must not close its pools."""
+
+    def close(self):
+        pass
+
+    def close_pools(self):
+        super().close()
+
+
+class SharedTLSAdapter(SharedAdapter):
+    """Shared adapter forcing TLS 1.2."""
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        self.poolmanager = PoolManager(
+            num_pools=connections, maxsize=maxsize,
+            block=block, ssl_version=ssl.PROTOCOL_TLSv1_2, **pool_kwargs)
+
+
+class PoolRegistry:
+    """Shared adapters per scheme (pools per host inside) plus background pre-connect."""
+
+    def __init__(self, pool_connections=DEFAULT_POOL_CONNECTIONS, pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                 prewarm_connections=DEFAULT_PREWARM_CONNECTIONS, http2=False):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.prewarm_connections = prewarm_connections
+        self.http2 = http2
+        self.lock = threading.Lock()
+        self.adapters = {}  # 'https://' / 'http://' -> SharedAdapter
+        self.prewarmed = {}  # host -> connections opened by prewarm()
+
+    def adapter(self, prefix='https://'):
+        """The shared adapter for a scheme prefix, created on first use."""
+        with self.lock:
+            adapter = self.adapters.get(prefix)
+            if adapter is None:
+                if prefix == 'https://' and self.http2:
+                    adapter = http2_transport.HTTP2Adapter(max_connections=self.pool_maxsize)
+                else:
+                    cls = SharedTLSAdapter if prefix == 'https://' else SharedAdapter
+                    adapter = cls(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize)
+                self.adapters[prefix] = adapter
+            return adapter
+
+    def mount(self, session):
+        """Mount the shared adapters on a session (before any wrapping adapters)."""
+        for prefix in ('https://', 'http://'):
+            session.mount(prefix, self.adapter(prefix))
+        return session
+
+    def _pool(self, adapter, url):
+        # Pools are keyed like requests keys them for verify=False, so requests reuse these sockets
+        if hasattr(adapter, 'get_connection_with_tls_context'):
+            return adapter.get_connection_with_tls_context(requests.Request('GET', url).prepare(), verify=False)
+        pool = adapter.get_connection(url)
+        adapter.cert_verify(pool, url, False, None)
+        return pool
+
+    def _open(self, host, count):
+        url = host.rstrip('/') + '/'
+        prefix = 'https://' if url.lower().startswith('https://') else 'http://'
+        try:
+            adapter = self.adapter(prefix)
+            if isinstance(adapter, http2_transport.HTTP2Adapter):
+                # One multiplexed connection per host
+                adapter.connect(url)
+                logger.debug("[DEBUG] Pre-connected HTTP/2 transport to %s", host)
+                return
+            pool = self._pool(adapter, url)
+            conns = [pool._get_conn() for _ in range(count)]
+            opened = 0
+            try:
+                for conn in conns:
+                    if getattr(conn, 'sock', None) is None:
+                        conn.connect()
+                        opened += 1
+            finally:
+                for conn in conns:
+                    pool._put_conn(conn)
+            with self.lock:
+                self.prewarmed[host] = self.prewarmed.get(host, 0) + opened
+            logger.debug("[DEBUG] Pre-connected %s connection(s) to %s", opened, host)
+        except Exception as e:
+            logger.debug("[DEBUG] Pre-connect to %s failed: %s", host, e)
+
+    def prewarm(self, host, count=None, background=True):
+        """
+        Open connections to a host ahead of use.
+
+        Args:
+            host (str): Base URL, e.g. https://tenant.cp.example.com
+            count (int): Connections to open (default prewarm_connections, capped at pool_maxsize)
+            background (bool): Open them in a daemon thread and return immediately
+
+        Returns:
+            threading.Thread or None
+        """
+        count = min(self.prewarm_connections if count is None else count, self.pool_maxsize)
+        if not host or count <= 0:
+            return None
+        if not background:
+            self._open(host, count)
+            return None
+        thread = threading.Thread(target=self._open, args=(host, count), name="prewarm", daemon=True)
+        thread.start()
+        return thread
+
+    def close(self):
+        with self.lock:
+            adapters, self.adapters = list(self.adapters.values()), {}
+        for adapter in adapters:
+            adapter.close_pools()
+
+
+# Process-wide registry used by SAMLAuthenticator
+registry = PoolRegistry()
+
+
+def mount(session):
+    return registry.mount(session)
+
+
+def prewarm(host, count=None, background=True):
+    return registry.prewarm(host, count, background)
+
+
+def configure(config):
+    """Apply connection_pool_config (pool_connections, pool_maxsize, prewarm_connections, http2)."""
+    pool_config = (config or {}).get('connection_pool_config', {})
+    registry.pool_connections = int(pool_config.get('pool_connections', DEFAULT_POOL_CONNECTIONS))
+    registry.pool_maxsize = int(pool_config.get('pool_maxsize', DEFAULT_POOL_MAXSIZE))
+    registry.prewarm_connections = int(pool_config.get('prewarm_connections', DEFAULT_PREWARM_CONNECTIONS))
+    registry.http2 = bool(pool_config.get('http2', False))
+    if registry.http2 and not http2_transport.available():
+        logger.warning("[!] connection_pool_config.http2 needs httpx[http2]; using HTTP/1.1")
+        registry.http2 = False
+    if registry.adapters:
+        logger.debug("[DEBUG] connection_pool_config applies to adapters created from now on")
+        registry.close()
+    return registry
@@ -0,0 +1,847 @@
+"""
+Local Control Plane simulator for offline runs and benchmarking.
+
+Implements the subset of CP, IdP and MailDev endpoints used by
+SAMLAuthenticator, TenantService, RestApiDeployer and accept_invite.py,
+with configurable latency, yellow -> green state transitions and error
+injection. Only the standard library is used.
+
+All hosts are served from one port:
+    http://127.0.0.1:<port>                admin host / IdP
+    http://127.0.0.1:<port>/t/<prefix>     tenant host for <prefix>
+    http://127.0.0.1:<port>/maildev        MailDev API
+
+Usage:
+    python cp_simulator.py --port 8080 --write-config config.sim.json
+    python main.py --config config.sim.json
+"""
+
+import argparse
+import base64
+import json
+import random
+import re
+import string
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# Paths that require an authenticated 'tsc' session cookie
+PROTECTED_PREFIXES = ('/cp/v1/', '/cp/api/', '/cp/bwce/', '/cp/flogo/', '/tp-cp-ws/', '/admin/v1/')
+
+DEFAULT_BWCE_VERSIONS = ["6.12.0-HF1", "6.11.0", "6.10.0"]
+DEFAULT_FLOGO_VERSION = "2.26.1-b357"
+
+
+def _new_id(length=20):
+    return ''.join(random.choices(string.ascii_lowercase + string.digits, k=length))
+
+
+class SimRequest:
+    """Parsed view of an incoming request passed to route handlers."""
+
+    def __init__(self, method, raw_path, headers, body, host):
+        self.method = method
+        self.headers = headers
+        self.body = body
+
+        parts = urllib.parse.urlsplit(raw_path)
+        self.query = {k: v[0] for k, v in urllib.parse.parse_qs(parts.query, keep_blank_values=True).items()}
+        path = parts.path
+
+        self.admin_base = f"http://{host}"
+        self.tenant = "admin"
+        self.base = self.admin_base
+        self.maildev = False
+
+        match = re.match(r'^/t/([^/]+)(/.*)?$', path)
+        if match:
+            self.tenant = match.group(1).lower()
+            self.base = f"{self.admin_base}/t/{match.group(1)}"
+            path = match.group(2) or '/'
+        elif path == '/maildev' or path.startswith('/maildev/'):
+            self.maildev = True
+            path = path[len('/maildev'):] or '/'
+        self.path = path
+
+        self.cookies = {}
+        for chunk in (headers.get('Cookie') or '').split(';'):
+            if '=' in chunk:
+                name, value = chunk.strip().split('=', 1)
+                self.cookies[name] = value
+
+    @property
+    def json(self):
+        try:
+            return json.loads(self.body.decode('utf-8')) if self.body else {}
+        except ValueError:
+            return {}
+
+    @property
+    def form(self):
+        parsed = urllib.parse.parse_qs(self.body.decode('utf-8', 'replace'), keep_blank_values=True)
+        return {k: v[0] for k, v in parsed.items()}
+
+
+def json_response(data, status=200, headers=None):
+    return status, dict(headers or {}, **{'Content-Type': 'application/json'}), json.dumps(data).encode()
+
+
+def html_response(html, status=200, headers=None):
+    return status, dict(headers or {}, **{'Content-Type': 'text/html; charset=utf-8'}), html.encode()
+
+
+def redirect(location, headers=None):
+    return 302, dict(headers or {}, Location=location), b''
+
+
+def auto_post_form(action, fields, title="Continue"):
+    inputs = "\n".join(
+        f'<input type="hidden" name="{name}" value="{value}"/>' for name, value in fields.items())
+    return f"""<html><head><title>{title}</title></head><body>
+<form method="post" action="{action}">
+{inputs}
+<input type="submit" value="{title}"/>
+</form></body></html>"""
+
+
+class CPSimulator:
+    """
+    In-memory Control Plane state plus the HTTP server that exposes it.
+
+    Usage:
+        sim = CPSimulator(port=8080, latency_ms=20, dp_green_after=5)
+        sim.start()          # background thread
+        ...
+        sim.stop()
+    """
+
+    def __init__(self, host='127.0.0.1', port=8080, latency_ms=0, jitter_ms=0,
+                 dp_green_after=10, capability_green_after=10, build_seconds=5,
+                 error_rate=0.0, error_paths=None, error_status=503, seed=None):
+        """
+        Args:
+            host (str): Interface to bind
+            port (int): Port to bind (0 picks a free port)
+            latency_ms (int): Fixed delay added to every response
+            jitter_ms (int): Random extra delay (0..jitter_ms) added to every response
+            dp_green_after (float): Seconds after registration before a dataplane turns green
+            capability_green_after (float): Seconds after provisioning before a capability turns green
+            build_seconds (float): Seconds before an app build reports success
+            error_rate (float): Probability (0..1) of answering an API call with error_status
+            error_paths (str): Regex restricting error injection to matching paths (default: all API paths)
+            error_status (int): HTTP status returned for injected errors
+            seed (int): Random seed for reproducible error injection and jitter
+        """
+        self.host = host
+        self.port = port
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.dp_green_after = dp_green_after
+        self.capability_green_after = capability_green_after
+        self.build_seconds = build_seconds
+        self.error_rate = error_rate
+        self.error_paths = re.compile(error_paths) if error_paths else None
+        self.error_status = error_status
+        self.rng = random.Random(seed)
+
+        self.lock = threading.Lock()
+        self.sessions = {}          # tsc cookie -> {"user": ..., "tenant": ...}
+        self.idp_sessions = {}      # idp cookie -> user
+        self.users = {}             # email -> {"password": ..., "status": ..., ...}
+        self.invites = {}           # invite id -> email
+        self.reset_tokens = {}      # token -> email
+        self.emails = []
+        self.tenants = {}
+        self.stats = {"requests": 0, "injected_errors": 0, "by_route": {}}
+
+        self.server = None
+        self.thread = None
+        self.routes = self._build_routes()
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def tenant_host_template(self):
+        return f"{self.base_url}/t/{{prefix}}"
+
+    def maildev_url(self):
+        return f"{self.base_url}/maildev"
+
+    def start(self):
+        """Start serving on a background daemon thread."""
+        simulator = self
+
+        class Handler(SimHandler):
+            sim = simulator
+
+        self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self.thread = threading.Thread(target=self.server.serve_forever, name="cp-simulator", daemon=True)
+        self.thread.start()
+        print(f"[+] CP simulator listening on {self.base_url}")
+        return self
+
+    def serve_forever(self):
+        self.start()
+        try:
+            while self.thread.is_alive():
+                self.thread.join(1)
+        except KeyboardInterrupt:
+            print("\n[*] Stopping CP simulator...")
+        finally:
+            self.stop()
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def write_config(self, source_path, target_path):
+        """
+        Write a copy of source_path pointing every host at this simulator,
+        with short polling intervals suitable for local runs.
+        """
+        with open(source_path, 'r') as f:
+            config = json.load(f)
+
+        config['admin_host'] = self.base_url
+        config['idp_host'] = self.base_url
+        config['tenant_host_template'] = self.tenant_host_template()
+        config['maildev_url'] = self.maildev_url()
+
+        poll = max(1, int(min(self.dp_green_after, self.capability_green_after) / 2) or 1)
+        config.setdefault('dataplane_status_check', {})['poll_interval_seconds'] = poll
+        capability_check = config.setdefault('combined_capability_status_check', {})
+        capability_check['initial_wait_seconds'] = 0
+        capability_check['poll_interval_seconds'] = poll
+        # The simulator activates users immediately; no need for the real-CP grace periods
+        config['wait_config'] = {
+            "user_activation_seconds": 0,
+            "permission_propagation_seconds": 0,
+            "login_retry_base_seconds": 1
+        }
+
+        with open(target_path, 'w') as f:
+            json.dump(config, f, indent=4)
+        print(f"[+] Simulator config written to {target_path}")
+
+    # ------------------------------------------------------------------
+    # Request dispatch
+    # ------------------------------------------------------------------
+
+    def _build_routes(self):
+        routes = [
+            # SAML / IdM
+            ('GET', r'^/admin/login$', self.landing),
+            ('GET', r'^/cp/login$', self.landing),
+            ('GET', r'^/idm/landing$', self.landing_page),
+            ('GET', r'^/idm/v1/login-saml$', self.login_saml),
+            ('POST', r'^/idp/sso$', self.idp_sso),
+            ('POST', r'^/idp/login$', self.idp_login),
+            ('POST', r'^/idm/v1/saml-acs$', self.saml_acs),
+            ('POST', r'^/idm/v1/cookie$', self.idm_cookie),
+            ('POST', r'^/idm/logout-request$', self.logout),
+            ('POST', r'^/idm/v1/reauthorize$', self.reauthorize),
+            ('GET', r'^/$', self.home_page),
+            ('GET', r'^/cp/app/.*$', self.home_page),
+
+            # Registration
+            ('GET', r'^/cp/accept-invites/(?P<invite_id>[^/]+)$', self.accept_invite_link),
+            ('GET', r'^/admin/reset-password/(?P<token>.+)$', self.home_page),
+            ('POST', r'^/idp/v1/reset-password$', self.reset_password),
+            ('PUT', r'^/cp/v1/accept-invitation/?$', self.accept_invitation),
+
+            # Admin / users
+            ('POST', r'^/admin/v1/cpass-subscriptions$', self.create_subscription),
+            ('GET', r'^/cp/v1/account/users$', self.list_users),
+            ('PUT', r'^/cp/v1/invite/members$', self.invite_members),
+
+            # Dataplanes and resources
+            ('POST', r'^/cp/v1/data-planes$', self.register_dataplane),
+            ('GET', r'^/cp/v1/data-planes-status$', self.dataplanes_status),
+            ('GET', r'^/cp/v1/data-planes/capabilities-status$', self.dataplanes_status),
+            ('GET', r'^/cp/v1/data-planes/(?P<dp_id>[^/]+)/capabilities-status$', self.dataplanes_status),
+            ('GET', r'^/cp/v1/resource-instances-details$', self.list_resources),
+            ('POST', r'^/cp/v1/resource-instances$', self.create_resource),
+            ('POST', r'^/cp/api/v1/resources/instances/ACTIVATION_SERVER$', self.create_activation_server),
+            ('PUT', r'^/cp/api/v1/data-planes/(?P<dp_id>[^/]+)/resource-association$', self.associate_resource),
+            ('POST', r'^/cp/api/v1/data-planes/(?P<dp_id>[^/]+)/capabilities/(?P<capability>[A-Z]+)$',
+             self.provision_capability),
+
+            # Apps
+            ('POST', r'^/cp/(?P<kind>bwce|flogo)/v1/files/store$', self.store_file),
+            ('GET', r'^/cp/bwce/v1/buildTypes$', self.bwce_catalog),
+            ('*', r'^/(?:cp/bwce/v1|cp/v1|tp-cp-ws/v1)/data-planes/(?P<dp_id>[^/]+)/dp-resource$', self.dp_resource),
+
+            # MailDev
+            ('GET', r'^/email$', self.maildev_list),
+            ('PATCH', r'^/email/read-all$', self.maildev_read_all),
+        ]
+        return [(method, re.compile(pattern), handler) for method, pattern, handler in routes]
+
+    def handle(self, req):
+        """Dispatch a request. Returns (status, headers, body)."""
+        delay = self.latency_ms + (self.rng.uniform(0, self.jitter_ms) if self.jitter_ms else 0)
+        if delay:
+            time.sleep(delay / 1000.0)
+
+        for method, pattern, handler in self.routes:
+            if method not in ('*', req.method):
+                continue
+            if (req.maildev) != (handler in (self.maildev_list, self.maildev_read_all)):
+                continue
+            match = pattern.match(req.path)
+            if not match:
+                continue
+
+            route = f"{req.method} {pattern.pattern}"
+            with self.lock:
+                self.stats["requests"] += 1
+                self.stats["by_route"][route] = self.stats["by_route"].get(route, 0) + 1
+
+            is_api = req.path.startswith(PROTECTED_PREFIXES)
+            if is_api and req.cookies.get('tsc') not in self.sessions:
+                return json_response({"status": "fail", "message": "Unauthorized"}, status=401)
+
+            if is_api and self.error_rate and (self.error_paths is None or self.error_paths.search(req.path)):
+                if self.rng.random() < self.error_rate:
+                    with self.lock:
+                        self.stats["injected_errors"] += 1
+                    return json_response({"status": "fail", "message": "Injected failure"}, status=self.error_status)
+
+            return handler(req, **match.groupdict())
+
+        return json_response({"status": "fail", "message": f"No route for {req.method} {req.path}"}, status=404)
+
+    def _tenant(self, name):
+        with self.lock:
+            if name not in self.tenants:
+                self.tenants[name] = {
+                    "dataplanes": {},
+                    "resources": [],
+                    "capabilities": {},
+                    "buildtypes": {},
+                    "builds": {},
+                    "apps": {},
+                    "artifacts": {},
+                    "files": {}
+                }
+            return self.tenants[name]
+
+    # ------------------------------------------------------------------
+    # SAML login flow
+    # ------------------------------------------------------------------
+
+    def landing(self, req):
+        state = {"resumeURL": f"{req.base}/cp/app/home", "tenantId": "TSC" if req.tenant != "admin" else "ADMIN", "xidp": "ta"}
+        relay_state = base64.b64encode(json.dumps(state, separators=(',', ':')).encode()).decode()
+        return redirect(f"{req.base}/idm/landing?relayState={urllib.parse.quote(relay_state)}")
+
+    def landing_page(self, req):
+        return html_response("<html><body><h1>Sign in</h1></body></html>")
+
+    def home_page(self, req, **kwargs):
+        return html_response("<html><body><h1>TIBCO Platform (simulated)</h1></body></html>")
+
+    def login_saml(self, req):
+        saml_request = base64.b64encode(f"<AuthnRequest ID='{_new_id()}'/>".encode()).decode()
+        fields = {
+            "SAMLRequest": saml_request,
+            "RelayState": req.query.get('relayState', ''),
+            "acs": f"{req.base}/idm/v1/saml-acs"
+        }
+        return html_response(auto_post_form(f"{req.admin_base}/idp/sso", fields))
+
+    def _saml_response_form(self, req, user, relay_state, acs):
+        assertion = base64.b64encode(f"<Response><NameID>{user}</NameID></Response>".encode()).decode()
+        return auto_post_form(acs, {"SAMLResponse": assertion, "RelayState": relay_state})
+
+    def idp_sso(self, req):
+        form = req.form
+        user = self.idp_sessions.get(req.cookies.get('idp_session'))
+        if user:
+            return html_response(self._saml_response_form(req, user, form.get('RelayState', ''), form.get('acs', '')))
+
+        fields = {
+            "username": "",
+            "password": "",
+            "RelayState": form.get('RelayState', ''),
+            "acs": form.get('acs', '')
+        }
+        return html_response(auto_post_form(f"{req.admin_base}/idp/login", fields, title="Sign in"))
+
+    def idp_login(self, req):
+        form = req.form
+        username = form.get('username', '')
+        password = form.get('password', '')
+
+        with self.lock:
+            user = self.users.get(username)
+        # Unknown users are treated as pre-provisioned accounts; invited users must register first
+        if not username or (user and (user.get('status') != 'active' or user.get('password') not in (None, password))):
+            return html_response("<html><body><p>Invalid credentials</p></body></html>", status=401)
+
+        idp_cookie = _new_id(32)
+        with self.lock:
+            self.idp_sessions[idp_cookie] = username
+        headers = {'Set-Cookie': f"idp_session={idp_cookie}; Path=/idp; HttpOnly"}
+        return html_response(self._saml_response_form(req, username, form.get('RelayState', ''), form.get('acs', '')),
+                             headers=headers)
+
+    def saml_acs(self, req):
+        form = req.form
+        try:
+            assertion = base64.b64decode(form.get('SAMLResponse', '')).decode()
+            user = re.search(r'<NameID>(.*?)</NameID>', assertion).group(1)
+        except Exception:
+            return redirect(f"{req.base}/tsc/error/?code=SAML-INVALID")
+
+        token = _new_id(32)
+        with self.lock:
+            self.sessions[token] = {"user": user, "tenant": req.tenant}
+            # Pre-provisioned accounts become active members of every tenant they sign in to
+            account = self.users.setdefault(user, {"status": "active", "password": None, "tenants": [],
+                                                    "firstName": "TIBCO", "lastName": "Platform", "roles": ["OWNER"]})
+            if req.tenant not in account['tenants']:
+                account['tenants'].append(req.tenant)
+        headers = {'Set-Cookie': f"tsc={token}; Path=/"}
+        return redirect(f"{req.base}/cp/app/home?token={token}", headers=headers)
+
+    def idm_cookie(self, req):
+        token = req.form.get('token', '')
+        if token not in self.sessions:
+            return json_response({"status": "fail", "message": "Invalid token"}, status=401)
+        return json_response({"status": "success"}, headers={'Set-Cookie': f"tsc={token}; Path=/"})
+
+    def logout(self, req):
+        with self.lock:
+            self.sessions.pop(req.cookies.get('tsc'), None)
+            self.idp_sessions.pop(req.cookies.get('idp_session'), None)
+        return redirect(f"{req.base}/", headers={'Set-Cookie': "tsc=; Path=/; Max-Age=0"})
+
+    def reauthorize(self, req):
+        return redirect(req.form.get('resumeURL') or f"{req.base}/cp/app/home")
+
+    # ------------------------------------------------------------------
+    # Users, invites and registration
+    # ------------------------------------------------------------------
+
+    def create_subscription(self, req):
+        prefix = (req.json.get('accountDetails', {}).get('hostPrefix') or '').lower()
+        with self.lock:
+            exists = prefix in self.tenants
+        if exists:
+            return json_response({"status": "fail", "message": f"Subscription {prefix} already exists"}, status=409)
+        self._tenant(prefix)
+        return json_response({"status": "success", "subscriptionId": _new_id()}, status=201)
+
+    def list_users(self, req):
+        with self.lock:
+            users = [dict(email=email, firstName=u.get('firstName', ''), lastName=u.get('lastName', ''),
+                          roles=[{"roleId": r} for r in u.get('roles', [])])
+                     for email, u in self.users.items()
+                     if u.get('status') == 'active' and req.tenant in u.get('tenants', [])]
+        page = int(req.query.get('page') or 1)
+        limit = int(req.query.get('limit') or 20)
+        start = (page - 1) * limit
+        return json_response({"users": users[start:start + limit], "totalUsers": len(users),
+                              "page": page, "limit": limit})
+
+    def invite_members(self, req):
+        body = req.json
+        roles = [p.get('roleId') for p in body.get('permissions', [])]
+        for email in body.get('emails', []):
+            invite_id = _new_id()
+            with self.lock:
+                user = self.users.setdefault(email, {"status": "invited", "tenants": []})
+                if req.tenant not in user['tenants']:
+                    user['tenants'].append(req.tenant)
+                user['roles'] = roles
+                self.invites[invite_id] = email
+                self.emails.append({
+                    "id": _new_id(8),
+                    "subject": "You have been invited to TIBCO Platform",
+                    "to": [{"address": email, "name": ""}],
+                    "html": f'<p>Click <a href="{req.base}/cp/accept-invites/{invite_id}">here</a> to accept.</p>',
+                    "read": False,
+                    "time": time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+                })
+        return json_response({"status": "success", "message": "Invitation sent"})
+
+    def accept_invite_link(self, req, invite_id):
+        with self.lock:
+            email = self.invites.get(invite_id)
+            if email:
+                token = _new_id(32)
+                self.reset_tokens[token] = email
+        if not email:
+            return html_response("<html><body>Invite not found</body></html>", status=404)
+        return redirect(f"{req.admin_base}/admin/reset-password/{token}|{email}|invite")
+
+    def reset_password(self, req):
+        form = req.form
+        with self.lock:
+            email = self.reset_tokens.pop(form.get('userPasswordToken', ''), None)
+            if not email or email != form.get('email'):
+                return json_response({"status": "fail", "message": "Invalid or expired token"}, status=400)
+            user = self.users[email]
+            user.update(status="active", password=form.get('password', ''),
+                        firstName=form.get('firstName', ''), lastName=form.get('lastName', ''))
+        return json_response({"status": "success", "message": "Password set successfully"})
+
+    def accept_invitation(self, req):
+        return json_response({"status": "success", "message": "Successfully accepted the invitation"})
+
+    # ------------------------------------------------------------------
+    # Dataplanes, capabilities and resources
+    # ------------------------------------------------------------------
+
+    def _status_for(self, created_at, green_after):
+        return "green" if time.time() - created_at >= green_after else "yellow"
+
+    def register_dataplane(self, req):
+        body = req.json
+        tenant = self._tenant(req.tenant)
+        dp_id = _new_id()
+        now = time.time()
+        with self.lock:
+            tenant['dataplanes'][dp_id] = {
+                "dp_id": dp_id,
+                "name": body.get('name', dp_id),
+                "namespace": body.get('namespace', 'default'),
+                "created_at": now,
+                "resources": []
+            }
+            core_id = _new_id()
+            tenant['capabilities'][core_id] = {
+                "dp_id": dp_id, "capability": "INTEGRATIONCORE", "capability_type": "platform",
+                "created_at": now, "services": ["artifactmanager"]
+            }
+
+        namespace = body.get('namespace', 'default')
+        commands = [
+            {"cmd": f"echo 'kubectl create namespace {namespace} (simulated)'"},
+            {"cmd": f"echo 'helm upgrade --install -n {namespace} dp-configure-namespace (simulated)'"},
+            {"cmd": f"echo 'helm upgrade --install -n {namespace} dp-core-infrastructure (simulated)'"}
+        ]
+        return json_response({"status": "success", "dp_id": dp_id, "commands": commands}, status=201)
+
+    def dataplanes_status(self, req, dp_id=None):
+        tenant = self._tenant(req.tenant)
+        with self.lock:
+            dataplanes = [dp for dp in tenant['dataplanes'].values() if dp_id is None or dp['dp_id'] == dp_id]
+            capabilities = list(tenant['capabilities'].items())
+
+        result = []
+        for dp in dataplanes:
+            dp_status = self._status_for(dp['created_at'], self.dp_green_after)
+            caps = []
+            for cap_id, cap in capabilities:
+                if cap['dp_id'] != dp['dp_id']:
+                    continue
+                if cap['capability'] == 'INTEGRATIONCORE':
+                    cap_status = dp_status
+                else:
+                    cap_status = self._status_for(cap['created_at'], self.capability_green_after)
+                caps.append({
+                    "capability": cap['capability'],
+                    "capability_instance_id": cap_id,
+                    "capability_type": cap['capability_type'],
+                    "status": cap_status,
+                    "services": [{"name": name, "status": cap_status} for name in cap['services']]
+                })
+            result.append({
+                "dp_id": dp['dp_id'],
+                "dp_name": dp['name'],
+                "status": dp_status,
+                "tibtunnel_connected": dp_status == "green",
+                "message": "" if dp_status == "green" else "Waiting for tibtunnel to connect",
+                "capabilities": caps
+            })
+        return json_response({"dataplanes": result})
+
+    def list_resources(self, req):
+        tenant = self._tenant(req.tenant)
+        scope = req.query.get('scope')
+        resource_id = req.query.get('resourceId')
+        dp_id = req.query.get('dataPlaneId')
+
+        if scope == 'SUBSCRIPTION' and resource_id == 'HELMREPO':
+            return json_response({"data": [{
+                "resource_instance_id": "helm-default",
+                "resource_instance_name": "tibco-platform",
+                "resource_id": "HELMREPO"
+            }]})
+
+        with self.lock:
+            data = [r for r in tenant['resources']
+                    if (not scope or r['scope'] == scope)
+                    and (not resource_id or r['resource_id'] == resource_id)
+                    and (not dp_id or r['scope_id'] == dp_id)]
+        return json_response({"data": data})
+
+    def create_resource(self, req):
+        body = req.json
+        payload = body.get('payload', {})
+        tenant = self._tenant(req.tenant)
+        resource = {
+            "resource_instance_id": _new_id(),
+            "resource_instance_name": payload.get('resourceInstanceName', ''),
+            "resource_id": body.get('resourceId'),
+            "scope": payload.get('scope', 'DATAPLANE'),
+            "scope_id": payload.get('scopeId', ''),
+            "resource_instance_metadata": payload.get('resourceInstanceMetadata', {})
+        }
+        with self.lock:
+            duplicate = any(r['resource_instance_name'] == resource['resource_instance_name']
+                            and r['resource_id'] == resource['resource_id']
+                            and r['scope_id'] == resource['scope_id'] for r in tenant['resources'])
+            if not duplicate:
+                tenant['resources'].append(resource)
+        if duplicate:
+            return json_response({"status": "fail", "message": "Resource instance name already exists"}, status=409)
+        return json_response({"status": "success", "resource_instance_id": resource['resource_instance_id']}, status=201)
+
+    def create_activation_server(self, req):
+        body = req.json
+        tenant = self._tenant(req.tenant)
+        resource = {
+            "resource_instance_id": _new_id(),
+            "resource_instance_name": body.get('name', ''),
+            "resource_id": "ACTIVATION_SERVER",
+            "scope": "SUBSCRIPTION",
+            "scope_id": "",
+            "resource_instance_metadata": {"fields": [{"key": "url", "value": body.get('url', '')}]}
+        }
+        with self.lock:
+            tenant['resources'].append(resource)
+        return json_response({"status": "success",
+                              "response": {"resource_instance_id": resource['resource_instance_id']}}, status=201)
+
+    def associate_resource(self, req, dp_id):
+        tenant = self._tenant(req.tenant)
+        with self.lock:
+            dp = tenant['dataplanes'].get(dp_id)
+            if dp is None:
+                return json_response({"status": "fail", "message": "Dataplane not found"}, status=404)
+            dp['resources'].append(req.json.get('resource-instance-id'))
+        return json_response({"status": "success", "response": {"message": "Resource linked successfully"}})
+
+    def provision_capability(self, req, dp_id, capability):
+        tenant = self._tenant(req.tenant)
+        services = {"BWCE": ["bwprovisioner"], "FLOGO": ["flogoprovisioner"]}.get(capability, [capability.lower()])
+        with self.lock:
+            if dp_id not in tenant['dataplanes']:
+                return json_response({"status": "fail", "message": "Dataplane not found"}, status=404)
+            existing = [cid for cid, cap in tenant['capabilities'].items()
+                        if cap['dp_id'] == dp_id and cap['capability'] == capability]
+            if existing:
+                return json_response({"status": "fail", "message": f"{capability} capability already provisioned"},
+                                     status=409)
+            cap_id = _new_id()
+            tenant['capabilities'][cap_id] = {
+                "dp_id": dp_id, "capability": capability, "capability_type": "infra",
+                "created_at": time.time(), "services": services
+            }
+        return json_response({"status": "success", "response": {"capabilityInstanceId": cap_id}})
+
+    # ------------------------------------------------------------------
+    # Files, buildtypes, builds and apps (dp-resource proxy)
+    # ------------------------------------------------------------------
+
+    def store_file(self, req, kind):
+        match = re.search(rb'filename="([^"]+)"', req.body)
+        file_name = match.group(1).decode() if match else f"{_new_id(8)}.bin"
+        tenant = self._tenant(req.tenant)
+        stored = f"{_new_id(12)}/{file_name}"
+        with self.lock:
+            tenant['files'][stored] = len(req.body)
+        return json_response({"fileName": stored}, status=201)
+
+    def bwce_catalog(self, req):
+        return json_response({"data": [{"version": v} for v in DEFAULT_BWCE_VERSIONS]})
+
+    def dp_resource(self, req, dp_id):
+        tenant = self._tenant(req.tenant)
+        body = req.json if req.method != 'GET' else {}
+        inner = body.get('path') or req.query.get('path', '')
+        inner_path = inner.split('?', 1)[0]
+
+        match = re.match(r'^/tibco/agent/integration/(?P<cap_id>[^/]+)/(?P<service>[^/]+)(?:/private)?/v1/(?:dp/)?(?P<rest>.*)$',
+                         inner_path)
+        if not match:
+            return json_response({"status": "fail", "message": f"Unknown dp-resource path: {inner}"}, status=404)
+
+        cap_id = match.group('cap_id')
+        service = match.group('service')
+        rest = match.group('rest')
+        payload = body.get('payload', {})
+
+        with self.lock:
+            cap = tenant['capabilities'].get(cap_id)
+        if cap is None or cap['dp_id'] != dp_id:
+            return json_response({"status": "fail", "message": "Capability instance not found"}, status=404)
+
+        if service == 'artifactmanager':
+            return self._artifacts(req, tenant, dp_id, payload)
+
+        kind = 'bw' if service == 'bwprovisioner' else 'flogo'
+        rest = rest[len(kind) + 1:] if rest.startswith(kind + '/') else rest
+
+        buildtype = re.match(r'^buildtype(?:/(?P<version>[^/]+))?$', rest)
+        if buildtype:
+            return self._buildtype(req, tenant, cap_id, kind, buildtype.group('version'), payload)
+        if rest == 'info':
+            version = DEFAULT_BWCE_VERSIONS[0] if kind == 'bw' else DEFAULT_FLOGO_VERSION.split('-')[0]
+            return json_response({"version": version, "capabilityInstanceId": cap_id})
+        if rest == 'builds' and req.method == 'POST':
+            build_id = _new_id()
+            with self.lock:
+                tenant['builds'][build_id] = {"created_at": time.time(), "name": payload.get('buildName', '')}
+            return json_response({"buildId": build_id, "status": "inprogress"}, status=202)
+        build_status = re.match(r'^builds/(?P<build_id>[^/]+)/status$', rest)
+        if build_status:
+            with self.lock:
+                build = tenant['builds'].get(build_status.group('build_id'))
+            if build is None:
+                return json_response({"status": "fail", "message": "Build not found"}, status=404)
+            done = time.time() - build['created_at'] >= self.build_seconds
+            return json_response({"status": "success" if done else "inprogress"})
+        if rest == 'deploy' and req.method == 'POST':
+            app_id = _new_id()
+            with self.lock:
+                tenant['apps'][app_id] = {"name": payload.get('appName', ''), "build_id": payload.get('buildId'),
+                                          "namespace": body.get('queryParams', {}).get('namespace'), "replicas": 0}
+            return json_response({"appId": app_id, "status": "success"}, status=202)
+        scale = re.match(r'^apps/(?P<app_id>[^/]+)/scale$', rest)
+        if scale:
+            count = urllib.parse.parse_qs(inner.split('?', 1)[1] if '?' in inner else '').get('count', ['1'])[0]
+            with self.lock:
+                app = tenant['apps'].get(scale.group('app_id'))
+                if app is not None:
+                    app['replicas'] = int(count)
+            if app is None:
+                return json_response({"status": "fail", "message": "App not found"}, status=404)
+            return json_response({"status": "success", "message": f"Scaled to {count}", "code": 200})
+
+        return json_response({"status": "fail", "message": f"Unsupported dp-resource path: {inner}"}, status=404)
+
+    def _buildtype(self, req, tenant, cap_id, kind, version, payload):
+        with self.lock:
+            provisioned = tenant['buildtypes'].setdefault(cap_id, [])
+            if req.method == 'GET':
+                catalog = [{"buildtypeTag": v, "baseImages": [{"imageTag": f"{v}-base"}]} for v in provisioned]
+                return json_response({"totalBuildtypes": len(catalog), "buildtypeCatalog": catalog})
+
+            version = version or payload.get('buildTypeVersion') or (
+                DEFAULT_BWCE_VERSIONS[0] if kind == 'bw' else DEFAULT_FLOGO_VERSION)
+            if version not in provisioned:
+                provisioned.append(version)
+        return json_response({"status": "success", "message": f"Buildtype {version} provisioned successfully"})
+
+    def _artifacts(self, req, tenant, dp_id, payload):
+        with self.lock:
+            artifacts = tenant['artifacts'].setdefault(dp_id, {})
+            if req.method == 'GET':
+                return json_response({"artifacts": list(artifacts.values())})
+            for artifact in payload.get('artifacts', []):
+                artifacts[f"{artifact.get('name')}:{artifact.get('version')}"] = artifact
+        return json_response({"status": "success", "message": "Artifacts provisioned"})
+
+    # ------------------------------------------------------------------
+    # MailDev
+    # ------------------------------------------------------------------
+
+    def maildev_list(self, req):
+        with self.lock:
+            return json_response(list(self.emails))
+
+    def maildev_read_all(self, req):
+        with self.lock:
+            for mail in self.emails:
+                mail['read'] = True
+        return json_response({"status": "success"})
+
+
+class SimHandler(BaseHTTPRequestHandler):
+    """HTTP/1.1 keep-alive handler delegating to CPSimulator.handle."""
+
+    protocol_version = "HTTP/1.1"
+    sim = None
+    server_verbose = False
+
+    def _dispatch(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        host = self.headers.get('Host') or f"{self.sim.host}:{self.sim.port}"
+        req = SimRequest(self.command, self.path, self.headers, body, host)
+
+        try:
+            status, headers, payload = self.sim.handle(req)
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            status, headers, payload = json_response({"status": "fail", "message": str(e)}, status=500)
+
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(payload)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = _dispatch
+
+    def log_message(self, format, *args):
+        if self.server_verbose:
+            super().log_message(format, *args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local Control Plane simulator')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to bind (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8080, help='Port to bind (default: 8080)')
+    parser.add_argument('--latency-ms', type=int, default=0, help='Fixed latency added to every response')
+    parser.add_argument('--jitter-ms', type=int, default=0, help='Random extra latency (0..N ms)')
+    parser.add_argument('--dp-green-after', type=float, default=10,
+                        help='Seconds before a registered dataplane turns green (default: 10)')
+    parser.add_argument('--capability-green-after', type=float, default=10,
+                        help='Seconds before a provisioned capability turns green (default: 10)')
+    parser.add_argument('--build-seconds', type=float, default=5,
+                        help='Seconds before an app build completes (default: 5)')
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help='Probability (0..1) of injecting an error into an API call')
+    parser.add_argument('--error-paths', default=None,
+                        help='Regex limiting error injection to matching API paths')
+    parser.add_argument('--error-status', type=int, default=503, help='HTTP status for injected errors')
+    parser.add_argument('--seed', type=int, default=None, help='Random seed for reproducible runs')
+    parser.add_argument('--write-config', metavar='PATH', default=None,
+                        help='Write a copy of --config pointing at this simulator')
+    parser.add_argument('--config', default='config.json', help='Source configuration for --write-config')
+    parser.add_argument('--verbose', action='store_true', help='Log every request')
+
+    args = parser.parse_args()
+    SimHandler.server_verbose = args.verbose
+
+    sim = CPSimulator(host=args.host, port=args.port, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                      dp_green_after=args.dp_green_after, capability_green_after=args.capability_green_after,
+                      build_seconds=args.build_seconds, error_rate=args.error_rate,
+                      error_paths=args.error_paths, error_status=args.error_status, seed=args.seed)
+    if args.write_config:
+        sim.write_config(args.config, args.write_config)
+    sim.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -10,20 +10,30 @@ Prerequisites:
   - BWCE and/or Flogo capabilities are provisioned and green
 """
 
+import argparse
 import json
 import sys
+import har_replay
+import tracing
+import metrics
+import catalog_cache
+import flogo_connectors
+import relay_resolver
+import connection_pool
+import rate_limit
+import logging_config
 from auth import SAMLAuthenticator
 from services import TenantService
-from utils import generate_tenant_relay_state
+from utils import generate_tenant_relay_state, get_tenant_host
 from deploy_rest_api import RestApiDeployer
 
-def main():
+def main(config_path='config.json'):
     # Load configuration
-    with open('config.json', 'r') as f:
+    with open(config_path, 'r') as f:
         config = json.load(f)
 
-    tenant_host = f"https://{config['target_prefix']}.cp1-my.localhost.dataplanes.pro"
     target_prefix = config['target_prefix']
+    tenant_host = get_tenant_host(config, target_prefix)
     invite_user_email = config.get('invite_user_email')
     user_password = config.get('new_user_details', {}).get('password')
 
@@ -54,14 +64,10 @@ def main():
 
     try:
         auth = SAMLAuthenticator(tenant_host, invite_user_email, user_password)
+        connection_pool.prewarm(tenant_host)
 
-        print("[*] Login attempt 1/3...")
-        login_success = auth.run_login_flow()
-
-        if not login_success:
-            print("[*] Dynamic RelayState failed. Using generated state...")
-            relay_state = generate_tenant_relay_state(target_prefix)
-            login_success = auth.run_login_flow(relay_state)
+        print("[*] Logging in...")
+        login_success = relay_resolver.login(auth, generate_tenant_relay_state(target_prefix, tenant_host), "tenant")
 
         if not login_success:
             print("[!] Login failed. Cannot proceed with deployment.")
@@ -96,7 +102,8 @@ def main():
             print("[!] Could not get dataplane status")
             sys.exit(1)
 
-        dataplanes = status_result.get('dataplanes', [])
+        snapshot = status_result.get('snapshot')
+        dataplanes = snapshot.dataplanes if snapshot else []
 
         if not dataplanes:
             print("[!] No dataplanes found")
@@ -125,7 +132,7 @@ def main():
 
         # Map each registered dataplane
         for idx, dp in enumerate(dataplanes):
-            dp_id = dp.get('dp_id')
+            dp_id = dp.dp_id
 
             # Try to use expected name from config based on order
             # This assumes dataplanes are returned in registration order
@@ -134,29 +141,23 @@ def main():
             else:
                 dp_name = f"Dataplane-{dp_id[:8]}"
 
-            capabilities = dp.get('capabilities', [])
-
-            # Find BWCE and Flogo capabilities
-            bwce_cap = None
-            flogo_cap = None
-
-            for cap in capabilities:
-                if cap.get('capability') == 'BWCE' and cap.get('status') == 'green':
-                    bwce_cap = cap.get('capability_instance_id')
-                elif cap.get('capability') == 'FLOGO' and cap.get('status') == 'green':
-                    flogo_cap = cap.get('capability_instance_id')
+            # Find green BWCE and Flogo capabilities
+            bwce = dp.capability('BWCE', status='green')
+            flogo = dp.capability('FLOGO', status='green')
+            bwce_cap = bwce.instance_id if bwce else None
+            flogo_cap = flogo.instance_id if flogo else None
 
             dataplane_map[dp_name] = {
                 'id': dp_id,
                 'name': dp_name,
                 'bwce_capability_id': bwce_cap,
                 'flogo_capability_id': flogo_cap,
-                'status': dp.get('status')
+                'status': dp.status
             }
 
             print(f"    - {dp_name}")
             print(f"      ID: {dp_id}")
-            print(f"      Status: {dp.get('status')}")
+            print(f"      Status: {dp.status}")
             print(f"      BWCE: {'[OK] Green' if bwce_cap else '[X] Not available'}")
             print(f"      Flogo: {'[OK] Green' if flogo_cap else '[X] Not available'}")
 
@@ -267,6 +268,7 @@ def main():
 
         # Provision Flogo buildtype and connectors for each dataplane (only once per dataplane)
         flogo_dataplanes_provisioned = set()
+        unknown_connectors = {}  # dp_name -> contrib names without a catalog entry
 
         for app in flogo_apps:
             target_dataplanes = app.get('deploy_to_dataplanes', [])
@@ -297,13 +299,17 @@ def main():
 
                 # Step 2: Provision Flogo connectors
                 print(f"[*] Step 2: Provisioning Flogo connectors...")
-                connectors = config.get('flogo', {}).get('connectors', ['General'])
+                # Connectors used by the apps targeting this dataplane; already provisioned ones are skipped
+                connectors = sorted({name for a in flogo_apps if dp_name in a.get('deploy_to_dataplanes', [])
+                                     for name in a.get('contrib_names', [])})
+                connectors = connectors or config.get('flogo', {}).get('connectors', ['General'])
                 connector_result = api_deployer.provision_flogo_connectors(
                     dp['id'],
                     dp['flogo_capability_id'],
                     connectors=connectors
                 )
 
+                unknown_connectors[dp_name] = set(connector_result.get('unknown') or [])
                 if not connector_result.get('success'):
                     print(f"[!] Warning: Connector provisioning had issues for {dp_name}")
                     print(f"    Error: {connector_result.get('error')}")
@@ -343,6 +349,17 @@ def main():
                     })
                     continue
 
+                missing = sorted(set(app.get('contrib_names', [])) & unknown_connectors.get(dp_name, set()))
+                if missing:
+                    print(f"    [!] Connector(s) {', '.join(missing)} not provisioned on '{dp_name}' - skipping")
+                    flogo_results.append({
+                        'app': app_name,
+                        'dataplane': dp_name,
+                        'success': False,
+                        'error': f"Connectors not provisioned: {', '.join(missing)}"
+                    })
+                    continue
+
                 # Deploy using REST API
                 app_config = {
                     'app_file_name': app_file_name,
@@ -498,5 +515,25 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description='Deploy BWCE/Flogo applications to existing dataplanes')
+    parser.add_argument('--config', type=str, default='config.json',
+                        help='Configuration file path (default: config.json)')
+    har_replay.add_arguments(parser)
+    tracing.add_arguments(parser)
+    metrics.add_arguments(parser)
+    logging_config.add_arguments(parser)
+
+    args = parser.parse_args()
+    with open(args.config, 'r') as f:
+        file_config = json.load(f)
+    logging_config.setup_from_config(file_config, args.verbosity, args.log_file)
+    har_replay.install_from_args(args)
+    tracing.install_from_config(file_config, args.trace)
+    metrics.install_from_config(file_config, args.metrics_textfile, args.metrics_json)
+    catalog_cache.configure(file_config)
+    flogo_connectors.configure(file_config)
+    connection_pool.configure(file_config)
+    rate_limit.configure(file_config)
+    with tracing.tracer.span("deploy_apps_only"):
+        main(args.config)
 
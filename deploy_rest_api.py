@@ -5,9 +5,16 @@ Based on JavaScript files: bwceAppApiEndpoint.js and flogoAppApiEndpoint.js
 
 import os
 import time
-import json
 import re
+import logging
 import requests
+from logging_config import get_logger, LazyJson
+import status_cache
+import catalog_cache
+import flogo_connectors
+import payloads
+
+logger = get_logger(__name__)
 
 
 class RestApiDeployer:
@@ -67,10 +74,10 @@ class RestApiDeployer:
         Returns:
             dict: Deployment result
         """
-        print(f"\n[*] Deploying BWCE application via REST API")
-        print(f"    App: {app_config.get('app_name')}")
-        print(f"    Dataplane ID: {dataplane_id}")
-        print(f"    Capability ID: {capability_id}")
+        logger.info("\n[*] Deploying BWCE application via REST API")
+        logger.info("    App: %s", app_config.get('app_name'))
+        logger.info("    Dataplane ID: %s", dataplane_id)
+        logger.info("    Capability ID: %s", capability_id)
 
         # Get app file
         app_folder = app_config.get('app_folder', 'apps_to_deploy')
@@ -86,23 +93,23 @@ class RestApiDeployer:
         if not os.path.exists(app_file_path):
             return {"success": False, "error": f"File not found: {app_file_path}"}
 
-        print(f"    App file: {app_file_path}")
+        logger.info("    App file: %s", app_file_path)
 
         try:
             # Step 1: Upload file to CP filesystem (store)
-            print(f"\n[*] Step 1: Uploading file to CP filesystem...")
+            logger.info("\n[*] Step 1: Uploading file to CP filesystem...")
             file_id = self._store_bwce_file(app_file_path)
             if not file_id:
                 return {"success": False, "error": "File upload failed"}
 
-            print(f"[+] File uploaded successfully. File ID: {file_id}")
+            logger.info("[+] File uploaded successfully. File ID: %s", file_id)
 
             # Step 2: Check if BWCE version is provisioned, provision if needed
-            print(f"\n[*] Step 2: Checking BWCE version provisioning...")
+            logger.info("\n[*] Step 2: Checking BWCE version provisioning...")
             provisioned_versions = self._list_provisioned_bwce_versions(dataplane_id, capability_id)
 
             if not provisioned_versions:
-                print(f"[!] No BWCE versions provisioned. Provisioning latest version...")
+                logger.warning("[!] No BWCE versions provisioned. Provisioning latest version...")
                 if not self._provision_latest_bwce_version(dataplane_id, capability_id):
                     return {"success": False, "error": "Failed to provision BWCE version"}
                 # Refresh the list after provisioning
@@ -112,11 +119,11 @@ class RestApiDeployer:
             bwce_version = provisioned_versions[0]['version']
             base_image_tag = provisioned_versions[0]['baseImageTag']
 
-            print(f"[+] Using BWCE Version: {bwce_version}")
-            print(f"[+] Using Base Image Tag: {base_image_tag}")
+            logger.info("[+] Using BWCE Version: %s", bwce_version)
+            logger.info("[+] Using Base Image Tag: %s", base_image_tag)
 
             # Step 3: Create build
-            print(f"\n[*] Step 3: Creating build...")
+            logger.info("\n[*] Step 3: Creating build...")
             build_result = self._create_bwce_build(
                 dataplane_id,
                 capability_id,
@@ -130,7 +137,7 @@ class RestApiDeployer:
                 return build_result
 
             build_id = build_result.get('build_id')
-            print(f"[+] Build created successfully. Build ID: {build_id}")
+            logger.info("[+] Build created successfully. Build ID: %s", build_id)
 
             # NOTE: BWCE does NOT wait for build completion (confirmed from HAR and JavaScript)
             # The JavaScript code (bwceAppUtils.js line 76-81) immediately deploys after build
@@ -138,12 +145,12 @@ class RestApiDeployer:
             # The build happens asynchronously and deployment handles it internally
 
             # Step 4: Deploy application immediately (no build wait)
-            print(f"\n[*] Step 4: Deploying application...")
+            logger.info("\n[*] Step 4: Deploying application...")
 
             # IMPORTANT: BWCE requires lowercase app names (alphanumeric + '-' only)
             app_name_sanitized = self.sanitize_app_name(app_name)
             if app_name_sanitized != app_name:
-                print(f"[*] App name sanitized: '{app_name}' -> '{app_name_sanitized}'")
+                logger.info("[*] App name sanitized: '%s' -> '%s'", app_name, app_name_sanitized)
 
             deploy_result = self._deploy_bwce_app(
                 dataplane_id,
@@ -154,7 +161,7 @@ class RestApiDeployer:
             )
 
             if deploy_result.get('success'):
-                print(f"[+] Application deployed successfully!")
+                logger.info("[+] Application deployed successfully!")
                 return {
                     "success": True,
                     "app_name": app_name_sanitized,
@@ -168,9 +175,8 @@ class RestApiDeployer:
                 return deploy_result
 
         except Exception as e:
-            print(f"[!] Deployment error: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.warning("[!] Deployment error: %s", e)
+            logger.debug("[DEBUG] Full traceback:", exc_info=True)
             return {"success": False, "error": str(e)}
 
     def _store_bwce_file(self, file_path):
@@ -178,14 +184,14 @@ class RestApiDeployer:
         Upload BWCE .ear file to CP filesystem
         Matches: async store(data) in bwceAppApiEndpoint.js
         """
-        url = f"{self.tenant_host}/cp/bwce/v1/files/store"
+        url = payloads.file_store('BWCE', self.tenant_host).url
 
         with open(file_path, 'rb') as f:
             files = {
                 'file': (os.path.basename(file_path), f, 'application/octet-stream')
             }
 
-            print(f"[DEBUG] Upload URL: {url}")
+            logger.debug("[DEBUG] Upload URL: %s", url)
 
             resp = self.session.post(
                 url,
@@ -193,17 +199,15 @@ class RestApiDeployer:
                 verify=False
             )
 
-            print(f"[DEBUG] Upload status: {resp.status_code}")
+            logger.debug("[DEBUG] Upload status: %s", resp.status_code)
 
             if resp.status_code in [200, 201]:
                 result = resp.json()
-                print(f"[DEBUG] Upload response: {json.dumps(result, indent=2)}")
-                # Response contains 'fileName' which is the file ID/path
-                file_id = result.get('fileName') or result.get('fileId') or result.get('id')
-                return file_id
+                logger.debug("[DEBUG] Upload response: %s", LazyJson(result))
+                return payloads.stored_file_id(result)
             else:
-                print(f"[!] Upload failed. Status: {resp.status_code}")
-                print(f"[!] Response: {resp.text}")
+                logger.warning("[!] Upload failed. Status: %s", resp.status_code)
+                logger.warning("[!] Response: %s", resp.text)
                 return None
 
     def _list_provisioned_bwce_versions(self, dataplane_id, capability_id):
@@ -211,41 +215,21 @@ class RestApiDeployer:
         List provisioned BWCE versions on the dataplane
         Matches: async listBwceVersion(dpId,capabilityId) in bwceAppApiEndpoint.js
         """
-        path = f"/tibco/agent/integration/{capability_id}/bwprovisioner/private/v1/dp/bw/buildtype"
-        url = f"{self.tenant_host}/tp-cp-ws/v1/data-planes/{dataplane_id}/dp-resource"
-
-        params = {
-            'sortBy': 'buildtypeTag',
-            'orderBy': 'desc',  # Get latest first
-            'filterKey': '',
-            'filterValue': '',
-            'path': path
-        }
+        req = payloads.bwce_buildtypes(self.tenant_host, dataplane_id, capability_id)
 
-        resp = self.session.get(url, params=params, verify=False)
+        resp = self.session.get(req.url, params=req.params, verify=False)
 
         if resp.status_code == 200:
             result = resp.json()
-            total = result.get('totalBuildtypes', 0)
-
-            if total == 0:
-                print(f"[!] No BWCE versions provisioned yet")
+            if result.get('totalBuildtypes', 0) == 0:
+                logger.warning("[!] No BWCE versions provisioned yet")
                 return []
 
-            buildtypes = result.get('buildtypeCatalog', [])
-            versions = []
-
-            for bt in buildtypes:
-                version = bt.get('buildtypeTag')
-                base_images = bt.get('baseImages', [])
-                if base_images:
-                    base_image_tag = base_images[0].get('imageTag')
-                    versions.append({'version': version, 'baseImageTag': base_image_tag})
-
-            print(f"[+] Found {len(versions)} provisioned BWCE version(s)")
+            versions = payloads.provisioned_bwce_versions(result)
+            logger.info("[+] Found %s provisioned BWCE version(s)", len(versions))
             return versions
         else:
-            print(f"[!] Failed to list BWCE versions. Status: {resp.status_code}")
+            logger.warning("[!] Failed to list BWCE versions. Status: %s", resp.status_code)
             return []
 
     def _list_available_bwce_versions(self):
@@ -255,17 +239,16 @@ class RestApiDeployer:
         """
         url = f"{self.tenant_host}/cp/bwce/v1/buildTypes"
 
-        resp = self.session.get(url, verify=False)
-
-        if resp.status_code == 200:
-            result = resp.json()
-            versions = result.get('data', [])
-            print(f"[+] Found {len(versions)} available BWCE version(s) in catalog")
-            return versions
-        else:
-            print(f"[!] Failed to list available BWCE versions. Status: {resp.status_code}")
+        try:
+            result = catalog_cache.get_json(self.session, url, verify=False)
+        except catalog_cache.CatalogError as e:
+            logger.warning("[!] Failed to list available BWCE versions. Status: %s", e.status_code)
             return []
 
+        versions = result.get('data', [])
+        logger.info("[+] Found %s available BWCE version(s) in catalog", len(versions))
+        return versions
+
     def provision_bwce_buildtype(self, dataplane_id, capability_id, version="6.12.0-HF1"):
         """
         Provision BWCE buildtype (runtime templates and deployment files).
@@ -275,7 +258,7 @@ class RestApiDeployer:
         import random
         import string
 
-        print(f"\n[*] Provisioning BWCE buildtype {version}...")
+        logger.info("\n[*] Provisioning BWCE buildtype %s...", version)
 
         try:
             # Generate random event ID (like the HAR shows)
@@ -310,21 +293,22 @@ class RestApiDeployer:
                 headers={'Content-Type': 'application/json'},
                 verify=False
             )
+            status_cache.invalidate(self.session, dataplane_id)
 
             if resp.status_code == 200:
                 response_data = resp.json()
                 if response_data.get('status') == 'success':
-                    print(f"[+] BWCE buildtype {version} provisioned successfully!")
+                    logger.info("[+] BWCE buildtype %s provisioned successfully!", version)
                     return {"success": True, "version": version}
                 else:
                     return {"success": False, "error": response_data.get('message')}
             else:
-                print(f"[!] BWCE buildtype provisioning failed. Status: {resp.status_code}")
-                print(f"[!] Response: {resp.text}")
+                logger.warning("[!] BWCE buildtype provisioning failed. Status: %s", resp.status_code)
+                logger.warning("[!] Response: %s", resp.text)
                 return {"success": False, "error": f"HTTP {resp.status_code}"}
 
         except Exception as e:
-            print(f"[!] Exception during BWCE buildtype provisioning: {e}")
+            logger.warning("[!] Exception during BWCE buildtype provisioning: %s", e)
             return {"success": False, "error": str(e)}
 
     def _provision_latest_bwce_version(self, dataplane_id, capability_id):
@@ -337,14 +321,13 @@ class RestApiDeployer:
         available = self._list_available_bwce_versions()
 
         if not available:
-            print(f"[!] No BWCE versions available in catalog")
+            logger.warning("[!] No BWCE versions available in catalog")
             return False
 
-        # Sort and get latest version
-        versions = [v['version'] for v in available]
-        latest_version = sorted(versions, reverse=True)[0]
+        # Latest version by numeric comparison (6.12 > 6.9)
+        latest_version = catalog_cache.latest_version([v.get('version') for v in available])
 
-        print(f"[*] Provisioning BWCE version: {latest_version}")
+        logger.info("[*] Provisioning BWCE version: %s", latest_version)
 
         url = f"{self.tenant_host}/tp-cp-ws/v1/data-planes/{dataplane_id}/dp-resource"
 
@@ -366,15 +349,16 @@ class RestApiDeployer:
         }
 
         resp = self.session.post(url, json=payload, params=params, verify=False)
+        status_cache.invalidate(self.session, dataplane_id)
 
         if resp.status_code in [200, 201, 202]:
-            print(f"[+] BWCE version {latest_version} provisioned successfully")
+            logger.info("[+] BWCE version %s provisioned successfully", latest_version)
             # Wait a bit for provisioning to complete
             time.sleep(10)
             return True
         else:
-            print(f"[!] Failed to provision BWCE version. Status: {resp.status_code}")
-            print(f"[!] Response: {resp.text}")
+            logger.warning("[!] Failed to provision BWCE version. Status: %s", resp.status_code)
+            logger.warning("[!] Response: %s", resp.text)
             return False
 
     def _get_bwce_capability_info(self, dataplane_id, capability_id):
@@ -383,17 +367,12 @@ class RestApiDeployer:
         Matches: async getCapabilityInfo(dpId,capabilityInstanceId) in bwceAppApiEndpoint.js
         """
         # /tp-cp-ws/v1/data-planes/{dpId}/dp-resource?path=/tibco/agent/integration/{capabilityInstanceId}/bwprovisioner/private/v1/dp/bw/info
-        path = f"/tibco/agent/integration/{capability_id}/bwprovisioner/private/v1/dp/bw/info"
-        url = f"{self.tenant_host}/tp-cp-ws/v1/data-planes/{dataplane_id}/dp-resource"
-
-        params = {'path': path}
-
-        resp = self.session.get(url, params=params, verify=False)
+        req = payloads.capability_info('BWCE', self.tenant_host, dataplane_id, capability_id)
 
-        if resp.status_code == 200:
-            return resp.json()
-        else:
-            print(f"[!] Could not get BWCE info. Using defaults.")
+        try:
+            return catalog_cache.get_json(self.session, req.url, params=req.params, verify=False)
+        except catalog_cache.CatalogError:
+            logger.warning("[!] Could not get BWCE info. Using defaults.")
             return {}
 
     def _create_bwce_build(self, dataplane_id, capability_id, file_id, app_name, bwce_version, base_image_tag):
@@ -405,65 +384,42 @@ class RestApiDeployer:
         IMPORTANT: Uses "filePath" not "fileId" (confirmed from bwceHelper.js)
         HAR Analysis: Includes autoProvision=false parameter
         """
-        url = f"{self.tenant_host}/cp/bwce/v1/data-planes/{dataplane_id}/dp-resource"
-
-        params = {
-            'baseversion': bwce_version,
-            'baseimagetag': base_image_tag,
-            'capability_instance_id': capability_id,
-            'autoProvision': 'false'  # NEW: From HAR analysis
-        }
-
-        # The body has a special wrapper structure (same as Flogo)
-        payload = {
-            "dataPlaneId": dataplane_id,
-            "path": f"/tibco/agent/integration/{capability_id}/bwprovisioner/private/v1/dp/bw/builds",
-            "queryParams": {
-                "baseversion": bwce_version,
-                "baseimagetag": base_image_tag,
-                "capability_instance_id": capability_id,
-                "autoProvision": "false"  # NEW: From HAR analysis
-            },
-            "payload": {
-                "dependencies": [],  # Empty for now
-                "filePath": file_id,  # CHANGED from fileId to filePath
-                "tags": [],
-                "buildName": app_name if app_name else ""  # Can be empty string
-            },
-            "eventId": f"bwce_build_{int(time.time())}"
-        }
+        req = payloads.bwce_build(self.tenant_host, dataplane_id, capability_id, file_id,
+                                  app_name, bwce_version, base_image_tag)
+        url, params, payload = req.url, req.params, req.json
 
-        print(f"[DEBUG] BWCE Build URL: {url}")
-        print(f"[DEBUG] BWCE Build params: {params}")
-        print(f"[DEBUG] BWCE Build payload:")
-        print(json.dumps(payload, indent=2))
-        print(f"[DEBUG] File path being used: {file_id}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[DEBUG] BWCE Build URL: %s", url)
+            logger.debug("[DEBUG] BWCE Build params: %s", params)
+            logger.debug("[DEBUG] BWCE Build payload:")
+            logger.debug("%s", LazyJson(payload))
+            logger.debug("[DEBUG] File path being used: %s", file_id)
 
         resp = self.session.post(url, json=payload, params=params, verify=False)
 
-        print(f"[DEBUG] BWCE Build status: {resp.status_code}")
+        logger.debug("[DEBUG] BWCE Build status: %s", resp.status_code)
 
         if resp.status_code in [200, 201, 202]:  # 202 = Accepted (async operation)
             try:
                 result = resp.json()
-                print(f"[DEBUG] BWCE Build response: {json.dumps(result, indent=2)}")
+                logger.debug("[DEBUG] BWCE Build response: %s", LazyJson(result))
                 build_id = result.get('buildId') or result.get('id')
                 if build_id:
                     return {"success": True, "build_id": build_id}
                 else:
-                    print(f"[!] Build ID not found in response")
+                    logger.warning("[!] Build ID not found in response")
                     return {"success": False, "error": "Build ID not in response"}
             except Exception as e:
-                print(f"[!] Error parsing build response: {e}")
-                print(f"[!] Raw response: {resp.text}")
+                logger.warning("[!] Error parsing build response: %s", e)
+                logger.warning("[!] Raw response: %s", resp.text)
                 return {"success": False, "error": str(e)}
         else:
-            print(f"[!] BWCE Build creation failed. Status: {resp.status_code}")
+            logger.warning("[!] BWCE Build creation failed. Status: %s", resp.status_code)
             try:
                 error_detail = resp.json()
-                print(f"[!] Error response: {json.dumps(error_detail, indent=2)}")
+                logger.warning("[!] Error response: %s", LazyJson(error_detail))
             except:
-                print(f"[!] Response: {resp.text}")
+                logger.warning("[!] Response: %s", resp.text)
             return {"success": False, "error": f"HTTP {resp.status_code}"}
 
     def _wait_for_bwce_build(self, dataplane_id, capability_id, build_id, max_wait=300, poll_interval=10):
@@ -471,45 +427,43 @@ class RestApiDeployer:
         Poll build status until complete
         """
         # /tp-cp-ws/v1/data-planes/{dpId}/dp-resource?path=/tibco/agent/integration/{capId}/bwprovisioner/private/v1/dp/bw/builds/{buildId}/status
-        path = f"/tibco/agent/integration/{capability_id}/bwprovisioner/private/v1/dp/bw/builds/{build_id}/status"
-        url = f"{self.tenant_host}/tp-cp-ws/v1/data-planes/{dataplane_id}/dp-resource"
-
-        params = {'path': path}
+        req = payloads.build_status('BWCE', self.tenant_host, dataplane_id, capability_id, build_id)
+        url, params = req.url, req.params
 
         start_time = time.time()
         attempts = 0
 
         while time.time() - start_time < max_wait:
             attempts += 1
-            print(f"[*] Checking build status (attempt {attempts})...")
+            logger.info("[*] Checking build status (attempt %s)...", attempts)
 
             resp = self.session.get(url, params=params, verify=False)
 
-            print(f"[DEBUG] Status check response code: {resp.status_code}")
+            logger.debug("[DEBUG] Status check response code: %s", resp.status_code)
 
             if resp.status_code == 200:
                 try:
                     result = resp.json()
-                    print(f"[DEBUG] Status response: {json.dumps(result, indent=2)}")
+                    logger.debug("[DEBUG] Status response: %s", LazyJson(result))
                     status = result.get('status', '').lower()
 
-                    print(f"    Build status: {status}")
+                    logger.info("    Build status: %s", status)
 
                     if status == 'success' or status == 'completed':
                         return True
                     elif status == 'failed' or status == 'error':
-                        print(f"[!] Build failed: {result.get('message')}")
+                        logger.warning("[!] Build failed: %s", result.get('message'))
                         return False
                 except Exception as e:
-                    print(f"[!] Error parsing status response: {e}")
-                    print(f"[!] Raw response: {resp.text}")
+                    logger.warning("[!] Error parsing status response: %s", e)
+                    logger.warning("[!] Raw response: %s", resp.text)
             else:
-                print(f"[!] Status check failed with code {resp.status_code}")
-                print(f"[!] Response: {resp.text[:200]}")
+                logger.warning("[!] Status check failed with code %s", resp.status_code)
+                logger.warning("[!] Response: %s", resp.text[:200])
 
             time.sleep(poll_interval)
 
-        print(f"[!] Build timeout after {max_wait} seconds")
+        logger.warning("[!] Build timeout after %s seconds", max_wait)
         return False
 
     def _deploy_bwce_app(self, dataplane_id, capability_id, namespace, build_id, app_name):
@@ -522,66 +476,30 @@ class RestApiDeployer:
         IMPORTANT: Requires eula: true (confirmed from bwceHelper.js line 115)
         HAR Analysis: Uses /cp/bwce/v1/ URL and replicas=0
         """
-        url = f"{self.tenant_host}/cp/bwce/v1/data-planes/{dataplane_id}/dp-resource"
+        req = payloads.bwce_deploy(self.tenant_host, dataplane_id, capability_id, namespace, build_id, app_name)
+        url, params, payload = req.url, req.params, req.json
 
-        params = {
-            'namespace': namespace,
-            'capability_instance_id': capability_id
-        }
-
-        # Deploy payload structure from HAR analysis and bwceHelper.js
-        payload = {
-            "dataPlaneId": dataplane_id,
-            "path": f"/tibco/agent/integration/{capability_id}/bwprovisioner/private/v1/dp/bw/deploy",
-            "queryParams": {
-                "namespace": namespace,
-                "capability_instance_id": capability_id
-            },
-            "payload": {
-                "appId": "",  # Empty for new deployment
-                "buildId": build_id,
-                "eula": True,  # REQUIRED: Accept End User License Agreement
-                "appName": app_name,
-                "tags": [],
-                "profile": "default.substvar",  # Default profile
-                "replicas": 0,  # HAR shows 0, not 1
-                "enableExecutionHistory": False,
-                "enableServiceMesh": False,
-                "enableAutoscaling": False,
-                "resourceLimits": {
-                    "limits": {
-                        "cpu": "1",
-                        "memory": "4096Mi"
-                    },
-                    "requests": {
-                        "cpu": "250m",
-                        "memory": "1024Mi"
-                    }
-                }
-            },
-            "eventId": f"bwce_deploy_{int(time.time())}"
-        }
-
-        print(f"[DEBUG] BWCE Deploy URL: {url}")
-        print(f"[DEBUG] BWCE Deploy params: {params}")
-        print(f"[DEBUG] BWCE Deploy payload: {json.dumps(payload, indent=2)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[DEBUG] BWCE Deploy URL: %s", url)
+            logger.debug("[DEBUG] BWCE Deploy params: %s", params)
+            logger.debug("[DEBUG] BWCE Deploy payload: %s", LazyJson(payload))
 
         resp = self.session.post(url, json=payload, params=params, verify=False)
 
-        print(f"[DEBUG] BWCE Deploy status: {resp.status_code}")
+        logger.debug("[DEBUG] BWCE Deploy status: %s", resp.status_code)
 
         if resp.status_code in [200, 201, 202]:
             try:
                 result = resp.json()
-                print(f"[DEBUG] BWCE Deploy response: {json.dumps(result, indent=2)}")
+                logger.debug("[DEBUG] BWCE Deploy response: %s", LazyJson(result))
                 return {"success": True, "app_id": result.get('appId') or result.get('id')}
             except:
                 # Response might not be JSON
-                print(f"[+] Deployment accepted (non-JSON response)")
+                logger.info("[+] Deployment accepted (non-JSON response)")
                 return {"success": True, "app_id": None}
         else:
-            print(f"[!] BWCE Deploy failed. Status: {resp.status_code}")
-            print(f"[!] Response: {resp.text}")
+            logger.warning("[!] BWCE Deploy failed. Status: %s", resp.status_code)
+            logger.warning("[!] Response: %s", resp.text)
             return {"success": False, "error": f"HTTP {resp.status_code}"}
 
     def provision_flogo_buildtype(self, dataplane_id, capability_id, version="2.26.1-b357"):
@@ -593,7 +511,7 @@ class RestApiDeployer:
         import random
         import string
 
-        print(f"\n[*] Provisioning Flogo buildtype {version}...")
+        logger.info("\n[*] Provisioning Flogo buildtype %s...", version)
 
         try:
             # Generate random event ID
@@ -630,22 +548,75 @@ class RestApiDeployer:
                 headers={'Content-Type': 'application/json'},
                 verify=False
             )
+            status_cache.invalidate(self.session, dataplane_id)
 
             if resp.status_code == 200:
                 response_data = resp.json()
                 if response_data.get('status') == 'success':
-                    print(f"[+] Flogo buildtype {version} provisioned successfully!")
+                    logger.info("[+] Flogo buildtype %s provisioned successfully!", version)
                     return {"success": True, "version": version}
                 else:
                     return {"success": False, "error": response_data.get('message')}
             else:
-                print(f"[!] Flogo buildtype provisioning failed. Status: {resp.status_code}")
+                logger.warning("[!] Flogo buildtype provisioning failed. Status: %s", resp.status_code)
                 return {"success": False, "error": f"HTTP {resp.status_code}"}
 
         except Exception as e:
-            print(f"[!] Exception during Flogo buildtype provisioning: {e}")
+            logger.warning("[!] Exception during Flogo buildtype provisioning: %s", e)
             return {"success": False, "error": str(e)}
 
+    def _list_provisioned_flogo_versions(self, dataplane_id, capability_id):
+        """
+        List provisioned Flogo buildtype tags on the dataplane
+        Same buildtype catalog as BWCE, served by flogoprovisioner
+        """
+        path = f"/tibco/agent/integration/{capability_id}/flogoprovisioner/v1/dp/flogo/buildtype"
+        url = f"{self.tenant_host}/tp-cp-ws/v1/data-planes/{dataplane_id}/dp-resource"
+        params = {'capability_instance_id': capability_id, 'path': path}
+
+        resp = self.session.get(url, params=params, verify=False)
+
+        if resp.status_code == 200:
+            buildtypes = resp.json().get('buildtypeCatalog', []) or []
+            return [bt.get('buildtypeTag') for bt in buildtypes if bt.get('buildtypeTag')]
+        else:
+            logger.warning("[!] Failed to list Flogo versions. Status: %s", resp.status_code)
+            return []
+
+    def ensure_buildtype(self, capability, dataplane_id, capability_id, version):
+        """
+        Provision a BWCE or Flogo buildtype unless that version is already provisioned.
+
+        Args:
+            capability (str): 'BWCE' or 'FLOGO'
+            dataplane_id (str): Dataplane ID
+            capability_id (str): BWCE/Flogo capability instance ID
+            version (str): Buildtype version
+
+        Returns:
+            dict: {"success": bool, "version": str, "existing": bool} or {"success": False, "error": str}
+        """
+        try:
+            if capability == 'BWCE':
+                provisioned = [v['version'] for v in self._list_provisioned_bwce_versions(dataplane_id, capability_id)]
+            else:
+                provisioned = self._list_provisioned_flogo_versions(dataplane_id, capability_id)
+        except Exception as e:
+            logger.warning("[!] Could not list provisioned %s buildtypes: %s", capability, e)
+            provisioned = []
+
+        if version in provisioned:
+            logger.info("[+] %s buildtype %s already provisioned", capability, version)
+            return {"success": True, "version": version, "existing": True}
+
+        if capability == 'BWCE':
+            result = self.provision_bwce_buildtype(dataplane_id, capability_id, version=version)
+        else:
+            result = self.provision_flogo_buildtype(dataplane_id, capability_id, version=version)
+        if result.get('success'):
+            result['existing'] = False
+        return result
+
     def provision_flogo_connectors(self, dataplane_id, flogo_capability_id, connectors=None):
         """
         Provision Flogo connectors (e.g., General connector).
@@ -653,51 +624,30 @@ class RestApiDeployer:
 
         Based on the HAR file, connectors are provisioned via artifactmanager, not flogoprovisioner.
         The path uses INTEGRATIONCORE capability ID, but query param uses FLOGO capability ID.
+        Connectors already on the dataplane are skipped; the missing ones are sent in one
+        request (see flogo_connectors.ConnectorManager).
         """
-        import time
-
         if connectors is None:
             connectors = ["General"]
 
-        print(f"\n[*] Provisioning Flogo connectors: {', '.join(connectors)}...")
+        logger.info("\n[*] Provisioning Flogo connectors: %s...", ', '.join(connectors))
 
         try:
-            # Step 1: Get INTEGRATIONCORE capability ID (for artifactmanager)
-            # Connectors are managed by artifactmanager, not flogoprovisioner
-            integrationcore_cap_id = self._get_integrationcore_capability_id(dataplane_id)
-            if not integrationcore_cap_id:
-                print(f"[!] Could not find INTEGRATIONCORE capability")
-                return {"success": False, "error": "INTEGRATIONCORE capability not found"}
-
-            print(f"[+] Found INTEGRATIONCORE capability ID: {integrationcore_cap_id}")
-
-            # Step 2: Build artifacts payload
-            # Based on HAR: /tibco/agent/integration/{INTEGRATIONCORE_ID}/artifactmanager/v1/artifacts
-            # The payload uses exact format from flogo-version-har
-            artifacts = []
-            for conn_name in connectors:
-                # Default connector paths and versions
-                if conn_name == "General":
-                    artifact = {
-                        "name": "General",
-                        "path": "/flogo-contribution/tp-flogo-connector-general/1.6.12-b03",
-                        "targetPath": f"{dataplane_id}/tibco/flogo/connectors",
-                        "version": "1.6.12-b03",
-                        "files": ["Dockerfile", "connector.zip", "contribution.json"],
-                        "catalog": {
-                            "name": "General",
-                            "id": "General",
-                            "version": "1.6.12-b03",
-                            "displayName": "1.6.12"
-                        }
-                    }
-                    artifacts.append(artifact)
-
-            if not artifacts:
-                print(f"[!] No artifacts to provision")
-                return {"success": False, "error": "No valid connectors"}
-
-            # Step 3: Provision via artifactmanager
+            return flogo_connectors.manager.ensure(self, dataplane_id, flogo_capability_id, connectors)
+        except Exception as e:
+            logger.warning("[!] Exception during connector provisioning: %s", e)
+            logger.debug("[DEBUG] Full traceback:", exc_info=True)
+            return {"success": False, "error": str(e)}
+
+    def _post_connector_artifacts(self, dataplane_id, flogo_capability_id, integrationcore_cap_id, artifacts):
+        """
+        POST connector artifacts to the dataplane's artifactmanager in one request.
+
+        Returns:
+            dict: {"success": True, "connectors": artifacts} or {"success": False, "error": str}
+        """
+        try:
+            # Provision via artifactmanager
             # URL: /tp-cp-ws/v1/data-planes/{dp_id}/dp-resource?capability_instance_id={flogo_cap_id}
             provision_url = f"{self.tenant_host}/tp-cp-ws/v1/data-planes/{dataplane_id}/dp-resource"
 
@@ -719,10 +669,11 @@ class RestApiDeployer:
                 "eventId": f"flogo_{self._generate_random_id()}"
             }
 
-            print(f"[DEBUG] Provision URL: {provision_url}")
-            print(f"[DEBUG] INTEGRATIONCORE Cap ID: {integrationcore_cap_id}")
-            print(f"[DEBUG] Flogo Cap ID (query param): {flogo_capability_id}")
-            print(f"[DEBUG] Provisioning {len(artifacts)} connector(s)...")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("[DEBUG] Provision URL: %s", provision_url)
+                logger.debug("[DEBUG] INTEGRATIONCORE Cap ID: %s", integrationcore_cap_id)
+                logger.debug("[DEBUG] Flogo Cap ID (query param): %s", flogo_capability_id)
+                logger.debug("[DEBUG] Provisioning %s connector(s)...", len(artifacts))
 
             resp = self.session.post(
                 provision_url,
@@ -731,44 +682,36 @@ class RestApiDeployer:
                 headers={'Content-Type': 'application/json'},
                 verify=False
             )
+            status_cache.invalidate(self.session, dataplane_id)
 
-            print(f"[DEBUG] Connector provision status: {resp.status_code}")
+            logger.debug("[DEBUG] Connector provision status: %s", resp.status_code)
 
             if resp.status_code in [200, 201, 202]:
                 try:
                     resp_data = resp.json()
-                    print(f"[DEBUG] Response: {resp_data}")
-                    print(f"[+] Connectors provisioned successfully!")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("[DEBUG] Response: %s", resp_data)
+                        logger.debug("[+] Connectors provisioned successfully!")
                 except:
-                    print(f"[+] Connectors provisioned successfully!")
+                    logger.info("[+] Connectors provisioned successfully!")
                 return {"success": True, "connectors": artifacts}
             else:
-                print(f"[!] Connector provisioning failed: {resp.status_code}")
-                print(f"[!] Response: {resp.text}")
+                logger.warning("[!] Connector provisioning failed: %s", resp.status_code)
+                logger.warning("[!] Response: %s", resp.text)
                 return {"success": False, "error": f"HTTP {resp.status_code}: {resp.text}"}
 
         except Exception as e:
-            print(f"[!] Exception during connector provisioning: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.warning("[!] Exception during connector provisioning: %s", e)
+            logger.debug("[DEBUG] Full traceback:", exc_info=True)
             return {"success": False, "error": str(e)}
 
     def _get_integrationcore_capability_id(self, dataplane_id):
         """Get the INTEGRATIONCORE capability instance ID"""
         try:
-            status_url = f"{self.tenant_host}/cp/v1/data-planes/{dataplane_id}/capabilities-status"
-            resp = self.session.get(status_url, headers={'Content-Type': 'application/json'}, verify=False)
-
-            if resp.status_code == 200:
-                data = resp.json()
-                dataplanes = data.get('dataplanes', [])
-                for dp in dataplanes:
-                    if dp.get('dp_id') == dataplane_id:
-                        capabilities = dp.get('capabilities', [])
-                        for cap in capabilities:
-                            if cap.get('capability') == 'INTEGRATIONCORE':
-                                return cap.get('capability_instance_id')
-            return None
+            snapshot = status_cache.capabilities_status(self.session, self.tenant_host, dataplane_id,
+                                                        headers={'Content-Type': 'application/json'}, verify=False)
+            cap = snapshot.find_capability(dataplane_id, 'INTEGRATIONCORE')
+            return cap.instance_id if cap else None
         except:
             return None
 
@@ -783,10 +726,10 @@ class RestApiDeployer:
         Deploy Flogo application using REST API
         Based on flogoAppApiEndpoint.js
         """
-        print(f"\n[*] Deploying Flogo application via REST API")
-        print(f"    App: {app_config.get('app_name')}")
-        print(f"    Dataplane ID: {dataplane_id}")
-        print(f"    Capability ID: {capability_id}")
+        logger.info("\n[*] Deploying Flogo application via REST API")
+        logger.info("    App: %s", app_config.get('app_name'))
+        logger.info("    Dataplane ID: %s", dataplane_id)
+        logger.info("    Capability ID: %s", capability_id)
 
         # Get app file
         app_folder = app_config.get('app_folder', 'apps_to_deploy')
@@ -802,25 +745,25 @@ class RestApiDeployer:
         if not os.path.exists(app_file_path):
             return {"success": False, "error": f"File not found: {app_file_path}"}
 
-        print(f"    App file: {app_file_path}")
+        logger.info("    App file: %s", app_file_path)
 
         try:
             # Step 1: Upload file
-            print(f"\n[*] Step 1: Uploading file to CP filesystem...")
+            logger.info("\n[*] Step 1: Uploading file to CP filesystem...")
             file_id = self._store_flogo_file(app_file_path)
             if not file_id:
                 return {"success": False, "error": "File upload failed"}
 
-            print(f"[+] File uploaded successfully. File ID: {file_id}")
+            logger.info("[+] File uploaded successfully. File ID: %s", file_id)
 
             # Step 2: Get Flogo version
-            print(f"\n[*] Step 2: Getting Flogo capability info...")
+            logger.info("\n[*] Step 2: Getting Flogo capability info...")
             flogo_info = self._get_flogo_capability_info(dataplane_id, capability_id)
             flogo_version = flogo_info.get('version', '1.0.0')
-            print(f"    Flogo Version: {flogo_version}")
+            logger.info("    Flogo Version: %s", flogo_version)
 
             # Step 3: Create build
-            print(f"\n[*] Step 3: Creating build...")
+            logger.info("\n[*] Step 3: Creating build...")
             build_result = self._create_flogo_build(
                 dataplane_id,
                 capability_id,
@@ -833,17 +776,17 @@ class RestApiDeployer:
                 return build_result
 
             build_id = build_result.get('build_id')
-            print(f"[+] Build created successfully. Build ID: {build_id}")
+            logger.info("[+] Build created successfully. Build ID: %s", build_id)
 
             # Step 4: Poll build status
-            print(f"\n[*] Step 4: Waiting for build to complete...")
+            logger.info("\n[*] Step 4: Waiting for build to complete...")
             if not self._wait_for_flogo_build(dataplane_id, capability_id, build_id):
                 return {"success": False, "error": "Build failed or timed out"}
 
-            print(f"[+] Build completed successfully!")
+            logger.info("[+] Build completed successfully!")
 
             # Step 5: Deploy application
-            print(f"\n[*] Step 5: Deploying application...")
+            logger.info("\n[*] Step 5: Deploying application...")
             deploy_result = self._deploy_flogo_app_final(
                 dataplane_id,
                 capability_id,
@@ -853,7 +796,7 @@ class RestApiDeployer:
             )
 
             if deploy_result.get('success'):
-                print(f"[+] Application deployed successfully!")
+                logger.info("[+] Application deployed successfully!")
                 return {
                     "success": True,
                     "app_name": app_name,
@@ -867,9 +810,8 @@ class RestApiDeployer:
                 return deploy_result
 
         except Exception as e:
-            print(f"[!] Deployment error: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.warning("[!] Deployment error: %s", e)
+            logger.debug("[DEBUG] Full traceback:", exc_info=True)
             return {"success": False, "error": str(e)}
 
     def _store_flogo_file(self, file_path):
@@ -877,7 +819,7 @@ class RestApiDeployer:
         Upload Flogo .flogo file to CP filesystem
         Matches: async storeFlogoToEFS(data) in flogoAppApiEndpoint.js
         """
-        url = f"{self.tenant_host}/cp/flogo/v1/files/store"
+        url = payloads.file_store('FLOGO', self.tenant_host).url
 
         with open(file_path, 'rb') as f:
             files = {
@@ -888,24 +830,18 @@ class RestApiDeployer:
 
             if resp.status_code in [200, 201]:
                 result = resp.json()
-                # Response contains 'fileName' which is the file ID/path
-                file_id = result.get('fileName') or result.get('fileId') or result.get('id')
-                return file_id
+                return payloads.stored_file_id(result)
             else:
-                print(f"[!] Upload failed. Status: {resp.status_code}, Response: {resp.text}")
+                logger.warning("[!] Upload failed. Status: %s, Response: %s", resp.status_code, resp.text)
                 return None
 
     def _get_flogo_capability_info(self, dataplane_id, capability_id):
         """Get Flogo capability info"""
-        path = f"/tibco/agent/integration/{capability_id}/flogoprovisioner/v1/dp/flogo/info"
-        url = f"{self.tenant_host}/tp-cp-ws/v1/data-planes/{dataplane_id}/dp-resource"
-        params = {'capability_instance_id': capability_id, 'path': path}
-
-        resp = self.session.get(url, params=params, verify=False)
+        req = payloads.capability_info('FLOGO', self.tenant_host, dataplane_id, capability_id)
 
-        if resp.status_code == 200:
-            return resp.json()
-        else:
+        try:
+            return catalog_cache.get_json(self.session, req.url, params=req.params, verify=False)
+        except catalog_cache.CatalogError:
             return {}
 
     def _create_flogo_build(self, dataplane_id, capability_id, file_id, app_name, flogo_version):
@@ -915,63 +851,39 @@ class RestApiDeployer:
 
         The request uses a wrapper structure with dataPlaneId, path, queryParams, and payload
         """
-        url = f"{self.tenant_host}/tp-cp-ws/v1/data-planes/{dataplane_id}/dp-resource"
+        req = payloads.flogo_build(self.tenant_host, dataplane_id, capability_id, file_id, app_name, flogo_version)
+        url, params, payload = req.url, req.params, req.json
 
-        params = {
-            'baseversion': flogo_version,
-            'capability_instance_id': capability_id
-        }
-
-        # The body has a special wrapper structure
-        payload = {
-            "dataPlaneId": dataplane_id,
-            "path": f"/tibco/agent/integration/{capability_id}/flogoprovisioner/v1/dp/flogo/builds",
-            "queryParams": {
-                "baseversion": flogo_version,
-                "capability_instance_id": capability_id
-            },
-            "payload": {
-                "dependencies": [],  # Empty for now, can be populated if needed
-                "buildName": app_name,
-                "filePath": file_id,
-                "tags": []
-            },
-            "eventId": f"flogo_build_{int(time.time())}"
-        }
-
-        print(f"[DEBUG] Flogo build URL: {url}")
-        print(f"[DEBUG] Flogo build params: {params}")
-        print(f"[DEBUG] Flogo build payload: {json.dumps(payload, indent=2)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[DEBUG] Flogo build URL: %s", url)
+            logger.debug("[DEBUG] Flogo build params: %s", params)
+            logger.debug("[DEBUG] Flogo build payload: %s", LazyJson(payload))
 
         resp = self.session.post(url, json=payload, params=params, verify=False)
 
-        print(f"[DEBUG] Flogo build status: {resp.status_code}")
+        logger.debug("[DEBUG] Flogo build status: %s", resp.status_code)
 
         if resp.status_code in [200, 201, 202]:  # 202 = Accepted (async operation)
             result = resp.json()
-            print(f"[DEBUG] Flogo build response: {json.dumps(result, indent=2)}")
+            logger.debug("[DEBUG] Flogo build response: %s", LazyJson(result))
             build_id = result.get('buildId') or result.get('id') or result.get('buildName')
             return {"success": True, "build_id": build_id}
         else:
-            print(f"[!] Build creation failed. Status: {resp.status_code}, Response: {resp.text}")
+            logger.warning("[!] Build creation failed. Status: %s, Response: %s", resp.status_code, resp.text)
             return {"success": False, "error": f"HTTP {resp.status_code}"}
 
     def _wait_for_flogo_build(self, dataplane_id, capability_id, build_id, max_wait=300, poll_interval=10):
         """Poll Flogo build status"""
         # Use getFlogoBuildStatus endpoint
-        url = f"{self.tenant_host}/tp-cp-ws/v1/data-planes/{dataplane_id}/dp-resource"
-
-        params = {
-            'capability_instance_id': capability_id,
-            'path': f"/tibco/agent/integration/{capability_id}/flogoprovisioner/v1/dp/flogo/builds/{build_id}/status"
-        }
+        req = payloads.build_status('FLOGO', self.tenant_host, dataplane_id, capability_id, build_id)
+        url, params = req.url, req.params
 
         start_time = time.time()
         attempts = 0
 
         while time.time() - start_time < max_wait:
             attempts += 1
-            print(f"[*] Checking build status (attempt {attempts})...")
+            logger.info("[*] Checking build status (attempt %s)...", attempts)
 
             resp = self.session.get(url, params=params, verify=False)
 
@@ -979,17 +891,17 @@ class RestApiDeployer:
                 result = resp.json()
                 status = result.get('status', '').lower()
 
-                print(f"    Build status: {status}")
+                logger.info("    Build status: %s", status)
 
                 if status == 'success' or status == 'completed':
                     return True
                 elif status == 'failed' or status == 'error':
-                    print(f"[!] Build failed: {result.get('message')}")
+                    logger.warning("[!] Build failed: %s", result.get('message'))
                     return False
 
             time.sleep(poll_interval)
 
-        print(f"[!] Build timeout after {max_wait} seconds")
+        logger.warning("[!] Build timeout after %s seconds", max_wait)
         return False
 
     def _deploy_flogo_app_final(self, dataplane_id, capability_id, namespace, build_id, app_name):
@@ -1000,60 +912,28 @@ class RestApiDeployer:
         IMPORTANT: Requires eula: true (lowercase) to accept TIBCO End User Agreement
         Based on flogoHelper.js line 124
         """
-        url = f"{self.tenant_host}/tp-cp-ws/v1/data-planes/{dataplane_id}/dp-resource"
-
-        params = {
-            'namespace': namespace,
-            'capability_instance_id': capability_id
-        }
+        req = payloads.flogo_deploy(self.tenant_host, dataplane_id, capability_id, namespace, build_id, app_name)
+        url, params, payload = req.url, req.params, req.json
 
-        # Deploy payload structure from flogoHelper.js
-        payload = {
-            "dataPlaneId": dataplane_id,
-            "path": f"/tibco/agent/integration/{capability_id}/flogoprovisioner/v1/dp/flogo/deploy",
-            "queryParams": {
-                "namespace": namespace,
-                "capability_instance_id": capability_id
-            },
-            "payload": {
-                "appId": "",  # Empty for new deployment
-                "buildId": build_id,
-                "eula": True,  # REQUIRED: Accept End User License Agreement (lowercase!)
-                "appName": app_name,
-                "tags": [],
-                "enableServiceMesh": False,
-                "resourceLimits": {
-                    "limits": {
-                        "cpu": "500m",
-                        "memory": "1024Mi"
-                    },
-                    "requests": {
-                        "cpu": "250m",
-                        "memory": "512Mi"
-                    }
-                }
-            },
-            "eventId": f"flogo_deploy_{int(time.time())}"
-        }
-
-        print(f"[DEBUG] Flogo Deploy URL: {url}")
-        print(f"[DEBUG] Flogo Deploy payload: {json.dumps(payload, indent=2)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[DEBUG] Flogo Deploy URL: %s", url)
+            logger.debug("[DEBUG] Flogo Deploy payload: %s", LazyJson(payload))
 
         resp = self.session.post(url, json=payload, params=params, verify=False)
 
-        print(f"[DEBUG] Flogo Deploy status: {resp.status_code}")
+        logger.debug("[DEBUG] Flogo Deploy status: %s", resp.status_code)
 
         if resp.status_code in [200, 201, 202]:
             try:
                 result = resp.json()
-                print(f"[DEBUG] Flogo Deploy response: {json.dumps(result, indent=2)}")
+                logger.debug("[DEBUG] Flogo Deploy response: %s", LazyJson(result))
                 return {"success": True, "app_id": result.get('appId') or result.get('id')}
             except:
                 # Response might not be JSON
-                print(f"[+] Deployment accepted (non-JSON response)")
+                logger.info("[+] Deployment accepted (non-JSON response)")
                 return {"success": True, "app_id": None}
         else:
-            print(f"[!] Flogo Deploy failed. Status: {resp.status_code}, Response: {resp.text}")
+            logger.warning("[!] Flogo Deploy failed. Status: %s, Response: %s", resp.status_code, resp.text)
             return {"success": False, "error": f"HTTP {resp.status_code}"}
 
 
@@ -1075,44 +955,34 @@ class RestApiDeployer:
         # PUT to /cp/v1/data-planes/{dp_id}/dp-resource?capability_instance_id={cap_id}
         # Payload: {"path": "/tibco/agent/integration/{cap_id}/bwprovisioner/private/v1/dp/bw/apps/{app_id}/scale?count={count}&namespace={ns}", ...}
 
-        url = f"{self.tenant_host}/cp/v1/data-planes/{dataplane_id}/dp-resource"
-        params = {
-            'capability_instance_id': capability_id
-        }
-
-        # Scale endpoint path
-        scale_path = f"/tibco/agent/integration/{capability_id}/bwprovisioner/private/v1/dp/bw/apps/{app_id}/scale"
-        scale_params = f"count={replica_count}&namespace={namespace}"
-
-        payload = {
-            "path": f"{scale_path}?{scale_params}",
-            "dataPlaneId": dataplane_id,
-            "capabilityInstanceId": capability_id,
-            "method": "PUT"
-        }
+        req = payloads.scale_app('BWCE', self.tenant_host, dataplane_id, capability_id, app_id, namespace, replica_count)
+        url, params, payload = req.url, req.params, req.json
 
         action = "Starting" if replica_count > 0 else "Stopping"
-        print(f"[*] {action} BWCE application...")
-        print(f"    App ID: {app_id}")
-        print(f"    Replica Count: {replica_count}")
-        print(f"[DEBUG] Scale URL: {url}")
-        print(f"[DEBUG] Scale payload: {json.dumps(payload, indent=2)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[*] %s BWCE application...", action)
+            logger.debug("    App ID: %s", app_id)
+            logger.debug("    Replica Count: %s", replica_count)
+            logger.debug("[DEBUG] Scale URL: %s", url)
+            logger.debug("[DEBUG] Scale payload: %s", LazyJson(payload))
 
         resp = self.session.put(url, json=payload, params=params, verify=False)
+        status_cache.invalidate(self.session, dataplane_id)
 
-        print(f"[DEBUG] Scale response status: {resp.status_code}")
+        logger.debug("[DEBUG] Scale response status: %s", resp.status_code)
 
         if resp.status_code in [200, 202]:
             try:
                 result = resp.json()
-                print(f"[DEBUG] Scale response: {json.dumps(result, indent=2)}")
-                print(f"[+] Application {'started' if replica_count > 0 else 'stopped'} successfully!")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("[DEBUG] Scale response: %s", LazyJson(result))
+                    logger.debug("[+] Application %s successfully!", 'started' if replica_count > 0 else 'stopped')
                 return {"success": True, "message": result.get('message', 'Success')}
             except:
-                print(f"[+] Scale request accepted")
+                logger.info("[+] Scale request accepted")
                 return {"success": True, "message": "Scale request accepted"}
         else:
-            print(f"[!] Scale failed. Status: {resp.status_code}, Response: {resp.text}")
+            logger.warning("[!] Scale failed. Status: %s, Response: %s", resp.status_code, resp.text)
             return {"success": False, "error": f"HTTP {resp.status_code}"}
 
 
@@ -1130,7 +1000,7 @@ class RestApiDeployer:
         Returns:
             dict: {"success": bool, "message": str}
         """
-        print(f"[*] Starting BWCE application: {app_id}")
+        logger.info("[*] Starting BWCE application: %s", app_id)
         return self.scale_bwce_app(dataplane_id, capability_id, app_id, namespace, replica_count)
 
 
@@ -1147,7 +1017,7 @@ class RestApiDeployer:
         Returns:
             dict: {"success": bool, "message": str}
         """
-        print(f"[*] Stopping BWCE application: {app_id}")
+        logger.info("[*] Stopping BWCE application: %s", app_id)
         return self.scale_bwce_app(dataplane_id, capability_id, app_id, namespace, 0)
 
 
@@ -1166,46 +1036,34 @@ class RestApiDeployer:
             dict: {"success": bool, "message": str}
         """
         # Similar to BWCE but using flogoprovisioner endpoint
-        url = f"{self.tenant_host}/tp-cp-ws/v1/data-planes/{dataplane_id}/dp-resource"
-        params = {
-            'capability_instance_id': capability_id
-        }
-
-        # Scale endpoint path for Flogo
-        scale_path = f"/tibco/agent/integration/{capability_id}/flogoprovisioner/v1/dp/flogo/apps/{app_id}/scale"
-        scale_params = f"count={replica_count}&namespace={namespace}"
-
-        payload = {
-            "dataPlaneId": dataplane_id,
-            "path": f"{scale_path}?{scale_params}",
-            "queryParams": {
-                "capability_instance_id": capability_id
-            },
-            "method": "PUT"
-        }
+        req = payloads.scale_app('FLOGO', self.tenant_host, dataplane_id, capability_id, app_id, namespace, replica_count)
+        url, params, payload = req.url, req.params, req.json
 
         action = "Starting" if replica_count > 0 else "Stopping"
-        print(f"[*] {action} Flogo application...")
-        print(f"    App ID: {app_id}")
-        print(f"    Replica Count: {replica_count}")
-        print(f"[DEBUG] Scale URL: {url}")
-        print(f"[DEBUG] Scale payload: {json.dumps(payload, indent=2)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[*] %s Flogo application...", action)
+            logger.debug("    App ID: %s", app_id)
+            logger.debug("    Replica Count: %s", replica_count)
+            logger.debug("[DEBUG] Scale URL: %s", url)
+            logger.debug("[DEBUG] Scale payload: %s", LazyJson(payload))
 
         resp = self.session.put(url, json=payload, params=params, verify=False)
+        status_cache.invalidate(self.session, dataplane_id)
 
-        print(f"[DEBUG] Scale response status: {resp.status_code}")
+        logger.debug("[DEBUG] Scale response status: %s", resp.status_code)
 
         if resp.status_code in [200, 202]:
             try:
                 result = resp.json()
-                print(f"[DEBUG] Scale response: {json.dumps(result, indent=2)}")
-                print(f"[+] Application {'started' if replica_count > 0 else 'stopped'} successfully!")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("[DEBUG] Scale response: %s", LazyJson(result))
+                    logger.debug("[+] Application %s successfully!", 'started' if replica_count > 0 else 'stopped')
                 return {"success": True, "message": result.get('message', 'Success')}
             except:
-                print(f"[+] Scale request accepted")
+                logger.info("[+] Scale request accepted")
                 return {"success": True, "message": "Scale request accepted"}
         else:
-            print(f"[!] Scale failed. Status: {resp.status_code}, Response: {resp.text}")
+            logger.warning("[!] Scale failed. Status: %s, Response: %s", resp.status_code, resp.text)
             return {"success": False, "error": f"HTTP {resp.status_code}"}
 
 
@@ -1223,7 +1081,7 @@ class RestApiDeployer:
         Returns:
             dict: {"success": bool, "message": str}
         """
-        print(f"[*] Starting Flogo application: {app_id}")
+        logger.info("[*] Starting Flogo application: %s", app_id)
         return self.scale_flogo_app(dataplane_id, capability_id, app_id, namespace, replica_count)
 
 
@@ -1240,7 +1098,7 @@ class RestApiDeployer:
         Returns:
             dict: {"success": bool, "message": str}
         """
-        print(f"[*] Stopping Flogo application: {app_id}")
+        logger.info("[*] Stopping Flogo application: %s", app_id)
         return self.scale_flogo_app(dataplane_id, capability_id, app_id, namespace, 0)
 
 
@@ -1262,42 +1120,34 @@ class RestApiDeployer:
         import time
 
         # Matches HAR: PUT /cp/v1/data-planes/{dp_id}/dp-resource?capability_instance_id={cap_id}
-        url = f"{self.tenant_host}/cp/v1/data-planes/{dataplane_id}/dp-resource"
-
-        params = {
-            'capability_instance_id': capability_id
-        }
-
         # Path matches HAR: /tibco/agent/integration/{cap_id}/bwprovisioner/private/v1/dp/bw/apps/{app_id}/scale?count={count}&namespace={ns}
-        payload = {
-            "path": f"/tibco/agent/integration/{capability_id}/bwprovisioner/private/v1/dp/bw/apps/{app_id}/scale?count={replica_count}&namespace={namespace}",
-            "dataPlaneId": dataplane_id,
-            "capabilityInstanceId": capability_id,
-            "method": "PUT"
-        }
+        req = payloads.scale_app('BWCE', self.tenant_host, dataplane_id, capability_id, app_id, namespace, replica_count)
+        url, params, payload = req.url, req.params, req.json
 
-        print(f"[DEBUG] BWCE Scale URL: {url}")
-        print(f"[DEBUG] BWCE Scale params: {params}")
-        print(f"[DEBUG] BWCE Scale payload: {json.dumps(payload, indent=2)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[DEBUG] BWCE Scale URL: %s", url)
+            logger.debug("[DEBUG] BWCE Scale params: %s", params)
+            logger.debug("[DEBUG] BWCE Scale payload: %s", LazyJson(payload))
 
         resp = self.session.put(url, json=payload, params=params, verify=False)
+        status_cache.invalidate(self.session, dataplane_id)
 
-        print(f"[DEBUG] BWCE Scale status: {resp.status_code}")
+        logger.debug("[DEBUG] BWCE Scale status: %s", resp.status_code)
 
         if resp.status_code in [200, 201, 202]:
             try:
                 result = resp.json()
-                print(f"[DEBUG] BWCE Scale response: {json.dumps(result, indent=2)}")
+                logger.debug("[DEBUG] BWCE Scale response: %s", LazyJson(result))
 
                 action = "started" if replica_count > 0 else "stopped"
-                print(f"[+] BWCE application {action} successfully!")
+                logger.info("[+] BWCE application %s successfully!", action)
                 return {"success": True, "message": result.get('message', f'App {action}')}
             except:
                 action = "start" if replica_count > 0 else "stop"
-                print(f"[+] BWCE application {action} request accepted")
+                logger.info("[+] BWCE application %s request accepted", action)
                 return {"success": True, "message": f"Request accepted"}
         else:
-            print(f"[!] Scale failed. Status: {resp.status_code}, Response: {resp.text}")
+            logger.warning("[!] Scale failed. Status: %s, Response: %s", resp.status_code, resp.text)
             return {"success": False, "error": f"HTTP {resp.status_code}"}
 
 
@@ -1315,7 +1165,7 @@ class RestApiDeployer:
         Returns:
             dict: {"success": bool, "message": str}
         """
-        print(f"[*] Starting BWCE application: {app_id}")
+        logger.info("[*] Starting BWCE application: %s", app_id)
         return self.scale_bwce_app(dataplane_id, capability_id, app_id, namespace, replica_count)
 
 
@@ -1332,7 +1182,7 @@ class RestApiDeployer:
         Returns:
             dict: {"success": bool, "message": str}
         """
-        print(f"[*] Stopping BWCE application: {app_id}")
+        logger.info("[*] Stopping BWCE application: %s", app_id)
         return self.scale_bwce_app(dataplane_id, capability_id, app_id, namespace, 0)
 
 
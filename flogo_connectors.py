@@ -0,0 +1,201 @@
+"""
+Flogo connector provisioning without duplicates.
+
+Connectors are artifacts managed by the dataplane's artifactmanager, which
+lives under the INTEGRATIONCORE capability. ConnectorManager lists the
+artifacts already provisioned on a dataplane, provisions only the missing
+connectors (the contrib_names of the apps targeting it) in one batch
+request, and caches the INTEGRATIONCORE instance id and the provisioned set
+per session and dataplane for the rest of the run.
+
+RestApiDeployer.provision_flogo_connectors delegates here, so main.py and
+deploy_apps_only.py get the same behaviour. Connectors beyond the built-in
+catalog are added with the flogo_connector_catalog section of config.json
+(see configure()); a contrib name without a catalog entry makes the result
+fail, so the apps needing it are not deployed without their connector.
+"""
+
+import threading
+import weakref
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+# Built-in connector catalog: contrib name -> artifact coordinates (from the flogo-version HAR);
+# flogo_connector_catalog in config.json adds or overrides entries
+DEFAULT_CONNECTORS = {
+    "General": {
+        "path": "/flogo-contribution/tp-flogo-connector-general/1.6.12-b03",
+        "version": "1.6.12-b03",
+        "display_name": "1.6.12",
+        "files": ["Dockerfile", "connector.zip", "contribution.json"]
+    }
+}
+
+
+def connector_artifact(name, dataplane_id, spec):
+    """artifactmanager artifact entry for one catalog connector."""
+    return {
+        "name": name,
+        "path": spec["path"],
+        "targetPath": f"{dataplane_id}/tibco/flogo/connectors",
+        "version": spec["version"],
+        "files": list(spec.get("files", ["Dockerfile", "connector.zip", "contribution.json"])),
+        "catalog": {
+            "name": name,
+            "id": name,
+            "version": spec["version"],
+            "displayName": spec.get("display_name", spec["version"])
+        }
+    }
+
+
+class _DataplaneState:
+    """Cached INTEGRATIONCORE id and provisioned connectors of one dataplane."""
+
+    __slots__ = ("lock", "integrationcore_id", "provisioned")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.integrationcore_id = None
+        self.provisioned = None  # {(name, version)} once listed
+
+
+class ConnectorManager:
+    """Provisions missing Flogo connectors per dataplane in one artifactmanager request."""
+
+    def __init__(self, catalog=None):
+        self.catalog = dict(DEFAULT_CONNECTORS if catalog is None else catalog)
+        self.lock = threading.Lock()
+        self.states = weakref.WeakKeyDictionary()  # session -> {(host, dataplane_id): _DataplaneState}
+
+    def _state(self, deployer, dataplane_id):
+        with self.lock:
+            states = self.states.setdefault(deployer.session, {})
+            key = (deployer.tenant_host, dataplane_id)
+            state = states.get(key)
+            if state is None:
+                state = states[key] = _DataplaneState()
+            return state
+
+    def integrationcore_id(self, deployer, dataplane_id):
+        """INTEGRATIONCORE capability instance id, looked up once per dataplane."""
+        state = self._state(deployer, dataplane_id)
+        with state.lock:
+            if not state.integrationcore_id:
+                state.integrationcore_id = deployer._get_integrationcore_capability_id(dataplane_id)
+            return state.integrationcore_id
+
+    def _list_artifacts(self, deployer, dataplane_id, integrationcore_id, flogo_capability_id):
+        """{(name, version)} of connector artifacts on the dataplane, or None when listing failed."""
+        url = f"{deployer.tenant_host}/tp-cp-ws/v1/data-planes/{dataplane_id}/dp-resource"
+        params = {
+            'capability_instance_id': flogo_capability_id,
+            'path': f"/tibco/agent/integration/{integrationcore_id}/artifactmanager/v1/artifacts"
+        }
+        try:
+            resp = deployer.session.get(url, params=params, verify=False)
+            if resp.status_code != 200:
+                logger.warning("[!] Could not list provisioned connectors. Status: %s", resp.status_code)
+                return None
+            data = resp.json()
+        except Exception as e:
+            logger.warning("[!] Could not list provisioned connectors: %s", e)
+            return None
+
+        artifacts = data if isinstance(data, list) else (data or {}).get('artifacts') or (data or {}).get('data') or []
+        return {(a.get('name'), a.get('version')) for a in artifacts if isinstance(a, dict) and a.get('name')}
+
+    def ensure(self, deployer, dataplane_id, flogo_capability_id, connectors):
+        """
+        Provision the connectors that are not on the dataplane yet.
+
+        Args:
+            deployer: RestApiDeployer (session, tenant host and the batch POST)
+            dataplane_id (str): Dataplane ID
+            flogo_capability_id (str): Flogo capability instance ID
+            connectors (list): Contrib names, e.g. the union of the apps' contrib_names
+
+        Returns:
+            dict: {"success": bool, "connectors": [artifacts posted], "existing": [names],
+                   "unknown": [names without a catalog entry], "error": str on failure}.
+            success is False when any connector is unknown; the known ones are still provisioned.
+        """
+        unknown = sorted(name for name in set(connectors) if name not in self.catalog)
+        for name in unknown:
+            logger.warning("[!] No catalog entry for connector '%s' (add it to flogo_connector_catalog)", name)
+        wanted = sorted(name for name in set(connectors) if name in self.catalog)
+        if not wanted:
+            logger.warning("[!] No artifacts to provision")
+            return {"success": False, "error": _unknown_error(unknown) if unknown else "No valid connectors",
+                    "unknown": unknown}
+
+        result = self._ensure(deployer, dataplane_id, flogo_capability_id, wanted)
+        result["unknown"] = unknown
+        if unknown and result.get('success'):
+            result.update({"success": False, "error": _unknown_error(unknown)})
+        return result
+
+    def _ensure(self, deployer, dataplane_id, flogo_capability_id, wanted):
+
+        integrationcore_id = self.integrationcore_id(deployer, dataplane_id)
+        if not integrationcore_id:
+            logger.warning("[!] Could not find INTEGRATIONCORE capability")
+            return {"success": False, "error": "INTEGRATIONCORE capability not found"}
+        logger.info("[+] Found INTEGRATIONCORE capability ID: %s", integrationcore_id)
+
+        state = self._state(deployer, dataplane_id)
+        # Held for list + POST so concurrent tasks for one dataplane never post the same connector twice
+        with state.lock:
+            if state.provisioned is None:
+                state.provisioned = self._list_artifacts(deployer, dataplane_id, integrationcore_id,
+                                                         flogo_capability_id)
+            provisioned = state.provisioned or set()
+
+            existing = [name for name in wanted if (name, self.catalog[name]["version"]) in provisioned]
+            missing = [name for name in wanted if name not in existing]
+            if existing:
+                logger.info("[+] Connectors already provisioned: %s", ', '.join(existing))
+            if not missing:
+                return {"success": True, "connectors": [], "existing": existing}
+
+            artifacts = [connector_artifact(name, dataplane_id, self.catalog[name]) for name in missing]
+            result = deployer._post_connector_artifacts(dataplane_id, flogo_capability_id, integrationcore_id, artifacts)
+            if result.get('success'):
+                if state.provisioned is not None:
+                    state.provisioned.update((a["name"], a["version"]) for a in artifacts)
+            else:
+                # Unknown outcome: list again next time
+                state.provisioned = None
+            result["existing"] = existing
+            return result
+
+
+def _unknown_error(unknown):
+    return f"No catalog entry for connector(s): {', '.join(unknown)}"
+
+
+# Process-wide manager used by RestApiDeployer
+manager = ConnectorManager()
+
+
+def configure(config):
+    """
+    Merge flogo_connector_catalog from config.json over DEFAULT_CONNECTORS.
+
+    Each entry maps a contrib name to {"path", "version", "display_name", "files"}
+    as in DEFAULT_CONNECTORS; path and version are required.
+    """
+    entries = (config or {}).get('flogo_connector_catalog') or {}
+    catalog = dict(DEFAULT_CONNECTORS)
+    for name, spec in entries.items():
+        if not isinstance(spec, dict) or not spec.get('path') or not spec.get('version'):
+            logger.warning("[!] Ignoring flogo_connector_catalog entry '%s': path and version are required", name)
+            continue
+        catalog[name] = dict(spec)
+    manager.catalog = catalog
+    if entries:
+        logger.info("[*] Flogo connector catalog: %s", ', '.join(sorted(catalog)))
+    return manager
@@ -0,0 +1,222 @@
+"""
+Lightweight HTML form extraction for the SAML login flow.
+
+Each login parses four or more pages (SAML request form, IdP login form,
+SAMLResponse form, final page) plus the landing page for the RelayState.
+BeautifulSoup builds a full tree for every one of them although only the
+first <form> and its <input> fields are needed. FormParser is a stdlib
+HTMLParser that collects the first form's action and inputs and stops at
+its </form>; RelayParser looks for the first relayState= link. When the
+stdlib parser fails on a page, BeautifulSoup (if installed) is used as a
+fallback with the previous extraction logic.
+
+Micro-benchmark (pages from a HAR recording, or built-in sample pages):
+    python form_extract.py --har run.har --iterations 500
+"""
+
+import argparse
+import json
+import time
+import urllib.parse
+from html.parser import HTMLParser
+
+from logging_config import get_logger
+
+try:
+    from bs4 import BeautifulSoup
+except ImportError:  # optional: only used as a fallback and by the benchmark
+    BeautifulSoup = None
+
+logger = get_logger(__name__)
+
+
+class _Done(Exception):
+    """Raised by the parsers to stop feeding once the answer is known."""
+
+
+class FormParser(HTMLParser):
+    """Collects action and named inputs of the first <form>, stopping at its end tag."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.found = False
+        self.action = None
+        self.inputs = {}
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'form' and not self.found:
+            self.found = True
+            self.action = dict(attrs).get('action')
+        elif tag == 'input' and self.found:
+            attrs = dict(attrs)
+            if attrs.get('name'):
+                self.inputs[attrs['name']] = attrs.get('value') or ''
+
+    def handle_endtag(self, tag):
+        if tag == 'form' and self.found:
+            raise _Done()
+
+
+class RelayParser(HTMLParser):
+    """Finds the first relayState in an a/form/input href, action or value."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.relay_state = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag not in ('a', 'form', 'input'):
+            return
+        attrs = dict(attrs)
+        href = attrs.get('href') or attrs.get('action') or attrs.get('value')
+        if href and 'relayState=' in href:
+            query = urllib.parse.urlparse(href).query or href
+            state = urllib.parse.parse_qs(query).get('relayState', [None])[0]
+            if state:
+                self.relay_state = state
+                raise _Done()
+
+
+def _feed(parser, html):
+    try:
+        parser.feed(html)
+        parser.close()
+    except _Done:
+        pass
+    return parser
+
+
+def _soup_form(html):
+    soup = BeautifulSoup(html, 'html.parser')
+    form = soup.find('form')
+    if not form:
+        return None, {}
+    inputs = {inp.get('name'): inp.get('value', '') for inp in form.find_all('input') if inp.get('name')}
+    return form.get('action'), inputs
+
+
+def _soup_relay_state(html):
+    soup = BeautifulSoup(html, 'html.parser')
+    for link in soup.find_all(['a', 'form', 'input'], recursive=True):
+        href = link.get('href') or link.get('action') or link.get('value')
+        if href and 'relayState=' in href:
+            query = urllib.parse.urlparse(href).query or href
+            state = urllib.parse.parse_qs(query).get('relayState', [None])[0]
+            if state:
+                return state
+    return None
+
+
+def extract_form(html, base_url=None):
+    """
+    Action and input fields of the first form in a page.
+
+    Args:
+        html (str): Page content
+        base_url (str): URL the page was loaded from (relative actions are resolved against it)
+
+    Returns:
+        tuple: (absolute action URL or None, {input name: value}); (None, {}) without a form
+    """
+    try:
+        parser = _feed(FormParser(), html or '')
+        found, action, inputs = parser.found, parser.action, parser.inputs
+    except Exception as e:
+        if BeautifulSoup is None:
+            raise
+        logger.debug("[DEBUG] HTMLParser failed (%s), falling back to BeautifulSoup", e)
+        action, inputs = _soup_form(html)
+        found = action is not None or bool(inputs)
+
+    if not found:
+        return None, {}
+    if action and base_url:
+        action = urllib.parse.urljoin(base_url, action)
+    return action, inputs
+
+
+def find_relay_state(html):
+    """First relayState carried by a link, form action or input value, or None."""
+    try:
+        return _feed(RelayParser(), html or '').relay_state
+    except Exception as e:
+        if BeautifulSoup is None:
+            raise
+        logger.debug("[DEBUG] HTMLParser failed (%s), falling back to BeautifulSoup", e)
+        return _soup_relay_state(html)
+
+
+# ---------------------------------------------------------------------------
+# Micro-benchmark
+# ---------------------------------------------------------------------------
+
+def sample_pages():
+    """Login-flow pages shaped like the IdP's (auto-post forms behind a heavy head)."""
+    head = ("<head><title>Sign in</title>"
+            + "".join(f'<link rel="stylesheet" href="/static/css/app{i}.css"/>' for i in range(20))
+            + "<style>" + "body{margin:0;padding:0}" * 200 + "</style>"
+            + "<script>" + "window.__cfg=window.__cfg||{};" * 400 + "</script></head>")
+    saml = "PHNhbWxwOlJlc3BvbnNlIElEPSJfYWJjIi8+" * 150
+    return [
+        f'<html>{head}<body><form method="post" action="/idp/sso">'
+        f'<input type="hidden" name="SAMLRequest" value="{saml[:800]}"/>'
+        f'<input type="hidden" name="RelayState" value="eyJyZXN1bWVVUkwiOiIvY3AvYXBwL2hvbWUifQ=="/>'
+        f'<input type="submit" value="Continue"/></form>' + "<div>footer</div>" * 200 + '</body></html>',
+        f'<html>{head}<body>' + '<div class="banner"><p>Welcome</p></div>' * 50
+        + '<form method="post" action="/idp/login"><input name="username" value=""/>'
+          '<input type="password" name="password" value=""/><input type="hidden" name="RelayState" value="abc"/>'
+          '<button type="submit">Sign in</button></form></body></html>',
+        f'<html>{head}<body><form method="post" action="https://cp.example.com/idm/v1/saml-acs">'
+        f'<input type="hidden" name="SAMLResponse" value="{saml}"/>'
+        f'<input type="hidden" name="RelayState" value="abc"/></form></body></html>',
+    ]
+
+
+def har_pages(path):
+    """HTML response bodies from a HAR recording (python main.py --record-har run.har)."""
+    with open(path, 'r') as f:
+        entries = json.load(f).get("log", {}).get("entries", [])
+    pages = []
+    for entry in entries:
+        content = entry.get("response", {}).get("content", {})
+        if 'html' in (content.get("mimeType") or '') and content.get("encoding") != "base64" and content.get("text"):
+            pages.append(content["text"])
+    return pages
+
+
+def benchmark(pages, iterations=200):
+    """Seconds per page for extract_form and (when installed) the BeautifulSoup extraction."""
+    results = {}
+    candidates = [("htmlparser", extract_form)]
+    if BeautifulSoup is not None:
+        candidates.append(("beautifulsoup", _soup_form))
+    for name, func in candidates:
+        started = time.perf_counter()
+        for _ in range(iterations):
+            for page in pages:
+                func(page)
+        results[name] = (time.perf_counter() - started) / (iterations * len(pages))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SAML form extraction")
+    parser.add_argument('--har', action='append', default=[], help="HAR recording(s) to take HTML pages from")
+    parser.add_argument('--iterations', type=int, default=200, help="Passes over the page set")
+    args = parser.parse_args()
+
+    pages = [page for path in args.har for page in har_pages(path)] or sample_pages()
+    source = ', '.join(args.har) if args.har else "built-in sample pages"
+    print(f"[*] {len(pages)} page(s) from {source}, {args.iterations} iterations")
+
+    results = benchmark(pages, args.iterations)
+    for name, seconds in results.items():
+        print(f"    {name:<14} {seconds * 1e6:10.1f} us/page")
+    if 'beautifulsoup' in results:
+        print(f"[+] Speed-up: {results['beautifulsoup'] / results['htmlparser']:.1f}x")
+    else:
+        print("[!] bs4 not installed; only the HTMLParser extractor was measured")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,397 @@
+"""
+HTTP record/replay for the population scripts.
+
+RecordingAdapter wraps the adapters mounted on each SAMLAuthenticator
+session and appends every request/response to a HAR 1.2 archive.
+ReplayAdapter answers requests from such an archive without touching the
+network, optionally reproducing the recorded server time (scaled by a
+speed factor), so main.py / deploy_apps_only.py can be rerun offline and
+their client-side overhead profiled in isolation.
+
+Usage:
+    python main.py --record-har run.har
+    python main.py --replay-har run.har --replay-speed 0     # no server delays
+    python main.py --replay-har run.har --replay-speed 1     # original timings
+"""
+
+import atexit
+import base64
+import hashlib
+import http.client
+import io
+import json
+import re
+import threading
+import time
+import urllib.parse
+from datetime import datetime, timezone
+
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from urllib3 import HTTPResponse
+
+from auth import DelegatingAdapter, register_session_hook, wrap_session_adapters
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Form/JSON fields whose values are masked in recorded request bodies
+SECRET_FIELDS = re.compile(r'pass|pwd|secret', re.I)
+
+# JSON fields that change on every run (e.g. "eventId": "bwce_build_<timestamp>") and are ignored when matching
+VOLATILE_FIELDS = ('eventId',)
+
+# The replay currently installed in this process (None when not replaying)
+_active_replay = None
+
+
+def active_replay():
+    """Return the installed HarReplay, or None when running against a live CP."""
+    return _active_replay
+
+
+def _iso(ts):
+    return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat().replace('+00:00', 'Z')
+
+
+def _header_list(headers):
+    """Header (name, value) pairs including duplicates such as Set-Cookie."""
+    items = getattr(headers, 'iteritems', None) or headers.items
+    return [{"name": k, "value": v} for k, v in items()]
+
+
+def _redact_body(body, content_type):
+    if not body:
+        return body
+    if 'application/x-www-form-urlencoded' in content_type:
+        pairs = urllib.parse.parse_qsl(body, keep_blank_values=True)
+        return urllib.parse.urlencode([(k, '***' if SECRET_FIELDS.search(k) else v) for k, v in pairs])
+    if 'json' in content_type:
+        try:
+            data = json.loads(body)
+        except ValueError:
+            return body
+        if isinstance(data, dict):
+            data = {k: ('***' if SECRET_FIELDS.search(k) and isinstance(v, str) else v) for k, v in data.items()}
+        return json.dumps(data)
+    return body
+
+
+def _body_key(body, content_type):
+    """
+    Digest of a request body for replay matching.
+
+    The body is redacted like a recorded one, multipart boundaries and
+    VOLATILE_FIELDS are masked and JSON is compared by content, so a request
+    and its recording get the same key.
+    """
+    if not body:
+        return ''
+    content_type = content_type or ''
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    if content_type.startswith('multipart/'):
+        boundary = content_type.partition('boundary=')[2].split(';')[0].strip('"')
+        if boundary:
+            body = body.replace(boundary.encode('utf-8'), b'BOUNDARY')
+    else:
+        try:
+            text = _redact_body(body.decode('utf-8'), content_type)
+        except UnicodeDecodeError:
+            text = None
+        if text is not None:
+            try:
+                data = json.loads(text) if 'json' in content_type else None
+            except ValueError:
+                data = None
+            if isinstance(data, dict):
+                data = {k: v for k, v in data.items() if k not in VOLATILE_FIELDS}
+                text = json.dumps(data, sort_keys=True)
+            body = text.encode('utf-8')
+    return hashlib.sha1(body).hexdigest()
+
+
+class HarArchive:
+    """Thread-safe HAR 1.2 log that can be saved to / loaded from disk."""
+
+    def __init__(self, path=None, entries=None):
+        self.path = path
+        self.entries = list(entries or [])
+        self.lock = threading.Lock()
+
+    def add(self, entry):
+        with self.lock:
+            self.entries.append(entry)
+
+    def to_dict(self):
+        with self.lock:
+            entries = sorted(self.entries, key=lambda e: e["startedDateTime"])
+        return {
+            "log": {
+                "version": "1.2",
+                "creator": {"name": "dp_population", "version": "1.0"},
+                "pages": [],
+                "entries": entries
+            }
+        }
+
+    def save(self, path=None):
+        path = path or self.path
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        logger.info("[+] Recorded %s HTTP exchanges to %s", len(self.entries), path)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r') as f:
+            data = json.load(f)
+        return cls(path, data.get("log", {}).get("entries", []))
+
+
+class RecordingAdapter(DelegatingAdapter):
+    """Passes requests through to the wrapped adapter and records them."""
+
+    def __init__(self, inner, archive, redact=True):
+        super().__init__(inner)
+        self.archive = archive
+        self.redact = redact
+
+    def send(self, request, **kwargs):
+        started = time.time()
+        response = super().send(request, **kwargs)
+        content = response.content  # reads the body so the elapsed time covers the full exchange
+        elapsed_ms = (time.time() - started) * 1000.0
+        self.archive.add(self._entry(request, response, content, started, elapsed_ms))
+        return response
+
+    def _entry(self, request, response, content, started, elapsed_ms):
+        parsed = urllib.parse.urlsplit(request.url)
+        request_type = request.headers.get('Content-Type', '')
+
+        post_data = None
+        body = request.body
+        if body is not None:
+            if isinstance(body, bytes):
+                try:
+                    body = body.decode('utf-8')
+                    encoded = False
+                except UnicodeDecodeError:
+                    body = base64.b64encode(body).decode('ascii')
+                    encoded = True
+            else:
+                encoded = False
+            if self.redact and not encoded:
+                body = _redact_body(body, request_type)
+            post_data = {"mimeType": request_type, "text": body}
+            if encoded:
+                post_data["encoding"] = "base64"
+
+        raw_headers = getattr(response.raw, 'headers', None) or response.headers
+        response_type = response.headers.get('Content-Type', '')
+        try:
+            text = content.decode(response.encoding or 'utf-8')
+            body_content = {"size": len(content), "mimeType": response_type, "text": text}
+        except (UnicodeDecodeError, LookupError):
+            body_content = {"size": len(content), "mimeType": response_type,
+                            "text": base64.b64encode(content).decode('ascii'), "encoding": "base64"}
+
+        entry = {
+            "startedDateTime": _iso(started),
+            "time": elapsed_ms,
+            "request": {
+                "method": request.method,
+                "url": request.url,
+                "httpVersion": "HTTP/1.1",
+                "headers": _header_list(request.headers),
+                "queryString": [{"name": k, "value": v} for k, v in urllib.parse.parse_qsl(parsed.query, keep_blank_values=True)],
+                "cookies": [],
+                "headersSize": -1,
+                "bodySize": len(request.body) if request.body else 0
+            },
+            "response": {
+                "status": response.status_code,
+                "statusText": response.reason or "",
+                "httpVersion": "HTTP/1.1",
+                "headers": _header_list(raw_headers),
+                "cookies": [],
+                "content": body_content,
+                "redirectURL": response.headers.get('Location', ''),
+                "headersSize": -1,
+                "bodySize": len(content)
+            },
+            "cache": {},
+            "timings": {"send": 0, "wait": elapsed_ms, "receive": 0}
+        }
+        if post_data is not None:
+            entry["request"]["postData"] = post_data
+        return entry
+
+
+class HarReplay:
+    """
+    Matches outgoing requests to archive entries.
+
+    A request only matches entries with the same method, full URL (query
+    string included) and body (see _body_key). Entries with the same key are
+    consumed in recording order; once they are used up, a GET or HEAD is
+    answered again with the last of them (e.g. a status poll that the TTL
+    status cache served from memory while recording). Anything else is
+    reported as unmatched.
+    """
+
+    def __init__(self, archive, speed=0.0):
+        """
+        Args:
+            archive (HarArchive): Recorded exchanges
+            speed (float): Replay speed factor for recorded server time.
+                1 reproduces the original timings, 2 halves them,
+                0 answers immediately.
+        """
+        self.archive = archive
+        self.speed = speed
+        self.lock = threading.Lock()
+        self.pending = {}  # (method, url, body key) -> unused entry indexes, in recording order
+        self.last = {}  # (method, url, body key) -> last entry index handed out
+        self.used = set()
+        self.misses = 0
+        self.repeats = 0
+        entries = archive.entries
+        for index in sorted(range(len(entries)), key=lambda i: entries[i]["startedDateTime"]):
+            request = entries[index]["request"]
+            post_data = request.get("postData") or {}
+            body = post_data.get("text")
+            if body is not None and post_data.get("encoding") == "base64":
+                body = base64.b64decode(body)
+            key = (request["method"], request["url"], _body_key(body, post_data.get("mimeType", "")))
+            self.pending.setdefault(key, []).append(index)
+
+    def match(self, request):
+        key = (request.method, request.url, _body_key(request.body, request.headers.get('Content-Type', '')))
+        with self.lock:
+            candidates = self.pending.get(key)
+            if candidates:
+                index = candidates.pop(0)
+                self.used.add(index)
+                self.last[key] = index
+            elif key in self.last and request.method in ('GET', 'HEAD'):
+                index = self.last[key]
+                self.repeats += 1
+            else:
+                self.misses += 1
+                return None
+            return self.archive.entries[index]
+
+    def delay_for(self, entry):
+        if not self.speed:
+            return 0.0
+        return entry.get("time", 0) / 1000.0 / self.speed
+
+    def report(self):
+        logger.info("[*] Replay: %s/%s recorded exchanges used, %s repeated, %s unmatched requests",
+                    len(self.used), len(self.archive.entries), self.repeats, self.misses)
+
+
+class ReplayAdapter(HTTPAdapter):
+    """Answers requests from a HarReplay instead of the network."""
+
+    def __init__(self, replay):
+        super().__init__()
+        self.replay = replay
+
+    def send(self, request, **kwargs):
+        entry = self.replay.match(request)
+        if entry is None:
+            raise RequestsConnectionError(f"No recorded response for {request.method} {request.url}", request=request)
+
+        delay = self.replay.delay_for(entry)
+        if delay:
+            time.sleep(delay)
+
+        recorded = entry["response"]
+        content = recorded.get("content", {})
+        if content.get("encoding") == "base64":
+            body = base64.b64decode(content.get("text", ""))
+        else:
+            body = (content.get("text") or "").encode('utf-8')
+
+        # The body is stored decoded, so drop transfer/encoding headers from the original response
+        headers = [(h["name"], h["value"]) for h in recorded.get("headers", [])
+                   if h["name"].lower() not in ('content-encoding', 'content-length', 'transfer-encoding')]
+        headers.append(('Content-Length', str(len(body))))
+
+        message = http.client.HTTPMessage()
+        for name, value in headers:
+            message[name] = value
+
+        raw = HTTPResponse(
+            body=io.BytesIO(body),
+            headers=headers,
+            status=recorded.get("status", 200),
+            reason=recorded.get("statusText", ""),
+            preload_content=False,
+            decode_content=False,
+            original_response=_RecordedResponse(message)
+        )
+        return self.build_response(request, raw)
+
+
+class _RecordedResponse:
+    """Minimal stand-in for http.client.HTTPResponse used for cookie extraction."""
+
+    def __init__(self, msg):
+        self.msg = msg
+
+    def isclosed(self):
+        return True
+
+    def close(self):
+        pass
+
+
+def install_recorder(path, redact=True):
+    """
+    Record every SAMLAuthenticator session created from now on.
+    The archive is written to path at interpreter exit.
+    """
+    archive = HarArchive(path)
+    register_session_hook(lambda session, auth: wrap_session_adapters(
+        session, lambda inner: RecordingAdapter(inner, archive, redact=redact)))
+    atexit.register(archive.save)
+    logger.info("[*] Recording HTTP traffic to %s", path)
+    return archive
+
+
+def install_replay(path, speed=0.0):
+    """Serve every SAMLAuthenticator session created from now on from a recorded archive."""
+    global _active_replay
+    replay = HarReplay(HarArchive.load(path), speed=speed)
+    adapter = ReplayAdapter(replay)
+    register_session_hook(lambda session, auth: wrap_session_adapters(session, lambda inner: adapter))
+    atexit.register(replay.report)
+    _active_replay = replay
+    logger.info("[*] Replaying %s recorded exchanges from %s (speed %s)", len(replay.archive.entries), path, speed)
+    return replay
+
+
+def add_arguments(parser):
+    """Add --record-har / --replay-har / --replay-speed to an argparse parser."""
+    group = parser.add_argument_group('record/replay')
+    group.add_argument('--record-har', metavar='PATH', default=None,
+                       help='Record all HTTP traffic to a HAR file')
+    group.add_argument('--replay-har', metavar='PATH', default=None,
+                       help='Replay HTTP responses from a HAR file instead of contacting the CP')
+    group.add_argument('--replay-speed', type=float, default=0.0,
+                       help='Replay speed for recorded server time: 1 = original, 2 = twice as fast, '
+                            '0 = no delay (default: 0)')
+
+
+def install_from_args(args):
+    """Install recording or replay according to parsed add_arguments() options."""
+    if args.record_har and args.replay_har:
+        raise SystemExit("[!] --record-har and --replay-har cannot be used together")
+    if args.record_har:
+        return install_recorder(args.record_har)
+    if args.replay_har:
+        return install_replay(args.replay_har, speed=args.replay_speed)
+    return None
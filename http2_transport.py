@@ -0,0 +1,246 @@
+"""
+Optional HTTP/2 transport for requests sessions.
+
+With HTTP/1.1 every concurrent request to the CP ingress needs its own
+TCP+TLS connection (connection_pool.py keeps up to pool_maxsize of them per
+host). HTTP2Adapter is a requests transport adapter that sends requests
+through one shared httpx.Client with http2=True, so concurrent requests
+from all workers are multiplexed as streams over one connection per host.
+Sessions keep their cookies, hooks and redirect handling; only the wire
+transport changes. Hosts that do not offer h2 in ALPN, and plain http://
+URLs (e.g. cp_simulator), are served over HTTP/1.1 by the same client.
+
+Requires httpx with the http2 extra (pip install 'httpx[http2]'); enable it
+with connection_pool_config.http2. Responses are read completely before
+they are returned (stream=True is not streamed).
+
+Benchmark (the local simulator is HTTP/1.1 only, so without --url the
+"http/2" row is labelled as httpx over HTTP/1.1; use --url of a CP for h2):
+    python http2_transport.py --requests 2000 --workers 32
+    python http2_transport.py --url https://<prefix>.<cp>/cp/v1/data-planes/capabilities-status --tsc <cookie>
+"""
+
+import argparse
+import http.client
+import io
+import ssl
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+try:
+    import httpx
+except ImportError:  # optional: only needed when connection_pool_config.http2 is enabled
+    httpx = None
+
+try:
+    import h2  # noqa: F401  (httpx needs it for http2=True)
+except ImportError:
+    h2 = None
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Connection-specific headers are not allowed in HTTP/2 requests
+HOP_BY_HOP_HEADERS = frozenset(("connection", "keep-alive", "proxy-connection", "transfer-encoding", "upgrade"))
+
+
+def available():
+    """True when httpx and h2 are installed."""
+    return httpx is not None and h2 is not None
+
+
+class _OriginalResponse:
+    """Enough of http.client.HTTPResponse for requests' cookie extraction."""
+
+    def __init__(self, headers):
+        self.msg = http.client.HTTPMessage()
+        for name, value in headers:
+            self.msg[name] = value
+
+    def info(self):
+        return self.msg
+
+
+class _RawResponse(io.BytesIO):
+    """Stands in for the urllib3 response behind Response.raw."""
+
+    def __init__(self, content, headers, status, version):
+        super().__init__(content)
+        self.status = status
+        self.version = version
+        self.headers = CaseInsensitiveDict(headers)
+        self._original_response = _OriginalResponse(headers)
+
+    def release_conn(self):
+        pass
+
+
+def _timeout(timeout):
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(read, connect=connect)
+    return httpx.Timeout(timeout)
+
+
+class HTTP2Adapter(BaseAdapter):
+    """requests adapter multiplexing all sessions' requests over shared httpx HTTP/2 clients."""
+
+    def __init__(self, max_connections=16):
+        if not available():
+            raise RuntimeError("HTTP/2 transport needs httpx and h2 (pip install 'httpx[http2]')")
+        super().__init__()
+        self.max_connections = max_connections
+        self.lock = threading.Lock()
+        self.clients = {}  # verify (bool) -> httpx.Client
+        self.versions = {}  # http_version -> responses
+
+    def _client(self, verify):
+        verify = bool(verify)
+        with self.lock:
+            client = self.clients.get(verify)
+            if client is None:
+                context = ssl.create_default_context()
+                context.minimum_version = ssl.TLSVersion.TLSv1_2
+                if not verify:
+                    context.check_hostname = False
+                    context.verify_mode = ssl.CERT_NONE
+                client = self.clients[verify] = httpx.Client(
+                    http2=True, verify=context, trust_env=False, follow_redirects=False,
+                    limits=httpx.Limits(max_connections=self.max_connections))
+            return client
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        headers = [(k, v) for k, v in request.headers.items() if k.lower() not in HOP_BY_HOP_HEADERS]
+        try:
+            resp = self._client(verify).request(request.method, request.url, headers=headers,
+                                                content=request.body, timeout=_timeout(timeout))
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(e, request=request)
+        except httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(e, request=request)
+        with self.lock:
+            self.versions[resp.http_version] = self.versions.get(resp.http_version, 0) + 1
+        return self.build_response(request, resp)
+
+    def build_response(self, request, resp):
+        # Like HTTPAdapter.build_response, from an already read httpx response
+        headers = resp.headers.multi_items()
+        response = requests.Response()
+        response.status_code = resp.status_code
+        response.headers = CaseInsensitiveDict(headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = _RawResponse(resp.content, headers, resp.status_code, resp.http_version)
+        response.reason = resp.reason_phrase
+        response.url = request.url
+        response._content = resp.content
+        response._content_consumed = True
+        requests.cookies.extract_cookies_to_jar(response.cookies, request, response.raw)
+        response.request = request
+        response.connection = self
+        return response
+
+    def connect(self, url):
+        """Open the (single, multiplexed) connection to a host ahead of use."""
+        self._client(False).request('HEAD', url, timeout=httpx.Timeout(10))
+
+    def close(self):
+        # Shared by many sessions (see connection_pool.SharedAdapter)
+        pass
+
+    def close_pools(self):
+        with self.lock:
+            clients, self.clients = list(self.clients.values()), {}
+        for client in clients:
+            client.close()
+
+
+# ---------------------------------------------------------------------------
+# Benchmark: pooled HTTP/1.1 vs HTTP/2 through a requests session
+# ---------------------------------------------------------------------------
+
+def _session(adapter):
+    session = requests.Session()
+    session.verify = False
+    session.trust_env = False
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def run_load(session, url, total, workers, cookies=None):
+    """Send `total` GETs from `workers` threads; returns wall seconds and sorted latencies."""
+    if cookies:
+        session.cookies.update(cookies)
+    latencies = []
+
+    def one(_):
+        started = time.perf_counter()
+        session.get(url, timeout=30).raise_for_status()
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        latencies.extend(executor.map(one, range(total)))
+    return time.perf_counter() - started, sorted(latencies)
+
+
+def main():
+    import connection_pool
+
+    parser = argparse.ArgumentParser(description="Compare pooled HTTP/1.1 with the HTTP/2 transport")
+    parser.add_argument('--url', help="URL to GET (default: capabilities-status on an in-process cp_simulator)")
+    parser.add_argument('--tsc', help="tsc cookie to send with --url")
+    parser.add_argument('--requests', type=int, default=1000, help="Requests per transport")
+    parser.add_argument('--workers', type=int, default=16, help="Concurrent threads")
+    parser.add_argument('--sim-latency-ms', type=int, default=5, help="Simulator latency per request")
+    args = parser.parse_args()
+
+    sim = None
+    cookies = {'tsc': args.tsc} if args.tsc else None
+    url = args.url
+    if not url:
+        from cp_simulator import CPSimulator
+        sim = CPSimulator(port=0, latency_ms=args.sim_latency_ms).start()
+        with sim.lock:
+            sim.sessions['benchmark'] = {"user": "benchmark", "tenant": "benchmark"}
+        url = f"{sim.base_url}/t/benchmark/cp/v1/data-planes/capabilities-status"
+        cookies = {'tsc': 'benchmark'}
+        print("[!] cp_simulator speaks HTTP/1.1 only: the httpx transport is measured without HTTP/2 "
+              "(pass --url of an h2-capable CP to compare HTTP/2)")
+
+    transports = [("http/1.1 pooled", connection_pool.SharedTLSAdapter(pool_maxsize=args.workers))]
+    if available():
+        transports.append(("http/2", HTTP2Adapter(max_connections=args.workers)))
+    else:
+        print("[!] httpx / h2 not installed; only the HTTP/1.1 path is measured")
+
+    try:
+        print(f"[*] {args.requests} GET {url} with {args.workers} workers")
+        for name, adapter in transports:
+            wall, latencies = run_load(_session(adapter), url, args.requests, args.workers, cookies)
+            p50 = latencies[len(latencies) // 2]
+            p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            versions = getattr(adapter, 'versions', None)
+            negotiated = ', '.join(f"{v}: {n}" for v, n in (versions or {}).items()) or "HTTP/1.1"
+            if versions is not None and "HTTP/2" not in versions:
+                # The server did not negotiate h2: this row is httpx over HTTP/1.1, not HTTP/2
+                name = "httpx (NOT h2)"
+            print(f"    {name:<16} {args.requests / wall:8.0f} req/s  p50 {p50 * 1000:6.1f} ms  "
+                  f"p95 {p95 * 1000:6.1f} ms  ({negotiated})")
+            adapter.close_pools()
+            if versions is not None and "HTTP/2" not in versions:
+                print("[!] No response used HTTP/2; this result does not measure HTTP/2 multiplexing")
+    finally:
+        if sim is not None:
+            sim.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,260 @@
+"""
+Authenticated sessions for every identity of a run.
+
+main.py used to create a SAMLAuthenticator per step (admin, tenant admin,
+invited user), log it out after a few requests and log in again for the
+next target prefix. IdentityManager keeps one authenticated session per
+(host, username) for the whole run:
+
+- login() logs an identity in on first use and returns the cached
+  authenticator afterwards; independent identities can be logged in
+  concurrently with login_all()
+- sessions are refreshed (login flow re-run on the same session) shortly
+  before the tsc cookie expires, or after session_lifetime_seconds when the
+  cookie carries no expiry; a background refresher does this between uses
+- service() / deployer() hand out TenantService / RestApiDeployer objects
+  bound to an identity's session
+- logout_all() ends all sessions at the end of the run
+
+Usage:
+    identities = IdentityManager.from_config(config)
+    auth = identities.login(host, username, password, fallback_relay_state, label="tenant")
+    service = identities.service(host, username)
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from auth import SAMLAuthenticator
+from services import TenantService
+from deploy_rest_api import RestApiDeployer
+from logging_config import get_logger
+import relay_resolver
+import connection_pool
+
+logger = get_logger(__name__)
+
+DEFAULT_SESSION_LIFETIME_SECONDS = 1800
+DEFAULT_REFRESH_BEFORE_SECONDS = 120
+DEFAULT_REFRESH_CHECK_SECONDS = 30
+
+
+def login_with_fallback(auth, fallback_relay_state, label):
+    """Log in with the RelayState strategy that works for the host (generated or dynamic)."""
+    # Also used by the session's re-authentication after expiry
+    auth.fallback_relay_state = fallback_relay_state
+    return relay_resolver.login(auth, fallback_relay_state, label)
+
+
+def cookie_expiry(session, name='tsc'):
+    """Expiry (epoch seconds) of a session cookie, or None for a browser-session cookie."""
+    expiries = [c.expires for c in session.cookies if c.name == name and c.expires]
+    return min(expiries) if expiries else None
+
+
+class Identity:
+    """One (host, username) login and its session state."""
+
+    __slots__ = ("host", "username", "password", "fallback_relay_state", "label",
+                 "lock", "auth", "service", "logged_in_at", "expires_at")
+
+    def __init__(self, host, username, password, fallback_relay_state=None, label=None):
+        self.host = host
+        self.username = username
+        self.password = password
+        self.fallback_relay_state = fallback_relay_state
+        self.label = label or username
+        self.lock = threading.Lock()
+        self.auth = None
+        self.service = None
+        self.logged_in_at = None
+        self.expires_at = None
+
+    @property
+    def logged_in(self):
+        return self.logged_in_at is not None
+
+
+class IdentityManager:
+    """Run-wide registry of authenticated sessions keyed by (host, username)."""
+
+    def __init__(self, session_lifetime=DEFAULT_SESSION_LIFETIME_SECONDS,
+                 refresh_before=DEFAULT_REFRESH_BEFORE_SECONDS, refresh_check=DEFAULT_REFRESH_CHECK_SECONDS):
+        self.session_lifetime = session_lifetime
+        self.refresh_before = refresh_before
+        self.refresh_check = refresh_check
+        self.lock = threading.Lock()
+        self.identities = {}  # (host, username) -> Identity
+        self.stats = {"logins": 0, "refreshes": 0, "reused": 0}
+        self._stop = threading.Event()
+        self._refresher = None
+
+    @classmethod
+    def from_config(cls, config):
+        """Manager configured from identity_config (session_lifetime_seconds, refresh_before_seconds, ...)."""
+        identity_config = (config or {}).get('identity_config', {})
+        return cls(
+            session_lifetime=float(identity_config.get('session_lifetime_seconds', DEFAULT_SESSION_LIFETIME_SECONDS)),
+            refresh_before=float(identity_config.get('refresh_before_seconds', DEFAULT_REFRESH_BEFORE_SECONDS)),
+            refresh_check=float(identity_config.get('refresh_check_seconds', DEFAULT_REFRESH_CHECK_SECONDS))
+        )
+
+    @staticmethod
+    def key(host, username):
+        return (host.rstrip('/'), username)
+
+    def register(self, host, username, password, fallback_relay_state=None, label=None):
+        """Add an identity (without logging in); updates credentials of a known one."""
+        key = self.key(host, username)
+        with self.lock:
+            identity = self.identities.get(key)
+            if identity is None:
+                identity = self.identities[key] = Identity(key[0], username, password, fallback_relay_state, label)
+            else:
+                identity.password = password
+                identity.fallback_relay_state = fallback_relay_state or identity.fallback_relay_state
+                identity.label = label or identity.label
+            return identity
+
+    def _identity(self, host, username):
+        identity = self.identities.get(self.key(host, username))
+        if identity is None:
+            raise KeyError(f"Unknown identity {username} @ {host}")
+        return identity
+
+    def _needs_refresh(self, identity):
+        if not identity.logged_in:
+            return True
+        return time.time() >= identity.expires_at - self.refresh_before
+
+    def _login(self, identity, refresh=False):
+        # Called with identity.lock held. A refresh re-runs the flow on the same
+        # session so services and deployers bound to it stay valid.
+        if identity.auth is None:
+            identity.auth = SAMLAuthenticator(identity.host, identity.username, identity.password)
+        if not refresh:
+            # Open connections for the API calls that follow while the SAML flow runs
+            connection_pool.prewarm(identity.host)
+        if not login_with_fallback(identity.auth, identity.fallback_relay_state, identity.label):
+            identity.logged_in_at = identity.expires_at = None
+            return False
+
+        now = time.time()
+        identity.logged_in_at = now
+        identity.expires_at = cookie_expiry(identity.auth.session) or now + self.session_lifetime
+        self.stats["refreshes" if refresh else "logins"] += 1
+        logger.debug("[DEBUG] %s %s session valid for %.0fs", "Refreshed" if refresh else "Opened",
+                     identity.label, identity.expires_at - now)
+        return True
+
+    def login(self, host, username, password=None, fallback_relay_state=None, label=None):
+        """
+        Authenticated SAMLAuthenticator for an identity, logging in on first use.
+
+        Args:
+            host (str): Host to log in to (admin or tenant host)
+            username (str): Login user
+            password (str): Password (registers the identity when given)
+            fallback_relay_state (str): RelayState used when the dynamic one fails
+            label (str): Name used in log messages (admin, tenant, new user)
+
+        Returns:
+            SAMLAuthenticator: Logged-in authenticator, or None when the login failed
+                               (a later call tries again)
+        """
+        if password is not None:
+            identity = self.register(host, username, password, fallback_relay_state, label)
+        else:
+            identity = self._identity(host, username)
+
+        with identity.lock:
+            if not self._needs_refresh(identity):
+                self.stats["reused"] += 1
+                return identity.auth
+            if not self._login(identity, refresh=identity.logged_in):
+                return None
+            return identity.auth
+
+    def login_all(self, keys=None, max_workers=4):
+        """
+        Log in several registered identities concurrently.
+
+        Args:
+            keys (list): (host, username) pairs; default all registered identities
+            max_workers (int): Parallel logins
+
+        Returns:
+            dict: {(host, username): bool}
+        """
+        with self.lock:
+            keys = [self.key(*k) for k in keys] if keys is not None else list(self.identities)
+        if not keys:
+            return {}
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(keys)))) as executor:
+            results = executor.map(lambda k: self.login(*k) is not None, keys)
+            return dict(zip(keys, results))
+
+    def service(self, host, username):
+        """TenantService bound to the identity's session (one per identity)."""
+        identity = self._identity(host, username)
+        auth = self.login(host, username)
+        if auth is None:
+            return None
+        with identity.lock:
+            if identity.service is None:
+                identity.service = TenantService(auth)
+            return identity.service
+
+    def deployer(self, host, username, tenant_host=None):
+        """New RestApiDeployer on the identity's session."""
+        auth = self.login(host, username)
+        if auth is None:
+            return None
+        return RestApiDeployer(auth.session, tenant_host or host)
+
+    def refresh_due(self):
+        """Refresh every logged-in identity whose session is about to expire."""
+        with self.lock:
+            identities = list(self.identities.values())
+        for identity in identities:
+            with identity.lock:
+                if identity.logged_in and self._needs_refresh(identity):
+                    logger.info("[*] Refreshing %s session before expiry", identity.label)
+                    if not self._login(identity, refresh=True):
+                        logger.warning("[!] Session refresh failed for %s", identity.label)
+
+    def _refresh_loop(self):
+        while not self._stop.wait(self.refresh_check):
+            try:
+                self.refresh_due()
+            except Exception as e:
+                logger.warning("[!] Session refresher error: %s", e)
+
+    def start(self):
+        """Start the background refresher (idempotent)."""
+        if self._refresher is None and self.refresh_check > 0:
+            self._stop.clear()
+            self._refresher = threading.Thread(target=self._refresh_loop, name="identity-refresher", daemon=True)
+            self._refresher.start()
+        return self
+
+    def stop(self):
+        if self._refresher is not None:
+            self._stop.set()
+            self._refresher.join(timeout=5)
+            self._refresher = None
+
+    def logout_all(self):
+        """Stop refreshing and log out every logged-in identity."""
+        self.stop()
+        with self.lock:
+            identities = list(self.identities.values())
+        for identity in identities:
+            with identity.lock:
+                if identity.logged_in:
+                    if identity.auth.logout():
+                        logger.info("[+] Logged out %s (%s)", identity.label, identity.username)
+                    else:
+                        logger.warning("[!] Logout failed for %s (%s)", identity.label, identity.username)
+                    identity.logged_in_at = identity.expires_at = None
@@ -0,0 +1,191 @@
+"""
+Logging setup for the population scripts.
+
+Modules log through get_logger(__name__). Until setup_logging() is called
+messages at INFO and above go straight to stdout unchanged, so scripts
+that never configure logging behave as before. setup_logging() sets the
+console level and can add a log file; the file handler sits behind a
+QueueHandler so the disk I/O happens on a background QueueListener thread
+instead of in the parallel workflow workers. The console stays synchronous
+so log lines keep their order relative to the remaining print() output.
+
+Messages logged from inside a workflow task are prefixed with the task
+name ("[Install DP 0] ...") so interleaved worker output stays attributable.
+Expensive payload dumps should be passed as LazyJson(obj) arguments, e.g.
+    logger.debug("[DEBUG] Status response: %s", LazyJson(result))
+so json.dumps only runs when DEBUG is enabled.
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+
+
+ROOT_LOGGER = "dp_population"
+
+VERBOSITY_LEVELS = {
+    "error": logging.ERROR,
+    "warning": logging.WARNING,
+    "info": logging.INFO,
+    "debug": logging.DEBUG
+}
+
+FILE_FORMAT = "%(asctime)s %(levelname)-7s %(threadName)s [%(task)s] %(name)s: %(message)s"
+
+_listener = None
+
+
+class LazyJson:
+    """Defers json.dumps(obj) until the log record is actually formatted."""
+
+    __slots__ = ("obj", "indent", "limit")
+
+    def __init__(self, obj, indent=2, limit=None):
+        self.obj = obj
+        self.indent = indent
+        self.limit = limit
+
+    def __str__(self):
+        try:
+            text = json.dumps(self.obj, indent=self.indent, default=str)
+        except (TypeError, ValueError):
+            text = repr(self.obj)
+        if self.limit and len(text) > self.limit:
+            return text[:self.limit] + "..."
+        return text
+
+
+class TaskFilter(logging.Filter):
+    """Tags each record with the workflow task running on the emitting thread."""
+
+    def filter(self, record):
+        if not hasattr(record, "task"):
+            # Imported lazily: workflow pulls in tracing/auth, which log through this module
+            from workflow import current_task
+            task = current_task()
+            record.task = task.name if task else "-"
+        return True
+
+
+class ConsoleFormatter(logging.Formatter):
+    """Message text only, each line prefixed with the task name when logged from a task."""
+
+    def format(self, record):
+        message = super().format(record)
+        task = getattr(record, "task", "-")
+        if task == "-":
+            return message
+        return "\n".join(f"[{task}] {line}" if line.strip() else line for line in message.split("\n"))
+
+
+class StdoutHandler(logging.StreamHandler):
+    """StreamHandler bound to the current sys.stdout (follows contextlib.redirect_stdout)."""
+
+    def __init__(self):
+        super().__init__(sys.stdout)
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+def _console_handler():
+    handler = StdoutHandler()
+    handler.setFormatter(ConsoleFormatter("%(message)s"))
+    return handler
+
+
+def _configure_default():
+    root = logging.getLogger(ROOT_LOGGER)
+    if not root.handlers:
+        handler = _console_handler()
+        handler.addFilter(TaskFilter())
+        root.addHandler(handler)
+        root.setLevel(logging.INFO)
+        root.propagate = False
+
+
+def get_logger(name):
+    """Logger under the dp_population hierarchy for a module (pass __name__)."""
+    _configure_default()
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+def setup_logging(verbosity="info", log_file=None, file_verbosity="debug"):
+    """
+    Configure leveled logging.
+
+    Args:
+        verbosity (str): Console level: error, warning, info or debug
+        log_file (str): Optional file receiving records at file_verbosity
+            with timestamp, level, thread and task (written asynchronously)
+        file_verbosity (str): Level written to log_file
+
+    Returns:
+        logging.Logger: The dp_population root logger
+    """
+    global _listener
+
+    console_level = VERBOSITY_LEVELS.get(str(verbosity).lower(), logging.INFO)
+    root = logging.getLogger(ROOT_LOGGER)
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    shutdown_logging()
+
+    console = _console_handler()
+    console.setLevel(console_level)
+    console.addFilter(TaskFilter())
+    root.addHandler(console)
+
+    root_level = console_level
+    if log_file:
+        file_level = VERBOSITY_LEVELS.get(str(file_verbosity).lower(), logging.DEBUG)
+        file_handler = logging.FileHandler(log_file, mode="a", encoding="utf-8")
+        file_handler.setFormatter(logging.Formatter(FILE_FORMAT))
+
+        log_queue = queue.SimpleQueue()
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        queue_handler.setLevel(file_level)
+        queue_handler.addFilter(TaskFilter())
+        root.addHandler(queue_handler)
+
+        _listener = logging.handlers.QueueListener(log_queue, file_handler)
+        _listener.start()
+        atexit.register(shutdown_logging)
+        root_level = min(root_level, file_level)
+
+    root.setLevel(root_level)
+    root.propagate = False
+    return root
+
+
+def shutdown_logging():
+    """Flush queued file records and stop the background listener."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def add_arguments(parser):
+    """Add --verbosity / --log-file to an argparse parser."""
+    parser.add_argument('--verbosity', choices=list(VERBOSITY_LEVELS), default=None,
+                        help='Console log level (default: logging_config.verbosity or info)')
+    parser.add_argument('--log-file', metavar='PATH', default=None,
+                        help='Also write timestamped logs with thread/task names to PATH '
+                             '(logging_config.file_verbosity, default debug)')
+
+
+def setup_from_config(config, verbosity=None, log_file=None):
+    """setup_logging() with CLI values taking precedence over logging_config."""
+    logging_config = (config or {}).get('logging_config', {})
+    return setup_logging(verbosity or logging_config.get('verbosity', 'info'),
+                         log_file or logging_config.get('file'),
+                         logging_config.get('file_verbosity', 'debug'))
@@ -1,490 +1,1031 @@
-from auth import SAMLAuthenticator
-from services import TenantService
-from utils import generate_admin_relay_state, generate_tenant_relay_state, load_config, execute_commands_sequentially, save_commands_to_file
+from identity_manager import IdentityManager
+from utils import generate_admin_relay_state, generate_tenant_relay_state, get_tenant_host, load_config, execute_commands_sequentially, save_commands_to_file
+from workflow import Workflow
+import har_replay
+import tracing
+import metrics
+import status_cache
+import catalog_cache
+import flogo_connectors
+import connection_pool
+import rate_limit
+import resource_index
+import user_index
 import subprocess
 import sys
+import os
 import argparse
 import time
-import json
+import logging_config
+
+logger = logging_config.get_logger(__name__)
+
+# Users printed by "Listing Users from CP" at info level (the rest at debug)
+USERS_LISTED = 20
+
+
+def print_step(title):
+    logger.info("\n" + "="*60)
+    logger.info("[STEP] %s", title)
+    logger.info("="*60)
+
+
+# ---------------------------------------------------------------------------
+# Identity / subscription tasks
+# ---------------------------------------------------------------------------
+
+def task_admin_login(ctx):
+    print_step("Admin Login")
+    creds = ctx['creds']
+    # Reused across target prefixes; logged out once at the end of the run
+    admin_auth = ctx['identities'].login(ctx['admin_host'], creds.get('username'), creds.get('password'),
+                                         generate_admin_relay_state(ctx['admin_host']), label="admin")
+    if admin_auth:
+        ctx['admin_auth'] = admin_auth
+        ctx['summary']["Admin Login"] = "Pass"
+        logger.info("[+] Admin Login Successful.")
+        return True
+
+    ctx['summary']["Admin Login"] = "Fail"
+    logger.warning("[!] Admin Login Failed")
+    return False
+
+
+def task_provision_subscription(ctx):
+    print_step("Provision Subscription")
+    target_prefix = ctx['prefix']
+    admin_service = ctx['identities'].service(ctx['admin_host'], ctx['creds'].get('username'))
+
+    if admin_service.provision_subscription(target_prefix, ctx['idp_host']):
+        ctx['summary']["Provision Subscription"] = "Pass"
+        logger.info("[+] Subscription provisioning completed for: %s", target_prefix)
+    else:
+        ctx['summary']["Provision Subscription"] = "Pass (Existing)"
+        logger.info("[*] Subscription %s already exists or provisioning handled", target_prefix)
+    return True
+
+
+def task_cp_login(ctx):
+    tenant_host = ctx['tenant_host']
+    logger.info("\n[*] Authenticating to Tenant Host: %s", tenant_host)
+    creds = ctx['creds']
+
+    tenant_auth = ctx['identities'].login(tenant_host, creds.get('username'), creds.get('password'),
+                                          generate_tenant_relay_state(ctx['prefix'], tenant_host), label="tenant")
+    if tenant_auth:
+        ctx['tenant_auth'] = tenant_auth
+        ctx['tenant_identity'] = (tenant_host, creds.get('username'))
+        ctx['tenant_service'] = ctx['identities'].service(*ctx['tenant_identity'])
+        ctx['summary']["CP Login"] = "Pass"
+        logger.info("[+] Tenant Login Successful.")
+        return True
+
+    ctx['summary']["CP Login"] = "Fail"
+    logger.warning("[!] Tenant Login Failed")
+    return False
+
+
+def task_invite_user(ctx):
+    summary = ctx['summary']
+    invite_email = ctx['invite_email']
+    tenant_service = ctx['tenant_service']
+
+    # Check if user already exists before inviting
+    logger.info("[*] Checking if %s already exists...", invite_email)
+    already_exists = False
+    try:
+        already_exists = bool(invite_email) and user_index.find(tenant_service, invite_email) is not None
+    except user_index.UserIndexError as e:
+        logger.warning("[!] Could not list users (%s); inviting anyway", e)
+
+    if already_exists:
+        logger.info("[*] User %s is already registered. Skipping invite/register.", invite_email)
+        summary["Invite New User"] = "Pass (Existing)"
+        summary["Accept & Register User"] = "Pass (Existing)"
+        summary["New User Login Verification"] = "Pass (Existing)"
+        summary["Listing Users from CP"] = "Pass (Existing)"
+
+        # The CP admin session already has the permissions needed for the rest of the workflow
+        ctx['user_existed'] = True
+        ctx['user_auth'] = ctx['tenant_auth']
+        ctx['user_identity'] = ctx['tenant_identity']
+        ctx['user_service'] = tenant_service
+        logger.info("[+] Using CP admin session for workflow continuation (user %s already exists)", invite_email)
+        return True
+
+    if not invite_email:
+        summary["Invite New User"] = "Skipped"
+        summary["Accept & Register User"] = "Skipped"
+        summary["Listing Users from CP"] = "Skipped"
+        return False
+
+    if tenant_service.invite_new_user(invite_email):
+        summary["Invite New User"] = "Pass"
+        return True
+
+    summary["Invite New User"] = "Fail"
+    summary["Accept & Register User"] = "Skipped"
+    summary["Listing Users from CP"] = "Skipped"
+    return False
+
+
+def task_accept_register(ctx):
+    if ctx.get('user_existed'):
+        return True
+
+    summary = ctx['summary']
+    invite_email = ctx['invite_email']
+    if har_replay.active_replay():
+        # accept_invite.py runs in its own process and is not part of the recording
+        logger.info("[*] Replay mode: skipping Accept/Register subprocess for %s", invite_email)
+        summary["Accept & Register User"] = "Pass (Replay)"
+        return True
+
+    logger.info("\n[*] Starting Accept/Register flow for %s...", invite_email)
+    try:
+        # Use absolute path for cross-platform compatibility (works in CMD and Git Bash)
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        accept_invite_path = os.path.join(script_dir, "accept_invite.py")
+
+        result = subprocess.run([sys.executable, accept_invite_path, invite_email, ctx['config_path']],
+                                capture_output=True, text=True, cwd=script_dir)
+
+        if result.stdout:
+            logger.info("\n" + "-"*20 + " SUBPROCESS OUTPUT " + "-"*20)
+            logger.info("%s", result.stdout.strip())
+            logger.info("-" * 59 + "\n")
+
+        if result.returncode == 0:
+            logger.info("[+] Registration flow finished for %s.", invite_email)
+            summary["Accept & Register User"] = "Pass"
+
+            # Wait for user account to be fully activated
+            wait_seconds = ctx['waits'].get('user_activation_seconds', 20)
+            logger.info("[*] Waiting %s seconds for user account activation...", wait_seconds)
+            time.sleep(wait_seconds)
+            return True
+
+        logger.warning("[!] Registration script exited with code %s", result.returncode)
+        if result.stderr:
+            logger.warning("[!] Error Details:\n%s", result.stderr.strip())
+        summary["Accept & Register User"] = "Fail (Script Error)"
+    except Exception as e:
+        logger.warning("[!] Exception during registration subprocess: %s", e)
+        summary["Accept & Register User"] = "Error"
+    return False
+
+
+def task_new_user_login(ctx):
+    if ctx.get('user_existed'):
+        return True
+
+    summary = ctx['summary']
+    invite_email = ctx['invite_email']
+    tenant_host = ctx['tenant_host']
+
+    print_step("New User Login Verification")
+    logger.info("[*] Verifying login for newly invited user: %s...", invite_email)
+    wait_seconds = ctx['waits'].get('permission_propagation_seconds', 30)
+    logger.info("[*] Waiting %s seconds for full user activation and permission propagation...", wait_seconds)
+    time.sleep(wait_seconds)
+
+    try:
+        new_user_password = ctx['config'].get('new_user_details', {}).get('password', 'Tibco@2025')
+        max_retries = 5
+        for attempt in range(1, max_retries + 1):
+            logger.info("[*] Login attempt %s/%s for new user %s...", attempt, max_retries, invite_email)
+
+            new_user_auth = ctx['identities'].login(tenant_host, invite_email, new_user_password,
+                                                    generate_tenant_relay_state(ctx['prefix'], tenant_host),
+                                                    label="new user")
+            if new_user_auth:
+                logger.info("[+] Successfully logged in as %s", invite_email)
+                summary["New User Login Verification"] = "Pass"
+                ctx['user_auth'] = new_user_auth
+                ctx['user_identity'] = (tenant_host, invite_email)
+                ctx['user_service'] = ctx['identities'].service(*ctx['user_identity'])
+                return True
+
+            if attempt < max_retries:
+                # Increasing wait time: 15, 30, 45, 60 seconds by default
+                wait_time = ctx['waits'].get('login_retry_base_seconds', 15) * attempt
+                logger.warning("[!] Login attempt %s failed. Waiting %s seconds before retry...", attempt, wait_time)
+                time.sleep(wait_time)
+
+        logger.warning("[!] Failed to login with new user %s after %s attempts", invite_email, max_retries)
+        logger.warning("[!] Error: ATMOSPHERE-11004 typically means user permissions are not fully propagated")
+        logger.info("[*] The user IS registered and active, but may need more time for permissions")
+        logger.info("[*] You can manually verify login at: %s", tenant_host)
+        summary["New User Login Verification"] = "Fail (Permissions Pending)"
+        summary["Listing Users from CP"] = "Skipped"
+    except Exception as e:
+        logger.warning("[!] New User Login Verification Error: %s", e)
+        summary["New User Login Verification"] = "Fail"
+        summary["Listing Users from CP"] = "Skipped"
+    return False
+
+
+def task_list_users(ctx):
+    if ctx.get('user_existed'):
+        return True
+
+    print_step("Listing Users from CP")
+    summary = ctx['summary']
+    invite_email = ctx['invite_email']
+    new_user_service = ctx['user_service']
+
+    logger.info("[*] Verifying final user list with new user session...")
+    try:
+        users = user_index.users(new_user_service)
+    except user_index.UserIndexError:
+        users = []
+    if not users:
+        summary["Listing Users from CP"] = "Fail"
+        logger.warning("[!] Failed to retrieve users from CP with new user session")
+        return False
+
+    summary["Listing Users from CP"] = "Pass"
+    logger.info("\n[+] Successfully retrieved %s users:", len(users))
+    for idx, user in enumerate(users):
+        log = logger.info if idx < USERS_LISTED else logger.debug
+        log("    %s. %s (%s %s)", idx+1, user.get('email'), user.get('firstName'), user.get('lastName'))
+    if len(users) > USERS_LISTED:
+        logger.info("    ... and %s more (--verbosity debug lists all)", len(users) - USERS_LISTED)
+
+    # Show user details for invited user
+    logger.info("\n[*] Verifying invited user %s details...", invite_email)
+    user_info = new_user_service.get_specific_user(invite_email)
+    if user_info:
+        logger.info("[+] User activated: %s", user_info.get('email'))
+        logger.info("    Name: %s %s", user_info.get('firstName'), user_info.get('lastName'))
+        logger.info("    Roles: %s", ', '.join([r.get('roleId', 'N/A') for r in user_info.get('roles', [])]))
+        logger.info("[+] User %s is fully registered and can access CP!", invite_email)
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Dataplane tasks (one chain per dataplane)
+# ---------------------------------------------------------------------------
+
+def build_dataplane_configs(config, target_prefix):
+    """
+    Expand dataplane_config into one config per dataplane.
+    The target_prefix is prepended to the name, namespace and serviceAccountName.
+    """
+    dataplane_config = config.get('dataplane_config', {})
+    dp_count = dataplane_config.get('dpCount', 0)
+
+    base_name = dataplane_config.get('name', 'Dp1')
+    base_namespace = dataplane_config.get('namespace', 'default')
+    base_sa = dataplane_config.get('serviceAccountName', 'tibco-sa')
+
+    dp_configs = []
+    for i in range(1, dp_count + 1):
+        dp_config = dataplane_config.copy()
+        if dp_count > 1:
+            dp_config['name'] = f"{target_prefix}-{base_name}-{i}"
+            dp_config['namespace'] = f"{target_prefix}-{base_namespace}-{i}"
+            dp_config['serviceAccountName'] = f"{target_prefix}-{base_sa}-{i}"
+            aliases = {dp_config['name'], f"{base_name}-{i}"}
+        else:
+            dp_config['name'] = f"{target_prefix}-{base_name}"
+            dp_config['namespace'] = f"{target_prefix}-{base_namespace}"
+            dp_config['serviceAccountName'] = f"{target_prefix}-{base_sa}"
+            aliases = {dp_config['name'], base_name}
+        dp_configs.append((i, dp_config, aliases))
+    return dp_configs
+
+
+def make_register_task(i):
+    def task(ctx):
+        dp = ctx['dataplanes'][i]
+        dp_config = dp['config']
+        print_step(f"Register Dataplane {i}/{ctx['dp_count']}")
+        logger.info("    Name: %s", dp_config['name'])
+        logger.info("    Namespace: %s", dp_config['namespace'])
+
+        result = ctx['user_service'].register_dataplane(dp_config)
+        if not (result and result.get('success')):
+            logger.warning("[!] Dataplane %s registration failed", i)
+            return False
+
+        dp['success'] = True
+        dp['commands'] = result.get('commands', [])
+        dp['dataplane_id'] = result.get('dataplane_id', '')
+
+        logger.info("[+] Dataplane %s registered successfully!", i)
+        logger.info("    ID: %s", dp['dataplane_id'])
+        logger.info("    Commands: %s", len(dp['commands']))
+
+        save_commands_to_file(dp['commands'], f"dataplane_{dp_config['name']}_commands.txt")
+        return True
+    return task
+
+
+def make_install_task(i):
+    def task(ctx):
+        dp = ctx['dataplanes'][i]
+        commands = dp['commands']
+        if har_replay.active_replay():
+            logger.info("[*] Replay mode: skipping %s installation commands for %s", len(commands), dp['name'])
+            return True
+
+        logger.info("\n" + "=" * 60)
+        logger.info("[*] Executing installation commands for %s", dp['name'])
+        logger.info("=" * 60)
+        execution_result = execute_commands_sequentially(commands)
+
+        if not execution_result.get('success'):
+            logger.warning("[!] Some commands failed. Dataplane may not come up properly.")
+            logger.warning("    Executed: %s", execution_result.get('executed'))
+            logger.warning("    Failed: %s", execution_result.get('failed'))
+        else:
+            logger.info("[+] All %s commands executed successfully!", len(commands))
+        # A partial failure is reported but does not stop the status check
+        return True
+    return task
+
+
+def make_status_task(i):
+    def task(ctx):
+        dp = ctx['dataplanes'][i]
+        status_cfg = ctx['config'].get('dataplane_status_check', {})
+        max_wait = status_cfg.get('max_wait_seconds', 120)
+        poll_interval = status_cfg.get('poll_interval_seconds', 10)
+
+        logger.info("\n" + "=" * 60)
+        logger.info("[STEP] Check Status for Dataplane %s/%s", i, ctx['dp_count'])
+        logger.info("=" * 60)
+        logger.info("[*] Checking status for: %s (ID: %s)", dp['name'], dp['dataplane_id'])
+
+        try:
+            status_result = ctx['user_service'].check_dataplane_status(
+                dataplane_id=dp['dataplane_id'],
+                max_wait_seconds=max_wait,
+                poll_interval_seconds=poll_interval
+            )
+        except Exception as e:
+            logger.warning("[!] Status check error for dataplane %s: %s", i, e)
+            dp['status_check_result'] = {"success": False, "error": str(e)}
+            return False
+
+        dp['status_check_result'] = status_result
+        if status_result and status_result.get('success') and status_result.get('all_green'):
+            logger.info("\n[+] Dataplane %s (%s) is GREEN!", i, dp['name'])
+            logger.info("    Time taken: %.1f seconds", status_result.get('elapsed_time', 0))
+            return True
+
+        logger.warning("\n[!] Dataplane %s (%s) did not reach green status", i, dp['name'])
+        if status_result:
+            logger.info("    Time elapsed: %.1f seconds", status_result.get('elapsed_time', 0))
+        return False
+    return task
+
+
+def task_dataplane_summary(ctx):
+    summary = ctx['summary']
+    dp_count = ctx['dp_count']
+    status_check_enabled = ctx['status_check_enabled']
+    all_results = list(ctx['dataplanes'].values())
+    successful = [r for r in all_results if r['success']]
+    failed = [r for r in all_results if not r['success']]
+
+    logger.info("\n" + "=" * 60)
+    logger.info("[*] Dataplane Registration & Status Summary:")
+    logger.info("=" * 60)
+    logger.info("    Total: %s", dp_count)
+    logger.info("    Successful Registrations: %s", len(successful))
+    logger.info("    Failed Registrations: %s", len(failed))
+
+    green_count = sum(1 for r in successful if (r.get('status_check_result') or {}).get('all_green'))
+    if status_check_enabled:
+        logger.info("    Status Check: Enabled")
+        logger.info("    Green Dataplanes: %s/%s", green_count, len(successful))
+        if green_count < len(successful):
+            logger.info("    Not Green: %s/%s", len(successful) - green_count, len(successful))
+    logger.info("=" * 60 + "\n")
+
+    if not successful:
+        summary["Register Dataplanes"] = "Fail"
+        summary["Check Dataplane Status"] = "Skipped (No dataplanes registered)"
+        return False
+
+    summary["Register Dataplanes"] = f"Pass ({len(successful)}/{dp_count})"
+    if not status_check_enabled:
+        summary["Check Dataplane Status"] = "Skipped (disabled)"
+    elif green_count == len(successful):
+        summary["Check Dataplane Status"] = f"Pass ({green_count}/{len(successful)} DPs green)"
+    elif green_count > 0:
+        summary["Check Dataplane Status"] = f"Partial ({green_count}/{len(successful)} DPs green)"
+    else:
+        summary["Check Dataplane Status"] = f"Fail (0/{len(successful)} DPs green)"
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Activation server, resources and capabilities
+# ---------------------------------------------------------------------------
+
+def task_add_activation_server(ctx):
+    print_step("Add Activation Server")
+    result = ctx['user_service'].add_activation_server(ctx['config'].get('activation_server_config', {}))
+    if result and result.get('success') and result.get('resource_instance_id'):
+        ctx['activation_server_id'] = result['resource_instance_id']
+        ctx['summary']["Add Activation Server"] = "Pass"
+        return True
+
+    ctx['summary']["Add Activation Server"] = "Fail"
+    return False
+
+
+def make_link_activation_task(i):
+    def task(ctx):
+        dp = ctx['dataplanes'][i]
+        result = ctx['user_service'].associate_activation_server_to_dataplane(
+            dp['dataplane_id'], ctx['activation_server_id'])
+        dp['activation_linked'] = bool(result and result.get('success'))
+        return dp['activation_linked']
+    return task
+
+
+def task_activation_summary(ctx):
+    if ctx.get('activation_server_id') is None:
+        return False
+    linked = [dp for dp in ctx['dataplanes'].values() if dp.get('activation_linked')]
+    registered = [dp for dp in ctx['dataplanes'].values() if dp['success']]
+    ctx['summary']["Add Activation Server"] = f"Pass ({len(linked)}/{len(registered)} DPs linked)"
+    return True
+
+
+def desired_resources(resources_cfg):
+    """
+    [(resource type, resource config)] from dataplane_resources_config.
+
+    storage / ingress may each be a single dict or a list of dicts.
+    """
+    desired = []
+    for resource_type, key in ((resource_index.STORAGE, 'storage'), (resource_index.INGRESS, 'ingress')):
+        entries = resources_cfg.get(key) or []
+        if isinstance(entries, dict):
+            entries = [entries]
+        desired.extend((resource_type, entry) for entry in entries)
+    return desired
+
+
+def make_resource_task(i, resource_type, resource_cfg):
+    def task(ctx):
+        dp = ctx['dataplanes'][i]
+        result = ctx['user_service'].ensure_dataplane_resource(dp['dataplane_id'], resource_type, resource_cfg)
+        if not result.get('success'):
+            return False
+
+        resource_id = result['resource_instance_id']
+        dp['resource_ids'][(resource_type, result['resource_name'])] = resource_id
+        # The first configured storage/ingress is the one capability provisioning uses by default
+        key = 'storage_resource_id' if resource_type == resource_index.STORAGE else 'ingress_resource_id'
+        if resource_cfg is dp['primary_resources'].get(resource_type):
+            dp[key] = resource_id
+        return True
+    return task
+
+
+def make_capability_task(i, capability):
+    """capability is 'BWCE' or 'FLOGO'."""
+    def task(ctx):
+        dp = ctx['dataplanes'][i]
+        service = ctx['user_service']
+        config_key = 'bwce_capability_config' if capability == 'BWCE' else 'flogo_capability_config'
+
+        cap_config = dict(ctx['config'].get(config_key, {}))
+        # Resources set up for this dataplane: the one named by the capability config, else the primary one
+        for resource_type, key in ((resource_index.STORAGE, 'storage'), (resource_index.INGRESS, 'ingress')):
+            resource_id = (dp['resource_ids'].get((resource_type, cap_config.get(f'{key}_resource_name')))
+                           or dp.get(f'{key}_resource_id'))
+            if resource_id:
+                cap_config[f'{key}_resource_id'] = resource_id
+
+        existing_id = service.find_provisioned_capability(dp['dataplane_id'], capability)
+        if existing_id:
+            logger.info("[+] %s capability already provisioned on %s: %s", capability, dp['name'], existing_id)
+            dp[f"{capability.lower()}_capability_id"] = existing_id
+            return True
+
+        if capability == 'BWCE':
+            result = service.provision_bwce_capability(dp['dataplane_id'], dp['name'], cap_config)
+        else:
+            result = service.provision_flogo_capability(dp['dataplane_id'], dp['name'], cap_config)
+
+        if result.get('success'):
+            dp[f"{capability.lower()}_capability_id"] = result['capability_instance_id']
+            return True
+        return False
+    return task
+
+
+def task_capability_readiness_gate(ctx):
+    """Wait for every provisioned BWCE/Flogo capability on every dataplane with one combined poll."""
+    status_cfg = ctx['config'].get('combined_capability_status_check', {})
+    if not status_cfg.get('enabled', True):
+        ctx['capability_gate_checked'] = False
+        return True
+
+    targets = []
+    for dp in ctx['dataplanes'].values():
+        for capability in ctx['capabilities']:
+            cap_id = dp.get(f"{capability.lower()}_capability_id")
+            if cap_id:
+                targets.append((dp['dataplane_id'], cap_id, capability))
+    if not targets:
+        return False
+
+    print_step("Capability Readiness Gate")
+    initial_wait = status_cfg.get('initial_wait_seconds', 0)
+    if initial_wait and not har_replay.active_replay():
+        time.sleep(initial_wait)
+
+    result = ctx['user_service'].wait_for_capabilities(
+        targets,
+        max_wait_seconds=status_cfg.get('max_wait_seconds', 300),
+        poll_interval_seconds=status_cfg.get('poll_interval_seconds', 15))
+
+    ctx['capability_gate_checked'] = True
+    for dp in ctx['dataplanes'].values():
+        for capability in ctx['capabilities']:
+            cap_id = dp.get(f"{capability.lower()}_capability_id")
+            if cap_id:
+                dp[f"{capability.lower()}_green"] = cap_id in result['green']
+    return bool(result['green'])
+
+
+def capability_ready(ctx, dp, capability):
+    """Provisioned and, when the readiness gate polled, green."""
+    if not dp.get(f"{capability.lower()}_capability_id"):
+        return False
+    return not ctx.get('capability_gate_checked') or dp.get(f"{capability.lower()}_green", False)
+
+
+def make_capability_summary_task(capability):
+    def task(ctx):
+        provisioned = [dp for dp in ctx['dataplanes'].values() if dp.get(f"{capability.lower()}_capability_id")]
+        registered = [dp for dp in ctx['dataplanes'].values() if dp['success']]
+        step = "Provision BWCE Capability" if capability == 'BWCE' else "Provision Flogo Capability"
+        if not provisioned:
+            ctx['summary'][step] = "Fail"
+            return False
+        state = "Pass" if len(provisioned) == len(registered) else "Partial"
+        ctx['summary'][step] = f"{state} ({len(provisioned)}/{len(registered)} DPs)"
+        return True
+    return task
+
+
+def task_capability_status_summary(ctx):
+    checks = []
+    for dp in ctx['dataplanes'].values():
+        for capability in ctx['capabilities']:
+            if dp.get(f"{capability.lower()}_capability_id"):
+                checks.append(dp.get(f"{capability.lower()}_green", False))
+
+    if not checks:
+        ctx['summary']["Check Capability Status"] = "Skipped (No capabilities provisioned)"
+        return False
+    if not ctx.get('capability_gate_checked'):
+        # combined_capability_status_check disabled: nothing was polled, so no *_green flags
+        ctx['summary']["Check Capability Status"] = "Skipped (disabled)"
+        return True
+
+    green = sum(1 for c in checks if c)
+    state = "Pass" if green == len(checks) else "Partial" if green else "Fail"
+    ctx['summary']["Check Capability Status"] = f"{state} ({green}/{len(checks)} green)"
+    return green > 0
+
+
+# ---------------------------------------------------------------------------
+# Buildtypes and application deployment
+# ---------------------------------------------------------------------------
+
+def make_buildtype_task(i, capability):
+    def task(ctx):
+        dp = ctx['dataplanes'][i]
+        if not capability_ready(ctx, dp, capability):
+            logger.warning("[!] %s capability on %s is not ready, skipping buildtype", capability, dp['name'])
+            return False
+
+        deployer = ctx['identities'].deployer(*ctx['user_identity'])
+        if deployer is None:
+            logger.warning("[!] No session for %s, cannot provision %s buildtype on %s",
+                           ctx['user_identity'][1], capability, dp['name'])
+            return False
+        cap_id = dp[f"{capability.lower()}_capability_id"]
+
+        if capability == 'BWCE':
+            version = ctx['config'].get('bwce_capability_config', {}).get('buildtype_version', '6.12.0-HF1')
+            result = deployer.ensure_buildtype('BWCE', dp['dataplane_id'], cap_id, version)
+            if not result.get('success'):
+                # It may already be provisioned; the deploy step checks again
+                logger.warning("    [!] Warning: BWCE buildtype provisioning had issues: %s", result.get('error'))
+            return True
+
+        version = ctx['config'].get('flogo_capability_config', {}).get('buildtype_version', '2.26.1-b357')
+        result = deployer.ensure_buildtype('FLOGO', dp['dataplane_id'], cap_id, version)
+        if not result.get('success'):
+            logger.warning("[!] Failed to provision Flogo buildtype for %s", dp['name'])
+            return False
+        return True
+    return task
+
+
+def make_connectors_task(i):
+    def task(ctx):
+        dp = ctx['dataplanes'][i]
+        deployer = ctx['identities'].deployer(*ctx['user_identity'])
+        if deployer is None:
+            logger.warning("[!] No session for %s, cannot provision Flogo connectors on %s",
+                           ctx['user_identity'][1], dp['name'])
+            return False
+        connectors = sorted(dp['flogo_connectors']) or ['General']
+        connector_result = deployer.provision_flogo_connectors(dp['dataplane_id'], dp['flogo_capability_id'], connectors=connectors)
+        # Apps using a connector without a catalog entry fail in their deploy task
+        dp['unknown_connectors'] = set(connector_result.get('unknown') or [])
+        if not connector_result.get('success'):
+            logger.warning("[!] Warning: Connector provisioning had issues for %s", dp['name'])
+            logger.warning("    Error: %s", connector_result.get('error'))
+        return True
+    return task
+
+
+def make_deploy_task(i, capability, app):
+    def task(ctx):
+        dp = ctx['dataplanes'][i]
+        service = ctx['user_service']
+        deploy_cfg = ctx['config'].get('app_deployment_config', {})
+        cap_id = dp[f"{capability.lower()}_capability_id"]
+
+        app_config = dict(app)
+        app_config['app_folder'] = deploy_cfg.get('app_folder', 'apps_to_deploy')
+        app_config['capability_id'] = cap_id
+        app_config['namespace'] = dp['namespace']
+
+        missing = sorted(set(app.get('contrib_names', [])) & dp.get('unknown_connectors', set()))
+        if capability == 'BWCE':
+            result = service.deploy_bwce_app(dp['dataplane_id'], dp['name'], app_config)
+        elif missing:
+            logger.warning("[!] Not deploying %s to %s: connector(s) %s could not be provisioned",
+                           app.get('app_name'), dp['name'], ', '.join(missing))
+            result = {"success": False, "error": f"Connectors not provisioned: {', '.join(missing)}"}
+        else:
+            result = service.deploy_flogo_app(dp['dataplane_id'], dp['name'], app_config)
+
+        record = {
+            'app': app.get('app_name'),
+            'dataplane': dp['name'],
+            'success': bool(result.get('success')),
+            'app_id': result.get('app_id'),
+            'error': result.get('error')
+        }
+        ctx['deploy_results'][capability].append(record)
+        ctx['deployed_apps'][(i, capability, app.get('app_name'))] = record
+        return record['success']
+    return task
+
+
+def make_start_task(i, capability, app):
+    def task(ctx):
+        dp = ctx['dataplanes'][i]
+        service = ctx['user_service']
+        record = ctx['deployed_apps'][(i, capability, app.get('app_name'))]
+        if not record['app_id']:
+            logger.warning("[!] No app ID returned for %s; cannot start it", record['app'])
+            return False
+
+        cap_id = dp[f"{capability.lower()}_capability_id"]
+        replicas = app.get('scale_instances', 1)
+        if capability == 'BWCE':
+            start = service.start_bwce_application(dp['dataplane_id'], cap_id, record['app_id'], dp['namespace'], replicas)
+        else:
+            start = service.start_flogo_application(dp['dataplane_id'], cap_id, record['app_id'], dp['namespace'], replicas)
+        record['started'] = bool(start.get('success'))
+        return record['started']
+    return task
+
+
+def make_deploy_summary_task(capability):
+    def task(ctx):
+        step = "Deploy BWCE Applications" if capability == 'BWCE' else "Deploy Flogo Applications"
+        results = ctx['deploy_results'][capability]
+        if not results:
+            ctx['summary'][step] = "Skipped (No deployments ran)"
+            return False
+        ok = sum(1 for r in results if r['success'])
+        state = "Pass" if ok == len(results) else "Partial" if ok else "Fail"
+        ctx['summary'][step] = f"{state} ({ok}/{len(results)})"
+        return ok > 0
+    return task
+
+
+# ---------------------------------------------------------------------------
+# Workflow assembly
+# ---------------------------------------------------------------------------
+
+def stage(labels, name):
+    """Copy of labels tagged with the benchmark stage a task belongs to."""
+    return dict(labels, stage=name)
+
+
+def build_workflow(ctx, max_workers):
+    """Express the population steps as a dependency graph."""
+    config = ctx['config']
+    summary = ctx['summary']
+    wf = Workflow(f"populate-{ctx['prefix']}", max_workers=max_workers)
+    labels = {'prefix': ctx['prefix']}
+
+    wf.add_task("Admin Login", task_admin_login, labels=stage(labels, "login"))
+    wf.add_task("Provision Subscription", task_provision_subscription, deps=["Admin Login"], labels=stage(labels, "subscription"))
+    wf.add_task("CP Login", task_cp_login, deps=["Provision Subscription"], labels=stage(labels, "login"))
+    wf.add_task("Invite New User", task_invite_user, deps=["CP Login"], labels=stage(labels, "invite"))
+    wf.add_task("Accept & Register User", task_accept_register, deps=["Invite New User"], labels=stage(labels, "accept"))
+    wf.add_task("New User Login Verification", task_new_user_login, deps=["Accept & Register User"], labels=stage(labels, "login"))
+    wf.add_task("Listing Users from CP", task_list_users, deps=["New User Login Verification"], labels=stage(labels, "invite"))
+    user_ready = "New User Login Verification"
+
+    dp_configs = build_dataplane_configs(config, ctx['prefix'])
+    ctx['dp_count'] = len(dp_configs)
+    if not dp_configs:
+        summary["Register Dataplanes"] = "Skipped (dpCount=0)"
+        summary["Check Dataplane Status"] = "Skipped (dpCount=0)"
+        logger.info("[*] dpCount is 0, skipping dataplane registration")
+        return wf
+
+    ctx['status_check_enabled'] = config.get('dataplane_status_check', {}).get('enabled', False)
+    activation_enabled = bool(config.get('activation_server_config')) and config['activation_server_config'].get('enabled', True)
+    ctx['capabilities'] = [cap for cap, key in (('BWCE', 'bwce_capability_config'), ('FLOGO', 'flogo_capability_config'))
+                           if config.get(key, {}).get('enabled', False)]
+    resources_cfg = config.get('dataplane_resources_config', {})
+    deploy_cfg = config.get('app_deployment_config', {})
+    deploy_enabled = deploy_cfg.get('enabled', False)
+    app_lists = {'BWCE': deploy_cfg.get('bwce_apps', []), 'FLOGO': deploy_cfg.get('flogo_apps', [])}
+
+    if activation_enabled:
+        wf.add_task("Add Activation Server", task_add_activation_server, deps=[user_ready], labels=stage(labels, "capability"))
+    else:
+        summary["Add Activation Server"] = "Skipped (disabled)"
+
+    dp_tasks = []
+    cap_tasks = {cap: [] for cap in ctx['capabilities']}
+    app_stages = []
+    link_tasks = []
+    deploy_tasks = {'BWCE': [], 'FLOGO': []}
+
+    for i, dp_config, aliases in dp_configs:
+        ctx['dataplanes'][i] = {
+            "index": i,
+            "name": dp_config['name'],
+            "namespace": dp_config['namespace'],
+            "config": dp_config,
+            "aliases": aliases,
+            "success": False,
+            "dataplane_id": "",
+            "commands": [],
+            "status_check_result": None,
+            "flogo_connectors": set(),
+            "unknown_connectors": set(),
+            "resource_ids": {},
+            "primary_resources": {}
+        }
+        dp_labels = dict(labels, dataplane=dp_config['name'])
+
+        register = wf.add_task(f"Register DP {i}", make_register_task(i), deps=[user_ready], labels=stage(dp_labels, "registration")).name
+        install = wf.add_task(f"Install DP {i}", make_install_task(i), deps=[register], labels=stage(dp_labels, "commands")).name
+        ready = install
+        if ctx['status_check_enabled']:
+            ready = wf.add_task(f"Status DP {i}", make_status_task(i), deps=[install], labels=stage(dp_labels, "status_wait")).name
+        dp_tasks.extend([register, install, ready])
+
+        # Storage/ingress setup: one idempotent task per desired resource, so the creates run
+        # concurrently across resources and dataplanes; without create_resources capability
+        # provisioning looks the resources up by name instead
+        cap_deps = []
+        if resources_cfg.get('create_resources', False):
+            for resource_type, resource_cfg in desired_resources(resources_cfg):
+                ctx['dataplanes'][i]['primary_resources'].setdefault(resource_type, resource_cfg)
+                name = resource_cfg.get('name', resource_type.lower())
+                cap_deps.append(wf.add_task(f"{resource_type.capitalize()} {name} DP {i}",
+                                            make_resource_task(i, resource_type, resource_cfg),
+                                            deps=[ready], labels=stage(dp_labels, "capability")).name)
+        else:
+            cap_deps.append(ready)
+        if activation_enabled:
+            link = wf.add_task(f"Link Activation Server DP {i}", make_link_activation_task(i),
+                               deps=["Add Activation Server", register], labels=stage(dp_labels, "capability")).name
+            link_tasks.append(link)
+            cap_deps.append(link)
+
+        for capability in ctx['capabilities']:
+            cap = wf.add_task(f"Provision {capability} DP {i}", make_capability_task(i, capability),
+                              deps=cap_deps, labels=stage(dp_labels, "capability")).name
+            cap_tasks[capability].append(cap)
+
+            apps = [app for app in app_lists[capability]
+                    if aliases & set(app.get('deploy_to_dataplanes', []))] if deploy_enabled else []
+            if apps:
+                app_stages.append((i, capability, apps, dp_labels))
+
+    # BWCE and Flogo capabilities of all dataplanes are provisioned concurrently above; one
+    # readiness gate polls them together, then buildtypes/connectors/deploys fan out again
+    gate = None
+    if any(cap_tasks.values()):
+        gate = wf.add_task("Capability Readiness Gate", task_capability_readiness_gate,
+                           deps=[t for tasks in cap_tasks.values() for t in tasks],
+                           labels=stage(labels, "status_wait"), allow_failed_deps=True).name
+
+    for i, capability, apps, dp_labels in app_stages:
+        buildtype = wf.add_task(f"{capability} Buildtype DP {i}", make_buildtype_task(i, capability),
+                                deps=[gate], labels=stage(dp_labels, "capability")).name
+        ready = buildtype
+        if capability == 'FLOGO':
+            for app in apps:
+                ctx['dataplanes'][i]['flogo_connectors'].update(app.get('contrib_names', []))
+            ready = wf.add_task(f"FLOGO Connectors DP {i}", make_connectors_task(i),
+                                deps=[buildtype], labels=stage(dp_labels, "capability")).name
+        for app in apps:
+            deploy = wf.add_task(f"Deploy {capability} {app.get('app_name')} DP {i}",
+                                 make_deploy_task(i, capability, app),
+                                 deps=[ready], labels=stage(dp_labels, "deploy")).name
+            deploy_tasks[capability].append(deploy)
+            if deploy_cfg.get('start_after_deploy'):
+                wf.add_task(f"Start {capability} {app.get('app_name')} DP {i}",
+                            make_start_task(i, capability, app),
+                            deps=[deploy], labels=stage(dp_labels, "start"))
+
+    wf.add_task("Dataplane Summary", task_dataplane_summary, deps=dp_tasks, labels=stage(labels, "summary"), allow_failed_deps=True)
+    if activation_enabled:
+        wf.add_task("Activation Server Summary", task_activation_summary,
+                    deps=["Add Activation Server"] + link_tasks, labels=stage(labels, "summary"), allow_failed_deps=True)
+
+    for capability in ('BWCE', 'FLOGO'):
+        step = "Provision BWCE Capability" if capability == 'BWCE' else "Provision Flogo Capability"
+        if capability not in ctx['capabilities']:
+            summary[step] = "Skipped (disabled)"
+            continue
+        wf.add_task(f"{capability} Capability Summary", make_capability_summary_task(capability),
+                    deps=cap_tasks[capability], labels=stage(labels, "summary"), allow_failed_deps=True)
 
+    if gate:
+        wf.add_task("Capability Status Summary", task_capability_status_summary,
+                    deps=[gate], labels=stage(labels, "summary"), allow_failed_deps=True)
 
-def main():
-    # Load configuration
-    config = load_config()
-    creds = config.get('credentials', {})
-    admin_host = config.get('admin_host')
-    idp_host = config.get('idp_host')
-    target_prefixes = config.get('target_prefixes', [config.get('target_prefix', 'DefaultPrefix')])
+    for capability in ('BWCE', 'FLOGO'):
+        step = "Deploy BWCE Applications" if capability == 'BWCE' else "Deploy Flogo Applications"
+        if not deploy_tasks[capability]:
+            summary[step] = "Skipped (disabled)" if not deploy_enabled else "Skipped (No apps targeted)"
+            continue
+        wf.add_task(f"{capability} Deploy Summary", make_deploy_summary_task(capability),
+                    deps=deploy_tasks[capability], labels=stage(labels, "summary"), allow_failed_deps=True)
 
-    # Safe access to user query params with defaults
-    user_params = config.get('user_query_params', {
-        'order-by': '',
-        'page': '1',
-        'limit': '20',
-        'person': ''
-    })
-
-    for prefix_entry in target_prefixes:
-        if isinstance(prefix_entry, dict):
-            target_prefix = prefix_entry.get('prefix')
-            invite_email = prefix_entry.get('user_email')
-        else:
-            target_prefix = prefix_entry
-            invite_email = config.get('invite_user_email')
-        config['target_prefix'] = target_prefix
-
-        # Track status for summary (reset for each prefix)
-        summary = {
-            "Admin Login": "Pending",
-            "Provision Subscription": "Pending",
-            "Admin Logout": "Pending",
-            "CP Login": "Pending",
-            "Invite New User": "Pending",
-            "CP Logout": "Pending",
-            "Accept & Register User": "Pending",
-            "Listing Users from CP": "Pending",
-            "New User Login Verification": "Pending",
-            "Register Dataplanes": "Pending",
-            "Add Activation Server": "Pending",
-            "Check Dataplane Status": "Pending",
-            "Provision BWCE Capability": "Pending",
-            "Provision Flogo Capability": "Pending",
-            "Check Capability Status": "Pending",
-            "Deploy BWCE Applications": "Pending",
-            "Deploy Flogo Applications": "Pending"
-        }
+    return wf
 
-        print(f"[*] Initializing populateData for Admin Host: {admin_host} and Target Prefix: {target_prefix}")
 
-        # 1. Admin Login
-        print("\n" + "="*60)
-        print("[STEP 1] Admin Login")
-        print("="*60)
+def run_prefix(config, prefix_entry, max_workers, config_path='config.json', identities=None):
+    """
+    Run the population workflow for a single target prefix.
 
-        admin_auth = SAMLAuthenticator(admin_host, creds.get('username'), creds.get('password'))
-        login_success = admin_auth.run_login_flow()
+    Args:
+        config (dict): Loaded configuration
+        prefix_entry (dict|str): Entry from target_prefixes ({"prefix": ..., "user_email": ...} or a plain prefix)
+        max_workers (int): Maximum number of tasks run in parallel
+        config_path (str): Path of the configuration file (passed to accept_invite.py)
+        identities (IdentityManager): Run-wide sessions; a private manager is created
+                                      (and logged out afterwards) when None
 
-        if not login_success:
-            print("[!] No RelayState found. Skipping flow.")
-            print("[*] Generating dynamic admin RelayState...")
-            admin_relay_state = generate_admin_relay_state(admin_host)
-            login_success = admin_auth.run_login_flow(admin_relay_state)
+    Returns:
+        tuple: (summary dict, Workflow)
+    """
+    creds = config.get('credentials', {})
+    admin_host = config.get('admin_host')
 
-        if login_success:
-            summary["Admin Login"] = "Pass"
-            print("[+] Admin Login Successful.")
-        else:
-            summary["Admin Login"] = "Fail"
-            print("[!] Admin Login Failed")
-            print_summary(summary)
-            continue
+    if isinstance(prefix_entry, dict):
+        target_prefix = prefix_entry.get('prefix')
+        invite_email = prefix_entry.get('user_email')
+    else:
+        target_prefix = prefix_entry
+        invite_email = config.get('invite_user_email')
+    config['target_prefix'] = target_prefix
+
+    # Track status for summary (reset for each prefix)
+    summary = {
+        "Admin Login": "Pending",
+        "Provision Subscription": "Pending",
+        "CP Login": "Pending",
+        "Invite New User": "Pending",
+        "Accept & Register User": "Pending",
+        "Listing Users from CP": "Pending",
+        "New User Login Verification": "Pending",
+        "Register Dataplanes": "Pending",
+        "Add Activation Server": "Pending",
+        "Check Dataplane Status": "Pending",
+        "Provision BWCE Capability": "Pending",
+        "Provision Flogo Capability": "Pending",
+        "Check Capability Status": "Pending",
+        "Deploy BWCE Applications": "Pending",
+        "Deploy Flogo Applications": "Pending"
+    }
+
+    logger.info("[*] Initializing populateData for Admin Host: %s and Target Prefix: %s", admin_host, target_prefix)
+
+    ctx = {
+        "config": config,
+        "config_path": os.path.abspath(config_path),
+        "creds": creds,
+        "admin_host": admin_host,
+        "idp_host": config.get('idp_host'),
+        "tenant_host": get_tenant_host(config, target_prefix),
+        "prefix": target_prefix,
+        "invite_email": invite_email,
+        "waits": config.get('wait_config', {}),
+        "summary": summary,
+        "dataplanes": {},
+        "deploy_results": {'BWCE': [], 'FLOGO': []},
+        "deployed_apps": {},
+        "identities": identities or IdentityManager.from_config(config)
+    }
+
+    wf = build_workflow(ctx, max_workers)
+    try:
+        wf.run(ctx)
+    finally:
+        if identities is None:
+            ctx['identities'].logout_all()
+
+    # Steps whose tasks never ran (failed prerequisites) are reported as skipped
+    for step, status in summary.items():
+        if status == "Pending":
+            summary[step] = "Skipped"
+    return summary, wf
 
-        # 2. Provision Subscription (ALWAYS RUN)
-        print("\n" + "="*60)
-        print("[STEP 2] Provision Subscription")
-        print("="*60)
 
-        admin_service = TenantService(admin_auth)
-        provision_result = admin_service.provision_subscription(target_prefix, idp_host)
+def main(config_path='config.json', max_workers=None):
+    # Load configuration
+    config = load_config(config_path)
+    target_prefixes = config.get('target_prefixes', [config.get('target_prefix', 'DefaultPrefix')])
 
-        if provision_result:
-            summary["Provision Subscription"] = "Pass"
-            print(f"[+] Subscription provisioning completed for: {target_prefix}")
-        else:
-            summary["Provision Subscription"] = "Pass (Existing)"
-            print(f"[*] Subscription {target_prefix} already exists or provisioning handled")
+    if max_workers is None:
+        max_workers = config.get('workflow_config', {}).get('max_workers', 4)
 
-        # --- Admin Logout ---
-        if admin_auth.logout():
-            summary["Admin Logout"] = "Pass"
-        else:
-            summary["Admin Logout"] = "Fail"
-
-        # 3. CP Login
-        tenant_host = f"https://{target_prefix.lower()}.cp1-my.localhost.dataplanes.pro"
-        print(f"\n[*] Authenticating to Tenant Host: {tenant_host}")
-
-        tenant_auth = SAMLAuthenticator(tenant_host, creds.get('username'), creds.get('password'))
-        tenant_login = tenant_auth.run_login_flow()
-
-        if not tenant_login:
-            print("[*] Dynamic RelayState failed for tenant. Using generated state...")
-            tenant_login = tenant_auth.run_login_flow(generate_tenant_relay_state(target_prefix))
-
-        if tenant_login:
-            summary["CP Login"] = "Pass"
-            print("[+] Tenant Login Successful.")
-            tenant_service = TenantService(tenant_auth)
-
-            # Check if user already exists before inviting
-            print(f"[*] Checking if {invite_email} already exists...")
-            users_check = tenant_service.get_user_details(user_params)
-            already_exists = False
-            if users_check and users_check.get('users'):
-                already_exists = any(u.get('email') == invite_email for u in users_check['users'])
-
-            if already_exists:
-                print(f"[*] User {invite_email} is already registered. Skipping invite/register.")
-                summary["Invite New User"] = "Pass (Existing)"
-                summary["CP Logout"] = "Skipped"
-                summary["Accept & Register User"] = "Pass (Existing)"
-
-                # Use the current tenant session (CP admin session) to continue workflow
-                print(f"\n[*] Using existing authenticated session for workflow continuation...")
-                try:
-                    # Since we're already authenticated as CP admin and user exists,
-                    # we can use the tenant_service which already has admin privileges
-                    summary["New User Login Verification"] = "Pass (Existing)"
-                    summary["Listing Users from CP"] = "Pass (Existing)"
-
-                    # Use tenant_service (CP admin session) for subsequent operations
-                    new_user_service = tenant_service
-                    new_user_auth = tenant_auth
-                    print(f"[+] Using CP admin session for workflow continuation (user {invite_email} already exists)")
-                except Exception as e:
-                    print(f"[!] Error setting up session: {e}")
-                    summary["New User Login Verification"] = "Fail"
-                    summary["Listing Users from CP"] = "Skipped"
-            else:
-                # 4. Invite New User
-                if invite_email:
-                    if tenant_service.invite_new_user(invite_email):
-                        summary["Invite New User"] = "Pass"
-
-                        # --- CP Logout (after invitation) ---
-                        print("\n" + "="*60)
-                        print("[STEP 4.5] CP Logout")
-                        print("="*60)
-                        print("[*] Logging out from CP after sending invitation...")
-                        if tenant_auth.logout():
-                            summary["CP Logout"] = "Pass"
-                            print("[+] CP logout successful")
-                        else:
-                            summary["CP Logout"] = "Fail"
-                            print("[!] CP logout failed")
-
-                        # --- 4.1 Accept Invite & Register ---
-                        print(f"\n[*] STEP 4.1: Starting Accept/Register flow for {invite_email}...")
-                        try:
-                            # Use absolute path for cross-platform compatibility (works in CMD and Git Bash)
-                            import os
-                            script_dir = os.path.dirname(os.path.abspath(__file__))
-                            accept_invite_path = os.path.join(script_dir, "accept_invite.py")
-
-                            result = subprocess.run([sys.executable, accept_invite_path, invite_email],
-                                                    capture_output=True, text=True, cwd=script_dir)
-
-                            if result.stdout:
-                                print("\n" + "-"*20 + " SUBPROCESS OUTPUT " + "-"*20)
-                                print(result.stdout.strip())
-                                print("-" * 59 + "\n")
-
-                            if result.returncode == 0:
-                                print(f"[+] STEP 4.1 COMPLETE: Registration flow finished for {invite_email}.")
-                                summary["Accept & Register User"] = "Pass"
-
-                                # Wait for user account to be fully activated
-                                import time
-                                print(f"[*] Waiting 20 seconds for user account activation...")
-                                time.sleep(20)
-
-                                # 5. New User Login Verification (Execute first to establish new user session)
-                                print("\n" + "="*60)
-                                print("[STEP 5] New User Login Verification")
-                                print("="*60)
-
-                                print(f"[*] Verifying login for newly invited user: {invite_email}...")
-                                print(f"[*] Waiting 30 seconds for full user activation and permission propagation...")
-                                time.sleep(30)
-
-                                try:
-                                    # Create new auth instance for the invited user
-                                    new_user_password = config.get('new_user_details', {}).get('password', 'Tibco@2025')
-                                    new_user_auth = SAMLAuthenticator(tenant_host, invite_email, new_user_password)
-
-                                    # Attempt login with retry
-                                    max_retries = 5
-                                    login_success = False
-
-                                    for attempt in range(1, max_retries + 1):
-                                        print(f"[*] Login attempt {attempt}/{max_retries} for new user {invite_email}...")
-
-                                        new_user_login = new_user_auth.run_login_flow()
-                                        if not new_user_login:
-                                            print("[*] Dynamic RelayState failed for new user. Using generated state...")
-                                            new_user_login = new_user_auth.run_login_flow(generate_tenant_relay_state(target_prefix))
-
-                                        if new_user_login:
-                                            login_success = True
-                                            print(f"[+] Successfully logged in as {invite_email}")
-                                            summary["New User Login Verification"] = "Pass"
-                                            break
-                                        else:
-                                            if attempt < max_retries:
-                                                wait_time = 15 * attempt  # Increasing wait time: 15, 30, 45, 60 seconds
-                                                print(f"[!] Login attempt {attempt} failed. Waiting {wait_time} seconds before retry...")
-                                                time.sleep(wait_time)
-
-                                    if not login_success:
-                                        print(f"[!] Failed to login with new user {invite_email} after {max_retries} attempts")
-                                        print(f"[!] Error: ATMOSPHERE-11004 typically means user permissions are not fully propagated")
-                                        print(f"[*] The user IS registered and active, but may need more time for permissions")
-                                        print(f"[*] You can manually verify login at: {tenant_host}")
-                                        summary["New User Login Verification"] = "Fail (Permissions Pending)"
-                                        summary["Listing Users from CP"] = "Skipped"
-                                    else:
-                                        # 6. Listing Users from CP (Execute after successful new user login)
-                                        print("\n" + "="*60)
-                                        print("[STEP 6] Listing Users from CP")
-                                        print("="*60)
-
-                                        # Now create TenantService with the NEW USER's authenticated session
-                                        new_user_service = TenantService(new_user_auth)
-
-                                        print("[*] Verifying final user list with new user session...")
-                                        users_data = new_user_service.get_user_details(user_params)
-                                        if users_data and users_data.get('users'):
-                                            summary["Listing Users from CP"] = "Pass"
-                                            print(f"\n[+] Successfully retrieved {len(users_data['users'])} users:")
-                                            for idx, user in enumerate(users_data['users']):
-                                                print(f"    {idx+1}. {user.get('email')} ({user.get('firstName')} {user.get('lastName')})")
-
-                                            # Show user details for invited user
-                                            print(f"\n[*] Verifying invited user {invite_email} details...")
-                                            user_info = new_user_service.get_specific_user(invite_email)
-                                            if user_info:
-                                                print(f"[+] User activated: {user_info.get('email')}")
-                                                print(f"    Name: {user_info.get('firstName')} {user_info.get('lastName')}")
-                                                print(f"    Roles: {', '.join([r.get('roleId', 'N/A') for r in user_info.get('roles', [])])}")
-                                                print(f"[+] User {invite_email} is fully registered and can access CP!")
-                                        else:
-                                            summary["Listing Users from CP"] = "Fail"
-                                            print("[!] Failed to retrieve users from CP with new user session")
-
-                                except Exception as e:
-                                    print(f"[!] New User Login Verification Error: {e}")
-                                    summary["New User Login Verification"] = "Fail"
-                                    summary["Listing Users from CP"] = "Skipped"
-                            else:
-                                print(f"[!] STEP 4.1 FAILED: registration script exited with code {result.returncode}")
-                                if result.stderr:
-                                    print(f"[!] Error Details:\n{result.stderr.strip()}")
-                                summary["Accept & Register User"] = "Fail (Script Error)"
-                        except Exception as e:
-                            print(f"[!] Exception during registration subprocess: {e}")
-                            summary["Accept & Register User"] = "Error"
-                    else:
-                        summary["Invite New User"] = "Fail"
-                        summary["Accept & Register User"] = "Skipped"
-                        summary["Listing Users from CP"] = "Skipped"
-                else:
-                    summary["Invite New User"] = "Skipped"
-                    summary["Accept & Register User"] = "Skipped"
-                    summary["Listing Users from CP"] = "Skipped"
-
-                # Step 7: Register Dataplanes (if user login was successful)
-                if "Pass" in summary["New User Login Verification"]:
-                    print("\n" + "="*60)
-                    print("[STEP 7] Register Dataplanes")
-                    print("="*60)
-
-                    try:
-                        dataplane_config = config.get('dataplane_config', {})
-                        dp_count = dataplane_config.get('dpCount', 0)
-
-                        if dp_count > 0:
-                            print(f"[*] Registering {dp_count} dataplane(s)...")
-
-                            # Use the new user's authenticated session for dataplane registration
-                            # (they have the necessary permissions)
-                            all_results = []
-                            all_commands = []
-
-                            # Get status check configuration
-                            status_check_config = config.get('dataplane_status_check', {})
-                            status_check_enabled = status_check_config.get('enabled', False)
-                            max_wait = status_check_config.get('max_wait_seconds', 120)
-                            poll_interval = status_check_config.get('poll_interval_seconds', 10)
-
-                            for i in range(1, dp_count + 1):
-                                dp_config = dataplane_config.copy()
-
-                                # Append target_prefix to the dataplane name, namespace, and serviceAccountName
-                                base_name = dataplane_config.get('name', 'Dp1')
-                                base_namespace = dataplane_config.get('namespace', 'default')
-                                base_sa = dataplane_config.get('serviceAccountName', 'tibco-sa')
-
-                                if dp_count > 1:
-                                    dp_config['name'] = f"{target_prefix}-{base_name}-{i}"
-                                    dp_config['namespace'] = f"{target_prefix}-{base_namespace}-{i}"
-                                    dp_config['serviceAccountName'] = f"{target_prefix}-{base_sa}-{i}"
-                                else:
-                                    dp_config['name'] = f"{target_prefix}-{base_name}"
-                                    dp_config['namespace'] = f"{target_prefix}-{base_namespace}"
-                                    dp_config['serviceAccountName'] = f"{target_prefix}-{base_sa}"
-
-                                print(f"    Name: {dp_config['name']}")
-                                print(f"    Namespace: {dp_config['namespace']}")
-
-                                # Register dataplane using the new user's session
-                                result = new_user_service.register_dataplane(dp_config)
-
-                                if result and result.get('success'):
-                                    commands = result.get('commands', [])
-                                    dataplane_id = result.get('dataplane_id', '')
-
-                                    print(f"[+] Dataplane {i} registered successfully!")
-                                    print(f"    ID: {dataplane_id}")
-                                    print(f"    Commands: {len(commands)}")
-
-                                    all_results.append({
-                                        "index": i,
-                                        "name": dp_config['name'],
-                                        "namespace": dp_config['namespace'],
-                                        "success": True,
-                                        "commands": commands,
-                                        "dataplane_id": dataplane_id,
-                                        "status_check_result": None
-                                    })
-
-                                    all_commands.extend(commands)
-
-                                    # Save commands to file
-                                    filename = f"dataplane_{dp_config['name']}_commands.txt"
-                                    save_commands_to_file(commands, filename)
-
-                                    # Execute commands immediately after registration
-                                    print(f"\n{'='*60}")
-                                    print(f"[*] Executing installation commands for {dp_config['name']}")
-                                    print(f"{'='*60}")
-                                    execution_result = execute_commands_sequentially(commands)
-
-                                    if not execution_result.get('success'):
-                                        print(f"[!] Some commands failed. Dataplane may not come up properly.")
-                                        print(f"    Executed: {execution_result.get('executed')}")
-                                        print(f"    Failed: {execution_result.get('failed')}")
-                                    else:
-                                        print(f"[+] All {len(commands)} commands executed successfully!")
-
-                                    # Check status immediately after registration if enabled
-                                    if status_check_enabled:
-                                        print(f"\n{'='*60}")
-                                        print(f"[STEP 7.{i}] Check Status for Dataplane {i}/{dp_count}")
-                                        print(f"{'='*60}")
-                                        print(f"[*] Checking status for: {dp_config['name']} (ID: {dataplane_id})")
-                                        print(f"    Max Wait Time: {max_wait} seconds")
-                                        print(f"    Poll Interval: {poll_interval} seconds")
-
-                                        try:
-                                            # Check status for THIS specific dataplane
-                                            status_result = new_user_service.check_dataplane_status(
-                                                dataplane_id=dataplane_id,
-                                                max_wait_seconds=max_wait,
-                                                poll_interval_seconds=poll_interval
-                                            )
-
-                                            # Store status result with this dataplane
-                                            all_results[-1]['status_check_result'] = status_result
-
-                                            if status_result and status_result.get('success') and status_result.get('all_green'):
-                                                print(f"\n[+] Dataplane {i} ({dp_config['name']}) is GREEN!")
-                                                print(f"    Time taken: {status_result.get('elapsed_time', 0):.1f} seconds")
-                                            else:
-                                                print(f"\n[!] Dataplane {i} ({dp_config['name']}) did not reach green status")
-                                                if status_result:
-                                                    print(f"    Time elapsed: {status_result.get('elapsed_time', 0):.1f} seconds")
-
-                                        except Exception as e:
-                                            print(f"[!] Status check error for dataplane {i}: {e}")
-                                            all_results[-1]['status_check_result'] = {"success": False, "error": str(e)}
-
-                                else:
-                                    print(f"[!] Dataplane {i} registration failed")
-                                    all_results.append({
-                                        "index": i,
-                                        "name": dp_config.get('name'),
-                                        "success": False,
-                                        "status_check_result": None
-                                    })
-
-                            # Summary
-                            successful = [r for r in all_results if r['success']]
-                            failed = [r for r in all_results if not r['success']]
-
-                            print(f"\n{'='*60}")
-                            print(f"[*] Dataplane Registration & Status Summary:")
-                            print(f"{'='*60}")
-                            print(f"    Total: {dp_count}")
-                            print(f"    Successful Registrations: {len(successful)}")
-                            print(f"    Failed Registrations: {len(failed)}")
-
-                            # Status check summary
-                            if status_check_enabled:
-                                green_count = 0
-                                not_green_count = 0
-                                for result in successful:
-                                    status_result = result.get('status_check_result')
-                                    if status_result and status_result.get('success') and status_result.get('all_green'):
-                                        green_count += 1
-                                    else:
-                                        not_green_count += 1
-
-                                print(f"    Status Check: Enabled")
-                                print(f"    Green Dataplanes: {green_count}/{len(successful)}")
-                                if not_green_count > 0:
-                                    print(f"    Not Green: {not_green_count}/{len(successful)}")
-
-                            print(f"{'='*60}\n")
-
-                            if len(successful) > 0:
-                                # Commands are now executed immediately after each dataplane registration
-                                # Summary is based on registration and status check results
-                                summary["Register Dataplanes"] = f"Pass ({len(successful)}/{dp_count})"
-
-                                # Update summary with status check results
-                                if status_check_enabled:
-                                    green_count = sum(1 for r in successful if r.get('status_check_result', {}).get('all_green'))
-                                    if green_count == len(successful):
-                                        summary["Check Dataplane Status"] = f"Pass ({green_count}/{len(successful)} DPs green)"
-                                    elif green_count > 0:
-                                        summary["Check Dataplane Status"] = f"Partial ({green_count}/{len(successful)} DPs green)"
-                                    else:
-                                        summary["Check Dataplane Status"] = f"Fail (0/{len(successful)} DPs green)"
-                            else:
-                                summary["Register Dataplanes"] = "Fail"
-                                summary["Check Dataplane Status"] = "Skipped (No dataplanes registered)"
-                        else:
-                            summary["Register Dataplanes"] = "Skipped (dpCount=0)"
-                            summary["Check Dataplane Status"] = "Skipped (dpCount=0)"
-                            print("[*] dpCount is 0, skipping dataplane registration")
-
-                    except Exception as e:
-                        print(f"[!] Dataplane Registration Error: {e}")
-                        import traceback
-                        traceback.print_exc()
-                        summary["Register Dataplanes"] = "Error"
+    if har_replay.active_replay():
+        # One worker runs the tasks in a fixed order, so every replay sends the same request sequence
+        if max_workers != 1:
+            logger.info("[*] Replay mode: running the workflow with 1 worker (instead of %s)", max_workers)
+            max_workers = 1
+        # Fixed waits only give the real CP time to settle; a replay answers immediately
+        config['wait_config'] = {"user_activation_seconds": 0, "permission_propagation_seconds": 0,
+                                 "login_retry_base_seconds": 0}
 
+    # One session per (host, user) for the whole run: the admin login is shared by all prefixes
+    identities = IdentityManager.from_config(config).start()
+    try:
+        for prefix_entry in target_prefixes:
+            summary, wf = run_prefix(config, prefix_entry, max_workers, config_path, identities)
 
             # Print per-prefix summary
             print_summary(summary)
+            wf.print_report()
+    finally:
+        identities.logout_all()
 
 def print_summary(summary):
-    print("\n" + "="*40)
-    print("       EXECUTION SUMMARY")
-    print("="*40)
+    logger.info("\n" + "="*40)
+    logger.info("       EXECUTION SUMMARY")
+    logger.info("="*40)
     for step, status in summary.items():
         dots = "." * (30 - len(step))
-        print(f"{step} {dots} {status}")
-    print("="*40 + "\n")
+        logger.info("%s %s %s", step, dots, status)
+    logger.info("="*40 + "\n")
 
 if __name__ == "__main__":
     # Parse command-line arguments
     parser = argparse.ArgumentParser(description='CP Automation - User Invitation Workflow')
     parser.add_argument('--config', type=str, default='config.json',
                         help='Configuration file path (default: config.json)')
+    parser.add_argument('--max-workers', type=int, default=None,
+                        help='Maximum number of workflow tasks run in parallel '
+                             '(default: workflow_config.max_workers or 4)')
+    har_replay.add_arguments(parser)
+    tracing.add_arguments(parser)
+    metrics.add_arguments(parser)
+    logging_config.add_arguments(parser)
 
     args = parser.parse_args()
+    file_config = load_config(args.config)
+    logging_config.setup_from_config(file_config, args.verbosity, args.log_file)
+    har_replay.install_from_args(args)
+    tracing.install_from_config(file_config, args.trace)
+    metrics.install_from_config(file_config, args.metrics_textfile, args.metrics_json)
+    status_cache.configure(file_config)
+    catalog_cache.configure(file_config)
+    flogo_connectors.configure(file_config)
+    connection_pool.configure(file_config)
+    rate_limit.configure(file_config)
+    user_index.configure(file_config)
 
     # Run user invitation workflow
-    print("[*] Running User Invitation Workflow...")
-    main()
\ No newline at end of file
+    logger.info("[*] Running User Invitation Workflow...")
+    main(args.config, args.max_workers)
@@ -0,0 +1,282 @@
+"""
+Client-side CP API metrics for the population scripts.
+
+A transport adapter mounted on every SAMLAuthenticator session keeps an
+in-memory latency histogram and request/error counters per endpoint
+template (e.g. /tp-cp-ws/v1/data-planes/{id}/dp-resource). At exit they are
+written as a Prometheus textfile (for node-exporter's textfile collector)
+and as a JSON summary with estimated percentiles.
+
+Usage:
+    python main.py --metrics-textfile /var/lib/node_exporter/dp_population.prom
+    # or in config.json: "metrics_config": {"enabled": true, ...}
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+
+from auth import DelegatingAdapter, register_session_hook, wrap_session_adapters
+from logging_config import get_logger
+from utils import endpoint_template
+
+logger = get_logger(__name__)
+
+METRIC_PREFIX = "dp_population"
+
+# Histogram bucket upper bounds in seconds (+Inf is implicit)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram (Prometheus semantics)."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def cumulative(self):
+        """[(upper bound, cumulative count)] including +Inf."""
+        total = 0
+        result = []
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def quantile(self, q):
+        """Estimate a quantile by linear interpolation inside the bucket (as histogram_quantile does)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        lower = 0.0
+        previous = 0
+        for bound, cumulative in self.cumulative():
+            if cumulative >= rank:
+                if bound == float('inf'):
+                    return self.max
+                in_bucket = cumulative - previous
+                fraction = (rank - previous) / in_bucket if in_bucket else 0.0
+                return min(lower + (bound - lower) * fraction, self.max)
+            lower, previous = bound, cumulative
+        return self.max
+
+
+class MetricsRegistry:
+    """Thread-safe per-endpoint latency histograms and request/error counters."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.lock = threading.Lock()
+        self.histograms = {}   # (method, endpoint) -> Histogram
+        self.requests = {}     # (method, endpoint, status) -> count
+        self.errors = {}       # (method, endpoint, kind) -> count
+        self.gauge_sources = []  # callables returning [(name, help, [(labels, value)])]
+        self.started = time.time()
+
+    def add_gauges(self, source):
+        """
+        Export gauges computed at write time (e.g. current rate limits).
+
+        Args:
+            source (callable): Returns [(name, help, [({label: value}, number)])]; names get METRIC_PREFIX
+        """
+        with self.lock:
+            if source not in self.gauge_sources:
+                self.gauge_sources.append(source)
+        return source
+
+    def gauges(self):
+        with self.lock:
+            sources = list(self.gauge_sources)
+        return [gauge for source in sources for gauge in source()]
+
+    def observe(self, method, endpoint, status, seconds, error_kind=None):
+        """
+        Record one HTTP exchange.
+
+        Args:
+            method (str): HTTP method
+            endpoint (str): Endpoint template
+            status (str): Status code, or "error" when no response was received
+            seconds (float): Duration
+            error_kind (str): "http_4xx", "http_5xx" or the exception class name, None on success
+        """
+        with self.lock:
+            histogram = self.histograms.get((method, endpoint))
+            if histogram is None:
+                histogram = self.histograms[(method, endpoint)] = Histogram(self.buckets)
+            histogram.observe(seconds)
+            key = (method, endpoint, status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            if error_kind:
+                key = (method, endpoint, error_kind)
+                self.errors[key] = self.errors.get(key, 0) + 1
+
+    def to_prometheus(self):
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = []
+        name = f"{METRIC_PREFIX}_http_request_duration_seconds"
+        lines.append(f"# HELP {name} CP API request latency as seen by the population client.")
+        lines.append(f"# TYPE {name} histogram")
+        with self.lock:
+            for (method, endpoint), histogram in sorted(self.histograms.items()):
+                labels = f'method="{method}",endpoint="{_escape(endpoint)}"'
+                for bound, cumulative in histogram.cumulative():
+                    le = "+Inf" if bound == float('inf') else repr(bound)
+                    lines.append(f'{name}_bucket{{{labels},le="{le}"}} {cumulative}')
+                lines.append(f"{name}_sum{{{labels}}} {histogram.sum:.6f}")
+                lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+            name = f"{METRIC_PREFIX}_http_requests_total"
+            lines.append(f"# HELP {name} CP API requests by endpoint and status code.")
+            lines.append(f"# TYPE {name} counter")
+            for (method, endpoint, status), count in sorted(self.requests.items()):
+                lines.append(f'{name}{{method="{method}",endpoint="{_escape(endpoint)}",status="{status}"}} {count}')
+
+            name = f"{METRIC_PREFIX}_http_errors_total"
+            lines.append(f"# HELP {name} CP API errors (HTTP 4xx/5xx or transport exceptions).")
+            lines.append(f"# TYPE {name} counter")
+            for (method, endpoint, kind), count in sorted(self.errors.items()):
+                lines.append(f'{name}{{method="{method}",endpoint="{_escape(endpoint)}",kind="{kind}"}} {count}')
+
+        for gauge_name, help_text, samples in self.gauges():
+            name = f"{METRIC_PREFIX}_{gauge_name}"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            for labels, value in samples:
+                label_text = ",".join(f'{k}="{_escape(str(v))}"' for k, v in sorted(labels.items()))
+                lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+
+        name = f"{METRIC_PREFIX}_last_run_timestamp_seconds"
+        lines.append(f"# HELP {name} Unix time the metrics were written.")
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name} {time.time():.0f}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self):
+        """Per-endpoint JSON summary with estimated percentiles."""
+        endpoints = []
+        with self.lock:
+            for (method, endpoint), histogram in sorted(self.histograms.items()):
+                statuses = {status: count for (m, e, status), count in self.requests.items() if (m, e) == (method, endpoint)}
+                errors = {kind: count for (m, e, kind), count in self.errors.items() if (m, e) == (method, endpoint)}
+                endpoints.append({
+                    "method": method,
+                    "endpoint": endpoint,
+                    "count": histogram.count,
+                    "errors": sum(errors.values()),
+                    "error_kinds": errors,
+                    "statuses": statuses,
+                    "mean": histogram.sum / histogram.count if histogram.count else 0.0,
+                    "p50": histogram.quantile(0.5),
+                    "p95": histogram.quantile(0.95),
+                    "p99": histogram.quantile(0.99),
+                    "max": histogram.max,
+                    "total_seconds": histogram.sum
+                })
+        return {
+            "started_at": time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(self.started)),
+            "duration_seconds": time.time() - self.started,
+            "total_requests": sum(e["count"] for e in endpoints),
+            "total_errors": sum(e["errors"] for e in endpoints),
+            "endpoints": endpoints,
+            "gauges": {name: [dict(labels, value=value) for labels, value in samples]
+                       for name, _, samples in self.gauges()}
+        }
+
+    def write_textfile(self, path):
+        """Write the Prometheus textfile atomically so node-exporter never reads a partial file."""
+        _atomic_write(path, self.to_prometheus())
+        logger.info("[+] Prometheus metrics written to %s", path)
+
+    def write_json(self, path):
+        _atomic_write(path, json.dumps(self.summary(), indent=2))
+        logger.info("[+] Metrics summary written to %s", path)
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _atomic_write(path, text):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+# Process-wide registry fed by MetricsAdapter
+registry = MetricsRegistry()
+
+
+class MetricsAdapter(DelegatingAdapter):
+    """Times each HTTP request sent through the session and records it in a MetricsRegistry."""
+
+    def __init__(self, inner, metrics=None):
+        super().__init__(inner)
+        self.metrics = metrics or registry
+
+    def send(self, request, **kwargs):
+        endpoint = endpoint_template(request.url)
+        started = time.perf_counter()
+        try:
+            response = super().send(request, **kwargs)
+            if not kwargs.get('stream'):
+                response.content  # include the body transfer in the measured latency
+        except Exception as e:
+            self.metrics.observe(request.method, endpoint, "error", time.perf_counter() - started, type(e).__name__)
+            raise
+
+        status = response.status_code
+        error_kind = "http_5xx" if status >= 500 else "http_4xx" if status >= 400 else None
+        self.metrics.observe(request.method, endpoint, str(status), time.perf_counter() - started, error_kind)
+        return response
+
+
+def install(textfile=None, json_path=None, metrics=None):
+    """Record metrics for every SAMLAuthenticator session created from now on and write them at exit."""
+    metrics = metrics or registry
+    register_session_hook(lambda session, auth: wrap_session_adapters(
+        session, lambda inner: MetricsAdapter(inner, metrics)))
+    if textfile:
+        atexit.register(metrics.write_textfile, textfile)
+    if json_path:
+        atexit.register(metrics.write_json, json_path)
+    logger.info("[*] Collecting CP API metrics (textfile: %s, json: %s)", textfile or '-', json_path or '-')
+    return metrics
+
+
+def add_arguments(parser):
+    """Add --metrics-textfile / --metrics-json to an argparse parser."""
+    parser.add_argument('--metrics-textfile', metavar='PATH', default=None,
+                        help='Write per-endpoint Prometheus metrics to PATH at exit (overrides metrics_config)')
+    parser.add_argument('--metrics-json', metavar='PATH', default=None,
+                        help='Write a per-endpoint JSON latency summary to PATH at exit (overrides metrics_config)')
+
+
+def install_from_config(config, textfile=None, json_path=None):
+    """Install metrics when a path is given or metrics_config.enabled is set."""
+    metrics_config = (config or {}).get('metrics_config', {})
+    if metrics_config.get('enabled', False):
+        textfile = textfile or metrics_config.get('prometheus_textfile')
+        json_path = json_path or metrics_config.get('json_summary')
+    if textfile or json_path:
+        return install(textfile, json_path)
+    return None
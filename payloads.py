@@ -0,0 +1,254 @@
+"""
+Request builders shared by the blocking and the asyncio clients.
+
+Each builder returns an ApiRequest (method, URL, query params, JSON body)
+for one CP call, exactly as TenantService / RestApiDeployer send it, so
+services.py, deploy_rest_api.py and async_client.py cannot drift apart.
+Builders do no I/O.
+
+Usage:
+    req = payloads.scale_app('BWCE', host, dp_id, cap_id, app_id, namespace, 1)
+    session.request(req.method, req.url, params=req.params, json=req.json, verify=False)
+"""
+
+import time
+
+
+class ApiRequest:
+    """One CP request: method, absolute URL, query params and JSON body."""
+
+    __slots__ = ("method", "url", "params", "json")
+
+    def __init__(self, method, url, params=None, json=None):
+        self.method = method
+        self.url = url
+        self.params = params
+        self.json = json
+
+    def __repr__(self):
+        return f"ApiRequest({self.method} {self.url})"
+
+
+def _dp_resource_url(host, dataplane_id, prefix="tp-cp-ws/v1"):
+    return f"{host.rstrip('/')}/{prefix}/data-planes/{dataplane_id}/dp-resource"
+
+
+def _provisioner(capability, capability_id):
+    if capability == 'BWCE':
+        return f"/tibco/agent/integration/{capability_id}/bwprovisioner/private/v1/dp/bw"
+    return f"/tibco/agent/integration/{capability_id}/flogoprovisioner/v1/dp/flogo"
+
+
+# ---------------------------------------------------------------------------
+# Status and capabilities
+# ---------------------------------------------------------------------------
+
+def capabilities_status(host, dataplane_id=None):
+    """GET capabilities status of one dataplane, or of all dataplanes when dataplane_id is None."""
+    host = host.rstrip('/')
+    if dataplane_id:
+        return ApiRequest('GET', f"{host}/cp/v1/data-planes/{dataplane_id}/capabilities-status")
+    return ApiRequest('GET', f"{host}/cp/v1/data-planes/capabilities-status")
+
+
+def provision_capability(host, dataplane_id, capability, storage_resource_id, ingress_resource_id, cap_config):
+    """
+    POST provisioning a BWCE or FLOGO capability.
+
+    Args:
+        host (str): Tenant host URL
+        dataplane_id (str): Dataplane ID
+        capability (str): 'BWCE' or 'FLOGO'
+        storage_resource_id (str): Storage resource instance ID
+        ingress_resource_id (str): Ingress resource instance ID
+        cap_config (dict): ingress_class_name, ingress_controller_name, enable_fluentbit
+
+    Returns:
+        ApiRequest
+    """
+    path_prefix = f"/tibco/bw/{dataplane_id}" if capability == 'BWCE' else f"/tibco/flogo/{dataplane_id}"
+    payload = {
+        "provision-schema": {
+            "path-prefix": path_prefix,
+            "storage-class-resource-instance-id": storage_resource_id,
+            "ingress-controller-resource-instance-id": ingress_resource_id,
+            "ingress-class-name": cap_config.get('ingress_class_name', 'nginx'),
+            "ingress-controller-name": cap_config.get('ingress_controller_name', 'nginx'),
+            "fluentbit-sidecar-enabled": cap_config.get('enable_fluentbit', True)
+        }
+    }
+    url = f"{host.rstrip('/')}/cp/api/v1/data-planes/{dataplane_id}/capabilities/{capability}"
+    return ApiRequest('POST', url, json=payload)
+
+
+def capability_info(capability, host, dataplane_id, capability_id):
+    """GET provisioner info (runtime version, base image tag)."""
+    if capability == 'BWCE':
+        params = {'path': f"{_provisioner(capability, capability_id)}/info"}
+    else:
+        params = {'capability_instance_id': capability_id, 'path': f"{_provisioner(capability, capability_id)}/info"}
+    return ApiRequest('GET', _dp_resource_url(host, dataplane_id), params=params)
+
+
+# ---------------------------------------------------------------------------
+# Application deployment
+# ---------------------------------------------------------------------------
+
+def file_store(capability, host):
+    """POST (multipart 'file') uploading an .ear / .flogo file to the CP filesystem."""
+    kind = 'bwce' if capability == 'BWCE' else 'flogo'
+    return ApiRequest('POST', f"{host.rstrip('/')}/cp/{kind}/v1/files/store")
+
+
+def bwce_buildtypes(host, dataplane_id, capability_id):
+    """GET provisioned BWCE buildtypes, latest first."""
+    params = {
+        'sortBy': 'buildtypeTag',
+        'orderBy': 'desc',
+        'filterKey': '',
+        'filterValue': '',
+        'path': f"{_provisioner('BWCE', capability_id)}/buildtype"
+    }
+    return ApiRequest('GET', _dp_resource_url(host, dataplane_id), params=params)
+
+
+def provisioned_bwce_versions(result):
+    """[{'version', 'baseImageTag'}] from a bwce_buildtypes response (buildtypes with a base image only)."""
+    if not result or not result.get('totalBuildtypes', 0):
+        return []
+    versions = []
+    for bt in result.get('buildtypeCatalog', []):
+        base_images = bt.get('baseImages', [])
+        if base_images:
+            versions.append({'version': bt.get('buildtypeTag'), 'baseImageTag': base_images[0].get('imageTag')})
+    return versions
+
+
+def stored_file_id(result):
+    """File ID from a file_store response ('fileName' is the file ID/path)."""
+    return result.get('fileName') or result.get('fileId') or result.get('id')
+
+
+def bwce_build(host, dataplane_id, capability_id, file_id, app_name, bwce_version, base_image_tag):
+    """POST creating a BWCE build from an uploaded .ear (autoProvision=false, filePath as in the HAR)."""
+    query = {
+        'baseversion': bwce_version,
+        'baseimagetag': base_image_tag,
+        'capability_instance_id': capability_id,
+        'autoProvision': 'false'
+    }
+    payload = {
+        "dataPlaneId": dataplane_id,
+        "path": f"{_provisioner('BWCE', capability_id)}/builds",
+        "queryParams": dict(query),
+        "payload": {
+            "dependencies": [],
+            "filePath": file_id,
+            "tags": [],
+            "buildName": app_name if app_name else ""
+        },
+        "eventId": f"bwce_build_{int(time.time())}"
+    }
+    return ApiRequest('POST', _dp_resource_url(host, dataplane_id, "cp/bwce/v1"), params=query, json=payload)
+
+
+def bwce_deploy(host, dataplane_id, capability_id, namespace, build_id, app_name):
+    """POST deploying a BWCE build (eula accepted, replicas 0 as in the HAR)."""
+    query = {'namespace': namespace, 'capability_instance_id': capability_id}
+    payload = {
+        "dataPlaneId": dataplane_id,
+        "path": f"{_provisioner('BWCE', capability_id)}/deploy",
+        "queryParams": dict(query),
+        "payload": {
+            "appId": "",
+            "buildId": build_id,
+            "eula": True,
+            "appName": app_name,
+            "tags": [],
+            "profile": "default.substvar",
+            "replicas": 0,
+            "enableExecutionHistory": False,
+            "enableServiceMesh": False,
+            "enableAutoscaling": False,
+            "resourceLimits": {
+                "limits": {"cpu": "1", "memory": "4096Mi"},
+                "requests": {"cpu": "250m", "memory": "1024Mi"}
+            }
+        },
+        "eventId": f"bwce_deploy_{int(time.time())}"
+    }
+    return ApiRequest('POST', _dp_resource_url(host, dataplane_id, "cp/bwce/v1"), params=query, json=payload)
+
+
+def flogo_build(host, dataplane_id, capability_id, file_id, app_name, flogo_version):
+    """POST creating a Flogo build from an uploaded .flogo file."""
+    query = {'baseversion': flogo_version, 'capability_instance_id': capability_id}
+    payload = {
+        "dataPlaneId": dataplane_id,
+        "path": f"{_provisioner('FLOGO', capability_id)}/builds",
+        "queryParams": dict(query),
+        "payload": {
+            "dependencies": [],
+            "buildName": app_name,
+            "filePath": file_id,
+            "tags": []
+        },
+        "eventId": f"flogo_build_{int(time.time())}"
+    }
+    return ApiRequest('POST', _dp_resource_url(host, dataplane_id), params=query, json=payload)
+
+
+def flogo_deploy(host, dataplane_id, capability_id, namespace, build_id, app_name):
+    """POST deploying a Flogo build (eula accepted)."""
+    query = {'namespace': namespace, 'capability_instance_id': capability_id}
+    payload = {
+        "dataPlaneId": dataplane_id,
+        "path": f"{_provisioner('FLOGO', capability_id)}/deploy",
+        "queryParams": dict(query),
+        "payload": {
+            "appId": "",
+            "buildId": build_id,
+            "eula": True,
+            "appName": app_name,
+            "tags": [],
+            "enableServiceMesh": False,
+            "resourceLimits": {
+                "limits": {"cpu": "500m", "memory": "1024Mi"},
+                "requests": {"cpu": "250m", "memory": "512Mi"}
+            }
+        },
+        "eventId": f"flogo_deploy_{int(time.time())}"
+    }
+    return ApiRequest('POST', _dp_resource_url(host, dataplane_id), params=query, json=payload)
+
+
+def build_status(capability, host, dataplane_id, capability_id, build_id):
+    """GET status of a BWCE / Flogo build."""
+    path = f"{_provisioner(capability, capability_id)}/builds/{build_id}/status"
+    params = {'path': path} if capability == 'BWCE' else {'capability_instance_id': capability_id, 'path': path}
+    return ApiRequest('GET', _dp_resource_url(host, dataplane_id), params=params)
+
+
+# ---------------------------------------------------------------------------
+# Lifecycle
+# ---------------------------------------------------------------------------
+
+def scale_app(capability, host, dataplane_id, capability_id, app_id, namespace, replica_count):
+    """PUT scaling an app to replica_count (0 = stop, 1+ = start)."""
+    path = f"{_provisioner(capability, capability_id)}/apps/{app_id}/scale?count={replica_count}&namespace={namespace}"
+    params = {'capability_instance_id': capability_id}
+    if capability == 'BWCE':
+        payload = {
+            "path": path,
+            "dataPlaneId": dataplane_id,
+            "capabilityInstanceId": capability_id,
+            "method": "PUT"
+        }
+        return ApiRequest('PUT', _dp_resource_url(host, dataplane_id, "cp/v1"), params=params, json=payload)
+    payload = {
+        "dataPlaneId": dataplane_id,
+        "path": path,
+        "queryParams": {"capability_instance_id": capability_id},
+        "method": "PUT"
+    }
+    return ApiRequest('PUT', _dp_resource_url(host, dataplane_id), params=params, json=payload)
@@ -0,0 +1,323 @@
+"""
+Client-side rate limiting and adaptive concurrency per CP host.
+
+With parallel workflow tasks, many threads can hit one CP at the same
+time and get 429s or 5xx under load. A RateLimitAdapter mounted on every
+SAMLAuthenticator session sends each request through the HostLimiter of
+its host:
+
+- a token bucket per endpoint class (reads, mutations, uploads, login)
+  caps the request rate (rate_limit_config.rates)
+- an AIMD controller caps the requests in flight: the window grows by about
+  one per window of healthy responses, and is halved on a 429, a 5xx or
+  a latency spike (latency_factor x the class's usual latency, or above
+  latency_threshold_seconds; uploads only use the former, since a large
+  .ear legitimately takes long). It is halved at most once per cooldown
+- a 429 Retry-After pauses the host
+
+Login-flow requests (including re-authentications) skip the window, because
+they run inside a request that already holds a slot, but take tokens from
+the "login" bucket, so a re-authentication storm stays rate-limited.
+
+Worker threads beyond the window wait for a slot, so max_workers acts as
+the upper bound and the window is the effective concurrency. The current
+limits are exported as metrics gauges (dp_population_rate_limit_*).
+
+Usage:
+    rate_limit.configure(config)             # rate_limit_config in config.json
+    print(rate_limit.limiter.snapshot())
+"""
+
+import threading
+import time
+import urllib.parse
+
+from auth import DelegatingAdapter, register_session_hook, wrap_session_adapters
+from logging_config import get_logger
+import metrics
+
+logger = get_logger(__name__)
+
+READ = "read"
+MUTATION = "mutation"
+UPLOAD = "upload"
+LOGIN = "login"
+
+DEFAULT_RATES = {
+    READ: {"rate": 20.0, "burst": 40},
+    MUTATION: {"rate": 5.0, "burst": 10},
+    UPLOAD: {"rate": 1.0, "burst": 2},
+    LOGIN: {"rate": 2.0, "burst": 10},
+}
+DEFAULT_CONCURRENCY = {
+    "initial": 4,
+    "min": 1,
+    "max": 32,
+    "latency_factor": 3.0,
+    "latency_threshold_seconds": 10.0,
+    "cooldown_seconds": 1.0,
+}
+# Latencies below this never count as a spike (ratio noise on fast calls)
+MIN_SPIKE_SECONDS = 0.25
+UPLOAD_MARKERS = ('/files/store',)
+
+
+def endpoint_class(request, auth=None):
+    """LOGIN (login flow of auth), UPLOAD, READ or MUTATION for a prepared request."""
+    if auth is not None and auth.in_login_flow():
+        return LOGIN
+    path = urllib.parse.urlsplit(request.url).path
+    content_type = request.headers.get('Content-Type') or ''
+    if any(marker in path for marker in UPLOAD_MARKERS) or content_type.startswith('multipart/'):
+        return UPLOAD
+    if request.method in ('GET', 'HEAD', 'OPTIONS'):
+        return READ
+    return MUTATION
+
+
+class TokenBucket:
+    """Blocking token bucket: `rate` tokens per second, at most `burst` stored."""
+
+    __slots__ = ("rate", "burst", "tokens", "updated", "lock")
+
+    def __init__(self, rate, burst):
+        self.rate = float(rate)
+        self.burst = max(1.0, float(burst))
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self, tokens=1.0):
+        """Take tokens if available; otherwise return the seconds until they will be."""
+        with self.lock:
+            self._refill(time.monotonic())
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return 0.0
+            if self.rate <= 0:
+                return float('inf')
+            return (tokens - self.tokens) / self.rate
+
+    def acquire(self, tokens=1.0):
+        """Block until tokens are available; returns the seconds waited."""
+        waited = 0.0
+        while True:
+            wait = self.try_acquire(tokens)
+            if not wait:
+                return waited
+            wait = min(wait, 1.0)
+            time.sleep(wait)
+            waited += wait
+
+
+class AIMDController:
+    """Additive-increase / multiplicative-decrease limit on requests in flight."""
+
+    def __init__(self, initial=4, min_limit=1, max_limit=32, latency_factor=3.0,
+                 latency_threshold=10.0, cooldown=1.0, decrease=0.5):
+        self.min_limit = max(1, int(min_limit))
+        self.max_limit = max(self.min_limit, int(max_limit))
+        self.limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self.latency_factor = latency_factor
+        self.latency_threshold = latency_threshold
+        self.cooldown = cooldown
+        self.decrease = decrease
+        self.inflight = 0
+        self.baseline = {}  # endpoint class -> smoothed healthy latency
+        self.last_decrease = 0.0
+        self.stats = {"increases": 0, "decreases": 0, "waits": 0}
+        self.cond = threading.Condition()
+
+    def acquire(self):
+        """Block until the window has room; returns the seconds waited."""
+        started = None
+        with self.cond:
+            while self.inflight >= int(self.limit):
+                if started is None:
+                    started = time.monotonic()
+                    self.stats["waits"] += 1
+                self.cond.wait(1.0)
+            self.inflight += 1
+        return time.monotonic() - started if started is not None else 0.0
+
+    def _spike(self, cls, latency):
+        # Upload time grows with the file size, so only the upload baseline can tell a slow upload
+        if cls != UPLOAD and latency > self.latency_threshold:
+            return True
+        baseline = self.baseline.get(cls)
+        return baseline is not None and latency > MIN_SPIKE_SECONDS and latency > baseline * self.latency_factor
+
+    def release(self, cls, latency, status):
+        """
+        Free a slot and adapt the window to the outcome.
+
+        Args:
+            cls (str): Endpoint class of the request
+            latency (float): Seconds the request took
+            status (int): HTTP status, or None when no response was received
+        """
+        overloaded = status is None or status == 429 or status >= 500
+        with self.cond:
+            self.inflight -= 1
+            if overloaded or self._spike(cls, latency):
+                now = time.monotonic()
+                if now - self.last_decrease >= self.cooldown:
+                    self.last_decrease = now
+                    self.limit = max(float(self.min_limit), self.limit * self.decrease)
+                    self.stats["decreases"] += 1
+                    logger.debug("[DEBUG] Concurrency window -> %d (status %s, %.2fs)", int(self.limit), status, latency)
+            else:
+                baseline = self.baseline.get(cls)
+                self.baseline[cls] = latency if baseline is None else baseline * 0.9 + latency * 0.1
+                if self.limit < self.max_limit:
+                    self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+                    self.stats["increases"] += 1
+            self.cond.notify_all()
+
+
+class HostLimiter:
+    """Token buckets per endpoint class plus the AIMD window of one host."""
+
+    def __init__(self, host, rates, concurrency):
+        self.host = host
+        self.buckets = {cls: TokenBucket(r["rate"], r["burst"]) for cls, r in rates.items()}
+        self.controller = AIMDController(
+            initial=concurrency["initial"], min_limit=concurrency["min"], max_limit=concurrency["max"],
+            latency_factor=concurrency["latency_factor"],
+            latency_threshold=concurrency["latency_threshold_seconds"],
+            cooldown=concurrency["cooldown_seconds"])
+        self.paused_until = 0.0
+        self.waited = 0.0
+
+    def pause(self, seconds):
+        """Hold all requests to the host (429 Retry-After)."""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def acquire(self, cls, windowed=True):
+        pause = self.paused_until - time.monotonic()
+        waited = 0.0
+        if pause > 0:
+            time.sleep(pause)
+            waited += pause
+        bucket = self.buckets.get(cls)
+        if bucket is not None:
+            waited += bucket.acquire()
+        if windowed:
+            waited += self.controller.acquire()
+        self.waited += waited
+
+    def release(self, cls, latency, status, retry_after=None, windowed=True):
+        if windowed:
+            self.controller.release(cls, latency, status)
+        if status == 429 and retry_after:
+            try:
+                self.pause(min(float(retry_after), 60.0))
+            except ValueError:
+                pass  # HTTP-date form; the window decrease already slows us down
+
+
+class RateLimiter:
+    """Process-wide HostLimiter per CP host."""
+
+    def __init__(self, rates=None, concurrency=None):
+        self.lock = threading.Lock()
+        self.hosts = {}  # scheme://netloc -> HostLimiter
+        self.configure(rates, concurrency)
+
+    def configure(self, rates=None, concurrency=None):
+        self.rates = {cls: dict(r) for cls, r in DEFAULT_RATES.items()}
+        for cls, r in (rates or {}).items():
+            self.rates.setdefault(cls, {}).update(r)
+        self.concurrency = dict(DEFAULT_CONCURRENCY, **(concurrency or {}))
+        with self.lock:
+            self.hosts = {}
+
+    def host(self, url):
+        parts = urllib.parse.urlsplit(url)
+        key = f"{parts.scheme}://{parts.netloc}"
+        with self.lock:
+            limiter = self.hosts.get(key)
+            if limiter is None:
+                limiter = self.hosts[key] = HostLimiter(key, self.rates, self.concurrency)
+            return limiter
+
+    def snapshot(self):
+        """{host: {window, inflight, waited_seconds, increases, decreases, rates}}"""
+        with self.lock:
+            hosts = list(self.hosts.values())
+        return {h.host: {
+            "window": int(h.controller.limit),
+            "inflight": h.controller.inflight,
+            "waited_seconds": round(h.waited, 3),
+            "increases": h.controller.stats["increases"],
+            "decreases": h.controller.stats["decreases"],
+            "rates": {cls: b.rate for cls, b in h.buckets.items()}
+        } for h in hosts}
+
+    def gauges(self):
+        """Current limits for metrics.MetricsRegistry.add_gauges."""
+        snapshot = self.snapshot()
+        return [
+            ("rate_limit_concurrency_window", "Current AIMD limit on CP requests in flight per host.",
+             [({"host": host}, s["window"]) for host, s in snapshot.items()]),
+            ("rate_limit_requests_per_second", "Token-bucket request rate per host and endpoint class.",
+             [({"host": host, "class": cls}, rate) for host, s in snapshot.items() for cls, rate in s["rates"].items()]),
+            ("rate_limit_wait_seconds", "Seconds requests waited for the rate limiter per host.",
+             [({"host": host}, s["waited_seconds"]) for host, s in snapshot.items()]),
+            ("rate_limit_window_decreases", "Times the concurrency window was cut per host.",
+             [({"host": host}, s["decreases"]) for host, s in snapshot.items()]),
+        ]
+
+
+# Process-wide limiter shared by all sessions
+limiter = RateLimiter()
+
+
+class RateLimitAdapter(DelegatingAdapter):
+    """Waits for the host's token bucket and concurrency window before sending."""
+
+    def __init__(self, inner, rate_limiter=None, auth=None):
+        super().__init__(inner)
+        self.limiter = rate_limiter or limiter
+        self.auth = auth
+
+    def send(self, request, **kwargs):
+        host = self.limiter.host(request.url)
+        cls = endpoint_class(request, self.auth)
+        # A re-authentication runs inside a request that already holds a window slot;
+        # login traffic is limited by the LOGIN token bucket only
+        windowed = cls != LOGIN
+        host.acquire(cls, windowed)
+        started = time.monotonic()
+        status = retry_after = None
+        try:
+            response = super().send(request, **kwargs)
+            status = response.status_code
+            retry_after = response.headers.get('Retry-After')
+            return response
+        finally:
+            host.release(cls, time.monotonic() - started, status, retry_after, windowed)
+
+
+def install(rate_limiter=None):
+    """Rate-limit every SAMLAuthenticator session created from now on."""
+    rate_limiter = rate_limiter or limiter
+    register_session_hook(lambda session, auth: wrap_session_adapters(
+        session, lambda inner: RateLimitAdapter(inner, rate_limiter, auth)))
+    metrics.registry.add_gauges(rate_limiter.gauges)
+    return rate_limiter
+
+
+def configure(config):
+    """Apply rate_limit_config (enabled, rates, concurrency) and install the limiter when enabled."""
+    rate_config = (config or {}).get('rate_limit_config', {})
+    if not rate_config.get('enabled', False):
+        return None
+    limiter.configure(rate_config.get('rates'), rate_config.get('concurrency'))
+    logger.info("[*] Rate limiting CP requests (window %s..%s in flight per host)",
+                limiter.concurrency["min"], limiter.concurrency["max"])
+    return install(limiter)
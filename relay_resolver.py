@@ -0,0 +1,104 @@
+"""
+RelayState selection for the SAML login flow.
+
+run_login_flow() without a RelayState first GETs /admin/login (and possibly
+/cp/login) to scrape a dynamic one, and every caller fell back to the
+locally generated state (utils.generate_admin_relay_state /
+generate_tenant_relay_state) when that flow failed, so a login could cost
+up to two and a half flows. RelayStateResolver tries the generated state
+first, remembers per host which strategy worked and caches a scraped
+dynamic state, so a login normally makes one flow attempt and no landing
+page request.
+
+Usage:
+    relay_resolver.login(auth, generate_tenant_relay_state(prefix, host), "tenant")
+"""
+
+import threading
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+GENERATED = "generated"
+DYNAMIC = "dynamic"
+
+
+class RelayStateResolver:
+    """Per-host memory of the RelayState strategy that last produced a login."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.preferred = {}  # host -> GENERATED | DYNAMIC
+        self.dynamic_states = {}  # host -> scraped RelayState that led to a login
+        self.stats = {"attempts": 0, "logins": 0, "landing_fetches": 0}
+
+    @staticmethod
+    def _host(auth):
+        return auth.host_idm.rstrip('/')
+
+    def strategies(self, host):
+        """Strategies in the order they are tried for a host."""
+        with self.lock:
+            preferred = self.preferred.get(host, GENERATED)
+        return [preferred] + [s for s in (GENERATED, DYNAMIC) if s != preferred]
+
+    def _dynamic_state(self, auth, host):
+        with self.lock:
+            state = self.dynamic_states.get(host)
+        if state:
+            return state
+        self.stats["landing_fetches"] += 1
+        return auth.get_dynamic_relay_state()
+
+    def record(self, host, strategy, state, ok):
+        """Remember the outcome of one login attempt."""
+        with self.lock:
+            if ok:
+                self.preferred[host] = strategy
+                if strategy == DYNAMIC:
+                    self.dynamic_states[host] = state
+            elif strategy == DYNAMIC:
+                # A cached state may be stale; scrape a fresh one next time
+                self.dynamic_states.pop(host, None)
+
+    def login(self, auth, generated_state=None, label=None):
+        """
+        Run the login flow with the RelayState most likely to work.
+
+        Args:
+            auth (SAMLAuthenticator): Authenticator to log in
+            generated_state (str): Locally generated RelayState for the host
+            label (str): Name used in log messages (admin, tenant, new user)
+
+        Returns:
+            bool: True when one of the strategies logged in
+        """
+        host = self._host(auth)
+        label = label or auth.username
+        # Landing-page fetches must not trigger re-authentication either
+        with auth.login_scope():
+            return self._login(auth, host, generated_state, label)
+
+    def _login(self, auth, host, generated_state, label):
+        for strategy in self.strategies(host):
+            state = generated_state if strategy == GENERATED else self._dynamic_state(auth, host)
+            if not state:
+                continue
+            self.stats["attempts"] += 1
+            ok = auth.run_login_flow(state)
+            self.record(host, strategy, state, ok)
+            if ok:
+                self.stats["logins"] += 1
+                logger.debug("[DEBUG] %s login with %s RelayState", label, strategy)
+                return True
+            logger.info("[*] %s RelayState failed for %s, trying the next one...", strategy.capitalize(), label)
+        return False
+
+
+# Process-wide resolver shared by all logins
+resolver = RelayStateResolver()
+
+
+def login(auth, generated_state=None, label=None):
+    return resolver.login(auth, generated_state, label)
@@ -0,0 +1,186 @@
+"""
+Run-scoped index of CP resource instances.
+
+The Helm repository (per subscription), storage and ingress instances (per
+dataplane) and activation servers (per subscription) used to be fetched
+from /cp/v1/resource-instances-details on every lookup: once per
+registered dataplane for the Helm repo and once per capability for the
+storage/ingress fallback by name. ResourceIndex loads each
+(host, resourceId, scope, scope id) list once per session and keeps it for
+the run; concurrent callers for the same list wait for the single load.
+Creations are written through with add(), so a resource created by this run
+is found without reloading.
+
+Usage:
+    helm = resource_index.find(session, host, HELMREPO, SUBSCRIPTION)
+    storage = resource_index.find(session, host, STORAGE, DATAPLANE, dp_id, name='dpstorage')
+    resource_index.add(session, host, STORAGE, DATAPLANE, dp_id, resource_id, 'dpstorage')
+"""
+
+import threading
+import weakref
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+HELMREPO = "HELMREPO"
+STORAGE = "STORAGE"
+INGRESS = "INGRESS"
+ACTIVATION_SERVER = "ACTIVATION_SERVER"
+
+SUBSCRIPTION = "SUBSCRIPTION"
+DATAPLANE = "DATAPLANE"
+
+
+class ResourceIndexError(Exception):
+    """The resource list could not be loaded (non-200 response)."""
+
+    def __init__(self, status_code, text=''):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.text = text
+
+
+class ResourceInstance:
+    """One resource instance with its metadata fields flattened to {key: value}."""
+
+    __slots__ = ("instance_id", "name", "resource_id", "scope_id", "fields")
+
+    def __init__(self, instance_id, name, resource_id, scope_id, fields=None):
+        self.instance_id = instance_id
+        self.name = name
+        self.resource_id = resource_id
+        self.scope_id = scope_id
+        self.fields = fields or {}
+
+    @classmethod
+    def from_response(cls, data):
+        metadata = data.get('resource_instance_metadata') or {}
+        fields = {f.get('key'): f.get('value', '') for f in metadata.get('fields', []) or [] if f.get('key')}
+        return cls(data.get('resource_instance_id', ''), data.get('resource_instance_name', ''),
+                   data.get('resource_id', ''), data.get('scope_id', ''), fields)
+
+    @property
+    def fqdn(self):
+        return self.fields.get('fqdn', '')
+
+
+class _Scope:
+    """Instances of one resource type in one scope; lock serializes the initial load."""
+
+    __slots__ = ("lock", "loaded", "by_name")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.loaded = False
+        self.by_name = {}  # resource_instance_name -> ResourceInstance, in CP order
+
+
+class ResourceIndex:
+    """Per-session cache of resource-instances-details lists, loaded once per scope."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.scopes = weakref.WeakKeyDictionary()  # session -> {(host, resource_id, scope, scope_id): _Scope}
+        self.stats = {"loads": 0, "hits": 0}
+
+    def _scope(self, session, key):
+        with self.lock:
+            scopes = self.scopes.setdefault(session, {})
+            entry = scopes.get(key)
+            if entry is None:
+                entry = scopes[key] = _Scope()
+            return entry
+
+    def instances(self, session, host, resource_id, scope, scope_id=None, **request_kwargs):
+        """
+        All instances of a resource type in a scope, loading them on first use.
+
+        Args:
+            session: Authenticated requests.Session
+            host (str): Tenant host URL
+            resource_id (str): HELMREPO, STORAGE, INGRESS, ACTIVATION_SERVER, ...
+            scope (str): SUBSCRIPTION or DATAPLANE
+            scope_id (str): Dataplane ID for DATAPLANE scope
+            **request_kwargs: Passed to session.get on the initial load (headers, timeout)
+
+        Returns:
+            list: ResourceInstance objects
+
+        Raises:
+            ResourceIndexError: The list request failed (nothing is cached)
+        """
+        host = host.rstrip('/')
+        entry = self._scope(session, (host, resource_id, scope, scope_id))
+        with entry.lock:
+            if entry.loaded:
+                self.stats["hits"] += 1
+                return list(entry.by_name.values())
+
+            params = {'scope': scope, 'resourceLevel': 'PLATFORM', 'resourceId': resource_id}
+            if scope_id:
+                params['dataPlaneId'] = scope_id
+            resp = session.get(f"{host}/cp/v1/resource-instances-details", params=params, **request_kwargs)
+            if resp.status_code != 200:
+                raise ResourceIndexError(resp.status_code, resp.text[:300])
+
+            response_data = resp.json() or {}
+            for data in response_data.get('data', []) or []:
+                instance = ResourceInstance.from_response(data)
+                # Keep instances written through while the list was not loaded yet
+                entry.by_name.setdefault(instance.name, instance)
+            entry.loaded = True
+            self.stats["loads"] += 1
+            logger.debug("[DEBUG] Loaded %s %s resource instance(s) (scope %s %s)",
+                         len(entry.by_name), resource_id, scope, scope_id or '-')
+            return list(entry.by_name.values())
+
+    def find(self, session, host, resource_id, scope, scope_id=None, name=None, **request_kwargs):
+        """
+        Instance by name, or the first instance when name is None.
+
+        Returns:
+            ResourceInstance: Or None when the scope has no such instance
+        """
+        instances = self.instances(session, host, resource_id, scope, scope_id, **request_kwargs)
+        if name is None:
+            return instances[0] if instances else None
+        for instance in instances:
+            if instance.name == name:
+                return instance
+        return None
+
+    def add(self, session, host, resource_id, scope, scope_id, instance_id, name, fields=None):
+        """Write a newly created instance through to the index."""
+        entry = self._scope(session, (host.rstrip('/'), resource_id, scope, scope_id))
+        with entry.lock:
+            entry.by_name[name] = ResourceInstance(instance_id, name, resource_id, scope_id or '', fields)
+
+    def invalidate(self, session, resource_id=None, scope_id=None):
+        """Forget loaded lists for a session (optionally only one resource type / scope id)."""
+        with self.lock:
+            scopes = self.scopes.get(session, {})
+            for key in [k for k in scopes if (resource_id is None or k[1] == resource_id)
+                        and (scope_id is None or k[3] == scope_id)]:
+                del scopes[key]
+
+
+# Process-wide index used by TenantService
+index = ResourceIndex()
+
+
+def instances(session, host, resource_id, scope, scope_id=None, **request_kwargs):
+    return index.instances(session, host, resource_id, scope, scope_id, **request_kwargs)
+
+
+def find(session, host, resource_id, scope, scope_id=None, name=None, **request_kwargs):
+    return index.find(session, host, resource_id, scope, scope_id, name, **request_kwargs)
+
+
+def add(session, host, resource_id, scope, scope_id, instance_id, name, fields=None):
+    index.add(session, host, resource_id, scope, scope_id, instance_id, name, fields)
+
+
+def invalidate(session, resource_id=None, scope_id=None):
+    index.invalidate(session, resource_id, scope_id)
@@ -1,5 +1,48 @@
 import json
+import logging
 import urllib.parse
+from logging_config import get_logger, LazyJson
+from status_model import StatusSnapshot
+import status_cache
+import payloads
+import resource_index
+import user_index
+from status_render import StatusRenderer
+
+logger = get_logger(__name__)
+
+# Emails per PUT /cp/v1/invite/members
+INVITE_BATCH_SIZE = 100
+
+# Full role set of the original invite (curl sample); the first ones are scoped to all dataplanes
+DEFAULT_INVITE_ROLES = [
+    "CAPABILITY_USER", "CAPABILITY_ADMIN", "DEV_OPS", "BROWSE_ASSIGNMENTS",
+    "PLATFORM_OPS", "TEAM_ADMIN", "IDP_MANAGER", "OWNER"
+]
+DATAPLANE_SCOPED_ROLES = {"CAPABILITY_USER", "CAPABILITY_ADMIN", "DEV_OPS", "PLATFORM_OPS"}
+
+
+def invite_permissions(roles):
+    """
+    Invite permissions for a role set.
+
+    Args:
+        roles (list): Role IDs (dataplane-scoped roles get dataplaneId/instanceId "*")
+                      or complete permission dicts
+
+    Returns:
+        list: Permission dicts for the invite payload
+    """
+    permissions = []
+    for role in roles:
+        if isinstance(role, dict):
+            permissions.append(dict({"exclude": False}, **role))
+        elif role in DATAPLANE_SCOPED_ROLES:
+            permissions.append({"roleId": role, "exclude": False, "dataplaneId": "*", "instanceId": "*"})
+        else:
+            permissions.append({"roleId": role, "exclude": False})
+    return permissions
+
 
 class TenantService:
     def __init__(self, auth_instance):
@@ -62,18 +105,18 @@ class TenantService:
         try:
             resp = self.session.post(provision_url, headers=headers, json=payload, timeout=30)
             if resp.status_code in [200, 201]:
-                print(f"[+] Subscription for {host_prefix} created.")
+                logger.info("[+] Subscription for %s created.", host_prefix)
                 return True
             
             # Handle "Already exists" - check body content
             resp_json = resp.json() if resp.text else {}
             if resp.status_code == 409 or "already exists" in str(resp_json).lower():
-                print(f"[*] Subscription for {host_prefix} already exists.")
+                logger.info("[*] Subscription for %s already exists.", host_prefix)
                 return True
             else:
-                print(f"[!] Provisioning failed: {resp.status_code} - {resp.text}")
+                logger.warning("[!] Provisioning failed: %s - %s", resp.status_code, resp.text)
         except Exception as e:
-            print(f"[!] Error during provisioning: {e}")
+            logger.warning("[!] Error during provisioning: %s", e)
         return False
 
     def get_user_details(self, params):
@@ -94,29 +137,104 @@ class TenantService:
             if resp.status_code == 200:
                 return resp.json()
             else:
-                print(f"[!] User list API failed. Status: {resp.status_code}")
-                print(f"    Response: {resp.text[:200]}")
+                logger.warning("[!] User list API failed. Status: %s", resp.status_code)
+                logger.warning("    Response: %s", resp.text[:200])
         except Exception as e:
-            print(f"[!] Error fetching users: {e}")
+            logger.warning("[!] Error fetching users: %s", e)
         return None
 
     def get_specific_user(self, email):
-        """Get specific user details by email."""
-        users_data = self.get_user_details({'order-by': '', 'page': '1', 'limit': '100', 'person': ''})
-        if users_data and users_data.get('users'):
-            for user in users_data['users']:
-                if user.get('email') == email:
-                    return user
-        return None
+        """Get specific user details by email (searches all pages via the user index)."""
+        try:
+            return user_index.find(self, email)
+        except user_index.UserIndexError as e:
+            logger.warning("[!] %s", e)
+            return None
 
     def invite_new_user(self, email):
         """
         Invites a new user to the tenant host with a full set of permissions.
-        Updated to match the specific PUT request and payload from curl.
+
+        Returns:
+            bool: True when the invite was accepted by CP
+        """
+        result = self.invite_users([email], skip_existing=False)
+        return result['results'].get(email) == "invited"
+
+    def invite_users(self, users, roles=None, skip_existing=True, batch_size=None):
         """
+        Invites many users with batched PUTs to /cp/v1/invite/members.
+
+        Users that are already in the tenant (user index) are skipped. The rest are
+        grouped by role set and sent in batches of batch_size emails per request.
+
+        Args:
+            users: List of emails, or dict {email: roles} for per-email role sets
+                   (roles None = the default role set)
+            roles (list): Role set for emails without their own (role IDs or permission
+                          dicts; default DEFAULT_INVITE_ROLES)
+            skip_existing (bool): Filter emails against the user index first
+            batch_size (int): Emails per request (default INVITE_BATCH_SIZE)
+
+        Returns:
+            dict: {"success": bool, "results": {email: "invited"|"existing"|"failed"},
+                   "requests": int, "errors": {email: str}}
+        """
+        if not isinstance(users, dict):
+            users = {email: None for email in users}
+        batch_size = max(1, batch_size or INVITE_BATCH_SIZE)
+        results, errors = {}, {}
+
+        existing = set()
+        if skip_existing:
+            for email in users:
+                try:
+                    if user_index.find(self, email) is not None:
+                        existing.add(email)
+                except user_index.UserIndexError as e:
+                    logger.warning("[!] Could not list users (%s); inviting without the existence check", e)
+                    break
+        for email in existing:
+            results[email] = "existing"
+        if existing:
+            logger.info("[*] Skipping %s already registered user(s)", len(existing))
+
+        # Group by role set so each request carries one permissions list
+        groups = {}
+        for email, email_roles in users.items():
+            if email in existing or not email:
+                continue
+            permissions = invite_permissions(email_roles or roles or DEFAULT_INVITE_ROLES)
+            key = json.dumps(permissions, sort_keys=True)
+            groups.setdefault(key, (permissions, []))[1].append(email)
+
+        requests_sent = 0
+        for permissions, emails in groups.values():
+            for start in range(0, len(emails), batch_size):
+                batch = emails[start:start + batch_size]
+                requests_sent += 1
+                ok, error = self._put_invites(batch, permissions)
+                for email in batch:
+                    results[email] = "invited" if ok else "failed"
+                    if ok:
+                        user_index.add(self, email)
+                    else:
+                        errors[email] = error
+
+        invited = [e for e, r in results.items() if r == "invited"]
+        if len(invited) > 1:
+            logger.info("[+] Invited %s user(s) in %s request(s)", len(invited), requests_sent)
+        return {
+            "success": not errors,
+            "results": results,
+            "requests": requests_sent,
+            "errors": errors
+        }
+
+    def _put_invites(self, emails, permissions):
+        """One PUT /cp/v1/invite/members for a batch of emails. Returns (ok, error)."""
         url = f"{self.auth.host_idm}/cp/v1/invite/members"
-        
-        # Updated headers to match curl sample
+
         headers = {
             'Accept': 'application/json, text/plain, */*',
             'Content-Type': 'application/json',
@@ -132,77 +250,34 @@ class TenantService:
         if tsc_value:
             headers['x-xsrf-token'] = tsc_value
 
-        # Expanded permissions payload as per the curl sample
         payload = {
             "action": "invite",
-            "emails": [email],
-            "permissions": [
-                {"roleId": "CAPABILITY_USER", "exclude": False, "dataplaneId": "*", "instanceId": "*"},
-                {"roleId": "CAPABILITY_ADMIN", "exclude": False, "dataplaneId": "*", "instanceId": "*"},
-                {"roleId": "DEV_OPS", "exclude": False, "dataplaneId": "*", "instanceId": "*"},
-                {"roleId": "BROWSE_ASSIGNMENTS", "exclude": False},
-                {"roleId": "PLATFORM_OPS", "exclude": False, "dataplaneId": "*", "instanceId": "*"},
-                {"roleId": "TEAM_ADMIN", "exclude": False},
-                {"roleId": "IDP_MANAGER", "exclude": False},
-                {"roleId": "OWNER", "exclude": False}
-            ],
+            "emails": list(emails),
+            "permissions": permissions,
             "allowTibcoAuthentication": True
         }
-
-        # ====== DEBUG: REQUEST PAYLOAD ======
-        # print(f"\n[DEBUG] Invitation Request Payload:")
-        # import json as json_module
-        # print(json_module.dumps(payload, indent=4))
-        # print(f"[DEBUG] Target URL: {url}")
-        # print(f"[DEBUG] CSRF Token (x-xsrf-token): {tsc_value if tsc_value else 'None'}\n")
-        # ====================================
+        logger.debug("[DEBUG] Invitation payload: %s", LazyJson(payload))
 
         try:
             # Using PUT as per the sample curl provided
             resp = self.session.put(url, headers=headers, json=payload, timeout=30)
-            
-            # ====== DEBUG LOGGING START ======
-            # print(f"\n{'='*60}")
-            # print(f"[DEBUG] Invitation API Call Details")
-            # print(f"{'='*60}")
-            # print(f"[DEBUG] Request URL: {url}")
-            # print(f"[DEBUG] Request Method: PUT")
-            # print(f"[DEBUG] Response Status Code: {resp.status_code}")
-            # print(f"[DEBUG] Response Headers:")
-            # for header, value in resp.headers.items():
-            #     print(f"        {header}: {value}")
-            # print(f"\n[DEBUG] Raw Response Text:")
-            # print(f"        {resp.text}")
-
-            # Try to parse as JSON for pretty printing
-            # try:
-            #     import json as json_module
-            #     response_json = resp.json()
-            #     print(f"\n[DEBUG] Parsed JSON Response:")
-            #     print(json_module.dumps(response_json, indent=4))
-            # except:
-            #     print(f"[DEBUG] (Response is not valid JSON)")
-
-            # print(f"{'='*60}\n")
-            # ====== DEBUG LOGGING END ======
-
-            # Original response logging
-            # print(f"[*] Invitation API Response: {resp.text}")
 
             if resp.status_code in [200, 201, 204]:
                 # Log the roles assigned for verification
-                role_ids = [p['roleId'] for p in payload['permissions']]
-                print(f"[+] Successfully invited user: {email} with permissions: {', '.join(role_ids)}")
-                return True
+                role_ids = [p['roleId'] for p in permissions]
+                if len(emails) == 1:
+                    logger.info("[+] Successfully invited user: %s with permissions: %s", emails[0], ', '.join(role_ids))
+                else:
+                    logger.info("[+] Successfully invited %s users with permissions: %s", len(emails), ', '.join(role_ids))
+                return True, None
             else:
-                print(f"[!] Failed to invite user. Status: {resp.status_code}")
-                return False
+                logger.warning("[!] Failed to invite user(s). Status: %s", resp.status_code)
+                logger.debug("[DEBUG] Response: %s", resp.text[:300])
+                return False, f"HTTP {resp.status_code}"
         except Exception as e:
-            print(f"[!] Error during user invitation: {e}")
-            import traceback
-            print(f"[DEBUG] Full traceback:")
-            traceback.print_exc()
-            return False
+            logger.warning("[!] Error during user invitation: %s", e)
+            logger.debug("[DEBUG] Full traceback:", exc_info=True)
+            return False, str(e)
 
     def get_helm_resource_instance_id(self, resource_name=None):
         """
@@ -215,14 +290,6 @@ class TenantService:
         Returns:
             str: Helm resource instance ID or empty string if failed
         """
-        url = f"{self.auth.host_idm}/cp/v1/resource-instances-details"
-
-        params = {
-            'scope': 'SUBSCRIPTION',
-            'resourceLevel': 'PLATFORM',
-            'resourceId': 'HELMREPO'
-        }
-
         headers = {
             'Accept': 'application/json, text/plain, */*',
             'Content-Type': 'application/json',
@@ -234,40 +301,33 @@ class TenantService:
             headers['x-xsrf-token'] = tsc_value
 
         try:
-            resp = self.session.get(url, params=params, headers=headers, timeout=30)
-            if resp.status_code == 200:
-                response_data = resp.json()
-
-                # Response structure: {"data": [{"resource_instance_id": "...", "resource_instance_name": "...", ...}]}
-                if response_data and 'data' in response_data and len(response_data['data']) > 0:
-                    resources = response_data['data']
-                    print(f"[+] Found {len(resources)} Helm repository resources")
-
-                    # If resource_name is specified, find that specific resource
-                    if resource_name:
-                        for resource in resources:
-                            if resource.get('resource_instance_name') == resource_name:
-                                resource_id = resource.get('resource_instance_id', '')
-                                print(f"[+] Found resource '{resource_name}' with ID: {resource_id}")
-                                return resource_id
-                        print(f"[!] Resource '{resource_name}' not found")
-                        return ''
-
-                    # Otherwise return first available resource
-                    first_resource = resources[0]
-                    resource_id = first_resource.get('resource_instance_id', '')
-                    resource_name = first_resource.get('resource_instance_name', 'Unknown')
-                    print(f"[+] Using Helm resource: {resource_name} (ID: {resource_id})")
-                    return resource_id
-                else:
-                    print("[!] No Helm repository resources found in response")
-                    return ''
-            else:
-                print(f"[!] Failed to get Helm resources. Status: {resp.status_code}")
-                print(f"    Response: {resp.text[:300]}")
+            # Loaded once per run and shared by every dataplane registration
+            resources = resource_index.instances(self.session, self.auth.host_idm, resource_index.HELMREPO,
+                                                 resource_index.SUBSCRIPTION, headers=headers, timeout=30)
+            if not resources:
+                logger.warning("[!] No Helm repository resources found in response")
                 return ''
+            logger.debug("[DEBUG] Found %s Helm repository resources", len(resources))
+
+            # If resource_name is specified, find that specific resource
+            if resource_name:
+                for resource in resources:
+                    if resource.name == resource_name:
+                        logger.info("[+] Found resource '%s' with ID: %s", resource_name, resource.instance_id)
+                        return resource.instance_id
+                logger.warning("[!] Resource '%s' not found", resource_name)
+                return ''
+
+            # Otherwise return first available resource
+            first_resource = resources[0]
+            logger.info("[+] Using Helm resource: %s (ID: %s)", first_resource.name or 'Unknown', first_resource.instance_id)
+            return first_resource.instance_id
+        except resource_index.ResourceIndexError as e:
+            logger.warning("[!] Failed to get Helm resources. Status: %s", e.status_code)
+            logger.warning("    Response: %s", e.text)
+            return ''
         except Exception as e:
-            print(f"[!] Error fetching Helm resources: {e}")
+            logger.warning("[!] Error fetching Helm resources: %s", e)
             return ''
 
     def register_dataplane(self, dataplane_config):
@@ -321,15 +381,15 @@ class TenantService:
         helm_repo_resource = None
 
         if not helm_resource_id:
-            print("[*] No Helm resource ID provided, fetching from API...")
+            logger.info("[*] No Helm resource ID provided, fetching from API...")
             helm_resource_id = self.get_helm_resource_instance_id()
 
             if helm_resource_id:
-                print(f"[+] Retrieved Helm resource instance ID: {helm_resource_id}")
+                logger.info("[+] Retrieved Helm resource instance ID: %s", helm_resource_id)
             else:
                 # If still no helm_resource_id, create a helmRepoResource object instead
-                print("[*] No Helm resource instance found, creating helmRepoResource object")
-                print("[*] Using default TIBCO Platform chart configuration")
+                logger.info("[*] No Helm resource instance found, creating helmRepoResource object")
+                logger.info("[*] Using default TIBCO Platform chart configuration")
 
                 # Create helmRepoResource as alternative to helmResourceInstanceId
                 helm_repo_resource = {
@@ -338,7 +398,7 @@ class TenantService:
                     "repoName": dataplane_config.get("helmRepoName", "tibco-platform"),
                     "repoUrl": dataplane_config.get("helmRepoUrl", "https://tibcosoftware.github.io/tp-helm-charts")
                 }
-                print(f"[+] Created helmRepoResource with chart: {helm_repo_resource['chartName']}")
+                logger.info("[+] Created helmRepoResource with chart: %s", helm_repo_resource['chartName'])
 
         # Build the payload from config
         payload = {
@@ -378,46 +438,48 @@ class TenantService:
         # Add either helmResourceInstanceId or helmRepoResource (API requires one of them)
         if helm_resource_id:
             payload["helmResourceInstanceId"] = helm_resource_id
-            print(f"[*] Using helmResourceInstanceId: {helm_resource_id}")
+            logger.info("[*] Using helmResourceInstanceId: %s", helm_resource_id)
         elif helm_repo_resource:
             payload["helmRepoResource"] = helm_repo_resource
-            print(f"[*] Using helmRepoResource with chart: {helm_repo_resource['chartName']}")
+            logger.info("[*] Using helmRepoResource with chart: %s", helm_repo_resource['chartName'])
         else:
-            print("[!] WARNING: Neither helmResourceInstanceId nor helmRepoResource is set!")
+            logger.warning("[!] WARNING: Neither helmResourceInstanceId nor helmRepoResource is set!")
 
-        print(f"\n[*] Registering dataplane: {payload['name']}")
-        print(f"    Namespace: {payload['namespace']}")
-        print(f"    Service Account: {dataplane_config.get('serviceAccountName', 'tibco-sa')}")
+        logger.info("\n[*] Registering dataplane: %s", payload['name'])
+        logger.info("    Namespace: %s", payload['namespace'])
+        logger.info("    Service Account: %s", dataplane_config.get('serviceAccountName', 'tibco-sa'))
 
         # Print request payload for debugging
-        print(f"\n{'='*60}")
-        print(f"[DEBUG] Request Payload")
-        print(f"{'='*60}")
-        print(json.dumps(payload, indent=2))
-        print(f"{'='*60}\n")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("\n" + "=" * 60)
+            logger.debug("[DEBUG] Request Payload")
+            logger.debug("=" * 60)
+            logger.debug("%s", LazyJson(payload))
+            logger.debug("=" * 60 + "\n")
 
         try:
             resp = self.session.post(url, headers=headers, json=payload, timeout=30)
 
             # Print full response for debugging
-            print(f"\n{'='*60}")
-            print(f"[DEBUG] API Response Details")
-            print(f"{'='*60}")
-            print(f"Status Code: {resp.status_code}")
-            print(f"Response Headers: {dict(resp.headers)}")
-            print(f"\nResponse Body:")
-            print(resp.text)
-            print(f"{'='*60}\n")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("\n" + "=" * 60)
+                logger.debug("[DEBUG] API Response Details")
+                logger.debug("=" * 60)
+                logger.debug("Status Code: %s", resp.status_code)
+                logger.debug("Response Headers: %s", dict(resp.headers))
+                logger.debug("\nResponse Body:")
+                logger.debug("%s", resp.text)
+                logger.debug("=" * 60 + "\n")
 
             if resp.status_code in [200, 201]:
-                print(f"[+] Dataplane '{payload['name']}' registered successfully!")
+                logger.info("[+] Dataplane '%s' registered successfully!", payload['name'])
 
                 # Parse response to extract commands
                 try:
                     response_json = resp.json()
 
                     # Debug: Print response keys to understand structure
-                    print(f"[*] Response contains keys: {list(response_json.keys())}")
+                    logger.info("[*] Response contains keys: %s", list(response_json.keys()))
 
                     # Extract commands array from response (try multiple locations)
                     commands = []
@@ -425,7 +487,7 @@ class TenantService:
                     # Try direct 'commands' field
                     if 'commands' in response_json:
                         raw_commands = response_json['commands']
-                        print(f"[+] Extracted {len(raw_commands)} installation commands from 'commands' field")
+                        logger.info("[+] Extracted %s installation commands from 'commands' field", len(raw_commands))
 
                         # Commands may be objects with 'cmd', 'id', 'desc' fields
                         # Extract just the command strings
@@ -435,12 +497,12 @@ class TenantService:
                             elif isinstance(item, str):
                                 commands.append(item)  # Already a string
 
-                        print(f"[+] Parsed {len(commands)} executable command strings")
+                        logger.info("[+] Parsed %s executable command strings", len(commands))
 
                     # Try nested locations (some APIs return commands in different structures)
                     elif 'data' in response_json and 'commands' in response_json['data']:
                         raw_commands = response_json['data']['commands']
-                        print(f"[+] Extracted {len(raw_commands)} installation commands from 'data.commands' field")
+                        logger.info("[+] Extracted %s installation commands from 'data.commands' field", len(raw_commands))
 
                         for item in raw_commands:
                             if isinstance(item, dict) and 'cmd' in item:
@@ -450,7 +512,7 @@ class TenantService:
 
                     elif 'installationCommands' in response_json:
                         raw_commands = response_json['installationCommands']
-                        print(f"[+] Extracted {len(raw_commands)} installation commands from 'installationCommands' field")
+                        logger.info("[+] Extracted %s installation commands from 'installationCommands' field", len(raw_commands))
 
                         for item in raw_commands:
                             if isinstance(item, dict) and 'cmd' in item:
@@ -459,13 +521,13 @@ class TenantService:
                                 commands.append(item)
 
                     else:
-                        print(f"[!] No 'commands' field found in response")
-                        print(f"[*] Full response structure: {json.dumps(response_json, indent=2)[:500]}...")
+                        logger.warning("[!] No 'commands' field found in response")
+                        logger.debug("[*] Full response structure: %s", LazyJson(response_json, limit=500))
 
                     # Get dataplane ID if available
                     dataplane_id = response_json.get('dp_id', response_json.get('id', response_json.get('dataplaneId', response_json.get('dpId', ''))))
                     if dataplane_id:
-                        print(f"[+] Dataplane ID: {dataplane_id}")
+                        logger.info("[+] Dataplane ID: %s", dataplane_id)
 
                     return {
                         "success": True,
@@ -474,8 +536,8 @@ class TenantService:
                         "response": response_json
                     }
                 except json.JSONDecodeError as e:
-                    print(f"[!] Failed to parse response JSON: {e}")
-                    print(f"[*] Raw response: {resp.text[:500]}")
+                    logger.warning("[!] Failed to parse response JSON: %s", e)
+                    logger.info("[*] Raw response: %s", resp.text[:500])
                     return {
                         "success": True,
                         "commands": [],
@@ -483,8 +545,8 @@ class TenantService:
                         "response": {"raw": resp.text}
                     }
             else:
-                print(f"[!] Dataplane registration failed. Status: {resp.status_code}")
-                print(f"    Response: {resp.text[:300]}")
+                logger.warning("[!] Dataplane registration failed. Status: %s", resp.status_code)
+                logger.warning("    Response: %s", resp.text[:300])
                 return {
                     "success": False,
                     "commands": [],
@@ -492,9 +554,8 @@ class TenantService:
                     "response": {"error": resp.text}
                 }
         except Exception as e:
-            print(f"[!] Error during dataplane registration: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.warning("[!] Error during dataplane registration: %s", e)
+            logger.debug("[DEBUG] Full traceback:", exc_info=True)
             return None
 
     def add_activation_server(self, activation_server_config):
@@ -547,39 +608,58 @@ class TenantService:
             "version": activation_server_config.get("version", "1.8.0")
         }
 
-        print(f"\n[*] Adding activation server: {payload['name']}")
-        print(f"    URL: {payload['url']}")
-        print(f"    Version: {payload['version']}")
+        logger.info("\n[*] Adding activation server: %s", payload['name'])
+        logger.info("    URL: %s", payload['url'])
+        logger.info("    Version: %s", payload['version'])
+
+        # Reuse an activation server registered under the same name (earlier in this run or a previous run)
+        try:
+            existing = resource_index.find(self.session, self.auth.host_idm, resource_index.ACTIVATION_SERVER,
+                                           resource_index.SUBSCRIPTION, name=payload['name'],
+                                           headers=headers, timeout=30)
+        except Exception as e:
+            logger.warning("[!] Could not list existing activation servers: %s", e)
+            existing = None
+        if existing and existing.instance_id:
+            logger.info("[+] Activation server '%s' already exists", payload['name'])
+            logger.info("[+] Resource Instance ID: %s", existing.instance_id)
+            return {
+                "success": True,
+                "resource_instance_id": existing.instance_id,
+                "response": {"existing": True}
+            }
 
         # Print request payload for debugging
-        print(f"\n{'='*60}")
-        print(f"[DEBUG] Request Payload")
-        print(f"{'='*60}")
-        print(json.dumps(payload, indent=2))
-        print(f"{'='*60}\n")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("\n" + "=" * 60)
+            logger.debug("[DEBUG] Request Payload")
+            logger.debug("=" * 60)
+            logger.debug("%s", LazyJson(payload))
+            logger.debug("=" * 60 + "\n")
 
         try:
             resp = self.session.post(url, headers=headers, json=payload, timeout=30)
 
             # Print full response for debugging
-            print(f"\n{'='*60}")
-            print(f"[DEBUG] API Response Details")
-            print(f"{'='*60}")
-            print(f"Status Code: {resp.status_code}")
-            print(f"Response Headers: {dict(resp.headers)}")
-            print(f"\nResponse Body:")
-            print(resp.text)
-            print(f"{'='*60}\n")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("\n" + "=" * 60)
+                logger.debug("[DEBUG] API Response Details")
+                logger.debug("=" * 60)
+                logger.debug("Status Code: %s", resp.status_code)
+                logger.debug("Response Headers: %s", dict(resp.headers))
+                logger.debug("\nResponse Body:")
+                logger.debug("%s", resp.text)
+                logger.debug("=" * 60 + "\n")
 
             if resp.status_code in [200, 201]:
-                print(f"[+] Activation server '{payload['name']}' added successfully!")
+                logger.info("[+] Activation server '%s' added successfully!", payload['name'])
 
                 # Parse response to extract resource_instance_id
                 try:
                     response_json = resp.json()
 
                     # Debug: Print response keys to understand structure
-                    print(f"[*] Response contains keys: {list(response_json.keys())}")
+                    logger.info("[*] Response contains keys: %s", list(response_json.keys()))
 
                     # Extract resource_instance_id from response
                     resource_instance_id = ""
@@ -588,12 +668,15 @@ class TenantService:
                     if response_json.get('status') == 'success' and 'response' in response_json:
                         resource_instance_id = response_json['response'].get('resource_instance_id', '')
                         if resource_instance_id:
-                            print(f"[+] Resource Instance ID: {resource_instance_id}")
+                            logger.info("[+] Resource Instance ID: %s", resource_instance_id)
+                            resource_index.add(self.session, self.auth.host_idm, resource_index.ACTIVATION_SERVER,
+                                               resource_index.SUBSCRIPTION, None, resource_instance_id,
+                                               payload['name'], {"url": payload['url']})
                         else:
-                            print(f"[!] No resource_instance_id found in response")
+                            logger.warning("[!] No resource_instance_id found in response")
                     else:
-                        print(f"[!] Unexpected response structure")
-                        print(f"[*] Full response: {json.dumps(response_json, indent=2)[:500]}...")
+                        logger.warning("[!] Unexpected response structure")
+                        logger.debug("[*] Full response: %s", LazyJson(response_json, limit=500))
 
                     return {
                         "success": True,
@@ -601,25 +684,24 @@ class TenantService:
                         "response": response_json
                     }
                 except json.JSONDecodeError as e:
-                    print(f"[!] Failed to parse response JSON: {e}")
-                    print(f"[*] Raw response: {resp.text[:500]}")
+                    logger.warning("[!] Failed to parse response JSON: %s", e)
+                    logger.info("[*] Raw response: %s", resp.text[:500])
                     return {
                         "success": True,
                         "resource_instance_id": "",
                         "response": {"raw": resp.text}
                     }
             else:
-                print(f"[!] Activation server addition failed. Status: {resp.status_code}")
-                print(f"    Response: {resp.text[:300]}")
+                logger.warning("[!] Activation server addition failed. Status: %s", resp.status_code)
+                logger.warning("    Response: %s", resp.text[:300])
                 return {
                     "success": False,
                     "resource_instance_id": "",
                     "response": {"error": resp.text}
                 }
         except Exception as e:
-            print(f"[!] Error during activation server addition: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.warning("[!] Error during activation server addition: %s", e)
+            logger.debug("[DEBUG] Full traceback:", exc_info=True)
             return None
 
     def associate_activation_server_to_dataplane(self, dataplane_id, activation_server_resource_id):
@@ -671,32 +753,34 @@ class TenantService:
             "licenseType": "TIBCO_ACTIVATION_SERVICE"
         }
 
-        print(f"\n[*] Associating activation server with dataplane: {dataplane_id}")
-        print(f"    Activation Server Resource ID: {activation_server_resource_id}")
+        logger.info("\n[*] Associating activation server with dataplane: %s", dataplane_id)
+        logger.info("    Activation Server Resource ID: %s", activation_server_resource_id)
 
         # Print request payload for debugging
-        print(f"\n{'='*60}")
-        print(f"[DEBUG] Associate Activation Server Request")
-        print(f"{'='*60}")
-        print(f"URL: {url}")
-        print(f"Payload:")
-        print(json.dumps(payload, indent=2))
-        print(f"{'='*60}\n")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("\n" + "=" * 60)
+            logger.debug("[DEBUG] Associate Activation Server Request")
+            logger.debug("=" * 60)
+            logger.debug("URL: %s", url)
+            logger.debug("Payload:")
+            logger.debug("%s", LazyJson(payload))
+            logger.debug("=" * 60 + "\n")
 
         try:
             resp = self.session.put(url, headers=headers, json=payload, timeout=30)
 
             # Print full response for debugging
-            print(f"\n{'='*60}")
-            print(f"[DEBUG] API Response Details")
-            print(f"{'='*60}")
-            print(f"Status Code: {resp.status_code}")
-            print(f"Response Body:")
-            print(resp.text)
-            print(f"{'='*60}\n")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("\n" + "=" * 60)
+                logger.debug("[DEBUG] API Response Details")
+                logger.debug("=" * 60)
+                logger.debug("Status Code: %s", resp.status_code)
+                logger.debug("Response Body:")
+                logger.debug("%s", resp.text)
+                logger.debug("=" * 60 + "\n")
 
             if resp.status_code in [200, 201]:
-                print(f"[+] Activation server associated successfully with dataplane!")
+                logger.info("[+] Activation server associated successfully with dataplane!")
 
                 # Parse response
                 try:
@@ -706,7 +790,7 @@ class TenantService:
                     message = ""
                     if response_json.get('status') == 'success' and 'response' in response_json:
                         message = response_json['response'].get('message', '')
-                        print(f"[+] {message}")
+                        logger.info("[+] %s", message)
 
                     return {
                         "success": True,
@@ -714,24 +798,23 @@ class TenantService:
                         "response": response_json
                     }
                 except json.JSONDecodeError as e:
-                    print(f"[!] Failed to parse response JSON: {e}")
+                    logger.warning("[!] Failed to parse response JSON: %s", e)
                     return {
                         "success": True,
                         "message": "Activation server linked successfully",
                         "response": {"raw": resp.text}
                     }
             else:
-                print(f"[!] Activation server association failed. Status: {resp.status_code}")
-                print(f"    Response: {resp.text[:300]}")
+                logger.warning("[!] Activation server association failed. Status: %s", resp.status_code)
+                logger.warning("    Response: %s", resp.text[:300])
                 return {
                     "success": False,
                     "message": f"HTTP {resp.status_code}",
                     "response": {"error": resp.text}
                 }
         except Exception as e:
-            print(f"[!] Error during activation server association: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.warning("[!] Error during activation server association: %s", e)
+            logger.debug("[DEBUG] Full traceback:", exc_info=True)
             return None
 
     def use_global_activation_server(self, dataplanes, activation_server_resource_id):
@@ -753,12 +836,12 @@ class TenantService:
                     "details": [...]
                 }
         """
-        print(f"\n{'='*60}")
-        print(f"[*] Associating Activation Server with Dataplanes")
-        print(f"{'='*60}")
-        print(f"[*] Activation Server Resource ID: {activation_server_resource_id}")
-        print(f"[*] Number of dataplanes: {len(dataplanes)}")
-        print(f"{'='*60}\n")
+        logger.info("\n" + "=" * 60)
+        logger.info("[*] Associating Activation Server with Dataplanes")
+        logger.info("=" * 60)
+        logger.info("[*] Activation Server Resource ID: %s", activation_server_resource_id)
+        logger.info("[*] Number of dataplanes: %s", len(dataplanes))
+        logger.info("=" * 60 + "\n")
 
         results = {
             "success": True,
@@ -772,8 +855,8 @@ class TenantService:
             dp_id = dp.get('id')
             dp_name = dp.get('name', 'Unknown')
 
-            print(f"\n[*] Associating activation server with dataplane: {dp_name}")
-            print(f"    Dataplane ID: {dp_id}")
+            logger.info("\n[*] Associating activation server with dataplane: %s", dp_name)
+            logger.info("    Dataplane ID: %s", dp_id)
 
             result = self.associate_activation_server_to_dataplane(dp_id, activation_server_resource_id)
 
@@ -784,7 +867,7 @@ class TenantService:
                     "dataplane_name": dp_name,
                     "status": "success"
                 })
-                print(f"[+] Activation server associated successfully with {dp_name}")
+                logger.info("[+] Activation server associated successfully with %s", dp_name)
             else:
                 results["failed"] += 1
                 results["success"] = False
@@ -794,16 +877,16 @@ class TenantService:
                     "status": "failed",
                     "error": result.get("message") if result else "Unknown error"
                 })
-                print(f"[!] Failed to associate activation server with {dp_name}")
+                logger.warning("[!] Failed to associate activation server with %s", dp_name)
 
         # Print summary
-        print(f"\n{'='*60}")
-        print(f"[*] Activation Server Association Summary:")
-        print(f"{'='*60}")
-        print(f"    Total Dataplanes: {results['total']}")
-        print(f"    Successful: {results['successful']}")
-        print(f"    Failed: {results['failed']}")
-        print(f"{'='*60}\n")
+        logger.info("\n" + "=" * 60)
+        logger.info("[*] Activation Server Association Summary:")
+        logger.info("=" * 60)
+        logger.info("    Total Dataplanes: %s", results['total'])
+        logger.info("    Successful: %s", results['successful'])
+        logger.info("    Failed: %s", results['failed'])
+        logger.info("=" * 60 + "\n")
 
         return results
 
@@ -847,15 +930,16 @@ class TenantService:
         if tsc_value:
             headers['x-xsrf-token'] = tsc_value
 
-        print(f"\n[*] Checking dataplane status...")
+        logger.info("\n[*] Checking dataplane status...")
         if dataplane_id:
-            print(f"    Target Dataplane ID: {dataplane_id}")
-        print(f"    Max Wait Time: {max_wait_seconds} seconds")
-        print(f"    Poll Interval: {poll_interval_seconds} seconds")
+            logger.info("    Target Dataplane ID: %s", dataplane_id)
+        logger.info("    Max Wait Time: %s seconds", max_wait_seconds)
+        logger.info("    Poll Interval: %s seconds", poll_interval_seconds)
 
         start_time = time.time()
         attempts = 0
         all_green = False
+        renderer = StatusRenderer()
 
         while True:
             attempts += 1
@@ -863,7 +947,7 @@ class TenantService:
 
             # Check if timeout reached
             if elapsed_time >= max_wait_seconds:
-                print(f"\n[!] Timeout reached after {elapsed_time:.1f} seconds ({attempts} attempts)")
+                logger.warning("\n[!] Timeout reached after %.1f seconds (%s attempts)", elapsed_time, attempts)
                 break
 
             try:
@@ -872,162 +956,83 @@ class TenantService:
                 if resp.status_code == 200:
                     response_json = resp.json()
                     dataplanes = response_json.get('dataplanes', [])
+                    snapshot = StatusSnapshot.from_response(response_json)
 
-                    if not dataplanes:
-                        print(f"[!] Attempt {attempts}: No dataplanes found in response")
+                    if not snapshot.dataplanes:
+                        logger.warning("[!] Attempt %s: No dataplanes found in response", attempts)
                         time.sleep(poll_interval_seconds)
                         continue
 
-                    # Print status for all dataplanes
-                    print(f"\n{'='*80}")
-                    print(f"[*] Attempt {attempts} | Elapsed: {elapsed_time:.1f}s | Dataplanes Found: {len(dataplanes)}")
-                    print(f"{'='*80}")
-
+                    if dataplane_id:
+                        target = snapshot.dataplane(dataplane_id)
+                        checked = [target] if target else []
+                    else:
+                        checked = snapshot.dataplanes
+                    target_found = bool(checked)
+                    dataplane_statuses = [dp.summary() for dp in checked]
                     all_green = True
-                    target_found = False
-                    dataplane_statuses = []
-
-                    for idx, dp in enumerate(dataplanes, 1):
-                        dp_id = dp.get('dp_id', 'Unknown')
-                        status = dp.get('status', 'unknown')
-                        message = dp.get('message', '')
-                        tibtunnel = dp.get('tibtunnel_connected', False)
-                        capabilities = dp.get('capabilities', [])
-
-                        # Check if this is the target dataplane (if specified)
-                        if dataplane_id and dp_id != dataplane_id:
-                            continue
-
-                        target_found = True if dataplane_id else True
-
-                        # Get status emoji
-                        status_emoji = "[OK]" if status == "green" else "[WARN]" if status == "yellow" else "[ERR]"
-                        tibtunnel_emoji = "[OK]" if tibtunnel else "[ERR]"
-
-                        print(f"\n    Dataplane #{idx}:")
-                        print(f"    |- ID: {dp_id}")
-                        print(f"    |- Status: {status_emoji} {status.upper()}")
-                        print(f"    |- Tibtunnel: {tibtunnel_emoji} {'Connected' if tibtunnel else 'Disconnected'}")
-
-                        if message:
-                            print(f"    |- Message: {message}")
-
-                        # Count capabilities by status
-                        cap_green = 0
-                        cap_other = 0
-                        non_green_caps = []
-
-                        if capabilities:
-                            print(f"    '- Capabilities ({len(capabilities)} total):")
-                            for cap in capabilities:
-                                cap_name = cap.get('capability', 'Unknown')
-                                cap_status = cap.get('status', 'unknown')
-                                cap_type = cap.get('capability_type', '')
-
-                                cap_emoji = "[OK]" if cap_status == "green" else "[WARN]" if cap_status == "yellow" else "[ERR]"
-                                print(f"       |- {cap_emoji} {cap_name} ({cap_type}): {cap_status}")
-
-                                if cap_status == 'green':
-                                    cap_green += 1
-                                else:
-                                    cap_other += 1
-                                    non_green_caps.append(f"{cap_name}:{cap_status}")
-
-                                # Check services
-                                services = cap.get('services', [])
-                                non_green_services = []
-                                for service in services:
-                                    svc_name = service.get('name', 'Unknown')
-                                    svc_status = service.get('status', 'unknown')
-
-                                    if svc_status not in ['green', 'absent']:
-                                        svc_emoji = "[WARN]" if svc_status == "yellow" else "[ERR]"
-                                        print(f"       |  '- {svc_emoji} Service: {svc_name} ({svc_status})")
-                                        non_green_services.append(f"{svc_name}:{svc_status}")
-                                        if svc_status != 'green':
-                                            all_green = False
-
-                        # Store dataplane status for summary
-                        dataplane_statuses.append({
-                            "id": dp_id,
-                            "status": status,
-                            "tibtunnel": tibtunnel,
-                            "cap_green": cap_green,
-                            "cap_total": len(capabilities),
-                            "non_green_caps": non_green_caps
-                        })
-
-                        # Check overall dataplane status
-                        if status != 'green':
-                            all_green = False
-
-                    # Print summary table
-                    print(f"\n{'='*80}")
-                    print(f"STATUS SUMMARY - Attempt {attempts}")
-                    print(f"{'='*80}")
-                    print(f"{'ID':<25} | {'Status':<10} | {'Tibtunnel':<10} | {'Capabilities':<20}")
-                    print(f"{'-'*80}")
-
-                    for dp_status in dataplane_statuses:
-                        status_display = dp_status['status'].upper()
-                        status_emoji = "[OK]" if dp_status['status'] == "green" else "[WARN]" if dp_status['status'] == "yellow" else "[ERR]"
-                        tibtunnel_display = "Connected" if dp_status['tibtunnel'] else "Disconnected"
-                        tibtunnel_emoji = "[OK]" if dp_status['tibtunnel'] else "[ERR]"
-                        cap_display = f"{dp_status['cap_green']}/{dp_status['cap_total']} green"
-
-                        print(f"{dp_status['id']:<25} | {status_emoji} {status_display:<8} | {tibtunnel_emoji} {tibtunnel_display:<8} | {cap_display:<20}")
-
-                        # Show non-green capabilities
-                        if dp_status['non_green_caps']:
-                            print(f"{'':25} | {'':11} | {'':11} | [!] {', '.join(dp_status['non_green_caps'][:3])}")
-
-                    print(f"{'='*80}")
 
-                    green_count = sum(1 for dp in dataplane_statuses if dp['status'] == 'green')
-                    yellow_count = sum(1 for dp in dataplane_statuses if dp['status'] == 'yellow')
-                    red_count = sum(1 for dp in dataplane_statuses if dp['status'] not in ['green', 'yellow'])
-
-                    print(f"Overall: {green_count} Green | {yellow_count} Yellow | {red_count} Red/Other | Total: {len(dataplane_statuses)}")
-                    print(f"{'='*80}\n")
+                    for dp in checked:
+                        if dp.status != 'green':
+                            all_green = False
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug("\n    Dataplane %s:", dp.dp_id)
+                            logger.debug("    |- Status: %s", dp.status.upper())
+                            logger.debug("    |- Tibtunnel: %s", 'Connected' if dp.tibtunnel else 'Disconnected')
+                            if dp.message:
+                                logger.debug("    |- Message: %s", dp.message)
+                            for cap in dp.capabilities:
+                                logger.debug("       |- %s (%s): %s", cap.capability, cap.capability_type, cap.status)
+
+                        for cap in dp.capabilities:
+                            non_green_services = cap.non_green_services()
+                            for service in non_green_services:
+                                logger.debug("       |  '- Service: %s (%s)", service.name, service.status)
+                            if non_green_services:
+                                all_green = False
+
+                    # Only transitions since the previous poll and a progress line; full table at the end
+                    renderer.update(checked, attempts, elapsed_time)
 
                     # If checking specific dataplane and it's not found
                     if dataplane_id and not target_found:
-                        print(f"[!] Target dataplane {dataplane_id} not found in status response")
+                        logger.warning("[!] Target dataplane %s not found in status response", dataplane_id)
                         all_green = False
 
                     # If all dataplanes are green, we're done!
                     if all_green:
-                        print(f"\n[+] ALL DATAPLANES ARE GREEN!")
-                        print(f"    Total time: {elapsed_time:.1f} seconds")
-                        print(f"    Total attempts: {attempts}")
-                        print(f"    Dataplanes checked: {len(dataplane_statuses)}")
+                        renderer.render_table(dataplane_statuses, f"STATUS SUMMARY - Attempt {attempts}")
+                        logger.info("[+] ALL DATAPLANES ARE GREEN!")
+                        logger.info("    Total time: %.1f seconds", elapsed_time)
+                        logger.info("    Total attempts: %s", attempts)
+                        logger.info("    Dataplanes checked: %s", len(dataplane_statuses))
 
                         return {
                             "success": True,
                             "all_green": True,
                             "dataplanes": dataplanes,
+                            "snapshot": snapshot,
                             "dataplane_statuses": dataplane_statuses,
                             "elapsed_time": elapsed_time,
                             "attempts": attempts
                         }
                     else:
-                        print(f"[*] Not all dataplanes are green yet. Waiting {poll_interval_seconds} seconds before next check...")
                         time.sleep(poll_interval_seconds)
 
                 else:
-                    print(f"[!] Attempt {attempts}: API returned status {resp.status_code}")
-                    print(f"    Response: {resp.text[:200]}")
+                    logger.warning("[!] Attempt %s: API returned status %s", attempts, resp.status_code)
+                    logger.warning("    Response: %s", resp.text[:200])
                     time.sleep(poll_interval_seconds)
 
             except Exception as e:
-                print(f"[!] Attempt {attempts}: Error checking status: {e}")
+                logger.warning("[!] Attempt %s: Error checking status: %s", attempts, e)
                 time.sleep(poll_interval_seconds)
 
         # Timeout reached
         final_elapsed = time.time() - start_time
-        print(f"\n{'='*80}")
-        print(f"[!] TIMEOUT REACHED after {final_elapsed:.1f} seconds ({attempts} attempts)")
-        print(f"{'='*80}")
+        logger.info("\n" + "=" * 80)
+        logger.warning("[!] TIMEOUT REACHED after %.1f seconds (%s attempts)", final_elapsed, attempts)
+        logger.info("=" * 80)
 
         # Try to get final status
         try:
@@ -1037,58 +1042,24 @@ class TenantService:
                 dataplanes = response_json.get('dataplanes', [])
 
                 if dataplanes:
-                    # Show final status summary
-                    print(f"\n[*] FINAL STATUS SUMMARY")
-                    print(f"{'='*80}")
-                    print(f"{'ID':<25} | {'Status':<10} | {'Tibtunnel':<10} | {'Capabilities':<20}")
-                    print(f"{'-'*80}")
-
-                    dataplane_statuses = []
-                    for dp in dataplanes:
-                        dp_id = dp.get('dp_id', 'Unknown')
-                        status = dp.get('status', 'unknown')
-                        tibtunnel = dp.get('tibtunnel_connected', False)
-                        capabilities = dp.get('capabilities', [])
-
-                        cap_green = sum(1 for cap in capabilities if cap.get('status') == 'green')
-                        cap_total = len(capabilities)
-
-                        status_display = status.upper()
-                        status_emoji = "[OK]" if status == "green" else "[WARN]" if status == "yellow" else "[ERR]"
-                        tibtunnel_display = "Connected" if tibtunnel else "Disconnected"
-                        tibtunnel_emoji = "[OK]" if tibtunnel else "[ERR]"
-                        cap_display = f"{cap_green}/{cap_total} green"
-
-                        print(f"{dp_id:<25} | {status_emoji} {status_display:<8} | {tibtunnel_emoji} {tibtunnel_display:<8} | {cap_display:<20}")
-
-                        dataplane_statuses.append({
-                            "id": dp_id,
-                            "status": status,
-                            "tibtunnel": tibtunnel,
-                            "cap_green": cap_green,
-                            "cap_total": cap_total
-                        })
-
-                    print(f"{'='*80}")
-                    green_count = sum(1 for dp in dataplane_statuses if dp['status'] == 'green')
-                    yellow_count = sum(1 for dp in dataplane_statuses if dp['status'] == 'yellow')
-                    red_count = sum(1 for dp in dataplane_statuses if dp['status'] not in ['green', 'yellow'])
-
-                    print(f"Overall: {green_count} Green | {yellow_count} Yellow | {red_count} Red/Other | Total: {len(dataplane_statuses)}")
-                    print(f"{'='*80}")
-                    print(f"\n[!] Not all dataplanes reached green status within {final_elapsed:.1f} seconds")
+                    snapshot = StatusSnapshot.from_response(response_json)
+                    dataplane_statuses = [dp.summary() for dp in snapshot.dataplanes]
+
+                    renderer.render_table(dataplane_statuses, "FINAL STATUS SUMMARY")
+                    logger.warning("\n[!] Not all dataplanes reached green status within %.1f seconds", final_elapsed)
 
                     return {
                         "success": False,
                         "all_green": False,
                         "dataplanes": dataplanes,
+                        "snapshot": snapshot,
                         "dataplane_statuses": dataplane_statuses,
                         "elapsed_time": final_elapsed,
                         "attempts": attempts,
                         "error": "Timeout reached"
                     }
         except Exception as e:
-            print(f"[!] Error getting final status: {e}")
+            logger.warning("[!] Error getting final status: %s", e)
 
         return {
             "success": False,
@@ -1114,7 +1085,7 @@ class TenantService:
         Returns:
             dict: Result with success status and resource_instance_id
         """
-        print(f"\n[*] Creating storage resource...")
+        logger.info("\n[*] Creating storage resource...")
 
         url = f"{self.auth.host_idm}/cp/v1/resource-instances"
 
@@ -1156,8 +1127,8 @@ class TenantService:
         if tsc_value:
             headers['x-xsrf-token'] = tsc_value
 
-        print(f"    Name: {storage_name}")
-        print(f"    Storage Class: {storage_class}")
+        logger.info("    Name: %s", storage_name)
+        logger.info("    Storage Class: %s", storage_class)
 
         try:
             resp = self.session.post(url, headers=headers, json=payload, timeout=30)
@@ -1167,24 +1138,26 @@ class TenantService:
                 resource_instance_id = response_json.get('resource_instance_id', '')
 
                 if resource_instance_id:
-                    print(f"[+] Storage resource created successfully!")
-                    print(f"    Resource ID: {resource_instance_id}")
+                    logger.info("[+] Storage resource created successfully!")
+                    logger.info("    Resource ID: %s", resource_instance_id)
+                    resource_index.add(self.session, self.auth.host_idm, resource_index.STORAGE, resource_index.DATAPLANE,
+                                       dataplane_id, resource_instance_id, storage_name,
+                                       {"storageClassName": storage_class})
                     return {
                         "success": True,
                         "resource_instance_id": resource_instance_id,
                         "resource_name": storage_name
                     }
                 else:
-                    print(f"[!] No resource instance ID in response")
+                    logger.warning("[!] No resource instance ID in response")
                     return {"success": False, "error": "No resource ID returned"}
             else:
-                print(f"[!] Storage resource creation failed. Status: {resp.status_code}")
-                print(f"    Response: {resp.text[:300]}")
+                logger.warning("[!] Storage resource creation failed. Status: %s", resp.status_code)
+                logger.warning("    Response: %s", resp.text[:300])
                 return {"success": False, "error": f"HTTP {resp.status_code}"}
         except Exception as e:
-            print(f"[!] Error creating storage resource: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.warning("[!] Error creating storage resource: %s", e)
+            logger.debug("[DEBUG] Full traceback:", exc_info=True)
             return {"success": False, "error": str(e)}
 
     def create_ingress_resource(self, dataplane_id, ingress_config):
@@ -1203,7 +1176,7 @@ class TenantService:
         Returns:
             dict: Result with success status and resource_instance_id
         """
-        print(f"\n[*] Creating ingress resource...")
+        logger.info("\n[*] Creating ingress resource...")
 
         url = f"{self.auth.host_idm}/cp/v1/resource-instances"
 
@@ -1214,7 +1187,7 @@ class TenantService:
         annotations = ingress_config.get('annotations', '')
 
         if not fqdn:
-            print(f"[!] FQDN is required for ingress resource")
+            logger.warning("[!] FQDN is required for ingress resource")
             return {"success": False, "error": "FQDN is required"}
 
         payload = {
@@ -1278,10 +1251,10 @@ class TenantService:
         if tsc_value:
             headers['x-xsrf-token'] = tsc_value
 
-        print(f"    Name: {ingress_name}")
-        print(f"    Controller: {ingress_controller}")
-        print(f"    Class Name: {ingress_class}")
-        print(f"    FQDN: {fqdn}")
+        logger.info("    Name: %s", ingress_name)
+        logger.info("    Controller: %s", ingress_controller)
+        logger.info("    Class Name: %s", ingress_class)
+        logger.info("    FQDN: %s", fqdn)
 
         try:
             resp = self.session.post(url, headers=headers, json=payload, timeout=30)
@@ -1291,8 +1264,12 @@ class TenantService:
                 resource_instance_id = response_json.get('resource_instance_id', '')
 
                 if resource_instance_id:
-                    print(f"[+] Ingress resource created successfully!")
-                    print(f"    Resource ID: {resource_instance_id}")
+                    logger.info("[+] Ingress resource created successfully!")
+                    logger.info("    Resource ID: %s", resource_instance_id)
+                    resource_index.add(self.session, self.auth.host_idm, resource_index.INGRESS, resource_index.DATAPLANE,
+                                       dataplane_id, resource_instance_id, ingress_name,
+                                       {"ingressController": ingress_controller, "ingressClassName": ingress_class,
+                                        "fqdn": fqdn})
                     return {
                         "success": True,
                         "resource_instance_id": resource_instance_id,
@@ -1300,16 +1277,15 @@ class TenantService:
                         "fqdn": fqdn
                     }
                 else:
-                    print(f"[!] No resource instance ID in response")
+                    logger.warning("[!] No resource instance ID in response")
                     return {"success": False, "error": "No resource ID returned"}
             else:
-                print(f"[!] Ingress resource creation failed. Status: {resp.status_code}")
-                print(f"    Response: {resp.text[:300]}")
+                logger.warning("[!] Ingress resource creation failed. Status: %s", resp.status_code)
+                logger.warning("    Response: %s", resp.text[:300])
                 return {"success": False, "error": f"HTTP {resp.status_code}"}
         except Exception as e:
-            print(f"[!] Error creating ingress resource: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.warning("[!] Error creating ingress resource: %s", e)
+            logger.debug("[DEBUG] Full traceback:", exc_info=True)
             return {"success": False, "error": str(e)}
 
     def get_storage_resource_id(self, dataplane_id, storage_name):
@@ -1323,15 +1299,6 @@ class TenantService:
         Returns:
             str: Storage resource ID or empty string if not found
         """
-        url = f"{self.auth.host_idm}/cp/v1/resource-instances-details"
-
-        params = {
-            'scope': 'DATAPLANE',
-            'resourceLevel': 'PLATFORM',
-            'resourceId': 'STORAGE',
-            'dataPlaneId': dataplane_id
-        }
-
         headers = {
             'Accept': 'application/json, text/plain, */*',
             'Content-Type': 'application/json',
@@ -1343,22 +1310,17 @@ class TenantService:
             headers['x-xsrf-token'] = tsc_value
 
         try:
-            resp = self.session.get(url, params=params, headers=headers, timeout=30)
-            if resp.status_code == 200:
-                response_data = resp.json()
-
-                if response_data and 'data' in response_data:
-                    for resource in response_data['data']:
-                        if resource.get('resource_instance_name') == storage_name:
-                            resource_id = resource.get('resource_instance_id', '')
-                            print(f"[+] Found existing storage resource '{storage_name}': {resource_id}")
-                            return resource_id
-
-                print(f"[!] Storage resource '{storage_name}' not found")
-            else:
-                print(f"[!] Failed to get storage resources. Status: {resp.status_code}")
+            resource = resource_index.find(self.session, self.auth.host_idm, resource_index.STORAGE,
+                                           resource_index.DATAPLANE, dataplane_id, storage_name,
+                                           headers=headers, timeout=30)
+            if resource:
+                logger.info("[+] Found existing storage resource '%s': %s", storage_name, resource.instance_id)
+                return resource.instance_id
+            logger.warning("[!] Storage resource '%s' not found", storage_name)
+        except resource_index.ResourceIndexError as e:
+            logger.warning("[!] Failed to get storage resources. Status: %s", e.status_code)
         except Exception as e:
-            print(f"[!] Error fetching storage resource: {e}")
+            logger.warning("[!] Error fetching storage resource: %s", e)
         return ''
 
     def get_ingress_resource_id(self, dataplane_id, ingress_name):
@@ -1372,15 +1334,6 @@ class TenantService:
         Returns:
             tuple: (resource_id, fqdn) or ('', '') if not found
         """
-        url = f"{self.auth.host_idm}/cp/v1/resource-instances-details"
-
-        params = {
-            'scope': 'DATAPLANE',
-            'resourceLevel': 'PLATFORM',
-            'resourceId': 'INGRESS',
-            'dataPlaneId': dataplane_id
-        }
-
         headers = {
             'Accept': 'application/json, text/plain, */*',
             'Content-Type': 'application/json',
@@ -1392,34 +1345,85 @@ class TenantService:
             headers['x-xsrf-token'] = tsc_value
 
         try:
-            resp = self.session.get(url, params=params, headers=headers, timeout=30)
-            if resp.status_code == 200:
-                response_data = resp.json()
-
-                if response_data and 'data' in response_data:
-                    for resource in response_data['data']:
-                        if resource.get('resource_instance_name') == ingress_name:
-                            resource_id = resource.get('resource_instance_id', '')
-                            # Get FQDN from metadata
-                            metadata = resource.get('resource_instance_metadata', {})
-                            fields = metadata.get('fields', [])
-                            fqdn = ''
-                            for field in fields:
-                                if field.get('key') == 'fqdn':
-                                    fqdn = field.get('value', '')
-                                    break
-                            print(f"[+] Found existing ingress resource '{ingress_name}': {resource_id}")
-                            if fqdn:
-                                print(f"    FQDN: {fqdn}")
-                            return resource_id, fqdn
-
-                print(f"[!] Ingress resource '{ingress_name}' not found")
-            else:
-                print(f"[!] Failed to get ingress resources. Status: {resp.status_code}")
+            resource = resource_index.find(self.session, self.auth.host_idm, resource_index.INGRESS,
+                                           resource_index.DATAPLANE, dataplane_id, ingress_name,
+                                           headers=headers, timeout=30)
+            if resource:
+                logger.info("[+] Found existing ingress resource '%s': %s", ingress_name, resource.instance_id)
+                if resource.fqdn:
+                    logger.info("    FQDN: %s", resource.fqdn)
+                return resource.instance_id, resource.fqdn
+            logger.warning("[!] Ingress resource '%s' not found", ingress_name)
+        except resource_index.ResourceIndexError as e:
+            logger.warning("[!] Failed to get ingress resources. Status: %s", e.status_code)
         except Exception as e:
-            print(f"[!] Error fetching ingress resource: {e}")
+            logger.warning("[!] Error fetching ingress resource: %s", e)
         return '', ''
 
+    def ensure_dataplane_resource(self, dataplane_id, resource_type, resource_config):
+        """
+        Create a storage or ingress resource unless the dataplane already has one with that name.
+
+        Existing instances come from the run's resource index (one list request per
+        dataplane and type), so reruns and concurrent setup tasks only POST what is missing.
+
+        Args:
+            dataplane_id (str): Dataplane ID
+            resource_type (str): resource_index.STORAGE or resource_index.INGRESS
+            resource_config (dict): Entry of dataplane_resources_config.storage / .ingress
+
+        Returns:
+            dict: success, resource_instance_id, resource_name, created (False when it existed)
+                and fqdn for ingress
+        """
+        default_name = 'dpstorage' if resource_type == resource_index.STORAGE else 'dpingress'
+        name = resource_config.get('name', default_name)
+        create = self.create_storage_resource if resource_type == resource_index.STORAGE else self.create_ingress_resource
+
+        headers = {
+            'Accept': 'application/json, text/plain, */*',
+            'Content-Type': 'application/json',
+            'Referer': f"{self.auth.host_idm}/cp/app/dataplanes"
+        }
+
+        tsc_value = self.session.cookies.get('tsc')
+        if tsc_value:
+            headers['x-xsrf-token'] = tsc_value
+
+        def existing_result():
+            try:
+                resource = resource_index.find(self.session, self.auth.host_idm, resource_type,
+                                               resource_index.DATAPLANE, dataplane_id, name,
+                                               headers=headers, timeout=30)
+            except Exception as e:
+                logger.warning("[!] Could not list existing %s resources: %s", resource_type.lower(), e)
+                return None
+            if not resource or not resource.instance_id:
+                return None
+            logger.info("[+] %s resource '%s' already exists: %s", resource_type.capitalize(), name, resource.instance_id)
+            result = {
+                "success": True,
+                "resource_instance_id": resource.instance_id,
+                "resource_name": name,
+                "created": False
+            }
+            if resource_type == resource_index.INGRESS:
+                result["fqdn"] = resource.fqdn or resource_config.get('fqdn', '')
+            return result
+
+        existing = existing_result()
+        if existing:
+            return existing
+
+        result = create(dataplane_id, resource_config)
+        if result.get('success'):
+            result['created'] = True
+            return result
+
+        # Another task or run may have created it in the meantime (e.g. HTTP 409): re-read once
+        resource_index.invalidate(self.session, resource_type, dataplane_id)
+        return existing_result() or result
+
     def provision_bwce_capability(self, dataplane_id, dataplane_name, bwce_config):
         """
         Provision BWCE capability on a dataplane.
@@ -1441,8 +1445,8 @@ class TenantService:
         Returns:
             dict: Provisioning result with success status and capability instance ID
         """
-        print(f"\n[*] Provisioning BWCE capability for dataplane: {dataplane_name}")
-        print(f"    Dataplane ID: {dataplane_id}")
+        logger.info("\n[*] Provisioning BWCE capability for dataplane: %s", dataplane_name)
+        logger.info("    Dataplane ID: %s", dataplane_id)
 
         # Get resource IDs - prefer direct IDs, fall back to lookup by name
         storage_resource_id = bwce_config.get('storage_resource_id')
@@ -1477,31 +1481,23 @@ class TenantService:
         # Build BWCE provisioning payload
         capability_version = bwce_config.get('capability_version', '1.5.0')
         ingress_class_name = bwce_config.get('ingress_class_name', 'nginx')
-        ingress_controller_name = bwce_config.get('ingress_controller_name', 'nginx')
         enable_fluentbit = bwce_config.get('enable_fluentbit', True)
 
-        payload = {
-            "provision-schema": {
-                "path-prefix": f"/tibco/bw/{dataplane_id}",
-                "storage-class-resource-instance-id": storage_resource_id,
-                "ingress-controller-resource-instance-id": ingress_resource_id,
-                "ingress-class-name": ingress_class_name,
-                "ingress-controller-name": ingress_controller_name,
-                "fluentbit-sidecar-enabled": enable_fluentbit
-            }
-        }
+        req = payloads.provision_capability(self.auth.host_idm, dataplane_id, 'BWCE',
+                                            storage_resource_id, ingress_resource_id, bwce_config)
+        payload = req.json
 
-        print(f"\n[*] BWCE Provisioning Details:")
-        print(f"    Version: {capability_version}")
-        print(f"    Storage Resource ID: {storage_resource_id}")
-        print(f"    Ingress Resource ID: {ingress_resource_id}")
+        logger.info("\n[*] BWCE Provisioning Details:")
+        logger.info("    Version: %s", capability_version)
+        logger.info("    Storage Resource ID: %s", storage_resource_id)
+        logger.info("    Ingress Resource ID: %s", ingress_resource_id)
         if ingress_fqdn:
-            print(f"    Ingress FQDN: {ingress_fqdn}")
-        print(f"    Ingress Class: {ingress_class_name}")
-        print(f"    FluentBit Enabled: {enable_fluentbit}")
+            logger.info("    Ingress FQDN: %s", ingress_fqdn)
+        logger.info("    Ingress Class: %s", ingress_class_name)
+        logger.info("    FluentBit Enabled: %s", enable_fluentbit)
 
         # Provision BWCE capability via REST API
-        url = f"{self.auth.host_idm}/cp/api/v1/data-planes/{dataplane_id}/capabilities/BWCE"
+        url = req.url
 
         headers = {
             'Accept': 'application/json, text/plain, */*',
@@ -1520,32 +1516,35 @@ class TenantService:
         if tsc_value:
             headers['x-xsrf-token'] = tsc_value
 
-        print(f"\n{'='*60}")
-        print(f"[DEBUG] BWCE Provision Request")
-        print(f"{'='*60}")
-        print(f"URL: {url}")
-        print(f"Payload:")
-        print(json.dumps(payload, indent=2))
-        print(f"{'='*60}\n")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("\n" + "=" * 60)
+            logger.debug("[DEBUG] BWCE Provision Request")
+            logger.debug("=" * 60)
+            logger.debug("URL: %s", url)
+            logger.debug("Payload:")
+            logger.debug("%s", LazyJson(payload))
+            logger.debug("=" * 60 + "\n")
 
         try:
             resp = self.session.post(url, headers=headers, json=payload, timeout=60)
+            status_cache.invalidate(self.session, dataplane_id)
 
-            print(f"\n{'='*60}")
-            print(f"[DEBUG] BWCE Provision Response")
-            print(f"{'='*60}")
-            print(f"Status Code: {resp.status_code}")
-            print(f"Response Body:")
-            print(resp.text)
-            print(f"{'='*60}\n")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("\n" + "=" * 60)
+                logger.debug("[DEBUG] BWCE Provision Response")
+                logger.debug("=" * 60)
+                logger.debug("Status Code: %s", resp.status_code)
+                logger.debug("Response Body:")
+                logger.debug("%s", resp.text)
+                logger.debug("=" * 60 + "\n")
 
             if resp.status_code in [200, 201]:
                 response_json = resp.json()
                 capability_instance_id = response_json.get('response', {}).get('capabilityInstanceId', '')
 
                 if capability_instance_id:
-                    print(f"[+] BWCE capability provisioning initiated successfully!")
-                    print(f"    Capability Instance ID: {capability_instance_id}")
+                    logger.info("[+] BWCE capability provisioning initiated successfully!")
+                    logger.info("    Capability Instance ID: %s", capability_instance_id)
 
                     return {
                         "success": True,
@@ -1555,24 +1554,23 @@ class TenantService:
                         "response": response_json
                     }
                 else:
-                    print(f"[!] No capability instance ID in response")
+                    logger.warning("[!] No capability instance ID in response")
                     return {
                         "success": False,
                         "error": "No capability instance ID returned",
                         "response": response_json
                     }
             else:
-                print(f"[!] BWCE provisioning failed. Status: {resp.status_code}")
-                print(f"    Response: {resp.text[:300]}")
+                logger.warning("[!] BWCE provisioning failed. Status: %s", resp.status_code)
+                logger.warning("    Response: %s", resp.text[:300])
                 return {
                     "success": False,
                     "error": f"HTTP {resp.status_code}",
                     "response": resp.text
                 }
         except Exception as e:
-            print(f"[!] Error during BWCE provisioning: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.warning("[!] Error during BWCE provisioning: %s", e)
+            logger.debug("[DEBUG] Full traceback:", exc_info=True)
             return {
                 "success": False,
                 "error": str(e)
@@ -1599,8 +1597,8 @@ class TenantService:
         Returns:
             dict: Provisioning result with success status and capability instance ID
         """
-        print(f"\n[*] Provisioning Flogo capability for dataplane: {dataplane_name}")
-        print(f"    Dataplane ID: {dataplane_id}")
+        logger.info("\n[*] Provisioning Flogo capability for dataplane: %s", dataplane_name)
+        logger.info("    Dataplane ID: %s", dataplane_id)
 
         # Get resource IDs - prefer direct IDs, fall back to lookup by name
         storage_resource_id = flogo_config.get('storage_resource_id')
@@ -1635,31 +1633,23 @@ class TenantService:
         # Build Flogo provisioning payload
         capability_version = flogo_config.get('capability_version', '1.5.0')
         ingress_class_name = flogo_config.get('ingress_class_name', 'nginx')
-        ingress_controller_name = flogo_config.get('ingress_controller_name', 'nginx')
         enable_fluentbit = flogo_config.get('enable_fluentbit', True)
 
-        payload = {
-            "provision-schema": {
-                "path-prefix": f"/tibco/flogo/{dataplane_id}",
-                "storage-class-resource-instance-id": storage_resource_id,
-                "ingress-controller-resource-instance-id": ingress_resource_id,
-                "ingress-class-name": ingress_class_name,
-                "ingress-controller-name": ingress_controller_name,
-                "fluentbit-sidecar-enabled": enable_fluentbit
-            }
-        }
+        req = payloads.provision_capability(self.auth.host_idm, dataplane_id, 'FLOGO',
+                                            storage_resource_id, ingress_resource_id, flogo_config)
+        payload = req.json
 
-        print(f"\n[*] Flogo Provisioning Details:")
-        print(f"    Version: {capability_version}")
-        print(f"    Storage Resource ID: {storage_resource_id}")
-        print(f"    Ingress Resource ID: {ingress_resource_id}")
+        logger.info("\n[*] Flogo Provisioning Details:")
+        logger.info("    Version: %s", capability_version)
+        logger.info("    Storage Resource ID: %s", storage_resource_id)
+        logger.info("    Ingress Resource ID: %s", ingress_resource_id)
         if ingress_fqdn:
-            print(f"    Ingress FQDN: {ingress_fqdn}")
-        print(f"    Ingress Class: {ingress_class_name}")
-        print(f"    FluentBit Enabled: {enable_fluentbit}")
+            logger.info("    Ingress FQDN: %s", ingress_fqdn)
+        logger.info("    Ingress Class: %s", ingress_class_name)
+        logger.info("    FluentBit Enabled: %s", enable_fluentbit)
 
         # Provision Flogo capability via REST API
-        url = f"{self.auth.host_idm}/cp/api/v1/data-planes/{dataplane_id}/capabilities/FLOGO"
+        url = req.url
 
         headers = {
             'Accept': 'application/json, text/plain, */*',
@@ -1678,32 +1668,35 @@ class TenantService:
         if tsc_value:
             headers['x-xsrf-token'] = tsc_value
 
-        print(f"\n{'='*60}")
-        print(f"[DEBUG] Flogo Provision Request")
-        print(f"{'='*60}")
-        print(f"URL: {url}")
-        print(f"Payload:")
-        print(json.dumps(payload, indent=2))
-        print(f"{'='*60}\n")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("\n" + "=" * 60)
+            logger.debug("[DEBUG] Flogo Provision Request")
+            logger.debug("=" * 60)
+            logger.debug("URL: %s", url)
+            logger.debug("Payload:")
+            logger.debug("%s", LazyJson(payload))
+            logger.debug("=" * 60 + "\n")
 
         try:
             resp = self.session.post(url, headers=headers, json=payload, timeout=60)
+            status_cache.invalidate(self.session, dataplane_id)
 
-            print(f"\n{'='*60}")
-            print(f"[DEBUG] Flogo Provision Response")
-            print(f"{'='*60}")
-            print(f"Status Code: {resp.status_code}")
-            print(f"Response Body:")
-            print(resp.text)
-            print(f"{'='*60}\n")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("\n" + "=" * 60)
+                logger.debug("[DEBUG] Flogo Provision Response")
+                logger.debug("=" * 60)
+                logger.debug("Status Code: %s", resp.status_code)
+                logger.debug("Response Body:")
+                logger.debug("%s", resp.text)
+                logger.debug("=" * 60 + "\n")
 
             if resp.status_code in [200, 201]:
                 response_json = resp.json()
                 capability_instance_id = response_json.get('response', {}).get('capabilityInstanceId', '')
 
                 if capability_instance_id:
-                    print(f"[+] Flogo capability provisioning initiated successfully!")
-                    print(f"    Capability Instance ID: {capability_instance_id}")
+                    logger.info("[+] Flogo capability provisioning initiated successfully!")
+                    logger.info("    Capability Instance ID: %s", capability_instance_id)
 
                     return {
                         "success": True,
@@ -1713,24 +1706,23 @@ class TenantService:
                         "response": response_json
                     }
                 else:
-                    print(f"[!] No capability instance ID in response")
+                    logger.warning("[!] No capability instance ID in response")
                     return {
                         "success": False,
                         "error": "No capability instance ID returned",
                         "response": response_json
                     }
             else:
-                print(f"[!] Flogo provisioning failed. Status: {resp.status_code}")
-                print(f"    Response: {resp.text[:300]}")
+                logger.warning("[!] Flogo provisioning failed. Status: %s", resp.status_code)
+                logger.warning("    Response: %s", resp.text[:300])
                 return {
                     "success": False,
                     "error": f"HTTP {resp.status_code}",
                     "response": resp.text
                 }
         except Exception as e:
-            print(f"[!] Error during Flogo provisioning: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.warning("[!] Error during Flogo provisioning: %s", e)
+            logger.debug("[DEBUG] Full traceback:", exc_info=True)
             return {
                 "success": False,
                 "error": str(e)
@@ -1749,9 +1741,9 @@ class TenantService:
         Returns:
             dict: Result with success status
         """
-        print(f"\n[*] Provisioning BWCE buildtype version: {version}")
-        print(f"    Dataplane ID: {dataplane_id}")
-        print(f"    Capability Instance ID: {capability_instance_id}")
+        logger.info("\n[*] Provisioning BWCE buildtype version: %s", version)
+        logger.info("    Dataplane ID: %s", dataplane_id)
+        logger.info("    Capability Instance ID: %s", capability_instance_id)
 
         # Generate random event ID
         import random
@@ -1795,56 +1787,58 @@ class TenantService:
         headers = self.get_api_headers()
         headers['Content-Type'] = 'application/json'
 
-        print(f"\n{'='*60}")
-        print(f"[DEBUG] BWCE Buildtype Provision Request")
-        print(f"{'='*60}")
-        print(f"URL: {url}")
-        print(f"Params: {params}")
-        print(f"Payload:")
-        print(json.dumps(payload, indent=2))
-        print(f"{'='*60}\n")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("\n" + "=" * 60)
+            logger.debug("[DEBUG] BWCE Buildtype Provision Request")
+            logger.debug("=" * 60)
+            logger.debug("URL: %s", url)
+            logger.debug("Params: %s", params)
+            logger.debug("Payload:")
+            logger.debug("%s", LazyJson(payload))
+            logger.debug("=" * 60 + "\n")
 
         try:
             resp = self.session.post(url, params=params, headers=headers, json=payload, timeout=60)
+            status_cache.invalidate(self.session, dataplane_id)
 
-            print(f"\n{'='*60}")
-            print(f"[DEBUG] BWCE Buildtype Provision Response")
-            print(f"{'='*60}")
-            print(f"Status Code: {resp.status_code}")
-            print(f"Response Body:")
-            print(resp.text)
-            print(f"{'='*60}\n")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("\n" + "=" * 60)
+                logger.debug("[DEBUG] BWCE Buildtype Provision Response")
+                logger.debug("=" * 60)
+                logger.debug("Status Code: %s", resp.status_code)
+                logger.debug("Response Body:")
+                logger.debug("%s", resp.text)
+                logger.debug("=" * 60 + "\n")
 
             if resp.status_code in [200, 201]:
                 response_json = resp.json()
 
                 # Check for success status
                 if response_json.get('status') == 'success' or response_json.get('message', '').lower().find('successful') != -1:
-                    print(f"[+] BWCE buildtype {version} provisioned successfully!")
+                    logger.info("[+] BWCE buildtype %s provisioned successfully!", version)
                     return {
                         "success": True,
                         "version": version,
                         "response": response_json
                     }
                 else:
-                    print(f"[!] BWCE buildtype provisioning returned unexpected response")
+                    logger.warning("[!] BWCE buildtype provisioning returned unexpected response")
                     return {
                         "success": False,
                         "error": "Unexpected response format",
                         "response": response_json
                     }
             else:
-                print(f"[!] BWCE buildtype provisioning failed. Status: {resp.status_code}")
-                print(f"    Response: {resp.text[:300]}")
+                logger.warning("[!] BWCE buildtype provisioning failed. Status: %s", resp.status_code)
+                logger.warning("    Response: %s", resp.text[:300])
                 return {
                     "success": False,
                     "error": f"HTTP {resp.status_code}",
                     "response": resp.text
                 }
         except Exception as e:
-            print(f"[!] Error during BWCE buildtype provisioning: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.warning("[!] Error during BWCE buildtype provisioning: %s", e)
+            logger.debug("[DEBUG] Full traceback:", exc_info=True)
             return {
                 "success": False,
                 "error": str(e)
@@ -1865,13 +1859,11 @@ class TenantService:
         """
         import time
 
-        print(f"\n[*] Checking BWCE capability status...")
-        print(f"    Dataplane ID: {dataplane_id}")
-        print(f"    Capability Instance ID: {capability_instance_id}")
-        print(f"    Max Wait Time: {max_wait_seconds} seconds")
-        print(f"    Poll Interval: {poll_interval_seconds} seconds")
-
-        url = f"{self.auth.host_idm}/cp/v1/data-planes/{dataplane_id}/capabilities-status"
+        logger.info("\n[*] Checking BWCE capability status...")
+        logger.info("    Dataplane ID: %s", dataplane_id)
+        logger.info("    Capability Instance ID: %s", capability_instance_id)
+        logger.info("    Max Wait Time: %s seconds", max_wait_seconds)
+        logger.info("    Poll Interval: %s seconds", poll_interval_seconds)
 
         headers = {
             'Accept': 'application/json',
@@ -1886,7 +1878,7 @@ class TenantService:
             elapsed_time = time.time() - start_time
 
             if elapsed_time >= max_wait_seconds:
-                print(f"[!] Timeout after {elapsed_time:.1f} seconds")
+                logger.warning("[!] Timeout after %.1f seconds", elapsed_time)
                 return {
                     "success": False,
                     "status": "timeout",
@@ -1895,70 +1887,55 @@ class TenantService:
                 }
 
             try:
-                resp = self.session.get(url, headers=headers, timeout=30)
+                snapshot = status_cache.capabilities_status(self.session, self.auth.host_idm, dataplane_id,
+                                                            headers=headers, timeout=30)
 
-                if resp.status_code == 200:
-                    data = resp.json()
-                    dataplanes = data.get('dataplanes', [])
-
-                    if not dataplanes:
-                        print(f"[!] Attempt {attempts}: No dataplanes in response")
-                        time.sleep(poll_interval_seconds)
-                        continue
+                if not snapshot.dataplanes:
+                    logger.warning("[!] Attempt %s: No dataplanes in response", attempts)
+                    time.sleep(poll_interval_seconds)
+                    continue
 
-                    # Find the dataplane
-                    for dp in dataplanes:
-                        if dp.get('dp_id') == dataplane_id:
-                            capabilities = dp.get('capabilities', [])
-
-                            # Find BWCE capability
-                            for cap in capabilities:
-                                if cap.get('capability') == 'BWCE' and cap.get('capability_instance_id') == capability_instance_id:
-                                    cap_status = cap.get('status', 'unknown')
-                                    services = cap.get('services', [])
-
-                                    print(f"\n[*] Attempt {attempts} | Elapsed: {elapsed_time:.1f}s")
-                                    print(f"    Capability: BWCE")
-                                    print(f"    Status: {'[OK]' if cap_status == 'green' else '[WARN]' if cap_status == 'yellow' else '[ERR]'} {cap_status.upper()}")
-
-                                    if services:
-                                        print(f"    Services:")
-                                        for svc in services:
-                                            svc_name = svc.get('name', 'Unknown')
-                                            svc_status = svc.get('status', 'unknown')
-                                            svc_emoji = '[OK]' if svc_status == 'green' else '[WARN]' if svc_status == 'yellow' else '[ERR]'
-                                            print(f"      {svc_emoji} {svc_name}: {svc_status}")
-
-                                    if cap_status == 'green':
-                                        print(f"\n[+] BWCE capability is GREEN!")
-                                        print(f"    Total time: {elapsed_time:.1f} seconds")
-                                        print(f"    Total attempts: {attempts}")
-                                        return {
-                                            "success": True,
-                                            "status": "green",
-                                            "elapsed_time": elapsed_time,
-                                            "attempts": attempts
-                                        }
-                                    else:
-                                        print(f"[*] BWCE not green yet, waiting {poll_interval_seconds}s...")
-                                        time.sleep(poll_interval_seconds)
-                                        break
-                            else:
-                                print(f"[!] Attempt {attempts}: Capability instance {capability_instance_id} not found in response")
-                                print(f"    Available capabilities: {len(capabilities)}")
-                                for cap in capabilities:
-                                    print(f"      - {cap.get('capability')}: {cap.get('capability_instance_id')}")
-                                time.sleep(poll_interval_seconds)
-                            break
-                    else:
-                        print(f"[!] Attempt {attempts}: Dataplane {dataplane_id} not found")
-                        time.sleep(poll_interval_seconds)
+                dp = snapshot.dataplane(dataplane_id)
+                cap = snapshot.capability(capability_instance_id)
+                if dp is None:
+                    logger.warning("[!] Attempt %s: Dataplane %s not found", attempts, dataplane_id)
+                    time.sleep(poll_interval_seconds)
+                elif cap is None or cap.dp_id != dataplane_id or cap.capability != 'BWCE':
+                    logger.warning("[!] Attempt %s: Capability instance %s not found in response", attempts, capability_instance_id)
+                    logger.warning("    Available capabilities: %s", len(dp.capabilities))
+                    for other in dp.capabilities:
+                        logger.info("      - %s: %s", other.capability, other.instance_id)
+                    time.sleep(poll_interval_seconds)
                 else:
-                    print(f"[!] Attempt {attempts}: HTTP {resp.status_code}")
+                    logger.info("\n[*] Attempt %s | Elapsed: %.1fs", attempts, elapsed_time)
+                    logger.info("    Capability: BWCE")
+                    logger.info("    Status: %s %s", '[OK]' if cap.is_green else '[WARN]' if cap.status == 'yellow' else '[ERR]', cap.status.upper())
+
+                    if cap.services:
+                        logger.info("    Services:")
+                        for svc in cap.services:
+                            svc_emoji = '[OK]' if svc.status == 'green' else '[WARN]' if svc.status == 'yellow' else '[ERR]'
+                            logger.info("      %s %s: %s", svc_emoji, svc.name, svc.status)
+
+                    if cap.is_green:
+                        logger.info("\n[+] BWCE capability is GREEN!")
+                        logger.info("    Total time: %.1f seconds", elapsed_time)
+                        logger.info("    Total attempts: %s", attempts)
+                        return {
+                            "success": True,
+                            "status": "green",
+                            "elapsed_time": elapsed_time,
+                            "attempts": attempts
+                        }
+                    logger.info("[*] BWCE not green yet, waiting %ss...", poll_interval_seconds)
                     time.sleep(poll_interval_seconds)
 
+            except status_cache.StatusHTTPError as e:
+                logger.warning("[!] Attempt %s: HTTP %s", attempts, e.status_code)
+                time.sleep(poll_interval_seconds)
+
             except Exception as e:
-                print(f"[!] Attempt {attempts}: Error - {e}")
+                logger.warning("[!] Attempt %s: Error - %s", attempts, e)
                 time.sleep(poll_interval_seconds)
 
     def check_flogo_capability_status(self, dataplane_id, capability_instance_id, max_wait_seconds=300, poll_interval_seconds=15):
@@ -1976,13 +1953,11 @@ class TenantService:
         """
         import time
 
-        print(f"\n[*] Checking Flogo capability status...")
-        print(f"    Dataplane ID: {dataplane_id}")
-        print(f"    Capability Instance ID: {capability_instance_id}")
-        print(f"    Max Wait Time: {max_wait_seconds} seconds")
-        print(f"    Poll Interval: {poll_interval_seconds} seconds")
-
-        url = f"{self.auth.host_idm}/cp/v1/data-planes/{dataplane_id}/capabilities-status"
+        logger.info("\n[*] Checking Flogo capability status...")
+        logger.info("    Dataplane ID: %s", dataplane_id)
+        logger.info("    Capability Instance ID: %s", capability_instance_id)
+        logger.info("    Max Wait Time: %s seconds", max_wait_seconds)
+        logger.info("    Poll Interval: %s seconds", poll_interval_seconds)
 
         headers = {
             'Accept': 'application/json',
@@ -1997,7 +1972,7 @@ class TenantService:
             elapsed_time = time.time() - start_time
 
             if elapsed_time >= max_wait_seconds:
-                print(f"[!] Timeout after {elapsed_time:.1f} seconds")
+                logger.warning("[!] Timeout after %.1f seconds", elapsed_time)
                 return {
                     "success": False,
                     "status": "timeout",
@@ -2006,72 +1981,154 @@ class TenantService:
                 }
 
             try:
-                resp = self.session.get(url, headers=headers, timeout=30)
-
-                if resp.status_code == 200:
-                    data = resp.json()
-                    dataplanes = data.get('dataplanes', [])
+                snapshot = status_cache.capabilities_status(self.session, self.auth.host_idm, dataplane_id,
+                                                            headers=headers, timeout=30)
 
-                    if not dataplanes:
-                        print(f"[!] Attempt {attempts}: No dataplanes in response")
-                        time.sleep(poll_interval_seconds)
-                        continue
+                if not snapshot.dataplanes:
+                    logger.warning("[!] Attempt %s: No dataplanes in response", attempts)
+                    time.sleep(poll_interval_seconds)
+                    continue
 
-                    # Find the dataplane
-                    for dp in dataplanes:
-                        if dp.get('dp_id') == dataplane_id:
-                            capabilities = dp.get('capabilities', [])
-
-                            # Find Flogo capability
-                            for cap in capabilities:
-                                if cap.get('capability') == 'FLOGO' and cap.get('capability_instance_id') == capability_instance_id:
-                                    cap_status = cap.get('status', 'unknown')
-                                    services = cap.get('services', [])
-
-                                    print(f"\n[*] Attempt {attempts} | Elapsed: {elapsed_time:.1f}s")
-                                    print(f"    Capability: FLOGO")
-                                    print(f"    Status: {'[OK]' if cap_status == 'green' else '[WARN]' if cap_status == 'yellow' else '[ERR]'} {cap_status.upper()}")
-
-                                    if services:
-                                        print(f"    Services:")
-                                        for svc in services:
-                                            svc_name = svc.get('name', 'Unknown')
-                                            svc_status = svc.get('status', 'unknown')
-                                            svc_emoji = '[OK]' if svc_status == 'green' else '[WARN]' if svc_status == 'yellow' else '[ERR]'
-                                            print(f"      {svc_emoji} {svc_name}: {svc_status}")
-
-                                    if cap_status == 'green':
-                                        print(f"\n[+] Flogo capability is GREEN!")
-                                        print(f"    Total time: {elapsed_time:.1f} seconds")
-                                        print(f"    Total attempts: {attempts}")
-                                        return {
-                                            "success": True,
-                                            "status": "green",
-                                            "elapsed_time": elapsed_time,
-                                            "attempts": attempts
-                                        }
-                                    else:
-                                        print(f"[*] Flogo not green yet, waiting {poll_interval_seconds}s...")
-                                        time.sleep(poll_interval_seconds)
-                                        break
-                            else:
-                                print(f"[!] Attempt {attempts}: Capability instance {capability_instance_id} not found in response")
-                                print(f"    Available capabilities: {len(capabilities)}")
-                                for cap in capabilities:
-                                    print(f"      - {cap.get('capability')}: {cap.get('capability_instance_id')}")
-                                time.sleep(poll_interval_seconds)
-                            break
-                    else:
-                        print(f"[!] Attempt {attempts}: Dataplane {dataplane_id} not found")
-                        time.sleep(poll_interval_seconds)
+                dp = snapshot.dataplane(dataplane_id)
+                cap = snapshot.capability(capability_instance_id)
+                if dp is None:
+                    logger.warning("[!] Attempt %s: Dataplane %s not found", attempts, dataplane_id)
+                    time.sleep(poll_interval_seconds)
+                elif cap is None or cap.dp_id != dataplane_id or cap.capability != 'FLOGO':
+                    logger.warning("[!] Attempt %s: Capability instance %s not found in response", attempts, capability_instance_id)
+                    logger.warning("    Available capabilities: %s", len(dp.capabilities))
+                    for other in dp.capabilities:
+                        logger.info("      - %s: %s", other.capability, other.instance_id)
+                    time.sleep(poll_interval_seconds)
                 else:
-                    print(f"[!] Attempt {attempts}: HTTP {resp.status_code}")
+                    logger.info("\n[*] Attempt %s | Elapsed: %.1fs", attempts, elapsed_time)
+                    logger.info("    Capability: FLOGO")
+                    logger.info("    Status: %s %s", '[OK]' if cap.is_green else '[WARN]' if cap.status == 'yellow' else '[ERR]', cap.status.upper())
+
+                    if cap.services:
+                        logger.info("    Services:")
+                        for svc in cap.services:
+                            svc_emoji = '[OK]' if svc.status == 'green' else '[WARN]' if svc.status == 'yellow' else '[ERR]'
+                            logger.info("      %s %s: %s", svc_emoji, svc.name, svc.status)
+
+                    if cap.is_green:
+                        logger.info("\n[+] Flogo capability is GREEN!")
+                        logger.info("    Total time: %.1f seconds", elapsed_time)
+                        logger.info("    Total attempts: %s", attempts)
+                        return {
+                            "success": True,
+                            "status": "green",
+                            "elapsed_time": elapsed_time,
+                            "attempts": attempts
+                        }
+                    logger.info("[*] Flogo not green yet, waiting %ss...", poll_interval_seconds)
                     time.sleep(poll_interval_seconds)
 
+            except status_cache.StatusHTTPError as e:
+                logger.warning("[!] Attempt %s: HTTP %s", attempts, e.status_code)
+                time.sleep(poll_interval_seconds)
+
             except Exception as e:
-                print(f"[!] Attempt {attempts}: Error - {e}")
+                logger.warning("[!] Attempt %s: Error - %s", attempts, e)
                 time.sleep(poll_interval_seconds)
 
+    def find_provisioned_capability(self, dataplane_id, capability):
+        """
+        Instance ID of a capability already provisioned on a dataplane.
+
+        Args:
+            dataplane_id (str): Dataplane ID
+            capability (str): 'BWCE', 'FLOGO', ...
+
+        Returns:
+            str: Capability instance ID or empty string if there is none (or the lookup failed)
+        """
+        try:
+            snapshot = status_cache.capabilities_status(self.session, self.auth.host_idm, dataplane_id,
+                                                        headers={'Accept': 'application/json'}, timeout=30)
+            cap = snapshot.find_capability(dataplane_id, capability)
+            return cap.instance_id if cap and cap.instance_id else ''
+        except Exception as e:
+            logger.warning("[!] Could not check existing %s capability on %s: %s", capability, dataplane_id, e)
+            return ''
+
+    def wait_for_capabilities(self, targets, max_wait_seconds=300, poll_interval_seconds=15):
+        """
+        Wait until every capability in targets is green, polling them all together.
+
+        Each poll reads the all-dataplanes capabilities-status once (falling back to the
+        per-dataplane endpoint for dataplanes missing from it) and logs only status changes.
+
+        Args:
+            targets (list): (dataplane_id, capability_instance_id, capability) tuples
+            max_wait_seconds: Maximum time to wait (default 300)
+            poll_interval_seconds: Time between polls (default 15)
+
+        Returns:
+            dict: success (all green), green (set of capability instance IDs),
+                statuses ({capability_instance_id: status}), elapsed_time, attempts
+        """
+        import time
+
+        headers = {
+            'Accept': 'application/json',
+            'Content-Type': 'application/json',
+        }
+
+        logger.info("\n[*] Waiting for %s capability instance(s) on %s dataplane(s) to become green...",
+                    len(targets), len({dp_id for dp_id, _, _ in targets}))
+
+        statuses = {cap_id: 'unknown' for _, cap_id, _ in targets}
+        pending = list(targets)
+        start_time = time.time()
+        attempts = 0
+
+        while True:
+            attempts += 1
+            elapsed_time = time.time() - start_time
+
+            try:
+                snapshot = status_cache.capabilities_status(self.session, self.auth.host_idm, None,
+                                                            headers=headers, timeout=30)
+            except Exception as e:
+                logger.warning("[!] Attempt %s: Error - %s", attempts, e)
+                snapshot = None
+
+            for dp_id, cap_id, capability in pending:
+                cap = snapshot.capability(cap_id) if snapshot else None
+                if cap is None:
+                    try:
+                        cap = status_cache.capabilities_status(self.session, self.auth.host_idm, dp_id,
+                                                               headers=headers, timeout=30).capability(cap_id)
+                    except Exception as e:
+                        logger.debug("[DEBUG] %s status for %s unavailable: %s", capability, dp_id, e)
+                status = cap.status if cap else 'absent'
+                if status != statuses[cap_id]:
+                    logger.info("    %s %s (%s): %s->%s", capability, dp_id, cap_id, statuses[cap_id], status)
+                    statuses[cap_id] = status
+
+            pending = [t for t in pending if statuses[t[1]] != 'green']
+            green = len(targets) - len(pending)
+            logger.info("[*] Attempt %s | %.1fs | capabilities green %s/%s", attempts, elapsed_time, green, len(targets))
+
+            if not pending:
+                logger.info("[+] All capabilities are GREEN (%.1f seconds, %s attempts)", elapsed_time, attempts)
+                break
+            if elapsed_time + poll_interval_seconds > max_wait_seconds:
+                logger.warning("[!] Timeout after %.1f seconds: %s capability instance(s) not green", elapsed_time, len(pending))
+                for dp_id, cap_id, capability in pending:
+                    logger.warning("    %s on %s: %s", capability, dp_id, statuses[cap_id])
+                break
+            time.sleep(poll_interval_seconds)
+
+        return {
+            "success": not pending,
+            "green": {cap_id for cap_id, status in statuses.items() if status == 'green'},
+            "statuses": statuses,
+            "elapsed_time": time.time() - start_time,
+            "attempts": attempts
+        }
+
     def deploy_bwce_app(self, dataplane_id, dataplane_name, app_config):
         """
         Deploy BWCE application
@@ -2109,9 +2166,8 @@ class TenantService:
             return result
 
         except Exception as e:
-            print(f"[!] BWCE Deployment Error: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.warning("[!] BWCE Deployment Error: %s", e)
+            logger.debug("[DEBUG] Full traceback:", exc_info=True)
             return {
                 "success": False,
                 "error": str(e)
@@ -2154,9 +2210,8 @@ class TenantService:
             return result
 
         except Exception as e:
-            print(f"[!] Flogo Deployment Error: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.warning("[!] Flogo Deployment Error: %s", e)
+            logger.debug("[DEBUG] Full traceback:", exc_info=True)
             return {
                 "success": False,
                 "error": str(e)
@@ -2185,30 +2240,29 @@ class TenantService:
                 "licenseType": "TIBCO_ACTIVATION_SERVICE"
             }
 
-            print(f"[*] Linking activation server to dataplane: {dataplane_id}")
-            print(f"    Activation Server Resource ID: {activation_server_resource_id}")
+            logger.info("[*] Linking activation server to dataplane: %s", dataplane_id)
+            logger.info("    Activation Server Resource ID: %s", activation_server_resource_id)
 
             resp = self.session.put(url, json=payload)
 
             if resp.status_code in [200, 201]:
                 result = resp.json()
-                print(f"[+] Activation server linked successfully to dataplane")
+                logger.info("[+] Activation server linked successfully to dataplane")
                 return {
                     "success": True,
                     "message": result.get('response', {}).get('message', 'Linked successfully')
                 }
             else:
-                print(f"[!] Failed to link activation server. Status: {resp.status_code}")
-                print(f"[!] Response: {resp.text}")
+                logger.warning("[!] Failed to link activation server. Status: %s", resp.status_code)
+                logger.warning("[!] Response: %s", resp.text)
                 return {
                     "success": False,
                     "error": f"HTTP {resp.status_code}: {resp.text}"
                 }
 
         except Exception as e:
-            print(f"[!] Error linking activation server: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.warning("[!] Error linking activation server: %s", e)
+            logger.debug("[DEBUG] Full traceback:", exc_info=True)
             return {
                 "success": False,
                 "error": str(e)
@@ -2239,14 +2293,15 @@ class TenantService:
             }
 
             action = "Starting" if replica_count > 0 else "Stopping"
-            print(f"[*] {action} BWCE application: {app_id}")
-            print(f"    Replica count: {replica_count}")
+            logger.info("[*] %s BWCE application: %s", action, app_id)
+            logger.info("    Replica count: %s", replica_count)
 
             resp = self.session.put(url, json=payload, params={"capability_instance_id": capability_instance_id})
+            status_cache.invalidate(self.session, dataplane_id)
 
             if resp.status_code in [200, 202]:
                 result = resp.json()
-                print(f"[+] BWCE application scale request accepted")
+                logger.info("[+] BWCE application scale request accepted")
                 return {
                     "success": True,
                     "app_id": result.get('appId', app_id),
@@ -2254,17 +2309,16 @@ class TenantService:
                     "message": result.get('message')
                 }
             else:
-                print(f"[!] Failed to scale BWCE app. Status: {resp.status_code}")
-                print(f"[!] Response: {resp.text}")
+                logger.warning("[!] Failed to scale BWCE app. Status: %s", resp.status_code)
+                logger.warning("[!] Response: %s", resp.text)
                 return {
                     "success": False,
                     "error": f"HTTP {resp.status_code}: {resp.text}"
                 }
 
         except Exception as e:
-            print(f"[!] Error scaling BWCE app: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.warning("[!] Error scaling BWCE app: %s", e)
+            logger.debug("[DEBUG] Full traceback:", exc_info=True)
             return {
                 "success": False,
                 "error": str(e)
@@ -2295,14 +2349,15 @@ class TenantService:
             }
 
             action = "Starting" if replica_count > 0 else "Stopping"
-            print(f"[*] {action} Flogo application: {app_id}")
-            print(f"    Replica count: {replica_count}")
+            logger.info("[*] %s Flogo application: %s", action, app_id)
+            logger.info("    Replica count: %s", replica_count)
 
             resp = self.session.put(url, json=payload, params={"capability_instance_id": capability_instance_id})
+            status_cache.invalidate(self.session, dataplane_id)
 
             if resp.status_code in [200, 202]:
                 result = resp.json()
-                print(f"[+] Flogo application scale request accepted")
+                logger.info("[+] Flogo application scale request accepted")
                 return {
                     "success": True,
                     "app_id": result.get('appId', app_id),
@@ -2310,17 +2365,16 @@ class TenantService:
                     "message": result.get('message')
                 }
             else:
-                print(f"[!] Failed to scale Flogo app. Status: {resp.status_code}")
-                print(f"[!] Response: {resp.text}")
+                logger.warning("[!] Failed to scale Flogo app. Status: %s", resp.status_code)
+                logger.warning("[!] Response: %s", resp.text)
                 return {
                     "success": False,
                     "error": f"HTTP {resp.status_code}: {resp.text}"
                 }
 
         except Exception as e:
-            print(f"[!] Error scaling Flogo app: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.warning("[!] Error scaling Flogo app: %s", e)
+            logger.debug("[DEBUG] Full traceback:", exc_info=True)
             return {
                 "success": False,
                 "error": str(e)
@@ -2351,30 +2405,30 @@ class TenantService:
 
             headers = self.get_api_headers()
 
-            print(f"[*] Linking activation server to dataplane...")
-            print(f"    Dataplane ID: {dataplane_id}")
-            print(f"    Activation Server ID: {activation_server_resource_id}")
+            logger.info("[*] Linking activation server to dataplane...")
+            logger.info("    Dataplane ID: %s", dataplane_id)
+            logger.info("    Activation Server ID: %s", activation_server_resource_id)
 
             resp = self.session.put(url, json=payload, headers=headers, timeout=30)
 
             if resp.status_code in [200, 201]:
                 result = resp.json()
                 message = result.get('response', {}).get('message', 'Linked successfully')
-                print(f"[+] {message}")
+                logger.info("[+] %s", message)
                 return {
                     "success": True,
                     "message": message
                 }
             else:
-                print(f"[!] Failed to link activation server. Status: {resp.status_code}")
-                print(f"[!] Response: {resp.text}")
+                logger.warning("[!] Failed to link activation server. Status: %s", resp.status_code)
+                logger.warning("[!] Response: %s", resp.text)
                 return {
                     "success": False,
                     "error": f"HTTP {resp.status_code}"
                 }
 
         except Exception as e:
-            print(f"[!] Error linking activation server: {e}")
+            logger.warning("[!] Error linking activation server: %s", e)
             return {
                 "success": False,
                 "error": str(e)
@@ -2392,10 +2446,10 @@ class TenantService:
         Returns:
             dict: Summary of linking results
         """
-        print(f"\n{'='*60}")
-        print(f"[STEP] Link Activation Server to Dataplanes")
-        print(f"{'='*60}")
-        print(f"[*] Linking activation server to {len(dataplane_ids)} dataplane(s)...")
+        logger.info("\n" + "=" * 60)
+        logger.info("[STEP] Link Activation Server to Dataplanes")
+        logger.info("=" * 60)
+        logger.info("[*] Linking activation server to %s dataplane(s)...", len(dataplane_ids))
 
         results = {
             "total": len(dataplane_ids),
@@ -2421,16 +2475,16 @@ class TenantService:
                     "error": result.get('error')
                 })
 
-        print(f"\n[*] Activation Server Linking Summary:")
-        print(f"    Total: {results['total']}")
-        print(f"    Successful: {results['successful']}")
-        print(f"    Failed: {results['failed']}")
+        logger.info("\n[*] Activation Server Linking Summary:")
+        logger.info("    Total: %s", results['total'])
+        logger.info("    Successful: %s", results['successful'])
+        logger.info("    Failed: %s", results['failed'])
 
         if results["failed"] > 0:
-            print(f"\n[!] Failed dataplanes:")
+            logger.warning("\n[!] Failed dataplanes:")
             for detail in results["details"]:
                 if detail["status"] == "failed":
-                    print(f"    - {detail['dataplane_id']}: {detail.get('error', 'Unknown error')}")
+                    logger.info("    - %s: %s", detail['dataplane_id'], detail.get('error', 'Unknown error'))
 
         return results
 
@@ -2466,16 +2520,17 @@ class TenantService:
                 "method": "PUT"
             }
 
-            print(f"[*] Starting BWCE application...")
-            print(f"    App ID: {app_id}")
-            print(f"    Replicas: {replicas}")
+            logger.info("[*] Starting BWCE application...")
+            logger.info("    App ID: %s", app_id)
+            logger.info("    Replicas: %s", replicas)
 
             headers = self.get_api_headers()
             resp = self.session.put(url, json=payload, headers=headers, params=params)
+            status_cache.invalidate(self.session, dataplane_id)
 
             if resp.status_code in [200, 202]:
                 result = resp.json()
-                print(f"[+] Application start request accepted")
+                logger.info("[+] Application start request accepted")
                 return {
                     "success": True,
                     "message": result.get('message', 'Application started successfully'),
@@ -2490,17 +2545,16 @@ class TenantService:
                 except:
                     error_msg = resp.text[:200]
 
-                print(f"[!] Failed to start application. Status: {resp.status_code}")
-                print(f"    Response: {error_msg}")
+                logger.warning("[!] Failed to start application. Status: %s", resp.status_code)
+                logger.warning("    Response: %s", error_msg)
                 return {
                     "success": False,
                     "error": error_msg
                 }
 
         except Exception as e:
-            print(f"[!] Error starting BWCE application: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.warning("[!] Error starting BWCE application: %s", e)
+            logger.debug("[DEBUG] Full traceback:", exc_info=True)
             return {
                 "success": False,
                 "error": str(e)
@@ -2538,16 +2592,17 @@ class TenantService:
                 "method": "PUT"
             }
 
-            print(f"[*] Starting Flogo application...")
-            print(f"    App ID: {app_id}")
-            print(f"    Replicas: {replicas}")
+            logger.info("[*] Starting Flogo application...")
+            logger.info("    App ID: %s", app_id)
+            logger.info("    Replicas: %s", replicas)
 
             headers = self.get_api_headers()
             resp = self.session.put(url, json=payload, headers=headers, params=params)
+            status_cache.invalidate(self.session, dataplane_id)
 
             if resp.status_code in [200, 202]:
                 result = resp.json()
-                print(f"[+] Application start request accepted")
+                logger.info("[+] Application start request accepted")
                 return {
                     "success": True,
                     "message": result.get('message', 'Application started successfully'),
@@ -2562,17 +2617,16 @@ class TenantService:
                 except:
                     error_msg = resp.text[:200]
 
-                print(f"[!] Failed to start application. Status: {resp.status_code}")
-                print(f"    Response: {error_msg}")
+                logger.warning("[!] Failed to start application. Status: %s", resp.status_code)
+                logger.warning("    Response: %s", error_msg)
                 return {
                     "success": False,
                     "error": error_msg
                 }
 
         except Exception as e:
-            print(f"[!] Error starting Flogo application: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.warning("[!] Error starting Flogo application: %s", e)
+            logger.debug("[DEBUG] Full traceback:", exc_info=True)
             return {
                 "success": False,
                 "error": str(e)
@@ -13,6 +13,7 @@ import sys
 import time
 from auth import SAMLAuthenticator
 from deploy_rest_api import RestApiDeployer
+import status_cache
 
 
 def load_config():
@@ -89,34 +90,27 @@ def get_deployed_apps_info(config):
 
 def get_dataplane_info(session, tenant_host):
     """Get list of dataplanes and their capabilities"""
-    import requests
-
-    url = f"{tenant_host}/cp/v1/data-planes/capabilities-status"
-
     try:
-        resp = session.get(url, verify=False)
-        if resp.status_code == 200:
-            data = resp.json()
-            dataplanes = data.get('dataplanes', [])
+        dataplanes = status_cache.capabilities_status(session, tenant_host, verify=False).dataplanes
 
-            print("\n" + "="*60)
-            print("AVAILABLE DATAPLANES")
-            print("="*60)
+        print("\n" + "="*60)
+        print("AVAILABLE DATAPLANES")
+        print("="*60)
 
-            for idx, dp in enumerate(dataplanes, 1):
-                print(f"\n{idx}. {dp.get('dp_name', 'Unknown')} (ID: {dp['dp_id']})")
-                print(f"   Status: {dp['status']}")
+        for idx, dp in enumerate(dataplanes, 1):
+            print(f"\n{idx}. {dp.name or 'Unknown'} (ID: {dp.dp_id})")
+            print(f"   Status: {dp.status}")
 
-                # Show capabilities
-                for cap in dp.get('capabilities', []):
-                    if cap['capability'] in ['BWCE', 'FLOGO']:
-                        print(f"   - {cap['capability']}: {cap['status']} (ID: {cap['capability_instance_id']})")
+            # Show capabilities
+            for cap_type in ('BWCE', 'FLOGO'):
+                for cap in dp.by_type.get(cap_type, []):
+                    print(f"   - {cap.capability}: {cap.status} (ID: {cap.instance_id})")
 
-            print("="*60)
-            return dataplanes
-        else:
-            print(f"[!] Failed to get dataplanes: {resp.status_code}")
-            return []
+        print("="*60)
+        return dataplanes
+    except status_cache.StatusHTTPError as e:
+        print(f"[!] Failed to get dataplanes: {e.status_code}")
+        return []
     except Exception as e:
         print(f"[!] Error getting dataplanes: {e}")
         return []
@@ -146,9 +140,9 @@ def interactive_mode(session, tenant_host):
             return
 
         selected_dp = dataplanes[dp_choice]
-        dataplane_id = selected_dp['dp_id']
+        dataplane_id = selected_dp.dp_id
 
-        print(f"\n[+] Selected: {selected_dp.get('dp_name', 'Unknown')} ({dataplane_id})")
+        print(f"\n[+] Selected: {selected_dp.name or 'Unknown'} ({dataplane_id})")
 
     except (ValueError, IndexError):
         print("[!] Invalid input")
@@ -165,11 +159,8 @@ def interactive_mode(session, tenant_host):
         if app_type_choice == 1:
             app_type = 'BWCE'
             # Find BWCE capability
-            cap_id = None
-            for cap in selected_dp.get('capabilities', []):
-                if cap['capability'] == 'BWCE':
-                    cap_id = cap['capability_instance_id']
-                    break
+            cap = selected_dp.capability('BWCE')
+            cap_id = cap.instance_id if cap else None
 
             if not cap_id:
                 print("[!] BWCE capability not found on this dataplane")
@@ -178,11 +169,8 @@ def interactive_mode(session, tenant_host):
         elif app_type_choice == 2:
             app_type = 'FLOGO'
             # Find Flogo capability
-            cap_id = None
-            for cap in selected_dp.get('capabilities', []):
-                if cap['capability'] == 'FLOGO':
-                    cap_id = cap['capability_instance_id']
-                    break
+            cap = selected_dp.capability('FLOGO')
+            cap_id = cap.instance_id if cap else None
 
             if not cap_id:
                 print("[!] Flogo capability not found on this dataplane")
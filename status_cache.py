@@ -0,0 +1,192 @@
+"""
+Shared capabilities-status cache.
+
+/cp/v1/data-planes/{id}/capabilities-status is read by the BWCE/Flogo
+capability waiters, by RestApiDeployer._get_integrationcore_capability_id
+for every connector provisioning and by start_stop_apps.py. StatusCache
+keeps the parsed StatusSnapshot per session and URL for a short TTL, and
+coalesces concurrent requests for the same URL into a single in-flight GET
+(single-flight): the first caller fetches, the others wait for its result.
+
+Code that changes capability state (capability/buildtype/connector
+provisioning, app start/stop/scale) must call invalidate() for the
+dataplane afterwards so the next read goes back to the CP.
+
+Usage:
+    snapshot = status_cache.capabilities_status(session, host, dataplane_id, timeout=30)
+    ...
+    status_cache.invalidate(session, dataplane_id)
+"""
+
+import threading
+import time
+import weakref
+
+from logging_config import get_logger
+from status_model import StatusSnapshot
+import payloads
+
+logger = get_logger(__name__)
+
+DEFAULT_TTL_SECONDS = 5.0
+
+
+class StatusHTTPError(Exception):
+    """A status request answered with something other than HTTP 200."""
+
+    def __init__(self, status_code, url):
+        super().__init__(f"HTTP {status_code} from {url}")
+        self.status_code = status_code
+        self.url = url
+
+
+class _Flight:
+    """One in-flight GET shared by every caller that asked for the same URL meanwhile."""
+
+    __slots__ = ("event", "result", "error", "dataplane_id", "stale")
+
+    def __init__(self, dataplane_id):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+        self.dataplane_id = dataplane_id
+        self.stale = False
+
+
+class StatusCache:
+    """Per-session TTL cache of StatusSnapshot objects with single-flight fetching."""
+
+    def __init__(self, ttl=DEFAULT_TTL_SECONDS):
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        # Keyed weakly by session so logged-out sessions drop their entries
+        self.entries = weakref.WeakKeyDictionary()   # session -> {url: (fetched_at, snapshot, dataplane_id)}
+        self.inflight = weakref.WeakKeyDictionary()  # session -> {url: _Flight}
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0, "invalidations": 0}
+
+    def get(self, session, url, dataplane_id=None, max_age=None, **request_kwargs):
+        """
+        Return the parsed status for url, fetching it at most once per TTL.
+
+        Args:
+            session: requests.Session used for the GET (also the cache scope)
+            url (str): Status URL
+            dataplane_id (str): Dataplane the URL is about (None for all-dataplane URLs);
+                used by invalidate()
+            max_age (float): Accept a cached response at most this old (default: the cache TTL,
+                0 forces a new request but still joins one already in flight)
+            **request_kwargs: Passed to session.get (headers, timeout, verify, ...)
+
+        Returns:
+            StatusSnapshot: Shared between callers, treat as read-only
+
+        Raises:
+            StatusHTTPError: The CP answered with a non-200 status (not cached)
+        """
+        max_age = self.ttl if max_age is None else max_age
+        with self.lock:
+            entry = self.entries.get(session, {}).get(url)
+            if entry and max_age > 0 and time.monotonic() - entry[0] <= max_age:
+                self.stats["hits"] += 1
+                logger.debug("[DEBUG] Status cache hit: %s", url)
+                return entry[1]
+
+            flights = self.inflight.setdefault(session, {})
+            flight = flights.get(url)
+            leader = flight is None
+            if leader:
+                flight = flights[url] = _Flight(dataplane_id)
+                self.stats["misses"] += 1
+            else:
+                self.stats["coalesced"] += 1
+
+        if not leader:
+            logger.debug("[DEBUG] Status cache: joining in-flight request for %s", url)
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        fetched_at = time.monotonic()
+        try:
+            resp = session.get(url, **request_kwargs)
+            if resp.status_code != 200:
+                raise StatusHTTPError(resp.status_code, url)
+            flight.result = StatusSnapshot.from_response(resp.json())
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self.lock:
+                flights = self.inflight.get(session, {})
+                if flights.get(url) is flight:
+                    del flights[url]
+                # A flight invalidated while running may predate the mutation: hand the result
+                # to the callers that were already waiting, but do not cache it
+                if flight.error is None and not flight.stale:
+                    self.entries.setdefault(session, {})[url] = (fetched_at, flight.result, dataplane_id)
+            flight.event.set()
+        return flight.result
+
+    def invalidate(self, session, dataplane_id=None):
+        """
+        Drop cached status for a session.
+
+        Args:
+            session: requests.Session whose entries are dropped
+            dataplane_id (str): Only drop entries for this dataplane (and all-dataplane URLs);
+                None drops everything for the session
+        """
+        with self.lock:
+            self.stats["invalidations"] += 1
+            entries = self.entries.get(session, {})
+            for url in [u for u, e in entries.items() if dataplane_id is None or e[2] in (None, dataplane_id)]:
+                del entries[url]
+            flights = self.inflight.get(session, {})
+            for url in [u for u, f in flights.items() if dataplane_id is None or f.dataplane_id in (None, dataplane_id)]:
+                # Later callers start a new request instead of joining this one
+                flights.pop(url).stale = True
+        logger.debug("[DEBUG] Status cache invalidated (dataplane: %s)", dataplane_id or "all")
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            for flights in self.inflight.values():
+                for flight in flights.values():
+                    flight.stale = True
+            self.inflight.clear()
+
+
+# Process-wide cache shared by services, deploy_rest_api and start_stop_apps
+cache = StatusCache()
+
+
+def capabilities_status(session, host, dataplane_id=None, max_age=None, **request_kwargs):
+    """
+    Cached GET of /cp/v1/data-planes/{id}/capabilities-status.
+
+    Args:
+        session: Authenticated requests.Session
+        host (str): Tenant host URL
+        dataplane_id (str): Dataplane ID, or None for all dataplanes
+        max_age (float): See StatusCache.get
+        **request_kwargs: Passed to session.get
+
+    Returns:
+        StatusSnapshot
+    """
+    url = payloads.capabilities_status(host, dataplane_id).url
+    return cache.get(session, url, dataplane_id, max_age, **request_kwargs)
+
+
+def invalidate(session, dataplane_id=None):
+    """Drop cached capabilities status after a call that changed it."""
+    cache.invalidate(session, dataplane_id)
+
+
+def configure(config):
+    """Apply status_cache_config.ttl_seconds from config.json."""
+    ttl = (config or {}).get('status_cache_config', {}).get('ttl_seconds')
+    if ttl is not None:
+        cache.ttl = float(ttl)
+    return cache
@@ -0,0 +1,159 @@
+"""
+Compact status model for data-planes-status / capabilities-status responses.
+
+StatusSnapshot.from_response() walks a status payload once and builds
+Dataplane/Capability/Service objects (with __slots__) plus indexes by
+dp_id, capability type and capability instance id, so callers look things
+up directly instead of re-scanning the raw dicts on every poll.
+
+Usage:
+    snapshot = StatusSnapshot.from_response(resp.json())
+    dp = snapshot.dataplane(dataplane_id)
+    cap = snapshot.find_capability(dataplane_id, 'BWCE', status='green')
+"""
+
+GREEN = "green"
+YELLOW = "yellow"
+
+
+class Service:
+    """A service of a capability."""
+
+    __slots__ = ("name", "status")
+
+    def __init__(self, name, status):
+        self.name = name
+        self.status = status
+
+
+class Capability:
+    """A capability instance (BWCE, FLOGO, INTEGRATIONCORE, ...) on a dataplane."""
+
+    __slots__ = ("dp_id", "capability", "instance_id", "capability_type", "status", "services")
+
+    def __init__(self, dp_id, capability, instance_id, capability_type, status, services):
+        self.dp_id = dp_id
+        self.capability = capability
+        self.instance_id = instance_id
+        self.capability_type = capability_type
+        self.status = status
+        self.services = services
+
+    @property
+    def is_green(self):
+        return self.status == GREEN
+
+    def non_green_services(self):
+        """Services that are neither green nor absent."""
+        return [s for s in self.services if s.status not in (GREEN, "absent")]
+
+
+class Dataplane:
+    """A dataplane with its capabilities, indexed by type and instance id."""
+
+    __slots__ = ("dp_id", "name", "status", "message", "tibtunnel", "capabilities",
+                 "cap_green", "by_type", "by_instance")
+
+    def __init__(self, dp_id, name, status, message, tibtunnel):
+        self.dp_id = dp_id
+        self.name = name
+        self.status = status
+        self.message = message
+        self.tibtunnel = tibtunnel
+        self.capabilities = []
+        self.cap_green = 0
+        self.by_type = {}      # capability type -> [Capability]
+        self.by_instance = {}  # capability_instance_id -> Capability
+
+    def _add(self, cap):
+        self.capabilities.append(cap)
+        if cap.is_green:
+            self.cap_green += 1
+        self.by_type.setdefault(cap.capability, []).append(cap)
+        if cap.instance_id:
+            self.by_instance[cap.instance_id] = cap
+
+    @property
+    def is_green(self):
+        return self.status == GREEN
+
+    def capability(self, capability, status=None):
+        """First capability of the given type (optionally with the given status), or None."""
+        for cap in self.by_type.get(capability, ()):
+            if status is None or cap.status == status:
+                return cap
+        return None
+
+    def non_green_capabilities(self):
+        return [cap for cap in self.capabilities if not cap.is_green]
+
+    def summary(self):
+        """Entry in the shape used by check_dataplane_status's dataplane_statuses."""
+        return {
+            "id": self.dp_id,
+            "status": self.status,
+            "tibtunnel": self.tibtunnel,
+            "cap_green": self.cap_green,
+            "cap_total": len(self.capabilities),
+            "non_green_caps": [f"{cap.capability}:{cap.status}" for cap in self.non_green_capabilities()]
+        }
+
+
+class StatusSnapshot:
+    """All dataplanes of one status response with O(1) lookups."""
+
+    __slots__ = ("dataplanes", "by_id", "capabilities_by_instance", "counts")
+
+    def __init__(self):
+        self.dataplanes = []
+        self.by_id = {}
+        self.capabilities_by_instance = {}
+        self.counts = {GREEN: 0, YELLOW: 0, "other": 0}
+
+    @classmethod
+    def from_response(cls, data):
+        """
+        Build a snapshot from a data-planes-status or capabilities-status payload.
+
+        Args:
+            data (dict): Parsed JSON response ({"dataplanes": [...]})
+
+        Returns:
+            StatusSnapshot
+        """
+        snapshot = cls()
+        for raw in (data or {}).get('dataplanes', []) or []:
+            dp_id = raw.get('dp_id', 'Unknown')
+            dp = Dataplane(dp_id, raw.get('dp_name') or raw.get('name'), raw.get('status', 'unknown'),
+                           raw.get('message', ''), bool(raw.get('tibtunnel_connected', False)))
+            for cap in raw.get('capabilities', []) or []:
+                services = [Service(s.get('name', 'Unknown'), s.get('status', 'unknown')) for s in cap.get('services', []) or []]
+                capability = Capability(dp_id, cap.get('capability', 'Unknown'), cap.get('capability_instance_id'),
+                                        cap.get('capability_type', ''), cap.get('status', 'unknown'), services)
+                dp._add(capability)
+                if capability.instance_id:
+                    snapshot.capabilities_by_instance[capability.instance_id] = capability
+
+            snapshot.dataplanes.append(dp)
+            snapshot.by_id[dp_id] = dp
+            snapshot.counts[dp.status if dp.status in (GREEN, YELLOW) else "other"] += 1
+        return snapshot
+
+    def __len__(self):
+        return len(self.dataplanes)
+
+    def dataplane(self, dp_id):
+        return self.by_id.get(dp_id)
+
+    def capability(self, instance_id):
+        """Capability by capability_instance_id, or None."""
+        return self.capabilities_by_instance.get(instance_id)
+
+    def find_capability(self, dp_id, capability, status=None):
+        """First capability of a type on a dataplane (optionally with a status), or None."""
+        dp = self.by_id.get(dp_id)
+        return dp.capability(capability, status) if dp else None
+
+    @property
+    def all_green(self):
+        return bool(self.dataplanes) and self.counts[GREEN] == len(self.dataplanes)
@@ -0,0 +1,148 @@
+"""
+Change-only rendering of dataplane status polls.
+
+check_dataplane_status used to print every dataplane, capability and
+non-green service plus a full summary table on each attempt. For large
+fleets StatusRenderer keeps the previous poll and prints only transitions
+("dp X: yellow->green", "dp X BWCE/bwprovisioner: red->green") and a single
+progress line per attempt; the full table is printed once, at completion
+or timeout.
+"""
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+def _marker(status):
+    return "[OK]" if status == "green" else "[WARN]" if status == "yellow" else "[ERR]"
+
+
+def snapshot(dataplanes):
+    """
+    Reduce status_model.Dataplane objects to comparable state.
+
+    Returns:
+        dict: {dp_id: {"status": str, "tibtunnel": bool,
+                       "capabilities": {cap_key: {"status": str, "services": {name: status}}}}}
+    """
+    state = {}
+    for dp in dataplanes:
+        capabilities = {}
+        for cap in dp.capabilities:
+            key = cap.capability
+            if key in capabilities:
+                # Several instances of the same capability type on one dataplane
+                key = f"{key}#{cap.instance_id or len(capabilities)}"
+            capabilities[key] = {
+                "status": cap.status,
+                "services": {svc.name: svc.status for svc in cap.services}
+            }
+        state[dp.dp_id] = {
+            "status": dp.status,
+            "tibtunnel": dp.tibtunnel,
+            "capabilities": capabilities
+        }
+    return state
+
+
+def diff(previous, current):
+    """
+    Transitions between two snapshots.
+
+    Returns:
+        list: Human-readable transition strings
+    """
+    changes = []
+    for dp_id, dp in current.items():
+        before = previous.get(dp_id)
+        if before is None:
+            caps = dp["capabilities"]
+            green = sum(1 for c in caps.values() if c["status"] == "green")
+            changes.append(f"dp {dp_id}: {dp['status']} (tibtunnel {'up' if dp['tibtunnel'] else 'down'}, "
+                           f"capabilities {green}/{len(caps)} green)")
+            continue
+
+        if before["status"] != dp["status"]:
+            changes.append(f"dp {dp_id}: {before['status']}->{dp['status']}")
+        if before["tibtunnel"] != dp["tibtunnel"]:
+            changes.append(f"dp {dp_id}: tibtunnel {'down->up' if dp['tibtunnel'] else 'up->down'}")
+
+        for cap_key, cap in dp["capabilities"].items():
+            old_cap = before["capabilities"].get(cap_key)
+            if old_cap is None:
+                changes.append(f"dp {dp_id} {cap_key}: added ({cap['status']})")
+                continue
+            if old_cap["status"] != cap["status"]:
+                changes.append(f"dp {dp_id} {cap_key}: {old_cap['status']}->{cap['status']}")
+            for svc, svc_status in cap["services"].items():
+                old_status = old_cap["services"].get(svc, "absent")
+                if old_status != svc_status:
+                    changes.append(f"dp {dp_id} {cap_key}/{svc}: {old_status}->{svc_status}")
+        for cap_key in before["capabilities"].keys() - dp["capabilities"].keys():
+            changes.append(f"dp {dp_id} {cap_key}: removed")
+
+    for dp_id in previous.keys() - current.keys():
+        changes.append(f"dp {dp_id}: no longer reported")
+    return changes
+
+
+class StatusRenderer:
+    """Prints status transitions per poll and the full table on demand."""
+
+    def __init__(self):
+        self.previous = {}
+
+    def update(self, dataplanes, attempt, elapsed):
+        """
+        Log the transitions since the last poll and a one-line progress counter.
+
+        Args:
+            dataplanes (list): status_model.Dataplane objects being waited on
+            attempt (int): Poll attempt number
+            elapsed (float): Seconds since polling started
+        """
+        current = snapshot(dataplanes)
+        for change in diff(self.previous, current):
+            logger.info("    %s", change)
+        self.previous = current
+
+        counts = {"green": 0, "yellow": 0}
+        for dp in current.values():
+            if dp["status"] in counts:
+                counts[dp["status"]] += 1
+        other = len(current) - counts["green"] - counts["yellow"]
+        logger.info("[*] Attempt %s | %.1fs | green %s/%s | yellow %s | red/other %s",
+                    attempt, elapsed, counts["green"], len(current), counts["yellow"], other)
+
+    def render_table(self, dataplane_statuses, title):
+        """
+        Log the full summary table.
+
+        Args:
+            dataplane_statuses (list): Entries with id, status, tibtunnel, cap_green, cap_total
+                and optionally non_green_caps
+            title (str): Table heading
+        """
+        logger.info("\n" + "=" * 80)
+        logger.info("%s", title)
+        logger.info("=" * 80)
+        logger.info("%-25s | %-10s | %-10s | %-20s", "ID", "Status", "Tibtunnel", "Capabilities")
+        logger.info("-" * 80)
+
+        for dp_status in dataplane_statuses:
+            tibtunnel_display = "Connected" if dp_status['tibtunnel'] else "Disconnected"
+            cap_display = f"{dp_status['cap_green']}/{dp_status['cap_total']} green"
+            logger.info("%-25s | %s %-8s | %s %-8s | %-20s", dp_status['id'], _marker(dp_status['status']),
+                        dp_status['status'].upper(), "[OK]" if dp_status['tibtunnel'] else "[ERR]",
+                        tibtunnel_display, cap_display)
+            if dp_status.get('non_green_caps'):
+                logger.info("%-25s | %-11s | %-11s | [!] %s", "", "", "", ', '.join(dp_status['non_green_caps'][:3]))
+
+        logger.info("=" * 80)
+        green_count = sum(1 for dp in dataplane_statuses if dp['status'] == 'green')
+        yellow_count = sum(1 for dp in dataplane_statuses if dp['status'] == 'yellow')
+        red_count = len(dataplane_statuses) - green_count - yellow_count
+        logger.info("Overall: %s Green | %s Yellow | %s Red/Other | Total: %s",
+                    green_count, yellow_count, red_count, len(dataplane_statuses))
+        logger.info("=" * 80 + "\n")
@@ -0,0 +1,24 @@
+"""Shared fixtures: an in-process cp_simulator and the repo root on sys.path."""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cp_simulator import CPSimulator  # noqa: E402
+
+
+@pytest.fixture
+def simulator():
+    sim = CPSimulator(port=0, seed=1).start()
+    try:
+        yield sim
+    finally:
+        sim.stop()
+
+
+@pytest.fixture
+def tenant_host(simulator):
+    return simulator.tenant_host_template().format(prefix="pytest")
@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+
+from auth import SAMLAuthenticator, session_expired
+from identity_manager import login_with_fallback
+from utils import generate_tenant_relay_state
+
+httpx = pytest.importorskip("httpx")
+import async_client  # noqa: E402  (needs httpx)
+import payloads  # noqa: E402
+
+USER = "owner@example.com"
+
+
+def _login(tenant_host):
+    auth = SAMLAuthenticator(tenant_host, USER, "secret")
+    assert login_with_fallback(auth, generate_tenant_relay_state("pytest", tenant_host), "tenant")
+    return auth
+
+
+def test_login_redirect_counts_as_expired():
+    login = httpx.Response(302, headers={"Location": "https://cp.example.com/admin/login?relayState=abc"})
+    other = httpx.Response(302, headers={"Location": "https://cp.example.com/cp/app/home"})
+    assert session_expired(login)
+    assert session_expired(httpx.Response(401))
+    assert not session_expired(other)
+
+
+def test_expired_session_relogs_and_replays(simulator, tenant_host):
+    auth = _login(tenant_host)
+    generation = auth.generation
+
+    async def status():
+        async with async_client.AsyncCPClient.from_auth(auth) as client:
+            with simulator.lock:
+                simulator.sessions.clear()
+            return await client.send(payloads.capabilities_status(tenant_host))
+
+    resp = asyncio.run(status())
+    assert resp.status_code == 200
+    assert auth.reauth_count == 1
+    assert auth.generation == generation + 1
+
+
+def test_picks_up_cookies_of_a_login_by_another_worker(simulator, tenant_host):
+    auth = _login(tenant_host)
+
+    async def status():
+        async with async_client.AsyncCPClient.from_auth(auth) as client:
+            with simulator.lock:
+                simulator.sessions.clear()
+            assert auth.reauthenticate(auth.generation)
+            return await client.send(payloads.capabilities_status(tenant_host))
+
+    resp = asyncio.run(status())
+    assert resp.status_code == 200
+    assert auth.reauth_count == 1
@@ -0,0 +1,52 @@
+import requests
+
+import flogo_connectors
+
+ANALYTICS = {"path": "/flogo-contribution/tp-flogo-connector-analytics/1.0.0", "version": "1.0.0"}
+
+
+class _Deployer:
+    """Stands in for RestApiDeployer's artifactmanager calls."""
+
+    tenant_host = "https://cp.example.com"
+
+    def __init__(self):
+        self.session = requests.Session()
+        self.posted = []
+
+    def _get_integrationcore_capability_id(self, dataplane_id):
+        return "ic1"
+
+    def _post_connector_artifacts(self, dataplane_id, flogo_capability_id, integrationcore_id, artifacts):
+        self.posted.extend(a["name"] for a in artifacts)
+        return {"success": True, "connectors": artifacts}
+
+
+def _manager(monkeypatch):
+    manager = flogo_connectors.ConnectorManager()
+    # Artifact listing is not under test: nothing is provisioned yet
+    monkeypatch.setattr(manager, "_list_artifacts", lambda *args: set())
+    return manager
+
+
+def test_unknown_connector_fails_but_known_ones_are_provisioned(monkeypatch):
+    deployer = _Deployer()
+    result = _manager(monkeypatch).ensure(deployer, "dp1", "flogo1", ["General", "Analytics"])
+
+    assert not result["success"]
+    assert result["unknown"] == ["Analytics"]
+    assert "Analytics" in result["error"]
+    assert deployer.posted == ["General"]
+
+
+def test_configured_catalog_entries_are_provisioned(monkeypatch):
+    monkeypatch.setattr(flogo_connectors, "manager", _manager(monkeypatch))
+    flogo_connectors.configure({"flogo_connector_catalog": {"Analytics": ANALYTICS, "Broken": {"path": "/x"}}})
+    assert set(flogo_connectors.manager.catalog) == {"General", "Analytics"}
+
+    deployer = _Deployer()
+    result = flogo_connectors.manager.ensure(deployer, "dp1", "flogo1", ["General", "Analytics"])
+
+    assert result["success"]
+    assert result["unknown"] == []
+    assert sorted(deployer.posted) == ["Analytics", "General"]
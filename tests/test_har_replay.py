@@ -0,0 +1,53 @@
+import json
+
+import requests
+
+from har_replay import HarArchive, HarReplay
+
+DP_RESOURCE = "https://cp.example.com/tp-cp-ws/v1/data-planes/dp1/dp-resource"
+
+
+def _entry(method, url, text, body=None, started="2026-01-01T00:00:00Z"):
+    entry = {"startedDateTime": started, "time": 1,
+             "request": {"method": method, "url": url},
+             "response": {"status": 200, "content": {"text": text}}}
+    if body is not None:
+        entry["request"]["postData"] = {"mimeType": "application/json", "text": json.dumps(body)}
+    return entry
+
+
+def _prepare(method, url, **kwargs):
+    return requests.Request(method, url, **kwargs).prepare()
+
+
+def test_requests_differing_only_in_query_are_not_swapped():
+    replay = HarReplay(HarArchive(entries=[
+        _entry("GET", DP_RESOURCE + "?path=%2Fbuildtype", "buildtypes"),
+        _entry("GET", DP_RESOURCE + "?path=%2Finfo", "info"),
+    ]))
+    assert replay.match(_prepare("GET", DP_RESOURCE, params={"path": "/info"}))["response"]["content"]["text"] == "info"
+    assert replay.match(_prepare("GET", DP_RESOURCE, params={"path": "/buildtype"}))["response"]["content"]["text"] == "buildtypes"
+    assert replay.match(_prepare("GET", DP_RESOURCE, params={"path": "/other"})) is None
+
+
+def test_bodies_are_matched_ignoring_event_ids():
+    replay = HarReplay(HarArchive(entries=[
+        _entry("POST", DP_RESOURCE, "build-a", {"buildName": "a", "eventId": "flogo_build_1"}),
+        _entry("POST", DP_RESOURCE, "build-b", {"buildName": "b", "eventId": "flogo_build_1"}),
+    ]))
+    assert replay.match(_prepare("POST", DP_RESOURCE, json={"eventId": "flogo_build_9", "buildName": "b"}))["response"]["content"]["text"] == "build-b"
+    assert replay.match(_prepare("POST", DP_RESOURCE, json={"buildName": "a", "eventId": "flogo_build_9"}))["response"]["content"]["text"] == "build-a"
+    # A POST is never answered twice
+    assert replay.match(_prepare("POST", DP_RESOURCE, json={"buildName": "a"})) is None
+    assert replay.misses == 1
+
+
+def test_repeated_get_gets_responses_in_recording_order_then_the_last():
+    url = "https://cp.example.com/cp/v1/data-planes/capabilities-status"
+    replay = HarReplay(HarArchive(entries=[
+        _entry("GET", url, "green", started="2026-01-01T00:00:02Z"),
+        _entry("GET", url, "yellow", started="2026-01-01T00:00:01Z"),
+    ]))
+    texts = [replay.match(_prepare("GET", url))["response"]["content"]["text"] for _ in range(3)]
+    assert texts == ["yellow", "green", "green"]
+    assert replay.repeats == 1
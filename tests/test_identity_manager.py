@@ -0,0 +1,25 @@
+from identity_manager import IdentityManager
+from utils import generate_tenant_relay_state
+
+USER = "owner@example.com"
+
+
+def test_refresh_keeps_identity_logged_in(tenant_host):
+    identities = IdentityManager(refresh_check=0)
+    auth = identities.login(tenant_host, USER, "secret",
+                            generate_tenant_relay_state("pytest", tenant_host), label="tenant")
+    assert auth is not None
+    generation = auth.generation
+
+    # Force the scheduled refresh: the IdP session is still valid, so the flow gets the SAMLResponse form
+    identity = identities.identities[identities.key(tenant_host, USER)]
+    identity.expires_at = 0
+    identities.refresh_due()
+
+    assert identity.logged_in
+    assert identities.stats["refreshes"] == 1
+    assert auth.generation == generation + 1
+    assert identities.login(tenant_host, USER) is auth
+    assert identities.deployer(tenant_host, USER) is not None
+    resp = auth.session.get(f"{tenant_host}/cp/v1/data-planes/capabilities-status")
+    assert resp.status_code == 200
@@ -0,0 +1,68 @@
+import requests
+
+import rate_limit
+
+
+class _Auth:
+    def __init__(self, in_login):
+        self.in_login = in_login
+
+    def in_login_flow(self):
+        return self.in_login
+
+
+class _Inner:
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        return response
+
+    def close(self):
+        pass
+
+
+def _get(url):
+    return requests.Request('GET', url).prepare()
+
+
+def test_login_traffic_skips_window_but_takes_login_tokens():
+    limiter = rate_limit.RateLimiter(rates={"login": {"rate": 0.001, "burst": 3}}, concurrency={"initial": 1, "max": 1})
+    adapter = rate_limit.RateLimitAdapter(_Inner(), limiter, _Auth(in_login=True))
+    host = limiter.host("https://cp.example.com")
+    host.controller.inflight = 1  # the request that triggered the re-authentication holds the only slot
+
+    for _ in range(3):
+        assert adapter.send(_get("https://cp.example.com/idm/v1/login-saml")).status_code == 200
+
+    assert host.controller.inflight == 1
+    # The burst is used up: a fourth login request would have to wait for a token
+    assert host.buckets[rate_limit.LOGIN].try_acquire() > 0
+
+
+def test_endpoint_class_of_login_flow():
+    request = _get("https://cp.example.com/cp/v1/data-planes")
+    assert rate_limit.endpoint_class(request) == rate_limit.READ
+    assert rate_limit.endpoint_class(request, _Auth(in_login=False)) == rate_limit.READ
+    assert rate_limit.endpoint_class(request, _Auth(in_login=True)) == rate_limit.LOGIN
+
+
+def test_slow_upload_does_not_shrink_the_window():
+    controller = rate_limit.AIMDController(initial=8, latency_threshold=10.0, cooldown=0.0)
+    for _ in range(3):
+        controller.acquire()
+        controller.release(rate_limit.UPLOAD, 30.0, 200)  # a multi-MB .ear
+    assert controller.stats["decreases"] == 0
+    assert int(controller.limit) >= 8
+
+    controller.acquire()
+    controller.release(rate_limit.READ, 30.0, 200)
+    assert controller.stats["decreases"] == 1
+
+
+def test_upload_far_above_its_baseline_still_counts_as_a_spike():
+    controller = rate_limit.AIMDController(initial=8, latency_factor=3.0, cooldown=0.0)
+    controller.acquire()
+    controller.release(rate_limit.UPLOAD, 5.0, 200)
+    controller.acquire()
+    controller.release(rate_limit.UPLOAD, 60.0, 200)
+    assert controller.stats["decreases"] == 1
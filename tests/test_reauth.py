@@ -0,0 +1,55 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from auth import SAMLAuthenticator
+from identity_manager import login_with_fallback
+from utils import generate_tenant_relay_state
+
+USER = "owner@example.com"
+
+
+def _login(tenant_host):
+    auth = SAMLAuthenticator(tenant_host, USER, "secret")
+    assert login_with_fallback(auth, generate_tenant_relay_state("pytest", tenant_host), "tenant")
+    return auth
+
+
+def _expire(simulator):
+    with simulator.lock:
+        simulator.sessions.clear()
+
+
+def test_expired_session_relogs_once_and_replays(simulator, tenant_host):
+    auth = _login(tenant_host)
+    generation = auth.generation
+    _expire(simulator)
+
+    resp = auth.session.get(f"{tenant_host}/cp/v1/data-planes/capabilities-status")
+
+    assert resp.status_code == 200
+    assert auth.reauth_count == 1
+    assert auth.generation == generation + 1
+
+
+def test_concurrent_expiry_triggers_one_login(simulator, tenant_host):
+    auth = _login(tenant_host)
+    generation = auth.generation
+    _expire(simulator)
+
+    url = f"{tenant_host}/cp/v1/data-planes/capabilities-status"
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        statuses = list(executor.map(lambda _: auth.session.get(url).status_code, range(6)))
+
+    assert statuses == [200] * 6
+    assert auth.reauth_count == 1
+    assert auth.generation == generation + 1
+
+
+def test_login_pages_below_base_path_are_not_reauthenticated(tenant_host):
+    auth = _login(tenant_host)
+    count = auth.reauth_count
+
+    # /t/<prefix>/admin/login redirects to a relayState= URL; that is not a session expiry
+    resp = auth.session.get(f"{tenant_host}/admin/login", allow_redirects=False)
+
+    assert resp.is_redirect
+    assert auth.reauth_count == count
@@ -0,0 +1,25 @@
+import relay_resolver
+from auth import SAMLAuthenticator
+
+USER = "owner@example.com"
+
+
+def test_dynamic_fallback_runs_inside_login_scope(tenant_host):
+    auth = SAMLAuthenticator(tenant_host, USER, "secret")
+    resolver = relay_resolver.RelayStateResolver()
+    seen = []
+    fetch = auth.get_dynamic_relay_state
+
+    def tracked_fetch(*args, **kwargs):
+        # The landing page redirects to a relayState= URL; ReauthAdapter must treat it as login traffic
+        seen.append(auth.in_login_flow())
+        return fetch(*args, **kwargs)
+
+    auth.get_dynamic_relay_state = tracked_fetch
+    # No generated RelayState: the resolver falls back to scraping the landing page
+    assert resolver.login(auth, None, "tenant")
+
+    assert seen == [True]
+    assert resolver.preferred[tenant_host.rstrip('/')] == relay_resolver.DYNAMIC
+    assert not auth.in_login_flow()
+    assert auth.reauth_count == 0
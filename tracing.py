@@ -0,0 +1,259 @@
+"""
+Lightweight tracing for the population scripts.
+
+Spans are kept on a per-thread stack so they nest naturally: workflow run ->
+workflow task -> HTTP call / subprocess. HTTP spans are produced by a
+transport adapter mounted on every SAMLAuthenticator session, so calls made
+through TenantService, RestApiDeployer and the SAML login are all covered.
+Finished spans are written as OTLP/JSON (the OpenTelemetry file exporter
+format), which Jaeger, Tempo or otel-desktop-viewer can load.
+
+Usage:
+    python main.py --trace trace.json
+    # or in config.json: "tracing_config": {"enabled": true, "output": "trace.json"}
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from auth import DelegatingAdapter, register_session_hook, wrap_session_adapters
+from logging_config import get_logger
+from utils import endpoint_template
+
+logger = get_logger(__name__)
+
+# OTLP span kinds / status codes
+KIND_INTERNAL = 1
+KIND_CLIENT = 3
+STATUS_UNSET = 0
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+# Span attributes copied from the enclosing spans onto HTTP and subprocess spans
+INHERITED_ATTRIBUTES = ("prefix", "dataplane")
+
+
+class Span:
+    """A timed operation with attributes."""
+
+    def __init__(self, name, trace_id, parent_id=None, attributes=None, kind=KIND_INTERNAL):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.attributes = dict(attributes or {})
+        self.kind = kind
+        self.status = STATUS_UNSET
+        self.status_message = ""
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def set_status(self, code, message=""):
+        self.status = code
+        self.status_message = message
+
+    @property
+    def duration(self):
+        end = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end - self.start_ns) / 1e9
+
+    def to_otlp(self):
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id or "",
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or self.start_ns),
+            "attributes": [_otlp_attribute(k, v) for k, v in self.attributes.items() if v is not None],
+            "status": {"code": self.status}
+        }
+        if self.status_message:
+            span["status"]["message"] = self.status_message
+        return span
+
+
+class _NoopSpan:
+    """Returned while tracing is disabled so callers need no checks."""
+
+    def set_attribute(self, key, value):
+        pass
+
+    def set_status(self, code, message=""):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+def _otlp_attribute(key, value):
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+
+class Tracer:
+    """Collects spans from all threads; disabled (no-op) until enable() is called."""
+
+    def __init__(self, service_name="dp_population"):
+        self.service_name = service_name
+        self.enabled = False
+        self.spans = []
+        self.lock = threading.Lock()
+        self._local = threading.local()
+
+    def enable(self):
+        self.enabled = True
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def current_span(self):
+        """Innermost open span on the calling thread, or None."""
+        stack = self._stack() if self.enabled else None
+        return stack[-1] if stack else None
+
+    def inherited_attributes(self):
+        """INHERITED_ATTRIBUTES found on the open spans of the calling thread (innermost wins)."""
+        values = {}
+        for span in reversed(self._stack()):
+            for key in INHERITED_ATTRIBUTES:
+                if key not in values and key in span.attributes:
+                    values[key] = span.attributes[key]
+        return values
+
+    def start_span(self, name, attributes=None, parent=None, kind=KIND_INTERNAL):
+        """
+        Open a span on the calling thread.
+
+        Args:
+            name (str): Span name
+            attributes (dict): Initial attributes
+            parent (Span): Explicit parent (for work handed to another thread);
+                defaults to the innermost open span of this thread
+            kind (int): KIND_INTERNAL or KIND_CLIENT
+
+        Returns:
+            Span, or NOOP_SPAN while tracing is disabled
+        """
+        if not self.enabled:
+            return NOOP_SPAN
+        if parent is None:
+            parent = self.current_span()
+        if parent is None or parent is NOOP_SPAN:
+            span = Span(name, os.urandom(16).hex(), None, attributes, kind)
+        else:
+            span = Span(name, parent.trace_id, parent.span_id, attributes, kind)
+        self._stack().append(span)
+        return span
+
+    def end_span(self, span):
+        if span is NOOP_SPAN:
+            return
+        span.end_ns = time.time_ns()
+        stack = self._stack()
+        if span in stack:
+            stack.remove(span)
+        with self.lock:
+            self.spans.append(span)
+
+    @contextmanager
+    def span(self, name, attributes=None, parent=None, kind=KIND_INTERNAL):
+        """Context manager around start_span()/end_span(); exceptions mark the span as failed."""
+        span = self.start_span(name, attributes, parent, kind)
+        try:
+            yield span
+        except Exception as e:
+            span.set_status(STATUS_ERROR, str(e))
+            raise
+        finally:
+            self.end_span(span)
+
+    def to_otlp(self):
+        with self.lock:
+            spans = sorted(self.spans, key=lambda s: s.start_ns)
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [_otlp_attribute("service.name", self.service_name)]},
+                "scopeSpans": [{
+                    "scope": {"name": "dp_population.tracing"},
+                    "spans": [s.to_otlp() for s in spans]
+                }]
+            }]
+        }
+
+    def export(self, path):
+        """Write all finished spans to path as OTLP/JSON."""
+        with open(path, 'w') as f:
+            json.dump(self.to_otlp(), f)
+        logger.info("[+] Wrote %s trace spans to %s", len(self.spans), path)
+        return path
+
+
+# Process-wide tracer used by workflow.py, utils.py and the HTTP adapter
+tracer = Tracer()
+
+
+class TracingAdapter(DelegatingAdapter):
+    """Wraps each HTTP request sent through the session in a client span."""
+
+    def send(self, request, **kwargs):
+        template = endpoint_template(request.url)
+        attributes = {
+            "http.request.method": request.method,
+            "url.template": template,
+            "server.address": request.url.split('/')[2] if '://' in request.url else "",
+            "http.request.body.size": len(request.body) if request.body else 0
+        }
+        attributes.update(tracer.inherited_attributes())
+
+        with tracer.span(f"{request.method} {template}", attributes, kind=KIND_CLIENT) as span:
+            response = super().send(request, **kwargs)
+            if not kwargs.get('stream'):
+                span.set_attribute("http.response.body.size", len(response.content))
+            span.set_attribute("http.response.status_code", response.status_code)
+            if response.status_code >= 400:
+                span.set_status(STATUS_ERROR, f"HTTP {response.status_code}")
+            return response
+
+
+def install(path):
+    """Enable tracing, trace every SAMLAuthenticator session created from now on and export at exit."""
+    tracer.enable()
+    register_session_hook(lambda session, auth: wrap_session_adapters(session, TracingAdapter))
+    atexit.register(tracer.export, path)
+    logger.info("[*] Tracing enabled, spans will be written to %s", path)
+    return tracer
+
+
+def add_arguments(parser):
+    """Add --trace to an argparse parser."""
+    parser.add_argument('--trace', metavar='PATH', default=None,
+                        help='Write OTLP/JSON trace spans to PATH (overrides tracing_config)')
+
+
+def install_from_config(config, path=None):
+    """Install tracing when a path is given or tracing_config.enabled is set."""
+    tracing_config = (config or {}).get('tracing_config', {})
+    if path is None and tracing_config.get('enabled', False):
+        path = tracing_config.get('output', 'trace.json')
+    if path:
+        return install(path)
+    return None
@@ -0,0 +1,213 @@
+"""
+Tenant-wide email -> user index.
+
+The invite check in main.py scanned one page of /cp/v1/account/users
+(limit 20) and get_specific_user one page of 100, so users on later pages
+were missed and invited again in larger tenants. UserIndex walks all pages
+(page 1 first, the remaining pages concurrently once the total is known),
+keys the users by lower-cased email and keeps the index per session and
+host for the rest of the run. Invites are written through with add(), so
+existence checks stay O(1) and correct at any tenant size.
+
+Usage:
+    user = user_index.find(tenant_service, "someone@example.com")
+    user_index.add(tenant_service, "new@example.com")   # after a successful invite
+"""
+
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_PAGE_SIZE = 100
+DEFAULT_MAX_WORKERS = 4
+
+
+class UserIndexError(Exception):
+    """A user list page could not be fetched (nothing is cached)."""
+
+    def __init__(self, page):
+        super().__init__(f"Could not fetch user list page {page}")
+        self.page = page
+
+
+class _Tenant:
+    """Users of one tenant host; lock serializes the initial load."""
+
+    __slots__ = ("lock", "loaded", "by_email")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.loaded = False
+        self.by_email = {}  # lower-cased email -> user dict, in CP order
+
+
+def _page_users(data):
+    return (data or {}).get('users') or []
+
+
+def _total_users(data):
+    for key in ('totalUsers', 'total', 'totalCount'):
+        value = (data or {}).get(key)
+        if isinstance(value, int) or (isinstance(value, str) and value.isdigit()):
+            return int(value)
+    return None
+
+
+class UserIndex:
+    """Per-session, per-host cache of all account users keyed by email."""
+
+    def __init__(self, page_size=DEFAULT_PAGE_SIZE, max_workers=DEFAULT_MAX_WORKERS):
+        self.params = {'order-by': '', 'person': ''}
+        self.page_size = page_size
+        self.max_workers = max_workers
+        self.lock = threading.Lock()
+        self.tenants = weakref.WeakKeyDictionary()  # session -> {host: _Tenant}
+        self.stats = {"loads": 0, "pages": 0, "hits": 0}
+
+    def _tenant(self, service):
+        with self.lock:
+            tenants = self.tenants.setdefault(service.session, {})
+            host = service.auth.host_idm.rstrip('/')
+            entry = tenants.get(host)
+            if entry is None:
+                entry = tenants[host] = _Tenant()
+            return entry
+
+    def _fetch_page(self, service, page):
+        params = dict(self.params, page=str(page), limit=str(self.page_size))
+        data = service.get_user_details(params)
+        if data is None:
+            raise UserIndexError(page)
+        self.stats["pages"] += 1
+        return _page_users(data), data
+
+    def iter_users(self, service):
+        """
+        Yield every user of the tenant, page by page.
+
+        Page 1 is fetched first; when the response carries the total user count
+        the remaining pages are fetched concurrently, otherwise pages are fetched
+        in batches of max_workers until a short or empty page.
+
+        Args:
+            service: TenantService (get_user_details, session, auth.host_idm)
+
+        Yields:
+            dict: User entries as returned by /cp/v1/account/users
+
+        Raises:
+            UserIndexError: A page request failed
+        """
+        users, data = self._fetch_page(service, 1)
+        yield from users
+        if len(users) < self.page_size:
+            return
+
+        total = _total_users(data)
+        workers = max(1, self.max_workers)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            if total is not None:
+                last_page = -(-total // self.page_size)
+                for users, _ in executor.map(lambda p: self._fetch_page(service, p), range(2, last_page + 1)):
+                    yield from users
+                return
+
+            page = 2
+            while True:
+                batch = range(page, page + workers)
+                for users, _ in executor.map(lambda p: self._fetch_page(service, p), batch):
+                    yield from users
+                    if len(users) < self.page_size:
+                        return
+                page += workers
+
+    def users(self, service):
+        """
+        All users of the tenant, loading the index on first use.
+
+        Returns:
+            list: User dicts (plus entries written through by add())
+
+        Raises:
+            UserIndexError: The list could not be loaded
+        """
+        entry = self._tenant(service)
+        with entry.lock:
+            if entry.loaded:
+                self.stats["hits"] += 1
+                return list(entry.by_email.values())
+
+            by_email = {}
+            for user in self.iter_users(service):
+                email = (user.get('email') or '').lower()
+                if email:
+                    by_email.setdefault(email, user)
+            # Keep invites written through while the list was not loaded yet
+            for email, user in entry.by_email.items():
+                by_email.setdefault(email, user)
+            entry.by_email = by_email
+            entry.loaded = True
+            self.stats["loads"] += 1
+            logger.debug("[DEBUG] Loaded %s user(s) from %s", len(by_email), service.auth.host_idm)
+            return list(by_email.values())
+
+    def find(self, service, email):
+        """
+        User by email (case-insensitive).
+
+        Returns:
+            dict: User entry, or None when the tenant has no such user
+        """
+        self.users(service)
+        entry = self._tenant(service)
+        with entry.lock:
+            return entry.by_email.get((email or '').lower())
+
+    def add(self, service, email, user=None):
+        """Write an invited (or otherwise created) user through to the index."""
+        entry = self._tenant(service)
+        with entry.lock:
+            entry.by_email[email.lower()] = user or {"email": email, "status": "invited"}
+
+    def invalidate(self, service=None):
+        """Forget loaded users (for one service's session, or all)."""
+        with self.lock:
+            if service is None:
+                self.tenants.clear()
+            else:
+                self.tenants.pop(service.session, None)
+
+
+# Process-wide index used by TenantService and main.py
+index = UserIndex()
+
+
+def users(service):
+    return index.users(service)
+
+
+def find(service, email):
+    return index.find(service, email)
+
+
+def add(service, email, user=None):
+    index.add(service, email, user)
+
+
+def invalidate(service=None):
+    index.invalidate(service)
+
+
+def configure(config):
+    """Apply user_index_config (page_size, max_workers) and the filters of user_query_params."""
+    config = config or {}
+    index_config = config.get('user_index_config', {})
+    query_params = config.get('user_query_params', {})
+    index.params = {k: v for k, v in query_params.items() if k not in ('page', 'limit')} or index.params
+    index.page_size = int(index_config.get('page_size', DEFAULT_PAGE_SIZE))
+    index.max_workers = int(index_config.get('max_workers', DEFAULT_MAX_WORKERS))
+    return index
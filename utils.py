@@ -1,9 +1,14 @@
 import json
 import base64
+import re
 import subprocess
 import sys
 import tempfile
 import os
+import urllib.parse
+from logging_config import get_logger
+
+logger = get_logger(__name__)
 
 def generate_admin_relay_state(admin_host):
     """Dynamically creates the Admin RelayState JSON and encodes it to Base64."""
@@ -15,9 +20,21 @@ def generate_admin_relay_state(admin_host):
     json_str = json.dumps(state_obj, separators=(',', ':'))
     return base64.b64encode(json_str.encode()).decode()
 
-def generate_tenant_relay_state(prefix):
+DEFAULT_TENANT_HOST_TEMPLATE = "https://{prefix}.cp1-my.localhost.dataplanes.pro"
+
+def get_tenant_host(config, prefix):
+    """
+    Builds the tenant host URL for a subscription prefix.
+    Uses config['tenant_host_template'] (e.g. "https://{prefix}.cp1-my.localhost.dataplanes.pro")
+    so the scripts can be pointed at another CP or at the local simulator.
+    """
+    template = (config or {}).get('tenant_host_template') or DEFAULT_TENANT_HOST_TEMPLATE
+    return template.format(prefix=prefix.lower())
+
+def generate_tenant_relay_state(prefix, host=None):
     """Dynamically creates the RelayState JSON and encodes it to Base64."""
-    host = f"https://{prefix.lower()}.cp1-my.localhost.dataplanes.pro"
+    if not host:
+        host = get_tenant_host(None, prefix)
     state_obj = {
         "tenantId": "TSC",
         "resumeURL": f"{host}/cp/app/home",
@@ -27,6 +44,25 @@ def generate_tenant_relay_state(prefix):
     json_str = json.dumps(state_obj, separators=(',', ':'))
     return base64.b64encode(json_str.encode()).decode()
 
+# Path segments that identify a resource (numbers, UUIDs, emails, generated IDs
+# such as dataplane/capability IDs) rather than an endpoint
+_ID_SEGMENT = re.compile(
+    r'^(?:\d+'
+    r'|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}'
+    r'|[^/]+@[^/]+'
+    r'|(?=[^/]*\d)[A-Za-z0-9_.-]{12,})$'
+)
+
+def endpoint_template(url):
+    """
+    Reduces a request URL to its endpoint template for tracing/metrics.
+    Example: https://x/tp-cp-ws/v1/data-planes/d1a2b3c4d5e6f7g8h9i0/dp-resource?x=1
+          -> /tp-cp-ws/v1/data-planes/{id}/dp-resource
+    """
+    path = urllib.parse.urlsplit(url).path or '/'
+    segments = [urllib.parse.unquote(seg) for seg in path.split('/')]
+    return '/'.join('{id}' if seg and _ID_SEGMENT.match(seg) else seg for seg in segments)
+
 def load_config(file_path='config.json'):
     """Loads project configuration from a JSON file."""
     with open(file_path, 'r') as f:
@@ -52,7 +88,7 @@ def execute_commands_sequentially(commands, working_dir=None, shell=True):
             }
     """
     if not commands:
-        print("[!] No commands to execute")
+        logger.warning("[!] No commands to execute")
         return {
             "success": False,
             "total_commands": 0,
@@ -61,17 +97,17 @@ def execute_commands_sequentially(commands, working_dir=None, shell=True):
             "results": []
         }
 
-    print(f"\n{'='*60}")
-    print(f"[*] Executing {len(commands)} commands sequentially")
-    print(f"{'='*60}\n")
+    logger.info("\n" + "=" * 60)
+    logger.info("[*] Executing %s commands sequentially", len(commands))
+    logger.info("=" * 60 + "\n")
 
     results = []
     executed = 0
     failed = 0
 
     for idx, command in enumerate(commands, 1):
-        print(f"[*] Command {idx}/{len(commands)}:")
-        print(f"    {command[:100]}{'...' if len(command) > 100 else ''}")
+        logger.info("[*] Command %s/%s:", idx, len(commands))
+        logger.info("    %s%s", command[:100], '...' if len(command) > 100 else '')
 
         temp_file = None
         try:
@@ -102,17 +138,25 @@ def execute_commands_sequentially(commands, working_dir=None, shell=True):
 
                     command = f'{kubectl_part} {temp_file.name}'
 
-                    print(f"    [*] Converted heredoc to file input: {temp_file.name}")
+                    logger.info("    [*] Converted heredoc to file input: %s", temp_file.name)
 
             # Execute command
-            result = subprocess.run(
-                command,
-                shell=shell,
-                cwd=working_dir,
-                capture_output=True,
-                text=True,
-                timeout=300  # 5 minutes timeout per command
-            )
+            from tracing import tracer, STATUS_ERROR
+            span_attributes = tracer.inherited_attributes()
+            # Only the executable name: installation commands can carry tokens
+            span_attributes.update({"process.executable.name": command.split()[0] if command.split() else "", "command.index": idx})
+            with tracer.span("subprocess", span_attributes) as span:
+                result = subprocess.run(
+                    command,
+                    shell=shell,
+                    cwd=working_dir,
+                    capture_output=True,
+                    text=True,
+                    timeout=300  # 5 minutes timeout per command
+                )
+                span.set_attribute("process.exit.code", result.returncode)
+                if result.returncode != 0:
+                    span.set_status(STATUS_ERROR, f"exit code {result.returncode}")
 
             executed += 1
 
@@ -124,20 +168,20 @@ def execute_commands_sequentially(commands, working_dir=None, shell=True):
             }
 
             if result.returncode == 0:
-                print(f"[+] Command {idx} completed successfully")
+                logger.info("[+] Command %s completed successfully", idx)
                 if result.stdout:
-                    print(f"    Output: {result.stdout[:200]}{'...' if len(result.stdout) > 200 else ''}")
+                    logger.info("    Output: %s%s", result.stdout[:200], '...' if len(result.stdout) > 200 else '')
             else:
                 failed += 1
-                print(f"[!] Command {idx} failed with return code {result.returncode}")
+                logger.warning("[!] Command %s failed with return code %s", idx, result.returncode)
                 if result.stderr:
-                    print(f"    Error: {result.stderr[:200]}")
+                    logger.info("    Error: %s", result.stderr[:200])
 
             results.append(command_result)
 
         except subprocess.TimeoutExpired:
             failed += 1
-            print(f"[!] Command {idx} timed out after 5 minutes")
+            logger.warning("[!] Command %s timed out after 5 minutes", idx)
             results.append({
                 "command": command,
                 "returncode": -1,
@@ -146,7 +190,7 @@ def execute_commands_sequentially(commands, working_dir=None, shell=True):
             })
         except Exception as e:
             failed += 1
-            print(f"[!] Command {idx} execution error: {e}")
+            logger.warning("[!] Command %s execution error: %s", idx, e)
             results.append({
                 "command": command,
                 "returncode": -1,
@@ -161,15 +205,15 @@ def execute_commands_sequentially(commands, working_dir=None, shell=True):
                 except:
                     pass
 
-        print()  # Empty line between commands
+        logger.info("")  # Empty line between commands
 
-    print(f"{'='*60}")
-    print(f"[*] Execution Summary:")
-    print(f"    Total: {len(commands)}")
-    print(f"    Executed: {executed}")
-    print(f"    Successful: {executed - failed}")
-    print(f"    Failed: {failed}")
-    print(f"{'='*60}\n")
+    logger.info("=" * 60)
+    logger.info("[*] Execution Summary:")
+    logger.info("    Total: %s", len(commands))
+    logger.info("    Executed: %s", executed)
+    logger.info("    Successful: %s", executed - failed)
+    logger.info("    Failed: %s", failed)
+    logger.info("=" * 60 + "\n")
 
     return {
         "success": failed == 0,
@@ -200,8 +244,8 @@ def save_commands_to_file(commands, filename="dataplane_commands.txt"):
                 f.write(f"# Command {idx}\n")
                 f.write(f"{command}\n\n")
 
-        print(f"[+] Commands saved to: {filename}")
+        logger.info("[+] Commands saved to: %s", filename)
         return True
     except Exception as e:
-        print(f"[!] Failed to save commands: {e}")
+        logger.warning("[!] Failed to save commands: %s", e)
         return False
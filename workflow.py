@@ -0,0 +1,216 @@
+"""
+DAG workflow engine for the population scripts.
+
+The steps of main.py are registered as tasks with explicit dependencies and
+executed by a thread pool, so independent branches (activation server setup,
+per-dataplane provisioning, app deploys on different dataplanes) overlap
+instead of running one after the other.
+"""
+
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from logging_config import get_logger
+from tracing import tracer, STATUS_ERROR, STATUS_OK
+
+logger = get_logger(__name__)
+
+
+PENDING = "pending"
+RUNNING = "running"
+PASSED = "pass"
+FAILED = "fail"
+SKIPPED = "skipped"
+
+_local = threading.local()
+
+
+def current_task():
+    """Return the Task running on the calling thread, or None outside a workflow."""
+    return getattr(_local, "task", None)
+
+
+class Task:
+    """A single unit of work in a Workflow."""
+
+    def __init__(self, name, func, deps=None, labels=None, allow_failed_deps=False):
+        """
+        Args:
+            name (str): Unique task name
+            func (callable): Called as func(context). Returning False or raising marks the task failed.
+            deps (list): Names of tasks that must finish first
+            labels (dict): Free-form attributes (e.g. prefix, dataplane) for reporting
+            allow_failed_deps (bool): Run even if a dependency failed or was skipped
+                (used for summary/join tasks)
+        """
+        self.name = name
+        self.func = func
+        self.deps = list(deps or [])
+        self.labels = dict(labels or {})
+        self.allow_failed_deps = allow_failed_deps
+        self.status = PENDING
+        self.result = None
+        self.error = None
+        self.traceback = None
+        self.start_time = None
+        self.end_time = None
+
+    @property
+    def duration(self):
+        if self.start_time is None or self.end_time is None:
+            return 0.0
+        return self.end_time - self.start_time
+
+
+class Workflow:
+    """
+    Dependency graph of tasks executed with configurable concurrency.
+
+    Usage:
+        wf = Workflow("populate", max_workers=4)
+        wf.add_task("login", do_login)
+        wf.add_task("register", do_register, deps=["login"])
+        wf.run(context)
+        wf.print_report()
+    """
+
+    def __init__(self, name, max_workers=4):
+        self.name = name
+        self.max_workers = max(1, int(max_workers or 1))
+        self.tasks = {}
+        self._order = []
+        self.start_time = None
+        self.end_time = None
+        self._span = None
+
+    def add_task(self, name, func, deps=None, labels=None, allow_failed_deps=False):
+        """Register a task. Dependencies must already be registered."""
+        if name in self.tasks:
+            raise ValueError(f"Duplicate task name: {name}")
+        for dep in deps or []:
+            if dep not in self.tasks:
+                raise ValueError(f"Task '{name}' depends on unknown task '{dep}'")
+
+        task = Task(name, func, deps=deps, labels=labels, allow_failed_deps=allow_failed_deps)
+        self.tasks[name] = task
+        self._order.append(name)
+        return task
+
+    def _is_ready(self, task):
+        return all(self.tasks[dep].status in (PASSED, FAILED, SKIPPED) for dep in task.deps)
+
+    def _deps_ok(self, task):
+        return all(self.tasks[dep].status == PASSED for dep in task.deps)
+
+    def _execute(self, task, context):
+        _local.task = task
+        # Task spans run on pool threads, so their parent is passed explicitly
+        span = tracer.start_span(task.name, task.labels, parent=self._span)
+        task.start_time = time.time()
+        try:
+            task.result = task.func(context)
+            task.status = FAILED if task.result is False else PASSED
+        except Exception as e:
+            task.error = str(e)
+            task.traceback = traceback.format_exc()
+            task.status = FAILED
+            logger.error("[!] Task '%s' raised an error: %s", task.name, e, exc_info=True)
+        finally:
+            task.end_time = time.time()
+            _local.task = None
+            span.set_attribute("task.status", task.status)
+            if task.status == FAILED:
+                span.set_status(STATUS_ERROR, task.error or "task returned False")
+            tracer.end_span(span)
+        return task
+
+    def run(self, context=None):
+        """
+        Execute all tasks, respecting dependencies.
+
+        Args:
+            context (dict): Shared state passed to every task function
+
+        Returns:
+            dict: {task_name: status}
+        """
+        if context is None:
+            context = {}
+
+        self.start_time = time.time()
+        self._span = tracer.start_span(f"workflow {self.name}", {"workflow.max_workers": self.max_workers})
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=self.name) as executor:
+            while True:
+                # Schedule every pending task whose dependencies have finished
+                for name in self._order:
+                    task = self.tasks[name]
+                    if task.status != PENDING or not self._is_ready(task):
+                        continue
+
+                    if not task.allow_failed_deps and not self._deps_ok(task):
+                        task.status = SKIPPED
+                        task.start_time = task.end_time = time.time()
+                        continue
+
+                    task.status = RUNNING
+                    running[executor.submit(self._execute, task, context)] = task
+
+                if not running:
+                    # Skipping a task can make others ready; loop until nothing changes
+                    if any(t.status == PENDING and self._is_ready(t) for t in self.tasks.values()):
+                        continue
+                    break
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    running.pop(future)
+
+        self.end_time = time.time()
+        failed = [name for name, task in self.tasks.items() if task.status == FAILED]
+        self._span.set_status(STATUS_ERROR if failed else STATUS_OK, f"{len(failed)} task(s) failed" if failed else "")
+        tracer.end_span(self._span)
+        return {name: self.tasks[name].status for name in self._order}
+
+    def critical_path(self):
+        """
+        Longest chain of dependent tasks, weighted by measured durations.
+
+        Returns:
+            tuple: (list of task names, total seconds)
+        """
+        best = {}
+        for name in self._order:
+            task = self.tasks[name]
+            prev = max((best[dep] for dep in task.deps), key=lambda item: item[1], default=([], 0.0))
+            best[name] = (prev[0] + [name], prev[1] + task.duration)
+
+        if not best:
+            return [], 0.0
+        return max(best.values(), key=lambda item: item[1])
+
+    def print_report(self):
+        """Log per-task durations and the critical path."""
+        wall = (self.end_time or time.time()) - (self.start_time or time.time())
+        total_work = sum(t.duration for t in self.tasks.values())
+
+        logger.info("\n" + "=" * 80)
+        logger.info("       WORKFLOW REPORT: %s", self.name)
+        logger.info("=" * 80)
+        logger.info("%-45s | %-8s | %8s | %9s", "Task", "Status", "Start", "Duration")
+        logger.info("-" * 80)
+        for name in self._order:
+            task = self.tasks[name]
+            offset = (task.start_time - self.start_time) if task.start_time and self.start_time else 0.0
+            logger.info("%-45s | %-8s | %7.1fs | %8.1fs", name[:45], task.status, offset, task.duration)
+        logger.info("-" * 80)
+
+        path, length = self.critical_path()
+        logger.info("Wall clock: %.1fs | Sum of task time: %.1fs | Workers: %s", wall, total_work, self.max_workers)
+        logger.info("Critical path (%.1fs):", length)
+        for name in path:
+            logger.info("    -> %s (%.1fs)", name, self.tasks[name].duration)
+        logger.info("=" * 80 + "\n")